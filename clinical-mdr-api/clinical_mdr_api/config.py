@@ -35,6 +35,12 @@ NUMBER_OF_UID_DIGITS = 6
 CACHE_MAX_SIZE = 1000
 CACHE_TTL = 3600
 
+# Number of HTML strings whose plain text is kept in memory, see `domains._utils.strip_html`
+PLAIN_TEXT_CACHE_MAX_SIZE = 10000
+
+# Number of threads running independent database reads of a single request concurrently
+CONCURRENT_READS_MAX_WORKERS = 8
+
 MAX_INT_NEO4J = 9223372036854775807
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 1000
@@ -122,6 +128,61 @@ TRACE_REQUEST_BODY_TRUNCATE_BYTES = int(
     environ.get("TRACE_REQUEST_BODY_TRUNCATE_BYTES", "2048")
 )
 
+# Per-route profiling of requests and their Cypher queries, reported by the /admin/query-profile endpoint.
+# Requires tracing, as it relies on its request metrics.
+QUERY_PROFILING_ENABLED = environ.get(
+    "QUERY_PROFILING_ENABLED", "true"
+).upper().strip() not in (_UPPERCASE_FALSE_STRINGS)
+# Number of most recent requests of each route the latency and query histograms are computed from
+QUERY_PROFILING_WINDOW_SIZE = int(environ.get("QUERY_PROFILING_WINDOW_SIZE", "500"))
+# Number of distinct queries kept per route, the least frequent being dropped first
+QUERY_PROFILING_MAX_FINGERPRINTS = 100
+# Requests running the same query more than this number of times are flagged as N+1 query patterns
+QUERY_PROFILING_N_PLUS_ONE_THRESHOLD = int(
+    environ.get("QUERY_PROFILING_N_PLUS_ONE_THRESHOLD", "20")
+)
+# Number of most recent flagged requests kept
+QUERY_PROFILING_FLAGGED_REQUESTS = 100
+
+# Move the literal values of Cypher queries into parameters, so that the database reuses cached query plans
+QUERY_CANONICALIZATION_ENABLED = environ.get(
+    "QUERY_CANONICALIZATION_ENABLED", "true"
+).upper().strip() not in (_UPPERCASE_FALSE_STRINGS)
+# Number of distinct texts counted per query by the query plan audit, reported by the /admin/query-plan-audit endpoint
+QUERY_PLAN_AUDIT_MAX_TEXTS = 1000
+
+# Measure the time spent importing each module on startup, reported by the /admin/startup-report endpoint
+STARTUP_REPORT_IMPORT_TIMES = environ.get(
+    "STARTUP_REPORT_IMPORT_TIMES", ""
+).upper().strip() in (_UPPERCASE_TRUE_STRINGS)
+
+# Seconds during which the version of the comments is not read again from the database,
+# comments changed through another API worker are listed after at most this delay
+COMMENTS_CACHE_MAX_STALENESS = int(environ.get("COMMENTS_CACHE_MAX_STALENESS", "5"))
+
+# Number of dictionary codelists whose term lookup index is kept in memory by each API worker
+DICTIONARY_LOOKUP_MAX_INDEXES = int(environ.get("DICTIONARY_LOOKUP_MAX_INDEXES", "8"))
+# Seconds during which the version of the terms of a dictionary codelist is not read again from the database,
+# terms changed through another API worker are looked up after at most this delay
+DICTIONARY_LOOKUP_MAX_STALENESS = int(
+    environ.get("DICTIONARY_LOOKUP_MAX_STALENESS", "5")
+)
+
+# Maximum number of names resolved to uids by a single request to the lookups endpoint
+LOOKUP_MAX_ITEMS = int(environ.get("LOOKUP_MAX_ITEMS", "5000"))
+
+# Number of study selections copied in one transaction when cloning a study
+STUDY_CLONE_BATCH_SIZE = int(environ.get("STUDY_CLONE_BATCH_SIZE", "500"))
+
+# Number of USDM and CTR ODM documents of locked and released study versions kept in memory by each API worker,
+# per type of document, for at most CACHE_TTL seconds
+STUDY_DOCUMENT_CACHE_MAX_SIZE = int(environ.get("STUDY_DOCUMENT_CACHE_MAX_SIZE", "20"))
+
+# Build the flowcharts and exports of a study version in the background when the study is locked or released
+PRECOMPUTE_STUDY_VERSIONS = environ.get(
+    "PRECOMPUTE_STUDY_VERSIONS", "true"
+).upper().strip() in (_UPPERCASE_TRUE_STRINGS)
+
 # Absolute path of application root directory
 APP_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 from threading import Lock
-from typing import Collection
+from typing import Any, Callable, Collection
 
 from cachetools import TTLCache, cached
 from cachetools.keys import hashkey
@@ -30,6 +30,66 @@ from clinical_mdr_api.repositories._utils import (
     validate_max_skip_clause,
 )
 
+# Every save, edit or delete of a comment thread or reply increments the version of its topic
+# (and of the topics whose path only differs by case, as topic paths are matched case-insensitively)
+# and the version of all comments.
+# The version of all comments is also written as change sequence onto the thread and the changed reply.
+# It is incremented in the transaction of the change, which holds the lock of the counter until it commits,
+# so changes are visible in the order of their sequence, unlike their times.
+INCREMENT_VERSIONS_QUERY = """
+MATCH (thread:CommentThread {uid: $thread_uid})-[:TOPIC]->(topic:CommentTopic)
+MATCH (same_topic:CommentTopic)
+WHERE toLower(same_topic.topic_path) = toLower(topic.topic_path)
+SET same_topic.comments_version = coalesce(same_topic.comments_version, 0) + 1
+WITH DISTINCT thread
+MERGE (counter:Counter {counterId: 'CommentsVersionCounter'})
+ON CREATE SET counter.count = 0
+SET counter.count = counter.count + 1
+SET thread.change_sequence = counter.count
+WITH counter
+OPTIONAL MATCH (reply:CommentReply {uid: $reply_uid})
+FOREACH (_ IN CASE WHEN reply IS NOT NULL THEN [1] ELSE [] END |
+    SET reply.change_sequence = counter.count)
+"""
+
+VERSIONS_QUERY = """
+OPTIONAL MATCH (counter:Counter {counterId: 'CommentsVersionCounter'})
+OPTIONAL MATCH (topic:CommentTopic {topic_path: $topic_path})
+RETURN counter.count, topic.comments_version
+"""
+
+
+def _comment_thread_ar_from_row(item: dict[str, Any]) -> CommentThreadAR:
+    reply_ars = [
+        CommentReplyAR.from_repository_values(
+            uid=reply._properties["uid"],
+            text=reply._properties["text"],
+            author=reply._properties["author"],
+            author_display_name=reply._properties["author_display_name"],
+            comment_thread_uid=item["thread.uid"],
+            created_at=convert_to_datetime(reply._properties["created_at"]),
+            modified_at=convert_to_datetime(reply._properties.get("modified_at", None)),
+            deleted_at=convert_to_datetime(reply._properties.get("deleted_at", None)),
+        )
+        for reply in item["replies"]
+    ]
+    reply_ars.sort(key=lambda x: x.created_at)
+
+    return CommentThreadAR.from_repository_values(
+        uid=item["thread.uid"],
+        text=item["thread.text"],
+        author=item["thread.author"],
+        author_display_name=item["thread.author_display_name"],
+        status=item["thread.status"],
+        created_at=convert_to_datetime(item["thread.created_at"]),
+        modified_at=convert_to_datetime(item["thread.modified_at"]),
+        status_modified_at=convert_to_datetime(item["thread.status_modified_at"]),
+        status_modified_by=item["thread.status_modified_by"],
+        deleted_at=convert_to_datetime(item["thread.deleted_at"]),
+        topic_path=item["topic.topic_path"],
+        replies=reply_ars,
+    )
+
 
 class CommentsRepository:
     cache_store_item_by_uid = TTLCache(
@@ -37,6 +97,17 @@ class CommentsRepository:
     )
     lock_store_item_by_uid = Lock()
 
+    # Thread, topic and reply lists, per version of the comments they were read from
+    cache_store_lists = TTLCache(maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL)
+    lock_store_lists = Lock()
+
+    # Versions read from the database are reused for a few seconds,
+    # changes made through another worker are thus listed after at most that delay
+    cache_store_versions = TTLCache(
+        maxsize=config.CACHE_MAX_SIZE, ttl=config.COMMENTS_CACHE_MAX_STALENESS
+    )
+    lock_store_versions = Lock()
+
     def generate_topic_uid(self) -> str:
         return CommentTopic.get_next_free_uid_and_increment_counter()
 
@@ -99,6 +170,73 @@ class CommentsRepository:
             return item
         return None
 
+    @classmethod
+    def get_version(cls, topic_path: str | None = None) -> int:
+        """
+        Returns the version of the comments of a topic, or of all comments.
+
+        Args:
+            topic_path (str | None): The exact path of the topic.
+                If not specified or if no topic has this path, the version of all comments is returned.
+
+        Returns:
+            int: The number of changes, 0 if no change was recorded yet.
+            The version of all comments is the change sequence of the last change.
+        """
+        return cls.get_tagged_version(topic_path)[1]
+
+    @classmethod
+    def get_tagged_version(cls, topic_path: str | None = None) -> tuple[str, int]:
+        """
+        Returns the version of the comments of a topic, or of all comments, with the counter it was read from.
+        The versions of a topic and of all comments are counted separately and can be equal,
+        so the keys of the cached lists must tell them apart.
+
+        Args:
+            topic_path (str | None): The exact path of the topic.
+                If not specified or if no topic has this path, the version of all comments is returned.
+
+        Returns:
+            tuple[str, int]: "topic" or "all", and the number of changes counted by that counter.
+        """
+        key = hashkey(topic_path)
+        with cls.lock_store_versions:
+            version = cls.cache_store_versions.get(key)
+        if version is not None:
+            return version
+
+        result, _ = db.cypher_query(VERSIONS_QUERY, {"topic_path": topic_path})
+        all_count, topic_count = result[0]
+        if topic_count is not None:
+            version = ("topic", topic_count)
+        else:
+            version = ("all", all_count or 0)
+
+        with cls.lock_store_versions:
+            cls.cache_store_versions[key] = version
+        return version
+
+    def _increment_versions(
+        self, thread_uid: str, reply_uid: str | None = None
+    ) -> None:
+        db.cypher_query(
+            INCREMENT_VERSIONS_QUERY, {"thread_uid": thread_uid, "reply_uid": reply_uid}
+        )
+
+    def _get_list(self, key, read: Callable[[], Any]) -> Any:
+        """
+        Returns the list cached for the given key, or reads and caches it.
+        The key must start with the version of the comments the list is read from.
+        """
+        with self.lock_store_lists:
+            result = self.cache_store_lists.get(key)
+        if result is not None:
+            return result
+        result = read()
+        with self.lock_store_lists:
+            self.cache_store_lists[key] = result
+        return result
+
     def find_topic_by_path(self, path: str) -> CommentTopicAR | None:
         node = CommentTopic.nodes.first_or_none(topic_path=path)
         if node is not None:
@@ -109,7 +247,7 @@ class CommentsRepository:
             return topic
         return None
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_versions"])
     def save_comment_thread(self, item: CommentThreadAR) -> None:
         repository_closure_data = item.repository_closure_data
 
@@ -131,10 +269,11 @@ class CommentsRepository:
             node.topic.connect(
                 CommentTopic.nodes.get_or_none(topic_path=item.topic_path)
             )
+            self._increment_versions(item.uid)
         else:
             raise NotImplementedError
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_versions"])
     def edit_comment_thread(
         self,
         item_latest: CommentThreadAR,
@@ -177,8 +316,9 @@ class CommentsRepository:
         )
         node_previous.save()
         node_latest.previous_version.connect(node_previous)
+        self._increment_versions(item_latest.uid)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_versions"])
     def save_comment_reply(self, item: CommentReplyAR) -> None:
         repository_closure_data = item.repository_closure_data
 
@@ -196,10 +336,11 @@ class CommentsRepository:
             node.reply_to.connect(
                 CommentThread.nodes.get_or_none(uid=item.comment_thread_uid)
             )
+            self._increment_versions(item.comment_thread_uid, item.uid)
         else:
             raise NotImplementedError
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_versions"])
     def edit_comment_reply(
         self, item_latest: CommentReplyAR, item_previous: CommentReplyAR
     ) -> None:
@@ -224,6 +365,7 @@ class CommentsRepository:
         )
         node_previous.save()
         node_latest.previous_version.connect(node_previous)
+        self._increment_versions(item_latest.comment_thread_uid, item_latest.uid)
 
     @sb_clear_cache(caches=["cache_store_item_by_uid"])
     def save_comment_topic(self, item: CommentTopicAR) -> None:
@@ -248,22 +390,51 @@ class CommentsRepository:
     ) -> tuple[list[CommentThreadAR], int]:
         validate_max_skip_clause(page_number=page_number, page_size=page_size)
 
+        version = self.get_tagged_version(
+            None if topic_path_partial_match else topic_path
+        )
+        return self._get_list(
+            hashkey(
+                version,
+                "threads",
+                topic_path,
+                topic_path_partial_match,
+                status,
+                page_number,
+                page_size,
+            ),
+            lambda: self._find_all_comment_threads(
+                topic_path=topic_path,
+                topic_path_partial_match=topic_path_partial_match,
+                status=status,
+                page_number=page_number,
+                page_size=page_size,
+            ),
+        )
+
+    def _find_all_comment_threads(
+        self,
+        topic_path: str | None,
+        topic_path_partial_match: bool,
+        status: CommentThreadStatus | None,
+        page_number: int,
+        page_size: int,
+    ) -> tuple[list[CommentThreadAR], int]:
+        params = {"skip": (page_number - 1) * page_size, "limit": page_size}
         topic_clause = ""
         if topic_path is not None:
+            params["topic_path"] = topic_path
             if topic_path_partial_match:
                 topic_clause = (
-                    f"AND toLower(topic.topic_path) CONTAINS toLower('{topic_path}') "
+                    "AND toLower(topic.topic_path) CONTAINS toLower($topic_path) "
                 )
             else:
-                topic_clause = (
-                    f"AND toLower(topic.topic_path) = toLower('{topic_path}') "
-                )
+                topic_clause = "AND toLower(topic.topic_path) = toLower($topic_path) "
 
-        status_clause = (
-            f"AND toLower(thread.status) = toLower('{status.value}') "
-            if status is not None
-            else ""
-        )
+        status_clause = ""
+        if status is not None:
+            params["status"] = status.value
+            status_clause = "AND toLower(thread.status) = toLower($status) "
 
         full_query = f"""
             MATCH (topic:CommentTopic)<-[:TOPIC]-(thread:CommentThread)
@@ -277,7 +448,7 @@ class CommentsRepository:
         
             WITH topic, thread, COLLECT(reply) as replies
             ORDER BY thread.created_at ASC
-            SKIP {page_number - 1} * {page_size} LIMIT {page_size}
+            SKIP $skip LIMIT $limit
             RETURN  topic.uid,
                     topic.topic_path, 
                     thread.uid,
@@ -303,51 +474,15 @@ class CommentsRepository:
 
         try:
             result_array, attributes_names = db.cypher_query(
-                query=full_query, params=None
+                query=full_query, params=params
             )
 
-            threads_ars: list[CommentThreadAR] = []
-            items = [dict(zip(attributes_names, res)) for res in result_array]
-            for item in items:
-                reply_ars = [
-                    CommentReplyAR.from_repository_values(
-                        uid=reply._properties["uid"],
-                        text=reply._properties["text"],
-                        author=reply._properties["author"],
-                        author_display_name=reply._properties["author_display_name"],
-                        comment_thread_uid=item["thread.uid"],
-                        created_at=convert_to_datetime(reply._properties["created_at"]),
-                        modified_at=convert_to_datetime(
-                            reply._properties.get("modified_at", None)
-                        ),
-                        deleted_at=convert_to_datetime(
-                            reply._properties.get("deleted_at", None)
-                        ),
-                    )
-                    for reply in item["replies"]
-                ]
-                reply_ars.sort(key=lambda x: x.created_at)
-
-                threads_ars.append(
-                    CommentThreadAR.from_repository_values(
-                        uid=item["thread.uid"],
-                        text=item["thread.text"],
-                        author=item["thread.author"],
-                        author_display_name=item["thread.author_display_name"],
-                        status=item["thread.status"],
-                        created_at=convert_to_datetime(item["thread.created_at"]),
-                        modified_at=convert_to_datetime(item["thread.modified_at"]),
-                        status_modified_at=convert_to_datetime(
-                            item["thread.status_modified_at"]
-                        ),
-                        status_modified_by=item["thread.status_modified_by"],
-                        deleted_at=convert_to_datetime(item["thread.deleted_at"]),
-                        topic_path=item["topic.topic_path"],
-                        replies=reply_ars,
-                    )
-                )
+            threads_ars: list[CommentThreadAR] = [
+                _comment_thread_ar_from_row(dict(zip(attributes_names, res)))
+                for res in result_array
+            ]
 
-            count_result, _ = db.cypher_query(query=count_query, params=None)
+            count_result, _ = db.cypher_query(query=count_query, params=params)
             total_amount = count_result[0][0] if len(count_result) > 0 else 0
 
             return threads_ars, total_amount
@@ -366,16 +501,43 @@ class CommentsRepository:
     ) -> tuple[list[CommentTopicAR], int]:
         validate_max_skip_clause(page_number=page_number, page_size=page_size)
 
+        version = self.get_tagged_version(
+            None if topic_path_partial_match else topic_path
+        )
+        return self._get_list(
+            hashkey(
+                version,
+                "topics",
+                topic_path,
+                topic_path_partial_match,
+                page_number,
+                page_size,
+            ),
+            lambda: self._find_all_comment_topics(
+                topic_path=topic_path,
+                topic_path_partial_match=topic_path_partial_match,
+                page_number=page_number,
+                page_size=page_size,
+            ),
+        )
+
+    def _find_all_comment_topics(
+        self,
+        topic_path: str | None,
+        topic_path_partial_match: bool,
+        page_number: int,
+        page_size: int,
+    ) -> tuple[list[CommentTopicAR], int]:
+        params = {"skip": (page_number - 1) * page_size, "limit": page_size}
         topic_clause = ""
         if topic_path is not None:
+            params["topic_path"] = topic_path
             if topic_path_partial_match:
                 topic_clause = (
-                    f"AND toLower(topic.topic_path) CONTAINS toLower('{topic_path}') "
+                    "AND toLower(topic.topic_path) CONTAINS toLower($topic_path) "
                 )
             else:
-                topic_clause = (
-                    f"AND toLower(topic.topic_path) = toLower('{topic_path}') "
-                )
+                topic_clause = "AND toLower(topic.topic_path) = toLower($topic_path) "
 
         full_query = f"""
             MATCH (topic:CommentTopic)<-[:TOPIC]-(thread:CommentThread)
@@ -391,7 +553,7 @@ class CommentsRepository:
                     topic_path, 
                     collect(thread_status) as thread_statuses, 
                     collect(threads_count) as thread_counts
-            SKIP {page_number - 1} * {page_size} LIMIT {page_size}
+            SKIP $skip LIMIT $limit
             RETURN *
         """
 
@@ -404,7 +566,7 @@ class CommentsRepository:
 
         try:
             result_array, attributes_names = db.cypher_query(
-                query=full_query, params=None
+                query=full_query, params=params
             )
 
             topics_ars: list[CommentTopicAR] = []
@@ -427,7 +589,7 @@ class CommentsRepository:
                     )
                 )
 
-            count_result, _ = db.cypher_query(query=count_query, params=None)
+            count_result, _ = db.cypher_query(query=count_query, params=params)
             total_amount = count_result[0][0] if len(count_result) > 0 else 0
 
             return topics_ars, total_amount
@@ -439,6 +601,14 @@ class CommentsRepository:
 
     def find_all_comment_thread_replies(
         self, thread_uid: str
+    ) -> Collection[CommentReplyAR]:
+        return self._get_list(
+            hashkey(self.get_version(), "replies", thread_uid),
+            lambda: self._find_all_comment_thread_replies(thread_uid),
+        )
+
+    def _find_all_comment_thread_replies(
+        self, thread_uid: str
     ) -> Collection[CommentReplyAR]:
         items: list[CommentReply] = CommentReply.nodes.filter(
             is_deleted=False, reply_to__uid=thread_uid, reply_to__is_deleted=False
@@ -466,21 +636,96 @@ class CommentsRepository:
 
         return item_ars
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    def find_comment_threads_changed_since(
+        self,
+        since: int,
+        topic_path: str | None = None,
+        topic_path_partial_match: bool = False,
+    ) -> tuple[list[CommentThreadAR], list[str], int]:
+        """
+        Returns the comment threads that were created, edited or deleted, or whose replies were,
+        after the change with the specified sequence number.
+
+        Args:
+            since (int): Only threads changed after this change sequence are returned, all threads if 0.
+            topic_path (str | None): The topic path of the threads, any topic if not specified.
+            topic_path_partial_match (bool): Whether the topic path of the threads only has to contain `topic_path`.
+
+        Returns:
+            tuple[list[CommentThreadAR], list[str], int]: The changed threads with their replies,
+            the uids of the deleted threads, and the change sequence to request the next changes from.
+        """
+        # Read before the threads: changes committed in between are returned again by the next request, never missed
+        sequence = max(self.get_version(), since)
+        if since and sequence == since:
+            return [], [], since
+
+        topic_clause = ""
+        if topic_path is not None:
+            if topic_path_partial_match:
+                topic_clause = (
+                    "AND toLower(topic.topic_path) CONTAINS toLower($topic_path)"
+                )
+            else:
+                topic_clause = "AND toLower(topic.topic_path) = toLower($topic_path)"
+
+        result_array, attributes_names = db.cypher_query(
+            query=f"""
+            MATCH (topic:CommentTopic)<-[:TOPIC]-(thread:CommentThread)
+            WHERE ($since = 0 OR thread.change_sequence > $since)
+            {topic_clause}
+
+            OPTIONAL MATCH (thread)<-[:REPLY_TO]-(reply:CommentReply)
+            WHERE reply.is_deleted = false
+
+            WITH topic, thread, COLLECT(reply) as replies
+            ORDER BY thread.created_at ASC
+            RETURN  topic.uid,
+                    topic.topic_path,
+                    thread.uid,
+                    thread.text,
+                    thread.author,
+                    thread.author_display_name,
+                    thread.status,
+                    thread.created_at,
+                    thread.modified_at,
+                    thread.status_modified_at,
+                    thread.status_modified_by,
+                    thread.deleted_at,
+                    thread.is_deleted,
+                    replies
+            """,
+            params={"since": since, "topic_path": topic_path},
+        )
+
+        threads_ars: list[CommentThreadAR] = []
+        deleted_thread_uids: list[str] = []
+        for res in result_array:
+            item = dict(zip(attributes_names, res))
+            if item["thread.is_deleted"]:
+                deleted_thread_uids.append(item["thread.uid"])
+            else:
+                threads_ars.append(_comment_thread_ar_from_row(item))
+
+        return threads_ars, deleted_thread_uids, sequence
+
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_versions"])
     def delete_comment_thread(self, uid: str):
         node = CommentThread.nodes.first_or_none(uid=uid)
         if node is not None:
             node.is_deleted = True
             node.deleted_at = datetime.now()
             node.save()
+            self._increment_versions(uid)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_versions"])
     def delete_comment_reply(self, uid: str):
         node = CommentReply.nodes.first_or_none(uid=uid)
         if node is not None:
             node.is_deleted = True
             node.deleted_at = datetime.now()
             node.save()
+            self._increment_versions(node.reply_to.single().uid, uid)
 
     def close(self) -> None:
         # Our repository guidelines state that repos should have a close method
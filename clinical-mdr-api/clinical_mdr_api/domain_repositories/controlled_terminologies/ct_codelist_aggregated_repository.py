@@ -9,6 +9,9 @@ from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_qu
     format_codelist_filter_sort_keys,
     list_codelist_wildcard_properties,
 )
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_sponsor_package_members import (
+    get_codelist_members_match_clause,
+)
 from clinical_mdr_api.domain_repositories.models._utils import (
     format_generic_header_values,
 )
@@ -322,54 +325,18 @@ class CTCodelistAggregatedRepository:
                 WHERE {operation_function}(term_uid IN {term_filter["term_uids"]} WHERE term_uid IN ct_term_uids)
                 """
 
-            match_clause += f"""
-                MATCH (package:CTPackage)-[:EXTENDS_PACKAGE]->(parent_package:CTPackage)
-                WITH package, parent_package, datetime(package.effective_date + "T23:59:59") AS exact_datetime
-                {"WHERE package.name=$package_name" if package else ""}
-                """
-
+            # The codelist versions making up the sponsor package are linked to it when it is created
+            match_clause += get_codelist_members_match_clause(library_name)
             if library_name:
                 # We will look only in a specific library
-                if library_name == "Sponsor":
-                    match_clause += f"""
-                        MATCH (:Library {{name:"Sponsor"}})-->(codelist_root{":CTCodelistRoot" if not term_filter else ""})
-                            -[:HAS_ATTRIBUTES_ROOT]->(codelist_attributes_root:CTCodelistAttributesRoot)-[attr_v_rel:HAS_VERSION]->(codelist_attributes_value:CTCodelistAttributesValue)
-                        MATCH (codelist_root)-[:HAS_NAME_ROOT]->(codelist_name_root:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(codelist_name_value:CTCodelistNameValue)
-                        WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
-                            AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime)) 
-                        WITH DISTINCT codelist_root, codelist_name_root, codelist_name_value, codelist_attributes_root, codelist_attributes_value, attr_v_rel, name_v_rel
-                    """
-                else:
-                    # We must look in the library and the parent package
-                    match_clause += f"""
-                        MATCH (parent_package:CTPackage)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
-                            (codelist_attributes_value:CTCodelistAttributesValue)<-[attr_v_rel:HAS_VERSION]-(codelist_attributes_root:CTCodelistAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
-                            (codelist_root{":CTCodelistRoot" if not term_filter else ""})-[:HAS_NAME_ROOT]->(codelist_name_root:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(codelist_name_value:CTCodelistNameValue)
-                        WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
+                if library_name != "Sponsor":
+                    # The codelists of the parent package
+                    match_clause += """
                         MATCH (library:Library)-->(codelist_root)
-                        WITH DISTINCT codelist_root, codelist_name_root, codelist_name_value, codelist_attributes_root, codelist_attributes_value, attr_v_rel, name_v_rel
                     """
-            else:
-                # Otherwise, we need to combine the sponsor terms with the terms in the parent package
-                match_clause += f"""
-                CALL {{
-                    WITH package, parent_package, exact_datetime
-                    MATCH (parent_package:CTPackage)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
-                        (codelist_attributes_value:CTCodelistAttributesValue)<-[attr_v_rel:HAS_VERSION]-(codelist_attributes_root:CTCodelistAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
-                        (codelist_root{":CTCodelistRoot" if not term_filter else ""})-[:HAS_NAME_ROOT]->(codelist_name_root:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(codelist_name_value:CTCodelistNameValue)
-                    WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
-                    RETURN DISTINCT codelist_root, codelist_name_root, codelist_name_value, codelist_attributes_root, codelist_attributes_value, attr_v_rel, name_v_rel
-
-                    UNION
-                    WITH exact_datetime
-                    MATCH (:Library {{name:"Sponsor"}})-->(codelist_root{":CTCodelistRoot" if not term_filter else ""})
-                        -[:HAS_ATTRIBUTES_ROOT]->(codelist_attributes_root:CTCodelistAttributesRoot)-[attr_v_rel:HAS_VERSION]->(codelist_attributes_value:CTCodelistAttributesValue)
-                    MATCH (codelist_root)-[:HAS_NAME_ROOT]->(codelist_name_root:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(codelist_name_value:CTCodelistNameValue)
-                    WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
-                        AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime)) 
-                    RETURN DISTINCT codelist_root, codelist_name_root, codelist_name_value, codelist_attributes_root, codelist_attributes_value, attr_v_rel, name_v_rel
-                }}
-            """
+                match_clause += """
+                    WITH DISTINCT codelist_root, codelist_name_root, codelist_name_value, codelist_attributes_root, codelist_attributes_value, attr_v_rel, name_v_rel
+                """
         else:
             if term_filter:
                 if "term_uids" not in term_filter:
@@ -13,6 +13,9 @@ from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_qu
     create_codelist_filter_statement,
     format_codelist_filter_sort_keys,
 )
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_sponsor_package_members import (
+    refresh_sponsor_package_codelist_members,
+)
 from clinical_mdr_api.domain_repositories.library_item_repository import (
     LibraryItemRepositoryImplBase,
 )
@@ -394,6 +397,8 @@ class CTCodelistGenericRepository(
         elif item.is_deleted:
             assert item.uid is not None
             self._soft_delete(item.uid)
+        # The sponsor packages whose effective date has not passed hold the current versions of the codelist
+        refresh_sponsor_package_codelist_members(item.uid)
 
     def codelist_exists(self, codelist_uid: str) -> bool:
         query = """
@@ -5,6 +5,9 @@ from neomodel import db
 from neomodel.exceptions import UniqueProperty
 
 from clinical_mdr_api import models
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_sponsor_package_members import (
+    create_sponsor_package_members,
+)
 from clinical_mdr_api.domain_repositories.models.controlled_terminology import (
     CTCatalogue,
     CTPackage,
@@ -179,6 +182,8 @@ class CTPackageRepository:
         # Connect the new package to its parent and the catalogue node
         sponsor_package.extends_package.connect(extends_package_node)
         catalogue_node.contains_package.connect(sponsor_package)
+        # Link the term and codelist versions making up the package
+        create_sponsor_package_members(sponsor_package.name)
 
         return CTPackageAR.from_repository_values(
             uid=sponsor_package.uid,
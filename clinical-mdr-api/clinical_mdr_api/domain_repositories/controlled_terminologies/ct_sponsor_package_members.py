@@ -0,0 +1,241 @@
+from neomodel import db
+
+# A sponsor package holds the items of the CDISC package it extends and the items of the Sponsor library,
+# in the version they have at the end of its effective date. Resolving these versions checks the date range
+# of every version of every item, so it is done when the package is created, and the resolved versions
+# are linked to the package through a member node per item:
+# (package)-[:CONTAINS_SPONSOR_TERM]->(member:CTPackageSponsorTerm)-[:CONTAINS_ATTRIBUTES_VERSION|CONTAINS_NAME_VERSION]->(value)
+# with the start date of the HAS_VERSION relationships of both values, and whether the item comes from
+# the parent package and/or from the Sponsor library.
+# Until the end of its effective date, the versions of an item can still change, so the members of the item
+# are resolved again in the packages whose effective date has not passed each time the item is saved.
+PACKAGES_CLAUSE = """
+MATCH (package:CTPackage)-[:EXTENDS_PACKAGE]->(parent_package:CTPackage)
+WITH package, parent_package, datetime(package.effective_date + "T23:59:59") AS exact_datetime
+WHERE {packages_filter}
+"""
+
+PACKAGE_BY_NAME_FILTER = "package.name = $package_name"
+OPEN_PACKAGES_FILTER = "exact_datetime >= datetime()"
+ITEM_FILTER = "AND root.uid = $uid"
+
+TERM_ITEMS_CLAUSE = """
+CALL {{
+    WITH parent_package, exact_datetime
+    MATCH (parent_package)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_TERM]->(:CTPackageTerm)-
+        [:CONTAINS_ATTRIBUTES]->(:CTTermAttributesValue)<-[attr_v_rel:HAS_VERSION]-(:CTTermAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
+        (root:CTTermRoot)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(:CTTermNameValue)
+    WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
+        {item_filter}
+    RETURN DISTINCT false AS is_sponsor_library, attr_v_rel, name_v_rel
+
+    UNION
+    WITH exact_datetime
+    MATCH (:Library {{name:"Sponsor"}})-->(root:CTTermRoot)
+        -[:HAS_ATTRIBUTES_ROOT]->(:CTTermAttributesRoot)-[attr_v_rel:HAS_VERSION]->(:CTTermAttributesValue)
+    MATCH (root)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(:CTTermNameValue)
+    WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
+        AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime))
+        {item_filter}
+    RETURN DISTINCT true AS is_sponsor_library, attr_v_rel, name_v_rel
+}}
+"""
+
+CODELIST_ITEMS_CLAUSE = """
+CALL {{
+    WITH parent_package, exact_datetime
+    MATCH (parent_package)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
+        (:CTCodelistAttributesValue)<-[attr_v_rel:HAS_VERSION]-(:CTCodelistAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
+        (root:CTCodelistRoot)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(:CTCodelistNameValue)
+    WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
+        {item_filter}
+    RETURN DISTINCT false AS is_sponsor_library, attr_v_rel, name_v_rel
+
+    UNION
+    WITH exact_datetime
+    MATCH (:Library {{name:"Sponsor"}})-->(root:CTCodelistRoot)
+        -[:HAS_ATTRIBUTES_ROOT]->(:CTCodelistAttributesRoot)-[attr_v_rel:HAS_VERSION]->(:CTCodelistAttributesValue)
+    MATCH (root)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(:CTCodelistNameValue)
+    WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
+        AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime))
+        {item_filter}
+    RETURN DISTINCT true AS is_sponsor_library, attr_v_rel, name_v_rel
+}}
+"""
+
+CREATE_MEMBERS_CLAUSE = """
+WITH package, attr_v_rel, name_v_rel, collect(is_sponsor_library) AS sources
+CREATE (package)-[:{relationship}]->(member:{label} {{
+    in_parent_package: false IN sources,
+    in_sponsor_library: true IN sources,
+    attributes_start_date: attr_v_rel.start_date,
+    name_start_date: name_v_rel.start_date
+}})
+WITH member, endNode(attr_v_rel) AS attributes_value, endNode(name_v_rel) AS name_value
+CREATE (member)-[:CONTAINS_ATTRIBUTES_VERSION]->(attributes_value)
+CREATE (member)-[:CONTAINS_NAME_VERSION]->(name_value)
+RETURN count(member)
+"""
+
+DELETE_MEMBERS_CLAUSE = """
+MATCH (package)-[:{relationship}]->(member:{label})-[:CONTAINS_ATTRIBUTES_VERSION]->()
+    <-[:HAS_VERSION]-()<-[:HAS_ATTRIBUTES_ROOT]-(:{root_label} {{uid: $uid}})
+DETACH DELETE member
+"""
+
+
+def _create_members_query(
+    items_clause: str,
+    relationship: str,
+    label: str,
+    packages_filter: str,
+    item_filter: str,
+) -> str:
+    return (
+        PACKAGES_CLAUSE.format(packages_filter=packages_filter)
+        + items_clause.format(item_filter=item_filter)
+        + CREATE_MEMBERS_CLAUSE.format(relationship=relationship, label=label)
+    )
+
+
+CREATE_TERM_MEMBERS_QUERY = _create_members_query(
+    TERM_ITEMS_CLAUSE,
+    "CONTAINS_SPONSOR_TERM",
+    "CTPackageSponsorTerm",
+    PACKAGE_BY_NAME_FILTER,
+    "",
+)
+
+CREATE_CODELIST_MEMBERS_QUERY = _create_members_query(
+    CODELIST_ITEMS_CLAUSE,
+    "CONTAINS_SPONSOR_CODELIST",
+    "CTPackageSponsorCodelist",
+    PACKAGE_BY_NAME_FILTER,
+    "",
+)
+
+DELETE_TERM_MEMBERS_QUERY = PACKAGES_CLAUSE.format(
+    packages_filter=OPEN_PACKAGES_FILTER
+) + DELETE_MEMBERS_CLAUSE.format(
+    relationship="CONTAINS_SPONSOR_TERM",
+    label="CTPackageSponsorTerm",
+    root_label="CTTermRoot",
+)
+
+DELETE_CODELIST_MEMBERS_QUERY = PACKAGES_CLAUSE.format(
+    packages_filter=OPEN_PACKAGES_FILTER
+) + DELETE_MEMBERS_CLAUSE.format(
+    relationship="CONTAINS_SPONSOR_CODELIST",
+    label="CTPackageSponsorCodelist",
+    root_label="CTCodelistRoot",
+)
+
+REFRESH_TERM_MEMBERS_QUERY = _create_members_query(
+    TERM_ITEMS_CLAUSE,
+    "CONTAINS_SPONSOR_TERM",
+    "CTPackageSponsorTerm",
+    OPEN_PACKAGES_FILTER,
+    ITEM_FILTER,
+)
+
+REFRESH_CODELIST_MEMBERS_QUERY = _create_members_query(
+    CODELIST_ITEMS_CLAUSE,
+    "CONTAINS_SPONSOR_CODELIST",
+    "CTPackageSponsorCodelist",
+    OPEN_PACKAGES_FILTER,
+    ITEM_FILTER,
+)
+
+
+def create_sponsor_package_members(package_name: str) -> None:
+    """
+    Links the versions of the terms and codelists making up a sponsor package to the package.
+    Must be called in the transaction creating the package.
+
+    Args:
+        package_name (str): The name of the sponsor package.
+    """
+    db.cypher_query(CREATE_TERM_MEMBERS_QUERY, {"package_name": package_name})
+    db.cypher_query(CREATE_CODELIST_MEMBERS_QUERY, {"package_name": package_name})
+
+
+def refresh_sponsor_package_term_members(term_uid: str) -> None:
+    """
+    Links the current versions of a term to the sponsor packages whose effective date has not passed.
+    Must be called in the transaction saving the term.
+
+    Args:
+        term_uid (str): The uid of the term.
+    """
+    db.cypher_query(DELETE_TERM_MEMBERS_QUERY, {"uid": term_uid})
+    db.cypher_query(REFRESH_TERM_MEMBERS_QUERY, {"uid": term_uid})
+
+
+def refresh_sponsor_package_codelist_members(codelist_uid: str) -> None:
+    """
+    Links the current versions of a codelist to the sponsor packages whose effective date has not passed.
+    Must be called in the transaction saving the codelist.
+
+    Args:
+        codelist_uid (str): The uid of the codelist.
+    """
+    db.cypher_query(DELETE_CODELIST_MEMBERS_QUERY, {"uid": codelist_uid})
+    db.cypher_query(REFRESH_CODELIST_MEMBERS_QUERY, {"uid": codelist_uid})
+
+
+def _members_filter(library_name: str | None) -> str:
+    if library_name == "Sponsor":
+        return "AND member.in_sponsor_library"
+    if library_name:
+        return "AND member.in_parent_package"
+    return ""
+
+
+def get_term_members_match_clause(library_name: str | None = None) -> str:
+    """
+    Returns the Cypher clause matching the term versions of the sponsor package named `$package_name`.
+
+    Args:
+        library_name (str | None): Only match the terms of the Sponsor library if "Sponsor",
+            or the terms of the parent package for any other library.
+
+    Returns:
+        str: The clause, binding `package`, `term_root`, `term_attributes_root`, `term_attributes_value`,
+        `attr_v_rel`, `term_name_root`, `term_name_value` and `name_v_rel`.
+    """
+    return f"""
+        MATCH (package:CTPackage)-[:CONTAINS_SPONSOR_TERM]->(member:CTPackageSponsorTerm)
+        WHERE package.name=$package_name {_members_filter(library_name)}
+        MATCH (member)-[:CONTAINS_ATTRIBUTES_VERSION]->(term_attributes_value:CTTermAttributesValue)
+            <-[attr_v_rel:HAS_VERSION]-(term_attributes_root:CTTermAttributesRoot)
+        WHERE attr_v_rel.start_date = member.attributes_start_date
+        MATCH (term_root:CTTermRoot)-[:HAS_ATTRIBUTES_ROOT]->(term_attributes_root)
+        MATCH (term_root)-[:HAS_NAME_ROOT]->(term_name_root:CTTermNameRoot)
+            -[name_v_rel:HAS_VERSION]->(term_name_value:CTTermNameValue)<-[:CONTAINS_NAME_VERSION]-(member)
+        WHERE name_v_rel.start_date = member.name_start_date
+    """
+
+
+def get_codelist_members_match_clause(library_name: str | None = None) -> str:
+    """
+    Returns the Cypher clause matching the codelist versions of the sponsor package named `$package_name`.
+
+    Args:
+        library_name (str | None): Only match the codelists of the Sponsor library if "Sponsor",
+            or the codelists of the parent package for any other library.
+
+    Returns:
+        str: The clause, binding `package`, `codelist_root`, `codelist_attributes_root`, `codelist_attributes_value`,
+        `attr_v_rel`, `codelist_name_root`, `codelist_name_value` and `name_v_rel`.
+    """
+    return f"""
+        MATCH (package:CTPackage)-[:CONTAINS_SPONSOR_CODELIST]->(member:CTPackageSponsorCodelist)
+        WHERE package.name=$package_name {_members_filter(library_name)}
+        MATCH (member)-[:CONTAINS_ATTRIBUTES_VERSION]->(codelist_attributes_value:CTCodelistAttributesValue)
+            <-[attr_v_rel:HAS_VERSION]-(codelist_attributes_root:CTCodelistAttributesRoot)
+        WHERE attr_v_rel.start_date = member.attributes_start_date
+        MATCH (codelist_root:CTCodelistRoot)-[:HAS_ATTRIBUTES_ROOT]->(codelist_attributes_root)
+        MATCH (codelist_root)-[:HAS_NAME_ROOT]->(codelist_name_root:CTCodelistNameRoot)
+            -[name_v_rel:HAS_VERSION]->(codelist_name_value:CTCodelistNameValue)<-[:CONTAINS_NAME_VERSION]-(member)
+        WHERE name_v_rel.start_date = member.name_start_date
+    """
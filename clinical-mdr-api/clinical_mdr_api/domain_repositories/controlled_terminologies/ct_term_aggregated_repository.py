@@ -9,6 +9,9 @@ from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_qu
     format_term_filter_sort_keys,
     list_term_wildcard_properties,
 )
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_sponsor_package_members import (
+    get_term_members_match_clause,
+)
 from clinical_mdr_api.domain_repositories.models._utils import (
     format_generic_header_values,
 )
@@ -296,53 +299,17 @@ class CTTermAggregatedRepository:
                     "Package must be provided when fetching sponsor terms."
                 )
 
-            match_clause += f"""
-                MATCH (package:CTPackage)-[:EXTENDS_PACKAGE]->(parent_package:CTPackage)
-                WITH package, parent_package, datetime(package.effective_date + "T23:59:59") AS exact_datetime
-                {"WHERE package.name=$package_name" if package else ""}
-            """
-
+            # The term versions making up the sponsor package are linked to it when it is created
+            match_clause += get_term_members_match_clause(library_name)
             if library_name:
                 # We will look only in a specific library
-                if library_name == "Sponsor":
+                if library_name != "Sponsor":
+                    # The terms of the parent package
                     match_clause += """
-                        MATCH (:Library {name:"Sponsor"})-->(term_root:CTTermRoot)
-                            -[:HAS_ATTRIBUTES_ROOT]->(term_attributes_root:CTTermAttributesRoot)-[attr_v_rel:HAS_VERSION]->(term_attributes_value:CTTermAttributesValue)
-                        MATCH (term_root)-[:HAS_NAME_ROOT]->(term_name_root:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(term_name_value:CTTermNameValue)
-                        WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
-                            AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime))
-                        WITH DISTINCT term_root, term_name_root, term_name_value, term_attributes_root, term_attributes_value, attr_v_rel, name_v_rel
-                """
-                else:
-                    # We must look in the library and the parent package
-                    match_clause += """
-                        MATCH (parent_package:CTPackage)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_TERM]->(:CTPackageTerm)-
-                        [:CONTAINS_ATTRIBUTES]->(term_attributes_value:CTTermAttributesValue)<-[attr_v_rel:HAS_VERSION]-(term_attributes_root:CTTermAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
-                        (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->(term_name_root:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(term_name_value:CTTermNameValue)
-                        WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
                         MATCH (library:Library)-[:CONTAINS_TERM]->(term_root)
-                        WITH DISTINCT term_root, term_name_root, term_name_value, term_attributes_root, term_attributes_value, attr_v_rel, name_v_rel
                     """
-            else:
-                # Otherwise, we need to combine the sponsor terms with the terms in the parent package
                 match_clause += """
-                CALL {
-                    WITH package, parent_package, exact_datetime
-                    MATCH (parent_package:CTPackage)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_TERM]->(:CTPackageTerm)-
-                        [:CONTAINS_ATTRIBUTES]->(term_attributes_value:CTTermAttributesValue)<-[attr_v_rel:HAS_VERSION]-(term_attributes_root:CTTermAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
-                        (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->(term_name_root:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(term_name_value:CTTermNameValue)
-                    WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
-                    RETURN DISTINCT term_root, term_name_root, term_name_value, term_attributes_root, term_attributes_value, attr_v_rel, name_v_rel
-
-                    UNION
-                    WITH exact_datetime
-                    MATCH (:Library {name:"Sponsor"})-->(term_root:CTTermRoot)
-                        -[:HAS_ATTRIBUTES_ROOT]->(term_attributes_root:CTTermAttributesRoot)-[attr_v_rel:HAS_VERSION]->(term_attributes_value:CTTermAttributesValue)
-                    MATCH (term_root)-[:HAS_NAME_ROOT]->(term_name_root:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(term_name_value:CTTermNameValue)
-                    WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
-                        AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime))
-                    RETURN DISTINCT term_root, term_name_root, term_name_value, term_attributes_root, term_attributes_value, attr_v_rel, name_v_rel
-                }
+                    WITH DISTINCT term_root, term_name_root, term_name_value, term_attributes_root, term_attributes_value, attr_v_rel, name_v_rel
                 """
 
         else:
@@ -14,6 +14,9 @@ from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_get_all_qu
     create_term_filter_statement,
     format_term_filter_sort_keys,
 )
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_sponsor_package_members import (
+    refresh_sponsor_package_term_members,
+)
 from clinical_mdr_api.domain_repositories.library_item_repository import (
     LibraryItemRepositoryImplBase,
 )
@@ -444,6 +447,8 @@ class CTTermGenericRepository(LibraryItemRepositoryImplBase[_AggregateRootType],
         elif item.is_deleted:
             assert item.uid is not None
             self._soft_delete(item.uid)
+        # The sponsor packages whose effective date has not passed hold the current versions of the term
+        refresh_sponsor_package_term_members(item.uid)
 
     def _is_repository_related_to_ct(self) -> bool:
         return True
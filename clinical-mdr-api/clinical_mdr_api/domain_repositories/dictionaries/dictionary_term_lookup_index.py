@@ -0,0 +1,112 @@
+"""In-memory index of the term names of a dictionary codelist, for typeahead search and lookup by exact name."""
+from array import array
+from bisect import bisect_left
+from typing import Iterable, NamedTuple
+
+
+class DictionaryTermLookupEntry(NamedTuple):
+    term_uid: str
+    name: str
+    dictionary_id: str | None
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+class DictionaryTermLookupIndex:
+    """
+    Index of the terms of a dictionary codelist by name.
+
+    Names are kept case-folded in alphabetical order, so that names starting with a search string are found
+    by bisection, and each trigram of the case-folded names maps to the (ordered) positions of the names
+    containing it, so that names containing a search string are only searched among the names containing
+    its least frequent trigram.
+    """
+
+    def __init__(self, entries: Iterable[DictionaryTermLookupEntry]):
+        keyed = sorted(
+            (((entry.name or "").casefold(), entry) for entry in entries),
+            key=lambda item: (item[0], item[1].term_uid),
+        )
+        self._keys = [key for key, _ in keyed]
+        self._entries = [entry for _, entry in keyed]
+        self._positions_by_name: dict[str, list[int]] = {}
+        self._positions_by_trigram: dict[str, array] = {}
+        for position, (key, entry) in enumerate(keyed):
+            self._positions_by_name.setdefault(entry.name, []).append(position)
+            for trigram in _trigrams(key):
+                positions = self._positions_by_trigram.get(trigram)
+                if positions is None:
+                    positions = self._positions_by_trigram[trigram] = array("I")
+                positions.append(position)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find_by_names(
+        self, names: Iterable[str]
+    ) -> dict[str, list[DictionaryTermLookupEntry]]:
+        """
+        Returns the terms with exactly the given names.
+
+        Args:
+            names (Iterable[str]): The names to look up, compared case-sensitively.
+
+        Returns:
+            dict[str, list[DictionaryTermLookupEntry]]: The terms by name, an empty list for a name without terms.
+        """
+        return {
+            name: [
+                self._entries[position]
+                for position in self._positions_by_name.get(name, ())
+            ]
+            for name in names
+        }
+
+    def search(
+        self, search_string: str, result_count: int = 10
+    ) -> list[DictionaryTermLookupEntry]:
+        """
+        Returns the terms whose name contains the search string, case-insensitively.
+
+        Names starting with the search string are returned first, then names containing it elsewhere,
+        both in alphabetical order. Names are only searched for containing search strings of at least
+        three characters, shorter search strings only match the start of names.
+
+        Args:
+            search_string (str): The text to search for.
+            result_count (int): The maximum number of terms to return.
+
+        Returns:
+            list[DictionaryTermLookupEntry]: The matching terms.
+        """
+        key = search_string.casefold()
+        start = bisect_left(self._keys, key)
+        end = start
+        while (
+            end < len(self._keys)
+            and end - start < result_count
+            and self._keys[end].startswith(key)
+        ):
+            end += 1
+        found = list(range(start, end))
+
+        if len(found) < result_count and len(key) >= 3:
+            candidates = []
+            for trigram in _trigrams(key):
+                positions = self._positions_by_trigram.get(trigram)
+                if positions is None:
+                    candidates = []
+                    break
+                candidates.append(positions)
+            if candidates:
+                for position in min(candidates, key=len):
+                    # names starting with the search string are all found already
+                    if start <= position < end or key not in self._keys[position]:
+                        continue
+                    found.append(position)
+                    if len(found) >= result_count:
+                        break
+
+        return [self._entries[position] for position in found]
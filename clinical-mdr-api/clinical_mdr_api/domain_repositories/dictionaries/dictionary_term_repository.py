@@ -1,13 +1,19 @@
 from abc import ABC
 from datetime import datetime, timezone
+from threading import Lock
 from typing import Any
 
+from cachetools import LRUCache, TTLCache
 from neomodel import db
 
-from clinical_mdr_api import exceptions
+from clinical_mdr_api import config, exceptions
 from clinical_mdr_api.domain_repositories._generic_repository_interface import (
     _AggregateRootType,
 )
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_lookup_index import (
+    DictionaryTermLookupEntry,
+    DictionaryTermLookupIndex,
+)
 from clinical_mdr_api.domain_repositories.library_item_repository import (
     LibraryItemRepositoryImplBase,
 )
@@ -52,6 +58,24 @@ from clinical_mdr_api.repositories._utils import (
     sb_clear_cache,
 )
 
+# Every save of a term increments the version of the terms of its codelist,
+# which invalidates the lookup index of the codelist
+INCREMENT_LOOKUP_VERSION_QUERY = """
+MATCH (dictionary_codelist_root:DictionaryCodelistRoot {uid: $codelist_uid})
+SET dictionary_codelist_root.terms_version = coalesce(dictionary_codelist_root.terms_version, 0) + 1
+"""
+
+LOOKUP_VERSION_QUERY = """
+MATCH (dictionary_codelist_root:DictionaryCodelistRoot {uid: $codelist_uid})
+RETURN coalesce(dictionary_codelist_root.terms_version, 0)
+"""
+
+LOOKUP_TERMS_QUERY = """
+MATCH (:DictionaryCodelistRoot {uid: $codelist_uid})
+    -[:HAS_TERM|HAD_TERM]->(dictionary_term_root:DictionaryTermRoot)-[:LATEST]->(dictionary_term_value)
+RETURN DISTINCT dictionary_term_root.uid, dictionary_term_value.name, dictionary_term_value.dictionary_id
+"""
+
 
 class DictionaryTermGenericRepository(
     LibraryItemRepositoryImplBase[_AggregateRootType], ABC
@@ -71,6 +95,20 @@ class DictionaryTermGenericRepository(
         "ucum": UCUMTermValue,
     }
 
+    # Lookup indexes of the terms of the most recently used codelists, by codelist uid,
+    # each with the version of the terms it was read from
+    cache_store_lookup_indexes = LRUCache(maxsize=config.DICTIONARY_LOOKUP_MAX_INDEXES)
+    lock_store_lookup_indexes = Lock()
+    # Held while the lookup index of a codelist is read, by codelist uid
+    lock_store_lookup_index_reads: dict[str, Lock] = {}
+
+    # Versions read from the database are reused for a few seconds,
+    # terms changed through another worker are thus looked up after at most that delay
+    cache_store_lookup_versions = TTLCache(
+        maxsize=config.CACHE_MAX_SIZE, ttl=config.DICTIONARY_LOOKUP_MAX_STALENESS
+    )
+    lock_store_lookup_versions = Lock()
+
     def generate_uid(self) -> str:
         return DictionaryTermRoot.get_next_free_uid_and_increment_counter()
 
@@ -312,6 +350,87 @@ class DictionaryTermGenericRepository(
             else []
         )
 
+    @classmethod
+    def get_lookup_version(cls, codelist_uid: str) -> int | None:
+        """
+        Returns the version of the terms of a dictionary codelist, incremented by every save of one of its terms.
+
+        Args:
+            codelist_uid (str): The unique identifier of the dictionary codelist.
+
+        Returns:
+            int | None: The version of the terms, None if the codelist doesn't exist.
+        """
+        with cls.lock_store_lookup_versions:
+            version = cls.cache_store_lookup_versions.get(codelist_uid)
+        if version is not None:
+            return version
+
+        result, _ = db.cypher_query(
+            LOOKUP_VERSION_QUERY, {"codelist_uid": codelist_uid}
+        )
+        if not result:
+            return None
+        version = result[0][0]
+
+        with cls.lock_store_lookup_versions:
+            cls.cache_store_lookup_versions[codelist_uid] = version
+        return version
+
+    def get_lookup_index(self, codelist_uid: str) -> DictionaryTermLookupIndex | None:
+        """
+        Returns the lookup index of the terms of a dictionary codelist,
+        read from the database on first use and again after any of its terms is saved.
+
+        The index of a codelist is read by one request at a time.
+        While it is read again after a save, the other requests are served the previous index.
+
+        Args:
+            codelist_uid (str): The unique identifier of the dictionary codelist.
+
+        Returns:
+            DictionaryTermLookupIndex | None: The index of the latest versions of the terms,
+            None if the codelist doesn't exist.
+        """
+        version = self.get_lookup_version(codelist_uid)
+        if version is None:
+            return None
+
+        with self.lock_store_lookup_indexes:
+            cached = self.cache_store_lookup_indexes.get(codelist_uid)
+            read_lock = self.lock_store_lookup_index_reads.setdefault(
+                codelist_uid, Lock()
+            )
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        if cached is None:
+            read_lock.acquire()
+        elif not read_lock.acquire(blocking=False):
+            # Already being read again by another request
+            return cached[1]
+        try:
+            with self.lock_store_lookup_indexes:
+                cached = self.cache_store_lookup_indexes.get(codelist_uid)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            result, _ = db.cypher_query(
+                LOOKUP_TERMS_QUERY, {"codelist_uid": codelist_uid}
+            )
+            index = DictionaryTermLookupIndex(
+                DictionaryTermLookupEntry(term_uid, name, dictionary_id)
+                for term_uid, name, dictionary_id in result
+            )
+            with self.lock_store_lookup_indexes:
+                self.cache_store_lookup_indexes[codelist_uid] = (version, index)
+            return index
+        finally:
+            read_lock.release()
+
+    def _increment_lookup_version(self, codelist_uid: str) -> None:
+        db.cypher_query(INCREMENT_LOOKUP_VERSION_QUERY, {"codelist_uid": codelist_uid})
+
     def find_by_uid(
         self, term_uid: str, for_update: bool | None = False
     ) -> DictionaryTermAR:
@@ -324,7 +443,7 @@ class DictionaryTermGenericRepository(
         """
         return self.find_by_uid_2(uid=term_uid, for_update=for_update)
 
-    @sb_clear_cache(caches=["cache_store_item_by_uid"])
+    @sb_clear_cache(caches=["cache_store_item_by_uid", "cache_store_lookup_versions"])
     def save(self, item: _AggregateRootType) -> None:
         if item.uid is not None and item.repository_closure_data is None:
             self._create(item)
@@ -333,6 +452,7 @@ class DictionaryTermGenericRepository(
         elif item.is_deleted:
             assert item.uid is not None
             self._soft_delete(item.uid)
+        self._increment_lookup_version(item.dictionary_term_vo.codelist_uid)
 
     def _create(self, item: DictionaryTermAR) -> DictionaryTermAR:
         """
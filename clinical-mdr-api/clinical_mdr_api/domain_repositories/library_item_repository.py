@@ -2180,6 +2180,7 @@ class LibraryItemRepositoryImplBase(
                     template_uid: template_root.uid,
                     template_sequence_id: template_root.sequence_id,
                     template_name: template_value.name,
+                    template_name_plain: template_value.name_plain,
                     template_guidance_text: template_value.guidance_text,
                     template_library_name: template_library.name,
                     term_uid: type_root.uid,
@@ -0,0 +1,84 @@
+"""Resolution of many names to uids, with one query per type of item."""
+from typing import Iterable
+
+from neomodel import db
+
+CT_CODELIST_UIDS_QUERY = """
+MATCH (codelist_value:CTCodelistNameValue)
+WHERE codelist_value.name IN $names
+MATCH (codelist_root:CTCodelistRoot)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)-[:LATEST]->(codelist_value)
+RETURN codelist_value.name AS name, min(codelist_root.uid) AS uid
+"""
+
+CT_TERM_UIDS_QUERY = """
+UNWIND $items AS item
+MATCH (:CTCodelistRoot {uid: item.codelist_uid})-[:HAS_TERM]->(term_root:CTTermRoot)
+    -[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[:LATEST]->(:CTTermNameValue {name: item.name})
+RETURN item.codelist_uid AS codelist_uid, item.name AS name, min(term_root.uid) AS uid
+"""
+
+# The labels are given by the code, never by the request
+CONCEPT_UIDS_QUERY = """
+MATCH (value:{value_label})
+WHERE value.name IN $names
+MATCH (root:{root_label})-[:LATEST]->(value)
+RETURN value.name AS name, min(root.uid) AS uid
+"""
+
+
+class LookupRepository:
+    def find_ct_codelist_uids(self, names: Iterable[str]) -> dict[str, str]:
+        """
+        Returns the uids of the CT codelists with the given names.
+
+        Args:
+            names (Iterable[str]): The names of the codelists.
+
+        Returns:
+            dict[str, str]: The uid by name, without the names of no codelist.
+        """
+        rows, _ = db.cypher_query(CT_CODELIST_UIDS_QUERY, {"names": list(names)})
+        return dict(rows)
+
+    def find_ct_term_uids(
+        self, items: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], str]:
+        """
+        Returns the uids of the CT terms with the given sponsor preferred names in the given codelists.
+
+        Args:
+            items (Iterable[tuple[str, str]]): The uid of the codelist and the name of the term to look up.
+
+        Returns:
+            dict[tuple[str, str], str]: The uid by codelist uid and name, without the names of no term.
+        """
+        rows, _ = db.cypher_query(
+            CT_TERM_UIDS_QUERY,
+            {
+                "items": [
+                    {"codelist_uid": codelist_uid, "name": name}
+                    for codelist_uid, name in items
+                ]
+            },
+        )
+        return {(codelist_uid, name): uid for codelist_uid, name, uid in rows}
+
+    def find_concept_uids(
+        self, root_label: str, value_label: str, names: Iterable[str]
+    ) -> dict[str, str]:
+        """
+        Returns the uids of the concepts whose latest version has the given names.
+
+        Args:
+            root_label (str): The label of the roots of the concepts, e.g. ActivityRoot.
+            value_label (str): The label of the versions of the concepts, e.g. ActivityValue.
+            names (Iterable[str]): The names of the concepts.
+
+        Returns:
+            dict[str, str]: The uid by name, without the names of no concept.
+        """
+        rows, _ = db.cypher_query(
+            CONCEPT_UIDS_QUERY.format(root_label=root_label, value_label=value_label),
+            {"names": list(names)},
+        )
+        return dict(rows)
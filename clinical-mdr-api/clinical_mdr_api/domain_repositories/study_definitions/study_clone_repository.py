@@ -0,0 +1,349 @@
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterator, Sequence
+
+from neomodel import db
+
+from clinical_mdr_api import config, exceptions
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StudyCloneComponent:
+    # label of the selection nodes
+    label: str
+    # path from the StudyValue to the selection nodes
+    path: str
+    # relationship linking the StudyValue to the selection nodes, if any
+    relationship: str | None = None
+    # label naming the uid counter and uid prefix used by the repository of the selections, if not their label
+    uid_label: str | None = None
+
+
+def _component(
+    label: str, relationship: str, uid_label: str | None = None
+) -> StudyCloneComponent:
+    return StudyCloneComponent(
+        label=label,
+        path=f"-[:{relationship}]->",
+        relationship=relationship,
+        uid_label=uid_label,
+    )
+
+
+def _activity_metadata_component(label: str, relationship: str) -> StudyCloneComponent:
+    # study activity groupings are only linked to the study through its activities
+    return StudyCloneComponent(
+        label=label,
+        path=f"-[:HAS_STUDY_ACTIVITY]->(:StudyActivity)-[:{relationship}]->",
+    )
+
+
+STUDY_CLONE_COMPONENTS = (
+    _component("StudyArm", "HAS_STUDY_ARM"),
+    _component("StudyBranchArm", "HAS_STUDY_BRANCH_ARM"),
+    _component("StudyCohort", "HAS_STUDY_COHORT"),
+    _component("StudyEpoch", "HAS_STUDY_EPOCH"),
+    _component("StudyVisit", "HAS_STUDY_VISIT"),
+    _component("StudyElement", "HAS_STUDY_ELEMENT"),
+    _component("StudyDesignCell", "HAS_STUDY_DESIGN_CELL"),
+    _component("StudyObjective", "HAS_STUDY_OBJECTIVE"),
+    _component("StudyEndpoint", "HAS_STUDY_ENDPOINT"),
+    _component("StudyCriteria", "HAS_STUDY_CRITERIA"),
+    _component("StudyCompound", "HAS_STUDY_COMPOUND"),
+    _component("StudyCompoundDosing", "HAS_STUDY_COMPOUND_DOSING"),
+    _component("StudyActivity", "HAS_STUDY_ACTIVITY"),
+    _activity_metadata_component("StudySoAGroup", "STUDY_ACTIVITY_HAS_STUDY_SOA_GROUP"),
+    _activity_metadata_component(
+        "StudyActivityGroup", "STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_GROUP"
+    ),
+    _activity_metadata_component(
+        "StudyActivitySubGroup", "STUDY_ACTIVITY_HAS_STUDY_ACTIVITY_SUBGROUP"
+    ),
+    _component("StudyActivityInstance", "HAS_STUDY_ACTIVITY_INSTANCE"),
+    # see StudyActivityScheduleRepository.generate_uid
+    _component(
+        "StudyActivitySchedule",
+        "HAS_STUDY_ACTIVITY_SCHEDULE",
+        uid_label="StudyActivity",
+    ),
+    _component("StudyActivityInstruction", "HAS_STUDY_ACTIVITY_INSTRUCTION"),
+    _component("StudySoAFootnote", "HAS_STUDY_FOOTNOTE"),
+    _component("StudyDiseaseMilestone", "HAS_STUDY_DISEASE_MILESTONE"),
+    _component("StudyStandardVersion", "HAS_STUDY_STANDARD_VERSION"),
+)
+
+# Nodes of a study that are never shared with a clone: relationships to them are either replaced by relationships
+# to their clones, or dropped when they are not part of the cloned study version (e.g. previous versions).
+STUDY_NODE_LABELS = [component.label for component in STUDY_CLONE_COMPONENTS] + [
+    "StudySelection",
+    "StudySelectionMetadata",
+    "StudyValue",
+    "StudyRoot",
+    "StudyAction",
+]
+
+# Properties holding the uid of another selection of the same study
+UID_REFERENCE_PROPERTIES = {"StudyVisit": ("visit_sublabel_reference",)}
+
+STUDY_VALUE_QUERY = """
+MATCH (:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
+RETURN elementId(sv)
+"""
+
+RELEASED_STUDY_VALUE_QUERY = """
+MATCH (:StudyRoot {uid: $study_uid})-[hv:HAS_VERSION {status: 'RELEASED', version: $study_value_version}]->(sv:StudyValue)
+WITH sv ORDER BY hv.start_date DESC
+RETURN elementId(sv) LIMIT 1
+"""
+
+RESERVE_UIDS_QUERY = """
+MERGE (m:Counter {{counterId: '{label}Counter'}})
+ON CREATE SET m:{label}Counter, m.count = 0
+WITH m
+CALL apoc.atomic.add(m, 'count', $count, 1) YIELD newValue
+RETURN toInteger(newValue)
+"""
+
+CREATE_AUDIT_NODE_QUERY = """
+MATCH (sr:StudyRoot {uid: $study_uid})
+CREATE (sr)-[:AUDIT_TRAIL]->(action:StudyAction:Create {user_initials: $user_initials, date: $date})
+RETURN elementId(action)
+"""
+
+# The clone keeps track of its source through a CLONED_TO relationship until the whole study is cloned
+CLONE_NODES_QUERY = """
+MATCH (action:StudyAction) WHERE elementId(action) = $action_id
+MATCH (sv:StudyValue) WHERE elementId(sv) = $study_value_id
+UNWIND $batch AS item
+MATCH (source) WHERE elementId(source) = item.source_id
+CREATE (source)-[:CLONED_TO {{clone_id: $clone_id}}]->(clone)
+SET clone = properties(source), clone.uid = item.uid
+CREATE (action)-[:AFTER]->(clone)
+{link_to_study_value}
+WITH source, clone
+CALL apoc.create.addLabels(clone, labels(source)) YIELD node
+RETURN count(node)
+"""
+
+CLONE_RELATIONSHIPS_QUERY = """
+UNWIND $batch AS source_id
+MATCH (source)-[:CLONED_TO {clone_id: $clone_id}]->(clone)
+WHERE elementId(source) = source_id
+MATCH (source)-[rel]->(target)
+WHERE type(rel) <> 'CLONED_TO'
+OPTIONAL MATCH (target)-[:CLONED_TO {clone_id: $clone_id}]->(target_clone)
+WITH clone, rel, target, target_clone
+WHERE target_clone IS NOT NULL OR none(label IN labels(target) WHERE label IN $study_node_labels)
+CALL apoc.create.relationship(clone, type(rel), properties(rel), coalesce(target_clone, target)) YIELD rel AS cloned_rel
+RETURN count(cloned_rel)
+"""
+
+REMAP_UID_REFERENCE_QUERY = """
+UNWIND $batch AS source_id
+MATCH (source)-[:CLONED_TO {{clone_id: $clone_id}}]->(clone:{label})
+WHERE elementId(source) = source_id AND clone.{property} IS NOT NULL
+MATCH (referenced:{label} {{uid: clone.{property}}})-[:CLONED_TO {{clone_id: $clone_id}}]->(referenced_clone)
+SET clone.{property} = referenced_clone.uid
+"""
+
+REMOVE_CLONE_TRACKING_QUERY = """
+UNWIND $batch AS source_id
+MATCH (source)-[cloned:CLONED_TO {clone_id: $clone_id}]->()
+WHERE elementId(source) = source_id
+DELETE cloned
+"""
+
+REMOVE_CLONES_QUERY = """
+UNWIND $batch AS source_id
+MATCH (source)-[:CLONED_TO {clone_id: $clone_id}]->(clone)
+WHERE elementId(source) = source_id
+DETACH DELETE clone
+"""
+
+REMOVE_AUDIT_NODES_QUERY = """
+MATCH (action:StudyAction) WHERE elementId(action) IN $action_ids
+DETACH DELETE action
+"""
+
+
+def _batches(items: Sequence[str], batch_size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def format_uid(label: str, number: int) -> str:
+    """Formats a uid the same way as `ClinicalMdrNodeWithUID.get_next_free_uid_and_increment_counter`"""
+    return f"{label}_{str(number).zfill(config.NUMBER_OF_UID_DIGITS)}"
+
+
+class StudyCloneRepository:
+    """
+    Copies the selections of a study version into another study, in bounded batches.
+
+    The selections of each component (arms, visits, activities, footnotes ...) are copied with new uids,
+    reserved in a single step per batch, and are all linked to a single `Create` audit action per component.
+    Relationships between copied selections are recreated between their copies, relationships to library items
+    (templates, CT terms, activities ...) are recreated to the same items.
+    Each batch runs in its own transaction, so that cloning a large study does not hold a large transaction.
+    """
+
+    def __init__(self, author: str, batch_size: int = config.STUDY_CLONE_BATCH_SIZE):
+        self.author = author
+        self.batch_size = batch_size
+        self.clone_id = uuid.uuid4().hex
+        self._source_ids: dict[StudyCloneComponent, list[str]] = {}
+        self._action_ids: list[str] = []
+
+    @staticmethod
+    def get_study_value_id(
+        study_uid: str, study_value_version: str | None = None
+    ) -> str:
+        if study_value_version:
+            result, _ = db.cypher_query(
+                RELEASED_STUDY_VALUE_QUERY,
+                {"study_uid": study_uid, "study_value_version": study_value_version},
+            )
+        else:
+            result, _ = db.cypher_query(STUDY_VALUE_QUERY, {"study_uid": study_uid})
+        if not result:
+            raise exceptions.NotFoundException(
+                f"Study with uid '{study_uid}'"
+                + (
+                    f" and version '{study_value_version}'"
+                    if study_value_version
+                    else ""
+                )
+                + " was not found."
+            )
+        return result[0][0]
+
+    def _reserve_uids(self, label: str, count: int) -> list[str]:
+        result, _ = db.cypher_query(
+            RESERVE_UIDS_QUERY.format(label=label), {"count": count}
+        )
+        last = result[0][0]
+        return [
+            format_uid(label, number) for number in range(last - count + 1, last + 1)
+        ]
+
+    def _create_audit_node(self, study_uid: str) -> str:
+        result, _ = db.cypher_query(
+            CREATE_AUDIT_NODE_QUERY,
+            {
+                "study_uid": study_uid,
+                "user_initials": self.author,
+                "date": datetime.now(timezone.utc),
+            },
+        )
+        self._action_ids.append(result[0][0])
+        return result[0][0]
+
+    def _run_in_batches(self, query: str, source_ids: Sequence[str], **params):
+        for batch in _batches(source_ids, self.batch_size):
+            db.cypher_query(
+                query, {"batch": list(batch), "clone_id": self.clone_id, **params}
+            )
+
+    def clone(
+        self,
+        source_study_uid: str,
+        target_study_uid: str,
+        study_value_version: str | None = None,
+    ) -> dict[str, int]:
+        """
+        Copies the selections of a study version into the latest draft of another study.
+
+        Args:
+            source_study_uid (str): The uid of the study to copy from.
+            target_study_uid (str): The uid of the study to copy into, usually just created.
+            study_value_version (str | None): The released version of the source study to copy, if not the latest.
+
+        Returns:
+            dict[str, int]: The number of copied selections, by node label.
+        """
+        source_study_value_id = self.get_study_value_id(
+            source_study_uid, study_value_version
+        )
+        target_study_value_id = self.get_study_value_id(target_study_uid)
+
+        for component in STUDY_CLONE_COMPONENTS:
+            result, _ = db.cypher_query(
+                f"""
+                MATCH (sv:StudyValue) WHERE elementId(sv) = $study_value_id
+                MATCH (sv){component.path}(source:{component.label})
+                RETURN DISTINCT elementId(source)
+                """,
+                {"study_value_id": source_study_value_id},
+            )
+            self._source_ids[component] = [row[0] for row in result]
+
+        try:
+            # first all nodes, so that all relationships between them can be recreated
+            for component, source_ids in self._source_ids.items():
+                if not source_ids:
+                    continue
+                log.info(
+                    "Cloning %i %s nodes of study '%s' into study '%s'",
+                    len(source_ids),
+                    component.label,
+                    source_study_uid,
+                    target_study_uid,
+                )
+                action_id = self._create_audit_node(target_study_uid)
+                query = CLONE_NODES_QUERY.format(
+                    link_to_study_value=f"CREATE (sv)-[:{component.relationship}]->(clone)"
+                    if component.relationship
+                    else ""
+                )
+                for batch in _batches(source_ids, self.batch_size):
+                    uids = self._reserve_uids(
+                        component.uid_label or component.label, len(batch)
+                    )
+                    db.cypher_query(
+                        query,
+                        {
+                            "batch": [
+                                {"source_id": source_id, "uid": uid}
+                                for source_id, uid in zip(batch, uids)
+                            ],
+                            "clone_id": self.clone_id,
+                            "action_id": action_id,
+                            "study_value_id": target_study_value_id,
+                        },
+                    )
+
+            for component, source_ids in self._source_ids.items():
+                self._run_in_batches(
+                    CLONE_RELATIONSHIPS_QUERY,
+                    source_ids,
+                    study_node_labels=STUDY_NODE_LABELS,
+                )
+                for prop in UID_REFERENCE_PROPERTIES.get(component.label, ()):
+                    self._run_in_batches(
+                        REMAP_UID_REFERENCE_QUERY.format(
+                            label=component.label, property=prop
+                        ),
+                        source_ids,
+                    )
+        except Exception:
+            log.exception(
+                "Cloning study '%s' into study '%s' failed, removing the copied selections",
+                source_study_uid,
+                target_study_uid,
+            )
+            for source_ids in self._source_ids.values():
+                self._run_in_batches(REMOVE_CLONES_QUERY, source_ids)
+            db.cypher_query(REMOVE_AUDIT_NODES_QUERY, {"action_ids": self._action_ids})
+            raise
+
+        for source_ids in self._source_ids.values():
+            self._run_in_batches(REMOVE_CLONE_TRACKING_QUERY, source_ids)
+
+        return {
+            component.label: len(source_ids)
+            for component, source_ids in self._source_ids.items()
+        }
@@ -20,6 +20,7 @@ from clinical_mdr_api.domain_repositories.generic_repository import RepositoryIm
 from clinical_mdr_api.domain_repositories.models._utils import (
     CustomNodeSet,
     convert_to_datetime,
+    convert_to_tz_aware_datetime,
     to_relation_trees,
 )
 from clinical_mdr_api.domain_repositories.models.concepts import UnitDefinitionRoot
@@ -43,7 +44,6 @@ from clinical_mdr_api.domain_repositories.models.study_field import (
     StudyArrayField,
     StudyBooleanField,
     StudyField,
-    StudyIntField,
     StudyProjectField,
     StudyTextField,
     StudyTimeField,
@@ -122,6 +122,80 @@ class _AdditionalClosure:
     previous_snapshot: StudyDefinitionSnapshot
 
 
+# Node label and relationship type from StudyValue for each type of single value study fields
+STUDY_FIELD_NODE_TYPES = {
+    StudyFieldType.TEXT: ("StudyTextField", "HAS_TEXT_FIELD"),
+    StudyFieldType.BOOL: ("StudyBooleanField", "HAS_BOOLEAN_FIELD"),
+    StudyFieldType.TIME: ("StudyTimeField", "HAS_TIME_FIELD"),
+    StudyFieldType.INT: ("StudyIntField", "HAS_INT_FIELD"),
+}
+
+STUDY_FIELDS_UPDATE_QUERY = """
+MATCH (study_root:StudyRoot {{uid: $study_uid}})
+MATCH (study_value:StudyValue) WHERE elementId(study_value) = $study_value_id
+UNWIND $fields AS field
+OPTIONAL MATCH (prev_study_field:StudyField) WHERE elementId(prev_study_field) = field.prev_study_field_id
+CALL {{
+    WITH field
+    WITH field WHERE field.create
+    CREATE (study_field:StudyField:{label} {{field_name: field.field_name}})
+    SET study_field.value = field.value
+    RETURN study_field
+    UNION
+    WITH field
+    WITH field WHERE NOT field.create
+    OPTIONAL MATCH (study_field:StudyField) WHERE elementId(study_field) = field.study_field_id
+    RETURN study_field
+}}
+OPTIONAL MATCH (type_term_root) WHERE elementId(type_term_root) = field.type_id
+OPTIONAL MATCH (null_value_reason_term_root) WHERE elementId(null_value_reason_term_root) = field.null_value_reason_id
+FOREACH (_ IN CASE WHEN study_field IS NOT NULL AND type_term_root IS NOT NULL THEN [1] ELSE [] END |
+    MERGE (study_field)-[:HAS_TYPE]->(type_term_root)
+)
+FOREACH (_ IN CASE WHEN study_field IS NOT NULL AND null_value_reason_term_root IS NOT NULL THEN [1] ELSE [] END |
+    MERGE (study_field)-[:HAS_REASON_FOR_NULL_VALUE]->(null_value_reason_term_root)
+)
+FOREACH (_ IN CASE WHEN study_field IS NOT NULL AND field.link THEN [1] ELSE [] END |
+    MERGE (study_value)-[:{relationship_type}]->(study_field)
+)
+WITH study_root, study_value, field, prev_study_field, study_field
+OPTIONAL MATCH (study_value)-[prev_rel:{relationship_type}]->(prev_study_field) WHERE field.unlink_prev
+DELETE prev_rel
+WITH study_root, field, prev_study_field, study_field
+WHERE field.audit_action IS NOT NULL
+CALL apoc.create.node(["StudyAction", field.audit_action], {{user_initials: $user_initials, date: $date}}) YIELD node AS audit_node
+CREATE (study_root)-[:AUDIT_TRAIL]->(audit_node)
+FOREACH (_ IN CASE WHEN prev_study_field IS NOT NULL THEN [1] ELSE [] END |
+    CREATE (audit_node)-[:BEFORE]->(prev_study_field)
+)
+FOREACH (_ IN CASE WHEN study_field IS NOT NULL THEN [1] ELSE [] END |
+    CREATE (audit_node)-[:AFTER]->(study_field)
+)
+"""
+
+
+@dataclass(frozen=True)
+class _UsedStudyField:
+    element_id: str
+    field_name: str
+    value: Any
+    null_value_codes: list[str]
+
+
+@dataclass
+class _StudyFieldChange:
+    config_item: Any
+    field_name: str
+    value: Any
+    null_value_code: str | None
+    prev_value: Any
+    prev_null_value_code: str | None
+    to_delete: bool = False
+    term_uid: str | None = None
+    term_root_id: str | None = None
+    null_value_term_root_id: str | None = None
+
+
 class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
     def __init__(self, user_initials):
         super().__init__()
@@ -1054,56 +1128,6 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
             f"({study_field_name})"
         )
 
-    def _get_previous_study_field_node(
-        self,
-        config_item,
-        study_root,
-        study_field_name,
-        prev_study_field_value,
-        prev_study_field_null_value_code,
-    ):
-        null_value_code = (
-            None if prev_study_field_value else prev_study_field_null_value_code
-        )
-        prev_study_field_node = None
-        if config_item.study_field_data_type == StudyFieldType.TEXT:
-            prev_study_field_node = (
-                StudyTextField.get_specific_field_currently_used_in_study(
-                    study_uid=study_root.uid,
-                    field_name=study_field_name,
-                    value=prev_study_field_value,
-                    null_value_code=null_value_code,
-                )
-            )
-        elif config_item.study_field_data_type == StudyFieldType.BOOL:
-            prev_study_field_node = (
-                StudyBooleanField.get_specific_field_currently_used_in_study(
-                    study_uid=study_root.uid,
-                    field_name=study_field_name,
-                    value=prev_study_field_value,
-                    null_value_code=null_value_code,
-                )
-            )
-        elif config_item.study_field_data_type == StudyFieldType.TIME:
-            prev_study_field_node = (
-                StudyTimeField.get_specific_field_currently_used_in_study(
-                    study_uid=study_root.uid,
-                    field_name=study_field_name,
-                    value=prev_study_field_value,
-                    null_value_code=null_value_code,
-                )
-            )
-        elif config_item.study_field_data_type == StudyFieldType.INT:
-            prev_study_field_node = (
-                StudyIntField.get_specific_field_currently_used_in_study(
-                    study_uid=study_root.uid,
-                    field_name=study_field_name,
-                    value=prev_study_field_value,
-                    null_value_code=null_value_code,
-                )
-            )
-        return prev_study_field_node
-
     def _get_or_create_study_field_node(
         self,
         study_field: type,
@@ -1138,6 +1162,78 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
             study_field_node.has_reason_for_null_value.connect(null_value_reason_node)
         return study_field_node
 
+    @staticmethod
+    def _find_study_field_used_in_study(
+        used_study_fields: Sequence[_UsedStudyField],
+        field_name: str,
+        value: Any,
+        null_value_code: str | None = None,
+    ) -> str | None:
+        """
+        Finds the StudyField with a given value, or null value reason, that has historically already been used
+        in the study, like `StudyField.get_specific_field_currently_used_in_study` does in the database.
+        """
+        for used_study_field in used_study_fields:
+            if used_study_field.field_name != field_name:
+                continue
+            if null_value_code:
+                if null_value_code in used_study_field.null_value_codes:
+                    return used_study_field.element_id
+            elif (
+                value is not None
+                # in Cypher, unlike in Python, true doesn't equal to 1
+                and isinstance(used_study_field.value, bool) == isinstance(value, bool)
+                and used_study_field.value == value
+            ):
+                return used_study_field.element_id
+        return None
+
+    @staticmethod
+    def _get_study_fields_used_in_study(
+        study_uid: str, study_value: StudyValue, field_names: list[str]
+    ) -> list[_UsedStudyField]:
+        # Fields linked to the study value being saved come first, as those are the ones to be unlinked on change
+        result, _ = db.cypher_query(
+            """
+            MATCH (study_root:StudyRoot {uid: $study_uid})-[:HAS_VERSION]->(study_value:StudyValue)-->(study_field:StudyField)
+            WHERE study_field.field_name IN $field_names
+            WITH study_field, max(elementId(study_value) = $study_value_id) AS is_linked
+            OPTIONAL MATCH (study_field)-[:HAS_REASON_FOR_NULL_VALUE]->(null_value_term)
+            RETURN elementId(study_field), study_field.field_name, study_field.value, collect(null_value_term.uid)
+            ORDER BY is_linked DESC
+            """,
+            {
+                "study_uid": study_uid,
+                "study_value_id": study_value.element_id,
+                "field_names": field_names,
+            },
+        )
+        return [_UsedStudyField(*row) for row in result]
+
+    @staticmethod
+    def _get_term_root_element_ids(
+        ct_term_uids: set[str], dictionary_term_uids: set[str]
+    ) -> dict[tuple[str, bool], str]:
+        result, _ = db.cypher_query(
+            """
+            MATCH (term_root:CTTermRoot)-[:HAS_NAME_ROOT]->()-[:LATEST_FINAL]->()
+            WHERE term_root.uid IN $ct_term_uids
+            RETURN DISTINCT term_root.uid AS uid, false AS is_dictionary_term, elementId(term_root) AS element_id
+            UNION
+            MATCH (term_root:DictionaryTermRoot)-[:LATEST_FINAL]->()
+            WHERE term_root.uid IN $dictionary_term_uids
+            RETURN DISTINCT term_root.uid AS uid, true AS is_dictionary_term, elementId(term_root) AS element_id
+            """,
+            {
+                "ct_term_uids": list(ct_term_uids),
+                "dictionary_term_uids": list(dictionary_term_uids),
+            },
+        )
+        return {
+            (uid, is_dictionary_term): element_id
+            for uid, is_dictionary_term, element_id in result
+        }
+
     def _maintain_study_fields_relationships(
         self,
         study_root: StudyRoot,
@@ -1147,18 +1243,20 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
         expected_latest_value: StudyValue,
         date: datetime,
     ):
+        """
+        Maintains the StudyField nodes of the text, boolean, time and integer study fields.
+
+        The changes of all fields are computed first, so that the StudyField nodes used in the study
+        and the referenced terms are read with one query each, and all changes are written
+        with one query per type of study field, regardless of the number of configured fields.
+        """
         curr_metadata = current_snapshot.current_metadata
         prev_metadata = previous_snapshot.current_metadata
+        changes: list[_StudyFieldChange] = []
         for config_item in FieldConfiguration.default_field_config():
             if (
                 config_item.study_field_grouping == "ver_metadata"
-                or config_item.study_field_data_type
-                not in [
-                    StudyFieldType.TEXT,
-                    StudyFieldType.BOOL,
-                    StudyFieldType.TIME,
-                    StudyFieldType.INT,
-                ]
+                or config_item.study_field_data_type not in STUDY_FIELD_NODE_TYPES
             ):
                 continue
 
@@ -1168,7 +1266,6 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
             prev_study_field_value = getattr(
                 prev_metadata, config_item.study_field_name
             )  # previous field value
-            study_field_name = config_item.study_field_name_api  # field name
             if config_item.study_field_null_value_code is not None:
                 prev_study_field_null_value_code = getattr(
                     prev_metadata, config_item.study_field_null_value_code
@@ -1181,196 +1278,169 @@ class StudyDefinitionRepositoryImpl(StudyDefinitionRepository, RepositoryImpl):
                 study_field_null_value_code = None
 
             if (
-                study_field_value != prev_study_field_value
-                or previous_value is not expected_latest_value
-                or prev_study_field_null_value_code != study_field_null_value_code
+                study_field_value == prev_study_field_value
+                and previous_value is expected_latest_value
+                and prev_study_field_null_value_code == study_field_null_value_code
             ):
-                prev_study_field_node = self._get_previous_study_field_node(
-                    config_item=config_item,
-                    study_root=study_root,
-                    study_field_name=study_field_name,
-                    prev_study_field_value=prev_study_field_value,
-                    prev_study_field_null_value_code=prev_study_field_null_value_code,
+                continue
+
+            change = _StudyFieldChange(
+                config_item=config_item,
+                field_name=config_item.study_field_name_api,
+                value=study_field_value,
+                null_value_code=study_field_null_value_code,
+                prev_value=prev_study_field_value,
+                prev_null_value_code=prev_study_field_null_value_code,
+            )
+            # check if the study field needs to be deleted
+            if study_field_value is None and study_field_null_value_code is None:
+                if prev_study_field_value is not None:
+                    change.value = prev_study_field_value
+                    change.to_delete = True
+                elif prev_study_field_null_value_code is not None:
+                    change.null_value_code = prev_study_field_null_value_code
+                    change.to_delete = True
+
+            if change.value is not None or change.null_value_code is not None:
+                if config_item.configured_codelist_uid:
+                    change.term_uid = change.value
+                elif config_item.study_field_data_type == StudyFieldType.BOOL:
+                    change.term_uid = (
+                        CT_UID_BOOLEAN_YES if change.value else CT_UID_BOOLEAN_NO
+                    )
+                elif config_item.configured_term_uid:
+                    change.term_uid = config_item.configured_term_uid
+
+            changes.append(change)
+
+        if not changes:
+            return
+
+        # Validate all referenced terms with a single query
+        term_root_ids = self._get_term_root_element_ids(
+            ct_term_uids={
+                change.term_uid
+                for change in changes
+                if change.term_uid and not change.config_item.is_dictionary_term
+            }
+            | {
+                change.null_value_code
+                for change in changes
+                if change.value is None and change.null_value_code is not None
+            },
+            dictionary_term_uids={
+                change.term_uid
+                for change in changes
+                if change.term_uid and change.config_item.is_dictionary_term
+            },
+        )
+        for change in changes:
+            if change.term_uid:
+                change.term_root_id = term_root_ids.get(
+                    (change.term_uid, bool(change.config_item.is_dictionary_term))
                 )
-                study_field_node = None
-                # check if the study field needs to be deleted
-                to_delete = False
-                if study_field_value is None and study_field_null_value_code is None:
-                    if study_field_value is None and prev_study_field_value is not None:
-                        study_field_value = prev_study_field_value
-                        to_delete = True
-                    elif (
-                        study_field_null_value_code is None
-                        and prev_study_field_null_value_code is not None
-                    ):
-                        study_field_null_value_code = prev_study_field_null_value_code
-                        to_delete = True
-                if (
-                    study_field_value is not None
-                    or study_field_null_value_code is not None
-                ):
-                    node_uid = None
-                    if config_item.configured_codelist_uid:
-                        node_uid = study_field_value
-                    elif config_item.study_field_data_type == StudyFieldType.BOOL:
-                        node_uid = (
-                            CT_UID_BOOLEAN_YES
-                            if study_field_value
-                            else CT_UID_BOOLEAN_NO
-                        )
-                    elif config_item.configured_term_uid:
-                        node_uid = config_item.configured_term_uid
-                    if node_uid:
-                        ct_term_root_node = self._get_associated_ct_term_root_node(
-                            term_uid=node_uid,
-                            study_field_name=study_field_name,
-                            is_dictionary_term=config_item.is_dictionary_term,
-                        )
-                    else:
-                        ct_term_root_node = None
-
-                    if study_field_value is not None:
-                        if config_item.study_field_data_type == StudyFieldType.TEXT:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyTextField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_text_field.connect(
-                                    study_field_node
-                                )
-                        elif config_item.study_field_data_type == StudyFieldType.BOOL:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyBooleanField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_boolean_field.connect(
-                                    study_field_node
-                                )
-                        elif config_item.study_field_data_type == StudyFieldType.TIME:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyTimeField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_time_field.connect(
-                                    study_field_node
-                                )
-                        elif config_item.study_field_data_type == StudyFieldType.INT:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyIntField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_int_field.connect(
-                                    study_field_node
-                                )
+                if change.term_root_id is None:
+                    raise exceptions.ValidationException(
+                        f"The following {'DictionaryTerm' if change.config_item.is_dictionary_term else 'CTTerm'} "
+                        f"uid ({change.term_uid}) wasn't found in the database."
+                        f"Please check if the CT data was properly loaded for the following StudyField "
+                        f"({change.field_name})"
+                    )
+            if change.value is None and change.null_value_code is not None:
+                change.null_value_term_root_id = term_root_ids.get(
+                    (change.null_value_code, False)
+                )
+                if change.null_value_term_root_id is None:
+                    raise exceptions.ValidationException(
+                        f"The following CTTerm uid ({change.null_value_code}) wasn't found in the database."
+                        f"Please check if the CT data was properly loaded for the following StudyField "
+                        f"(Null Flavour)"
+                    )
 
-                    elif study_field_null_value_code is not None:
-                        if config_item.study_field_data_type == StudyFieldType.TEXT:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyTextField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                null_value_code=study_field_null_value_code,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_text_field.connect(
-                                    study_field_node
-                                )
-                        elif config_item.study_field_data_type == StudyFieldType.BOOL:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyBooleanField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                null_value_code=study_field_null_value_code,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_boolean_field.connect(
-                                    study_field_node
-                                )
-                        elif config_item.study_field_data_type == StudyFieldType.TIME:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyTimeField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                null_value_code=study_field_null_value_code,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_time_field.connect(
-                                    study_field_node
-                                )
-                        elif config_item.study_field_data_type == StudyFieldType.INT:
-                            study_field_node = self._get_or_create_study_field_node(
-                                study_field=StudyIntField,
-                                study_root=study_root,
-                                study_field_name=study_field_name,
-                                study_field_value=study_field_value,
-                                term_root_node=ct_term_root_node,
-                                null_value_code=study_field_null_value_code,
-                                to_delete=to_delete,
-                            )
-                            if not to_delete:
-                                expected_latest_value.has_int_field.connect(
-                                    study_field_node
-                                )
-                if (
-                    prev_study_field_node is not None
-                    and (prev_study_field_node != study_field_node)
-                    and previous_value is expected_latest_value
-                ):
-                    if config_item.study_field_data_type == StudyFieldType.TEXT:
-                        expected_latest_value.has_text_field.disconnect(
-                            prev_study_field_node
-                        )
-                    elif config_item.study_field_data_type == StudyFieldType.BOOL:
-                        expected_latest_value.has_boolean_field.disconnect(
-                            prev_study_field_node
-                        )
-                    elif config_item.study_field_data_type == StudyFieldType.TIME:
-                        expected_latest_value.has_time_field.disconnect(
-                            prev_study_field_node
-                        )
-                    elif config_item.study_field_data_type == StudyFieldType.INT:
-                        expected_latest_value.has_int_field.disconnect(
-                            prev_study_field_node
-                        )
-                if study_field_node != prev_study_field_node:
-                    self._generate_study_field_audit_node(
-                        study_root_node=study_root,
-                        study_field_node_after=study_field_node,
-                        study_field_node_before=prev_study_field_node,
-                        change_status=None,
-                        user_initials=self.audit_info.user,
-                        date=date,
-                        to_delete=to_delete,
+        # Find the previous and reusable StudyField nodes with a single query
+        used_study_fields = self._get_study_fields_used_in_study(
+            study_uid=study_root.uid,
+            study_value=expected_latest_value,
+            field_names=[change.field_name for change in changes],
+        )
+        rows_by_field_type: dict[StudyFieldType, list[dict]] = {}
+        for change in changes:
+            prev_study_field_id = self._find_study_field_used_in_study(
+                used_study_fields,
+                field_name=change.field_name,
+                value=change.prev_value,
+                null_value_code=None
+                if change.prev_value
+                else change.prev_null_value_code,
+            )
+            study_field_id = None
+            create = False
+            if change.value is not None or change.null_value_code is not None:
+                if not change.to_delete:
+                    study_field_id = self._find_study_field_used_in_study(
+                        used_study_fields,
+                        field_name=change.field_name,
+                        value=change.value,
+                        null_value_code=change.null_value_code
+                        if change.value is None
+                        else None,
                     )
+                create = study_field_id is None
+
+            is_changed = create or study_field_id != prev_study_field_id
+            rows_by_field_type.setdefault(
+                change.config_item.study_field_data_type, []
+            ).append(
+                {
+                    "field_name": change.field_name,
+                    "value": change.value,
+                    "create": create,
+                    "study_field_id": study_field_id,
+                    "link": not change.to_delete,
+                    "type_id": change.term_root_id,
+                    "null_value_reason_id": change.null_value_term_root_id,
+                    "prev_study_field_id": prev_study_field_id,
+                    "unlink_prev": prev_study_field_id is not None
+                    and is_changed
+                    and previous_value is expected_latest_value,
+                    "audit_action": self._get_study_field_audit_action(
+                        has_before=prev_study_field_id is not None,
+                        has_after=create or study_field_id is not None,
+                        to_delete=change.to_delete,
+                    )
+                    if is_changed
+                    else None,
+                }
+            )
+
+        # Apply all changes with a single query per type of study field
+        for field_type, rows in rows_by_field_type.items():
+            label, relationship_type = STUDY_FIELD_NODE_TYPES[field_type]
+            db.cypher_query(
+                STUDY_FIELDS_UPDATE_QUERY.format(
+                    label=label, relationship_type=relationship_type
+                ),
+                {
+                    "study_uid": study_root.uid,
+                    "study_value_id": expected_latest_value.element_id,
+                    "user_initials": self.audit_info.user,
+                    "date": convert_to_tz_aware_datetime(date),
+                    "fields": rows,
+                },
+            )
+
+    @staticmethod
+    def _get_study_field_audit_action(
+        has_before: bool, has_after: bool, to_delete: bool
+    ) -> str | None:
+        # same rules as _generate_study_field_audit_node
+        if not has_before and not has_after:
+            return None
+        if not has_before:
+            return Create.__name__
+        if not has_after or to_delete:
+            return Delete.__name__
+        return Edit.__name__
 
     def _maintain_study_array_fields_relationships(
         self,
@@ -78,6 +78,7 @@ class GenericSyntaxInstanceRepository(
         value: VersionValue,
     ) -> None:
         value.name = versioned_object.name
+        value.name_plain = versioned_object.name_plain
         value.save()
         value.has_parameters.disconnect_all()
         value.has_conjunction.disconnect_all()
@@ -294,6 +295,9 @@ class GenericSyntaxInstanceRepository(
             guidance_text=template["template_guidance_text"],
             parameter_terms=self._get_template_parameters(root, value),
             library_name=template["template_library_name"],
+            persisted_template_name_plain=template.get("template_name_plain"),
+            persisted_name=value.name,
+            persisted_name_plain=value.name_plain,
             template_type=(
                 SimpleCTTermNameAndAttributes(
                     term_uid=template["term_uid"],
@@ -342,6 +346,9 @@ class GenericSyntaxInstanceRepository(
             parameter_terms=parameter_terms,
             guidance_text=template_value_object.guidance_text,
             library_name=template_object.has_library.get().name,
+            persisted_template_name_plain=template_value_object.name_plain,
+            persisted_name=value.name,
+            persisted_name_plain=value.name_plain,
         )
         return template
 
@@ -5,7 +5,6 @@ from typing import Any, TypeVar
 from neomodel import db
 
 from clinical_mdr_api.config import (
-    OPERATOR_PARAMETER_NAME,
     STUDY_DAY_NAME,
     STUDY_DURATION_DAYS_NAME,
     STUDY_DURATION_WEEKS_NAME,
@@ -26,6 +25,9 @@ from clinical_mdr_api.domain_repositories.models.syntax import SyntaxTemplateVal
 from clinical_mdr_api.domain_repositories.models.template_parameter import (
     TemplateParameter,
 )
+from clinical_mdr_api.domain_repositories.template_parameters.parameter_term_index import (
+    TemplateParameterTermIndex,
+)
 from clinical_mdr_api.domains._utils import strip_html
 from clinical_mdr_api.domains.syntax_templates.template import TemplateVO
 from clinical_mdr_api.domains.versioned_object_aggregate import LibraryVO
@@ -173,71 +175,29 @@ class GenericSyntaxTemplateRepository(
         study_uid: str | None = None,
         include_study_endpoints: bool | None = False,
     ):
+        # the allowed terms of each parameter are served from the flattened parameter term index
         cypher_query = f"""
             MATCH (otr:{self.root_class.__label__} {{uid: $uid}})-[uses_parameter:{self.root_class.PARAMETERS_LABEL}]->(pt)
             WHERE NOT pt.name=$name
             OPTIONAL MATCH (pt)-[:HAS_DEFINITION]->(tpd:ParameterTemplateRoot)-
                 [:LATEST_FINAL]->(tpv:ParameterTemplateValue)
-            WITH uses_parameter, pt, tpd, tpv
+            RETURN
+                pt.name AS name, tpd.uid as definition, tpv.template_string as template
             ORDER BY
                 uses_parameter.position ASC
-            CALL {{
-                WITH pt
-                    CALL{{
-                            WITH pt
-                            OPTIONAL MATCH (pt)<-[:HAS_PARENT_PARAMETER*0..]-(pt_parents)-[:HAS_PARAMETER_TERM]->(pr)-[:LATEST_FINAL]->(pv)
-                                WHERE pt.name <> "{OPERATOR_PARAMETER_NAME}" 
-                                // Filter out the child template parameter values if theirs parent contains the same value.
-                                // This ensures that the terms response will contain unique values.
-                                // Also filter out the values that are part of the Requested library.
-                                AND (pt=pt_parents OR NOT ((pt_parents)-[:HAS_PARAMETER_TERM]->(pr)
-                                    AND (pt)-[:HAS_PARAMETER_TERM]->(pr)))
-                                AND NOT (pr)<-[:CONTAINS_CONCEPT]-(:Library {{name: "Requested"}})
-                            CALL apoc.case(
-                            [
-                                pv.name_sentence_case IS NOT NULL, 'RETURN pv.name_sentence_case AS name',
-                                pv.name_sentence_case IS NULL, 'RETURN pv.name AS name'
-                            ],
-                            '',
-                            {{ pv:pv}})
-                            yield value
-                            WITH pt, pr, pt_parents, value.name as value
-                            // If a TemplateParameterTermValue is NumericValue type we sort template parameter values
-                            // by value property not name property
-                            ORDER BY 
-                                CASE 
-                                    WHEN "NumericValue" IN labels(pv) THEN pv.value 
-                                ELSE value END ASC
-                            WITH pr ,value,pt_parents
-                            RETURN pr.uid as uid, value, pt_parents.name as data_type
-                        union
-                            WITH pt
-                            OPTIONAL MATCH (pt)-[:HAS_PARAMETER_TERM]->(pr_op)-[:LATEST_FINAL]->(pv_op)
-                                WHERE pt.name = "{OPERATOR_PARAMETER_NAME}"
-                            MATCH (pr_op)<-[:HAS_NAME_ROOT]-(:CTTermRoot)
-                            WITH pt, pv_op.name as value, pr_op, pv_op
-                            ORDER BY value ASC
-                            WITH  pr_op , value, pt
-                            RETURN pr_op.uid as uid, value, pt.name as data_type
-                    }}
-                    WITH uid,value,data_type
-                        WHERE uid IS NOT NULL
-                    RETURN  
-                            collect({{uid: uid, name: value, type: data_type }}) AS terms
-            }}
-            RETURN
-                pt.name AS name, tpd.uid as definition, tpv.template_string as template,
-                terms
             """
         dataset, _ = db.cypher_query(
             cypher_query, {"uid": template_uid, "name": STUDY_ENDPOINT_TP_NAME}
         )
+        generation = TemplateParameterTermIndex.get_generation()
         data = [
             {
                 "name": item[0],
                 "definition": item[1],
                 "template": item[2],
-                "terms": item[3],
+                "terms": TemplateParameterTermIndex.get_template_parameter_terms(
+                    item[0], generation=generation
+                ),
             }
             for item in dataset
         ]
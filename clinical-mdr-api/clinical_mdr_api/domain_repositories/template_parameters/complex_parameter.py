@@ -4,6 +4,10 @@ from dataclasses import asdict, dataclass
 from neo4j.exceptions import ServiceUnavailable
 from neomodel import db
 
+from clinical_mdr_api.domain_repositories.template_parameters.parameter_term_index import (
+    TemplateParameterTermIndex,
+)
+
 log = logging.getLogger(__name__)
 
 
@@ -103,33 +107,19 @@ class ComplexTemplateParameterRepository:
         return_value = [{"name": item[0], "terms": item[1]} for item in items]
         return return_value
 
-    def find_values(self, template_parameter_name: str):
-        items, _ = db.cypher_query(
-            """
-            MATCH (pt:TemplateParameter {name: $name})
-            CALL {
-                WITH pt
-                MATCH (pt)<-[:HAS_PARENT_PARAMETER*0..]-(pt_parents)-[:HAS_PARAMETER_TERM]->(pr)-[:LATEST_FINAL]->(pv)
-                // Filter out the child template parameter values if theirs parent contains the same value.
-                // This ensures that the terms response will contain unique values.
-                // Also filter out items from the Requested library.
-                WHERE (pt=pt_parents OR NOT ((pt_parents)-[:HAS_PARAMETER_TERM]->(pr)
-                    AND (pt)-[:HAS_PARAMETER_TERM]->(pr)))
-                    AND NOT (pr)<-[:CONTAINS_CONCEPT]-(:Library {name: "Requested"})
-                WITH  pr, pv,  pt_parents
-                ORDER BY pv.name ASC
-                RETURN collect({uid: pr.uid, name: pv.name, type: pt_parents.name}) AS terms
-            }
-            RETURN
-                pt.name AS name,
-                terms
-            ORDER BY name
-        """,
-            {"name": template_parameter_name},
+    def find_values(
+        self,
+        template_parameter_name: str,
+        search_string: str | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
+    ):
+        return TemplateParameterTermIndex.get_values(
+            template_parameter_name,
+            search_string=search_string,
+            page_number=page_number,
+            page_size=page_size,
         )
-        if len(items) > 0:
-            return items[0][1]
-        return []
 
     def get_parameter_including_terms(self, parameter_name: str):
         for item in self.find_extended():
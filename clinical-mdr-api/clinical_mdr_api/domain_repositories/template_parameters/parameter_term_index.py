@@ -0,0 +1,217 @@
+import logging
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from neomodel import db
+
+from clinical_mdr_api import config
+
+log = logging.getLogger(__name__)
+
+# Every create, approve, inactivate or reactivate of a template parameter term adds a HAS_VERSION relationship,
+# to its TemplateParameterTermRoot or, for CT terms used as parameter terms, to its CTTermNameRoot.
+# Linking terms or parameters adds HAS_PARAMETER_TERM or HAS_PARENT_PARAMETER relationships.
+# These counts are read from the counts store of the database, in constant time.
+GENERATION_QUERY = """
+CALL { MATCH (:TemplateParameterTermRoot)-[r:HAS_VERSION]->() RETURN count(r) AS term_versions }
+CALL { MATCH (:CTTermNameRoot)-[r:HAS_VERSION]->() RETURN count(r) AS ct_term_versions }
+CALL { MATCH ()-[r:HAS_PARAMETER_TERM]->() RETURN count(r) AS parameter_terms }
+CALL { MATCH ()-[r:HAS_PARENT_PARAMETER]->() RETURN count(r) AS parent_parameters }
+CALL { MATCH (:Library)-[r:CONTAINS_CONCEPT]->() RETURN count(r) AS library_concepts }
+RETURN term_versions, ct_term_versions, parameter_terms, parent_parameters, library_concepts
+"""
+
+# All final terms of a template parameter and of its child parameters, flattened
+PARAMETER_TERMS_QUERY = """
+MATCH (pt:TemplateParameter {name: $name})<-[:HAS_PARENT_PARAMETER*0..]-(pt_parents)-[:HAS_PARAMETER_TERM]->(pr)-[:LATEST_FINAL]->(pv)
+RETURN
+    pr.uid AS uid,
+    pv.name AS name,
+    pv.name_sentence_case AS name_sentence_case,
+    CASE WHEN "NumericValue" IN labels(pv) THEN pv.value END AS numeric_value,
+    pt_parents.name AS type,
+    pt = pt_parents AS is_direct_term,
+    exists((pr)<-[:HAS_NAME_ROOT]-(:CTTermRoot)) AS is_ct_term,
+    exists((pr)<-[:CONTAINS_CONCEPT]-(:Library {name: "Requested"})) AS is_requested
+"""
+
+
+@dataclass(frozen=True)
+class _ParameterTerm:
+    uid: str
+    name: str | None
+    name_sentence_case: str | None
+    numeric_value: Any
+    type: str
+    is_direct_term: bool
+    is_ct_term: bool
+    is_requested: bool
+
+
+@dataclass(frozen=True)
+class _IndexedParameter:
+    # terms offered when instantiating a template, in the order they are offered
+    template_terms: tuple[dict, ...]
+    # all terms ordered by name, with names folded to lower case for searching
+    values: tuple[dict, ...]
+    folded_names: tuple[str, ...]
+
+
+def _cypher_sort_key(value: Any) -> tuple:
+    # Cypher orders strings before numbers and nulls last
+    if value is None:
+        return (2, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (0, value)
+
+
+def _index_parameter(
+    parameter_name: str, rows: list[_ParameterTerm]
+) -> _IndexedParameter:
+    # Terms of child parameters are left out if the parameter itself contains the same term,
+    # so that the terms of a parameter are unique.
+    direct_term_uids = {row.uid for row in rows if row.is_direct_term}
+    rows = [
+        row for row in rows if row.is_direct_term or row.uid not in direct_term_uids
+    ]
+
+    if parameter_name == config.OPERATOR_PARAMETER_NAME:
+        # operators are the CT terms directly linked to the parameter
+        template_terms = [
+            {"uid": row.uid, "name": row.name, "type": parameter_name}
+            for row in sorted(
+                (row for row in rows if row.is_direct_term and row.is_ct_term),
+                key=lambda row: _cypher_sort_key(row.name),
+            )
+        ]
+    else:
+        template_terms = []
+        for row in rows:
+            if row.is_requested or row.uid is None:
+                continue
+            name = (
+                row.name_sentence_case
+                if row.name_sentence_case is not None
+                else row.name
+            )
+            # numeric values are ordered by value, not by name
+            sort_value = row.numeric_value if row.numeric_value is not None else name
+            template_terms.append(
+                (
+                    _cypher_sort_key(sort_value),
+                    {"uid": row.uid, "name": name, "type": row.type},
+                )
+            )
+        template_terms = [
+            term for _, term in sorted(template_terms, key=lambda item: item[0])
+        ]
+
+    values = sorted(
+        (row for row in rows if not row.is_requested),
+        key=lambda row: _cypher_sort_key(row.name),
+    )
+    return _IndexedParameter(
+        template_terms=tuple(template_terms),
+        values=tuple(
+            {"uid": row.uid, "name": row.name, "type": row.type} for row in values
+        ),
+        folded_names=tuple((row.name or "").casefold() for row in values),
+    )
+
+
+class TemplateParameterTermIndex:
+    """
+    Flattened index of the final terms of each template parameter, including the terms of its child parameters.
+
+    Enumerating the allowed terms of a parameter traverses the whole parameter hierarchy, which is done
+    each time a template is opened for instantiation. The flattened and sorted term lists are kept per parameter
+    and per generation of the parameter terms, so that creating, approving or retiring any parameter term
+    (in any worker, or by an import) makes the next request rebuild the affected lists.
+    """
+
+    cache_store_terms = TTLCache(maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL)
+    lock_store_terms = Lock()
+
+    @classmethod
+    def get_generation(cls) -> tuple[int, ...]:
+        result, _ = db.cypher_query(GENERATION_QUERY)
+        return tuple(result[0]) if result else ()
+
+    @classmethod
+    def _get_indexed_parameter(
+        cls, parameter_name: str, generation: tuple[int, ...] | None = None
+    ) -> _IndexedParameter:
+        if generation is None:
+            generation = cls.get_generation()
+        key = hashkey(generation, parameter_name)
+        with cls.lock_store_terms:
+            indexed = cls.cache_store_terms.get(key)
+        if indexed is not None:
+            return indexed
+
+        log.debug("Indexing terms of template parameter '%s'", parameter_name)
+        result, _ = db.cypher_query(PARAMETER_TERMS_QUERY, {"name": parameter_name})
+        indexed = _index_parameter(
+            parameter_name, [_ParameterTerm(*row) for row in result]
+        )
+
+        with cls.lock_store_terms:
+            cls.cache_store_terms[key] = indexed
+        return indexed
+
+    @classmethod
+    def get_template_parameter_terms(
+        cls, parameter_name: str, generation: tuple[int, ...] | None = None
+    ) -> list[dict]:
+        """
+        Returns the terms offered for a parameter when instantiating a template.
+
+        Args:
+            parameter_name (str): The name of the template parameter.
+            generation (tuple[int, ...] | None): The generation of the parameter terms, as returned by
+                `get_generation`, to avoid reading it again when looking up several parameters.
+
+        Returns:
+            list[dict]: The terms as `uid`, `name` and `type`, with sentence case names where available,
+            ordered by name, or by value for numeric values.
+        """
+        indexed = cls._get_indexed_parameter(parameter_name, generation)
+        # callers may alter the returned terms
+        return [dict(term) for term in indexed.template_terms]
+
+    @classmethod
+    def get_values(
+        cls,
+        parameter_name: str,
+        search_string: str | None = None,
+        page_number: int = 1,
+        page_size: int = 0,
+    ) -> list[dict]:
+        """
+        Returns the terms of a template parameter.
+
+        Args:
+            parameter_name (str): The name of the template parameter.
+            search_string (str | None): Only return terms whose name contains this text, ignoring case.
+            page_number (int): The page to return, starting at 1.
+            page_size (int): The number of terms per page, 0 to return all terms.
+
+        Returns:
+            list[dict]: The terms as `uid`, `name` and `type`, ordered by name.
+        """
+        indexed = cls._get_indexed_parameter(parameter_name)
+        values = indexed.values
+        if search_string:
+            search_string = search_string.casefold()
+            values = [
+                value
+                for value, folded_name in zip(values, indexed.folded_names)
+                if search_string in folded_name
+            ]
+        if page_size:
+            values = values[(page_number - 1) * page_size : page_number * page_size]
+        return [dict(value) for value in values]
@@ -1,10 +1,12 @@
 import re
 from enum import Enum
+from threading import Lock
 from typing import Any
 
 from bs4 import BeautifulSoup
+from cachetools import LRUCache, cached
 
-from clinical_mdr_api import exceptions
+from clinical_mdr_api import config, exceptions
 from clinical_mdr_api.domains.iso_languages import LANGUAGES_INDEXED_BY
 
 
@@ -94,10 +96,105 @@ def normalize_string(string: str | None) -> str | None:
     return string or None
 
 
+# Tags produced by the rich text editor, whose removal leaves the text as it is
+_EDITOR_TAG_PATTERN = re.compile(
+    r"""<(/?)(a|b|br|div|em|font|h[1-6]|i|li|mark|ol|p|s|small|span|strike|strong|sub|sup|u|ul)"""
+    r"""(?:\s+[^\s"'>/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]*))?)*\s*(/?)>""",
+    re.IGNORECASE,
+)
+_EDITOR_ENTITIES = {
+    "&amp;": "&",
+    "&lt;": "<",
+    "&gt;": ">",
+    "&quot;": '"',
+    "&apos;": "'",
+    "&nbsp;": "\xa0",
+}
+_ENTITY_PATTERN = re.compile(r"&(?:#[0-9]{1,7}|#[xX][0-9a-fA-F]{1,6}|[a-z]+);")
+# Characters which the HTML parser drops or replaces
+_UNSAFE_CHARACTER_PATTERN = re.compile(
+    r"[\x00-\x08\x0b-\x1f\x7f-\x9f\ud800-\udfff\ufffe\uffff]"
+)
+
+cache_store_plain_text = LRUCache(maxsize=config.PLAIN_TEXT_CACHE_MAX_SIZE)
+lock_store_plain_text = Lock()
+
+
+def _replace_entity(match: re.Match) -> str | None:
+    entity = match.group()
+    if entity[1] != "#":
+        return _EDITOR_ENTITIES.get(entity)
+    code_point = int(entity[3:-1], 16) if entity[2] in "xX" else int(entity[2:-1])
+    if code_point > 0x10FFFF or _UNSAFE_CHARACTER_PATTERN.match(chr(code_point)):
+        return None
+    return chr(code_point)
+
+
+def _unescape_editor_text(text: str) -> str | None:
+    parts = []
+    position = 0
+    for match in _ENTITY_PATTERN.finditer(text):
+        replacement = _replace_entity(match)
+        if replacement is None or "&" in text[position : match.start()]:
+            return None
+        parts.append(text[position : match.start()])
+        parts.append(replacement)
+        position = match.end()
+    if "&" in text[position:]:
+        return None
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def _strip_editor_html(html: str) -> str | None:
+    """
+    Removes the tags of the HTML produced by the rich text editor, without building a parse tree.
+
+    Returns None if the string contains anything else the HTML parser would have to handle,
+    e.g. comments, tables, unknown entities, unbalanced tags or whitespace it would normalize.
+    """
+    if _UNSAFE_CHARACTER_PATTERN.search(html):
+        return None
+    # the parser drops whitespace at the start of the document
+    html = html.lstrip(" \t\n")
+    if "<" not in html and "&" not in html:
+        return html
+
+    open_tags = []
+    texts = []
+    position = 0
+    for match in _EDITOR_TAG_PATTERN.finditer(html):
+        texts.append(html[position : match.start()])
+        position = match.end()
+        is_closing, tag_name, is_self_closing = match.groups()
+        tag_name = tag_name.lower()
+        if tag_name == "br":
+            continue
+        if is_self_closing:
+            return None
+        if not is_closing:
+            open_tags.append(tag_name)
+        elif not open_tags or open_tags.pop() != tag_name:
+            return None
+    texts.append(html[position:])
+    if open_tags:
+        return None
+
+    for text in texts:
+        if "<" in text or (text.isspace() and text != " "):
+            return None
+    text = "".join(texts)
+    return _unescape_editor_text(text) if "&" in text else text
+
+
+@cached(cache=cache_store_plain_text, lock=lock_store_plain_text)
 def strip_html(html: str) -> str:
     """
     Removes HTML tags from a string.
 
+    The HTML produced by the rich text editor is stripped directly, anything else is parsed with BeautifulSoup.
+    Results are kept in a bounded cache, as the same names are stripped for each row of list endpoints.
+
     Args:
         html (str): The string containing HTML tags.
 
@@ -108,7 +205,10 @@ def strip_html(html: str) -> str:
         >>> strip_html("<p>Some <b>bold</b> text.</p>")
         "Some bold text."
     """
-    return BeautifulSoup(html, "lxml").text
+    text = _strip_editor_html(html)
+    if text is None:
+        text = BeautifulSoup(html, "lxml").text
+    return text
 
 
 def convert_to_plain(text: str) -> str:
@@ -38,6 +38,10 @@ class ParametrizedTemplateVO:
     parameter_terms: list[ParameterTermEntryVO]
     template_type: SimpleCTTermNameAndAttributes | None = None
     library_name: str | None = None
+    # plain text names as persisted on the value nodes, to avoid stripping the HTML on each read
+    persisted_template_name_plain: str | None = None
+    persisted_name: str | None = None
+    persisted_name_plain: str | None = None
 
     @classmethod
     def from_repository_values(
@@ -220,6 +224,8 @@ class ParametrizedTemplateVO:
 
     @property
     def template_name_plain(self) -> str:
+        if self.persisted_template_name_plain is not None:
+            return self.persisted_template_name_plain
         return strip_html(self.template_name)
 
     @property
@@ -234,6 +240,9 @@ class ParametrizedTemplateVO:
             template_name=self.template_name,
             parameter_terms=self.parameter_terms,
         )
+        # the persisted plain text is only valid for the name it was computed from
+        if self.persisted_name_plain is not None and name == self.persisted_name:
+            return self.persisted_name_plain
         return convert_to_plain(name)
 
 
@@ -21,6 +21,22 @@ MATCH_LATEST_STUDY = """
     MATCH (sr:StudyRoot {uid: $study_uid})-[:LATEST]->(sv:StudyValue)
 """
 
+MATERIALIZED_DATASET_RETRIEVAL_QUERY = """
+    MATCH (dataset:StudySDTMDataset {study_uid: $study_uid, study_value_version: $study_value_version, domain: $domain})
+    RETURN dataset.rows
+"""
+
+# Datasets are only stored for study versions that exist, so that requests for unknown versions don't create nodes
+MATERIALIZED_DATASET_UPDATE_QUERY = """
+    MATCH (sr:StudyRoot {uid: $study_uid})-[:HAS_VERSION {status: 'RELEASED', version: $study_value_version}]->(:StudyValue)
+    WITH DISTINCT sr
+    MERGE (dataset:StudySDTMDataset {study_uid: sr.uid, study_value_version: $study_value_version, domain: $domain})
+    SET dataset.rows = $rows,
+        dataset.row_count = $row_count,
+        dataset.materialized_date = datetime()
+    RETURN count(dataset)
+"""
+
 
 class QueryService:
     """class holding the queries for the listing endpoints."""
@@ -412,6 +428,59 @@ class QueryService:
 
         return GenericFilteringReturn.create(items=result, total=total)
 
+    def get_materialized_dataset(
+        self, study_uid: str, study_value_version: str, domain: str
+    ) -> list[dict] | None:
+        """
+        Returns the stored copy of an SDTM trial design dataset of a released or locked study version.
+
+        Args:
+            study_uid (str): The uid of the study.
+            study_value_version (str): The released or locked version of the study.
+            domain (str): The SDTM domain of the dataset, e.g. `TS`.
+
+        Returns:
+            list[dict] | None: The rows of the dataset, or None if the dataset wasn't materialized yet.
+        """
+        result, _ = db.cypher_query(
+            query=MATERIALIZED_DATASET_RETRIEVAL_QUERY,
+            params={
+                "study_uid": str(study_uid),
+                "study_value_version": str(study_value_version),
+                "domain": domain,
+            },
+        )
+        if not result or result[0][0] is None:
+            return None
+        return json.loads(result[0][0])
+
+    def save_materialized_dataset(
+        self, study_uid: str, study_value_version: str, domain: str, rows: list[dict]
+    ) -> bool:
+        """
+        Stores a copy of an SDTM trial design dataset of a released or locked study version.
+
+        Args:
+            study_uid (str): The uid of the study.
+            study_value_version (str): The released or locked version of the study.
+            domain (str): The SDTM domain of the dataset, e.g. `TS`.
+            rows (list[dict]): The JSON serializable rows of the dataset.
+
+        Returns:
+            bool: Whether the dataset was stored, i.e. whether the study version exists.
+        """
+        result, _ = db.cypher_query(
+            query=MATERIALIZED_DATASET_UPDATE_QUERY,
+            params={
+                "study_uid": str(study_uid),
+                "study_value_version": str(study_value_version),
+                "domain": domain,
+                "rows": json.dumps(rows, separators=(",", ":")),
+                "row_count": len(rows),
+            },
+        )
+        return bool(result and result[0][0])
+
     def get_tv(
         self,
         study_uid,
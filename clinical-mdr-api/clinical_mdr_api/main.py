@@ -1,4 +1,11 @@
 """Application main file."""
+# Start the startup report before the other imports, to measure the time spent importing them,
+# so the imports below come after a first-party import and a call
+# pylint: disable=wrong-import-position,wrong-import-order,ungrouped-imports
+from clinical_mdr_api.telemetry import startup_report
+
+startup_report.start()
+
 import logging
 from typing import Any
 
@@ -22,6 +29,8 @@ from clinical_mdr_api.oauth.discovery import reconfigure_with_openid_discovery
 from clinical_mdr_api.telemetry.traceback_middleware import ExceptionTracebackMiddleware
 from clinical_mdr_api.utils.api_version import get_api_version
 
+# pylint: enable=wrong-import-position,wrong-import-order,ungrouped-imports
+
 log = logging.getLogger(__name__)
 
 # Global dependencies, in order of execution
@@ -65,6 +74,14 @@ if not config.TRACING_DISABLED:
 
     patch_neomodel_database()
 
+# Applied after the tracing patch, so that the canonical queries are traced and profiled
+if config.QUERY_CANONICALIZATION_ENABLED or config.QUERY_PROFILING_ENABLED:
+    from clinical_mdr_api.telemetry.query_canonicalizer import (
+        patch_neomodel_query_canonicalization,
+    )
+
+    patch_neomodel_query_canonicalization()
+
 
 middlewares.append(
     Middleware(
@@ -133,6 +150,11 @@ System information is provided by a separate [System Information](../system/docs
 )
 
 
+@app.on_event("startup")
+def log_startup_report():
+    startup_report.log_startup_report()
+
+
 @app.on_event("startup")
 async def openid_discovery_on_startup():
     if OAUTH_ENABLED:
@@ -325,6 +347,7 @@ app.include_router(
     prefix="/template-parameters",
     tags=["Template Parameters"],
 )
+app.include_router(routers.lookups_router, prefix="/lookups", tags=["Lookups"])
 app.include_router(
     routers.activity_instances_router,
     prefix="/concepts/activities/activity-instances",
@@ -526,6 +549,8 @@ system_app.include_router(routers.system_router, tags=["System"])
 
 app.mount("/system", system_app)
 
+startup_report.finish()
+
 
 def custom_openapi():
     if app.openapi_schema:
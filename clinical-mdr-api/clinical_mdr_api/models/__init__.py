@@ -118,6 +118,7 @@ from clinical_mdr_api.models.projects.project import Project, ProjectCreateInput
 from clinical_mdr_api.models.brands.brand import Brand, BrandCreateInput
 from clinical_mdr_api.models.comments.comments import (
     CommentThread,
+    CommentThreadChanges,
     CommentThreadCreateInput,
     CommentThreadEditInput,
     CommentReplyCreateInput,
@@ -304,6 +305,12 @@ from clinical_mdr_api.models.listings.listings import (
     CDISCCTVal,
     CDISCCTPkg,
 )
+from clinical_mdr_api.models.lookups import (
+    LookupInput,
+    LookupItem,
+    LookupResult,
+    LookupType,
+)
 from clinical_mdr_api.models.system import SystemInformation
 from clinical_mdr_api.models.syntax_templates.template_parameter import (
     TemplateParameter,
@@ -324,6 +331,7 @@ from clinical_mdr_api.models.controlled_terminologies.ct_catalogue import (
 from clinical_mdr_api.models.controlled_terminologies.ct_package import (
     CTPackage,
     CTPackageChanges,
+    CTPackageChangeSet,
     CTPackageChangesSpecificCodelist,
     CTPackageDates,
 )
@@ -372,6 +380,8 @@ from clinical_mdr_api.models.dictionaries.dictionary_term import (
     DictionaryTerm,
     DictionaryTermEditInput,
     DictionaryTermCreateInput,
+    DictionaryTermLookupInput,
+    DictionaryTermLookupItem,
     DictionaryTermVersion,
     DictionaryTermSubstance,
     DictionaryTermSubstanceEditInput,
@@ -552,6 +562,7 @@ __all__ = [
     "CTCatalogueChanges",
     "CTPackage",
     "CTPackageChanges",
+    "CTPackageChangeSet",
     "CTPackageChangesSpecificCodelist",
     "CTPackageDates",
     "CTCodelist",
@@ -583,10 +594,16 @@ __all__ = [
     "DictionaryTerm",
     "DictionaryTermEditInput",
     "DictionaryTermCreateInput",
+    "DictionaryTermLookupInput",
+    "DictionaryTermLookupItem",
     "DictionaryTermVersion",
     "DictionaryTermSubstance",
     "DictionaryTermSubstanceEditInput",
     "DictionaryTermSubstanceCreateInput",
+    "LookupInput",
+    "LookupItem",
+    "LookupResult",
+    "LookupType",
     "SystemInformation",
     "ClinicalProgramme",
     "ClinicalProgrammeInput",
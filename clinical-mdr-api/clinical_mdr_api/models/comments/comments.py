@@ -132,6 +132,19 @@ class CommentThread(BaseModel):
         )
 
 
+class CommentThreadChanges(BaseModel):
+    threads: list[CommentThread] = Field(
+        [], description="Comment threads created or edited, or whose replies were"
+    )
+    deleted_thread_uids: list[str] = Field(
+        [], description="Unique ids of the deleted comment threads"
+    )
+    change_sequence: int = Field(
+        ...,
+        description="Sequence number of the last change, to request the next changes from as `since`",
+    )
+
+
 class CommentThreadCreateInput(BaseModel):
     text: str = Field(..., description="", min_length=1)
     topic_path: str = Field(..., min_length=1)
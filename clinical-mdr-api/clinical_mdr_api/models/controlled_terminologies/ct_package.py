@@ -151,6 +151,17 @@ class CTPackageChanges(BaseModel):
         )
 
 
+class CTPackageChangeSet(BaseModel):
+    from_package: str
+    to_package: str
+    added_codelists: int
+    deleted_codelists: int
+    updated_codelists: int
+    added_terms: int
+    deleted_terms: int
+    updated_terms: int
+
+
 class CTPackageChangesSpecificCodelist(CTPackageChanges):
     not_modified_terms: list[TermChangeItem]
 
@@ -83,6 +83,22 @@ class DictionaryTermCreateInput(BaseModel):
     library_name: str
 
 
+class DictionaryTermLookupItem(BaseModel):
+    term_uid: str
+    name: str
+    dictionary_id: str | None = Field(None, nullable=True)
+
+
+class DictionaryTermLookupInput(BaseModel):
+    codelist_uid: str = Field(
+        ..., description="The unique id of the DictionaryCodelist"
+    )
+    names: list[str] = Field(
+        ...,
+        description="The names of the terms to look up, compared case-sensitively",
+    )
+
+
 class DictionaryTermSubstance(DictionaryTerm):
     pclass: SimpleDictionaryTermModel | None
 
@@ -0,0 +1,55 @@
+"""Models of the lookup of uids by name."""
+from enum import Enum
+
+from pydantic import Field, conlist
+
+from clinical_mdr_api import config
+from clinical_mdr_api.models.utils import BaseModel
+
+
+class LookupType(str, Enum):
+    CT_CODELIST = "ct_codelist"
+    CT_TERM = "ct_term"
+    DICTIONARY_TERM = "dictionary_term"
+    ACTIVITY = "activity"
+    ACTIVITY_GROUP = "activity_group"
+    ACTIVITY_SUBGROUP = "activity_subgroup"
+    ACTIVITY_INSTANCE = "activity_instance"
+    COMPOUND = "compound"
+    COMPOUND_ALIAS = "compound_alias"
+    UNIT_DEFINITION = "unit_definition"
+
+
+class LookupItem(BaseModel):
+    type: LookupType = Field(..., description="The type of the item to look up")
+    name: str = Field(
+        ...,
+        description="The name of the item, compared case-sensitively. "
+        "For CT terms, the sponsor preferred name.",
+    )
+    codelist_uid: str | None = Field(
+        None,
+        description="For CT terms, the unique id of the CTCodelist containing the term. "
+        "For dictionary terms, the unique id of the DictionaryCodelist, which is required.",
+        nullable=True,
+    )
+    codelist_name: str | None = Field(
+        None,
+        description="For CT terms, the name of the CTCodelist containing the term, "
+        "if its codelist_uid isn't given.",
+        nullable=True,
+    )
+
+
+class LookupInput(BaseModel):
+    items: conlist(LookupItem, max_items=config.LOOKUP_MAX_ITEMS) = Field(
+        ..., description="The items to look up"
+    )
+
+
+class LookupResult(LookupItem):
+    uid: str | None = Field(
+        None,
+        description="The unique id of the item, or null if no item has this name",
+        nullable=True,
+    )
@@ -4,6 +4,8 @@ from copy import copy
 from datetime import datetime
 from typing import Any, Callable, Generic, Iterable, Self, Type, TypeVar
 
+import orjson
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import conint
 from pydantic.generics import GenericModel
@@ -301,6 +303,47 @@ class GenericFilteringReturn(GenericModel, Generic[T]):
         return cls(items=items, total=total)
 
 
+class FastJSONResponse(Response):
+    """
+    JSON response encoded with orjson directly from pydantic models.
+
+    Unlike responses built by FastAPI from the `response_model` of a route, the content is neither
+    validated again nor walked through `jsonable_encoder`, so it must only be used for models
+    the service layer already built as instances of the response model.
+
+    Args:
+        content (Any): Pydantic model, or JSON compatible data containing pydantic models.
+        exclude_unset (bool): Whether to leave out the fields of the models that were not set,
+            like `response_model_exclude_unset` of the route.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, exclude_unset: bool = False, **kwargs):
+        self.exclude_unset = exclude_unset
+        super().__init__(content, **kwargs)
+
+    def _default(self, value: Any) -> Any:
+        if isinstance(value, PydanticBaseModel):
+            return value.dict(by_alias=True, exclude_unset=self.exclude_unset)
+        # types not supported by orjson, like Decimal or sets
+        return jsonable_encoder(value)
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(
+                content, default=self._default, option=orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers out of 64-bit range
+            return json.dumps(
+                jsonable_encoder(content, exclude_unset=self.exclude_unset),
+                ensure_ascii=False,
+                allow_nan=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+
+
 class PrettyJSONResponse(Response):
     media_type = "application/json"
 
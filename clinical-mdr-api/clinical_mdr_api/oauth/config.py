@@ -4,6 +4,8 @@ from clinical_mdr_api.utils import strtobool
 
 AUTH_APP_ROOT_PATH = "/oauth"
 JWT_LEEWAY_SECONDS = 10
+# Number of validated access tokens whose claims are kept, see JWKService.validate_jwt
+JWT_CLAIMS_CACHE_SIZE = 1000
 OAUTH_ENABLED = strtobool(environ.get("OAUTH_ENABLED", "1"))
 OAUTH_RBAC_ENABLED = strtobool(environ.get("OAUTH_RBAC_ENABLED ", "1"))
 OAUTH_API_APP_ID = environ.get("OAUTH_API_APP_ID") or environ.get("OAUTH_APP_ID")
@@ -1,10 +1,13 @@
+import hashlib
 import logging
 import time
 import uuid
-from typing import Any, Mapping
+from threading import Lock
+from typing import Any, Mapping, NamedTuple
 
 from authlib.integrations.base_client import OAuth2Mixin
 from authlib.jose import JsonWebKey, JWTClaims, Key, KeySet, jwt
+from cachetools import LRUCache
 from httpx import AsyncClient
 
 from clinical_mdr_api import exceptions
@@ -12,6 +15,11 @@ from clinical_mdr_api import exceptions
 log = logging.getLogger(__name__)
 
 
+class _ValidatedClaims(NamedTuple):
+    claims: JWTClaims
+    expires_at: float
+
+
 class JWKService(KeySet):
     """JWK store and JWT validator, relies on AsyncRemoteApp for metadata and HTTP client"""
 
@@ -23,6 +31,7 @@ class JWKService(KeySet):
         oauth_client: OAuth2Mixin,
         audience: str | list[str],
         leeway_seconds: int | float = 15,
+        claims_cache_size: int = 1000,
     ):
         self.oauth_client = oauth_client
         self.audience = audience
@@ -31,6 +40,11 @@ class JWKService(KeySet):
         self.jwks_uri = None
         self.leeway = leeway_seconds
         self.claims_options = {}
+        # Claims of validated tokens by token hash, until the tokens expire or the keys are re-fetched
+        self._claims_cache = LRUCache(maxsize=claims_cache_size)
+        self._claims_cache_lock = Lock()
+        self.claims_cache_hits = 0
+        self.claims_cache_misses = 0
         super().__init__({})
 
     async def init(self) -> None:
@@ -101,6 +115,8 @@ class JWKService(KeySet):
 
         self.keys = keys_dict
         self._keys_updated = time.time()
+        # tokens signed with keys no longer in the set must not validate from the cache
+        self.clear_claims_cache()
 
         return keys_dict
 
@@ -138,10 +154,67 @@ class JWKService(KeySet):
         resp.raise_for_status()
         return resp.json()
 
+    def clear_claims_cache(self) -> None:
+        with self._claims_cache_lock:
+            self._claims_cache.clear()
+
+    def get_claims_cache_info(self) -> dict[str, int]:
+        """Returns the size of the cache of validated claims and its hit & miss counters."""
+        with self._claims_cache_lock:
+            return {
+                "size": len(self._claims_cache),
+                "max_size": self._claims_cache.maxsize,
+                "hits": self.claims_cache_hits,
+                "misses": self.claims_cache_misses,
+            }
+
+    @staticmethod
+    def _get_token_hash(token: str | bytes) -> bytes:
+        if isinstance(token, str):
+            token = token.encode("utf8")
+        return hashlib.sha256(token).digest()
+
+    @staticmethod
+    def _copy_claims(claims: JWTClaims) -> JWTClaims:
+        return JWTClaims(dict(claims), claims.header, claims.options, claims.params)
+
+    def _get_cached_claims(self, token_hash: bytes) -> JWTClaims | None:
+        with self._claims_cache_lock:
+            cached = self._claims_cache.get(token_hash)
+            if cached is not None and cached.expires_at <= time.time():
+                del self._claims_cache[token_hash]
+                cached = None
+            if cached is None:
+                self.claims_cache_misses += 1
+                return None
+            self.claims_cache_hits += 1
+
+        # callers get their own copy of the claims
+        return self._copy_claims(cached.claims)
+
+    def _cache_claims(self, token_hash: bytes, claims: JWTClaims) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            # tokens without expiration time are validated each time
+            return
+        with self._claims_cache_lock:
+            self._claims_cache[token_hash] = _ValidatedClaims(
+                claims=self._copy_claims(claims), expires_at=expires_at
+            )
+
     async def validate_jwt(self, token: str | bytes) -> JWTClaims:
-        """Validates JWT, fetching JWKs, checking signature and iss & aud claims (if init), then returns claims."""
+        """
+        Validates JWT, fetching JWKs, checking signature and iss & aud claims (if init), then returns claims.
+
+        The claims of a validated token are kept until the token expires or the keys are re-fetched,
+        so that concurrent requests with the same bearer token verify its signature only once.
+        """
         await self.init()
 
+        token_hash = self._get_token_hash(token)
+        if (claims := self._get_cached_claims(token_hash)) is not None:
+            return claims
+
         try:
             claims = jwt.decode(
                 token,
@@ -159,6 +232,7 @@ class JWKService(KeySet):
             claims = jwt.decode(token, key=self, claims_options=self.claims_options)
 
         claims.validate(leeway=self.leeway)
+        self._cache_claims(token_hash, claims)
 
         return claims
 
@@ -0,0 +1,445 @@
+"""
+Pruning of the alias clause of `CypherQueryBuilder` to the aliases a query actually needs.
+
+The alias clause is a pipeline of Cypher clauses following a WITH: projections (WITH), subqueries (CALL),
+and any other clause (MATCH, UNWIND ...). Counting the rows, or listing the distinct values of one column,
+only needs the aliases referenced by the filter clause and by the header column, and the aliases these
+depend on in the previous stages of the pipeline. Every other alias is left out, which saves evaluating
+its expression (collections, pattern comprehensions, subqueries) for every row.
+
+Only projections that never change the number of rows are pruned: items of WITH stages without DISTINCT
+nor aggregation, and CALL subqueries always returning exactly one row. Anything else is kept as is.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+
+log = logging.getLogger(__name__)
+
+_TOKEN_REGEX = re.compile(
+    r"""
+    (?P<space>\s+|//[^\n]*)
+    |(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    |(?P<ident>`[^`]*`|[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<number>\d+(?:\.\d+)?)
+    |(?P<punct>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Keywords starting a clause, when found outside of brackets
+CLAUSE_KEYWORDS = {
+    "WITH",
+    "RETURN",
+    "MATCH",
+    "OPTIONAL",
+    "UNWIND",
+    "CALL",
+    "MERGE",
+    "CREATE",
+    "SET",
+    "DELETE",
+    "DETACH",
+    "REMOVE",
+    "FOREACH",
+    "UNION",
+}
+# Keywords of the sub-clauses of a projection, following its items
+PROJECTION_TAIL_KEYWORDS = {"WHERE", "ORDER", "SKIP", "LIMIT"}
+AGGREGATING_FUNCTIONS = {
+    "avg",
+    "collect",
+    "count",
+    "max",
+    "min",
+    "percentilecont",
+    "percentiledisc",
+    "stdev",
+    "stdevp",
+    "sum",
+}
+OPENING_BRACKETS = "([{"
+CLOSING_BRACKETS = ")]}"
+
+
+class AliasClauseNotSupported(ValueError):
+    """Raised when an alias clause cannot be split into projections, so it must be used as is."""
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str
+    text: str
+    # depth of nested brackets, and of nested braces only
+    depth: int
+    brace_depth: int
+
+    @property
+    def keyword(self) -> str | None:
+        return self.text.upper() if self.kind == "ident" else None
+
+
+def _tokenize(text: str) -> list[_Token]:
+    tokens = []
+    depth = brace_depth = 0
+    for match in _TOKEN_REGEX.finditer(text):
+        kind, value = match.lastgroup, match.group()
+        if kind == "punct" and value in CLOSING_BRACKETS:
+            depth -= 1
+            brace_depth -= value == "}"
+        tokens.append(_Token(kind, value, depth, brace_depth))
+        if kind == "punct" and value in OPENING_BRACKETS:
+            depth += 1
+            brace_depth += value == "{"
+    if depth:
+        raise AliasClauseNotSupported("Unbalanced brackets")
+    return tokens
+
+
+def _text(tokens: list[_Token]) -> str:
+    return "".join(token.text for token in tokens).strip()
+
+
+def _code(tokens: list[_Token]) -> list[_Token]:
+    return [token for token in tokens if token.kind != "space"]
+
+
+def get_identifiers(tokens: list[_Token] | str) -> set[str]:
+    """
+    Returns the names of the variables a Cypher fragment may reference.
+
+    Property keys and parameters are left out. Other names (labels, function names, keywords ...)
+    are included, which at worst keeps an alias that could have been pruned.
+    """
+    if isinstance(tokens, str):
+        tokens = _tokenize(tokens)
+    identifiers = set()
+    previous = None
+    for token in _code(tokens):
+        if token.kind == "ident" and (previous is None or previous.text not in ".$"):
+            identifiers.add(token.text.strip("`"))
+        previous = token
+    return identifiers
+
+
+def _is_aggregating(tokens: list[_Token]) -> bool:
+    code = _code(tokens)
+    base_brace_depth = code[0].brace_depth if code else 0
+    for index, token in enumerate(code[:-1]):
+        # aggregations within subqueries do not aggregate the projection
+        if token.brace_depth != base_brace_depth or (
+            index and code[index - 1].text == "."
+        ):
+            continue
+        if (
+            token.kind == "ident"
+            and token.text.lower() in AGGREGATING_FUNCTIONS
+            and code[index + 1].text == "("
+        ):
+            return True
+    return False
+
+
+def _split(tokens: list[_Token], separator, depth: int) -> list[list[_Token]]:
+    """Splits tokens before each token at given depth for which `separator(token, previous, following)` is true"""
+    code = _code(tokens)
+    neighbours = {
+        id(token): (
+            code[index - 1] if index > 0 else None,
+            code[index + 1] if index + 1 < len(code) else None,
+        )
+        for index, token in enumerate(code)
+    }
+    parts = [[]]
+    for token in tokens:
+        if (
+            token.depth == depth
+            and token.kind != "space"
+            and separator(token, *neighbours[id(token)])
+        ):
+            parts.append([token])
+        else:
+            parts[-1].append(token)
+    return parts
+
+
+def _is_keyword(
+    token: _Token,
+    previous: _Token | None,
+    following: _Token | None,
+    keywords: set[str],
+) -> bool:
+    if token.keyword not in keywords:
+        return False
+    # property keys, parameters, labels and aliases may be named like keywords
+    if previous is not None and (previous.text in ".$:" or previous.keyword == "AS"):
+        return False
+    if token.keyword == "ORDER":
+        return following is not None and following.keyword == "BY"
+    # STARTS WITH and ENDS WITH are string operators
+    return not (
+        token.keyword == "WITH"
+        and previous is not None
+        and previous.keyword in ("STARTS", "ENDS")
+    )
+
+
+def _is_clause_start(
+    token: _Token, previous: _Token | None, following: _Token | None
+) -> bool:
+    return _is_keyword(token, previous, following, CLAUSE_KEYWORDS)
+
+
+@dataclass
+class _ProjectionItem:
+    tokens: list[_Token]
+    alias: str
+
+    @property
+    def expression(self) -> list[_Token]:
+        code = _code(self.tokens)
+        as_indexes = [
+            index
+            for index, token in enumerate(code)
+            if token.keyword == "AS" and token.depth == code[0].depth
+        ]
+        return code[: as_indexes[-1]] if as_indexes else code
+
+    @property
+    def is_star(self) -> bool:
+        return self.alias == "*"
+
+    @property
+    def is_variable(self) -> bool:
+        expression = self.expression
+        return len(expression) == 1 and expression[0].kind == "ident"
+
+
+@dataclass
+class _Clause:
+    # WITH and RETURN are projections, with their items and sub-clauses
+    keyword: str
+    tokens: list[_Token]
+    distinct: bool = False
+    items: list[_ProjectionItem] = field(default_factory=list)
+    tail: list[_Token] = field(default_factory=list)
+
+    @property
+    def is_projection(self) -> bool:
+        return self.keyword in ("WITH", "RETURN")
+
+    @property
+    def is_aggregating(self) -> bool:
+        return any(_is_aggregating(item.tokens) for item in self.items)
+
+    @property
+    def is_filtering(self) -> bool:
+        # sub-clauses that may change the number of rows
+        return any(
+            token.keyword in ("WHERE", "SKIP", "LIMIT")
+            and token.depth == self.tokens[0].depth
+            for token in self.tail
+        )
+
+    @property
+    def aliases(self) -> set[str]:
+        return {item.alias for item in self.items}
+
+    def render(self, items: list[_ProjectionItem] | None = None) -> str:
+        if not self.is_projection or items is None:
+            return _text(self.tokens)
+        return " ".join(
+            part
+            for part in (
+                "DISTINCT" if self.distinct else "",
+                ", ".join(_text(item.tokens) for item in items),
+                _text(self.tail),
+            )
+            if part
+        )
+
+
+def _parse_projection(keyword: str, tokens: list[_Token]) -> _Clause:
+    depth = tokens[0].depth if tokens else 0
+    clause = _Clause(keyword=keyword, tokens=tokens)
+    body = tokens
+    for modifier in (keyword, "DISTINCT"):
+        code = _code(body)
+        if code and code[0].keyword == modifier:
+            clause.distinct = clause.distinct or modifier == "DISTINCT"
+            body = body[body.index(code[0]) + 1 :]
+
+    tail_parts = _split(
+        body,
+        lambda token, previous, following: _is_keyword(
+            token, previous, following, PROJECTION_TAIL_KEYWORDS
+        ),
+        depth,
+    )
+    tail_start = len(tail_parts[0])
+    clause.tail = body[tail_start:]
+    for item_tokens in _split(
+        body[:tail_start], lambda token, *_: token.text == ",", depth
+    ):
+        if item_tokens and item_tokens[0].text == "," and item_tokens[0].depth == depth:
+            item_tokens = item_tokens[1:]
+        code = _code(item_tokens)
+        if not code:
+            raise AliasClauseNotSupported("Empty projection item")
+        if len(code) == 1 and (code[0].kind == "ident" or code[0].text == "*"):
+            alias = code[0].text
+        elif len(code) >= 3 and code[-2].keyword == "AS" and code[-1].kind == "ident":
+            alias = code[-1].text
+        else:
+            raise AliasClauseNotSupported(
+                f"Projection item without alias: {_text(code)}"
+            )
+        clause.items.append(_ProjectionItem(tokens=item_tokens, alias=alias.strip("`")))
+    return clause
+
+
+def _parse_clauses(tokens: list[_Token], first_keyword: str | None) -> list[_Clause]:
+    depth = tokens[0].depth if tokens else 0
+    clauses = []
+    for index, clause_tokens in enumerate(_split(tokens, _is_clause_start, depth)):
+        code = _code(clause_tokens)
+        if not code:
+            continue
+        keyword = code[0].keyword if code[0].keyword in CLAUSE_KEYWORDS else None
+        if index == 0 and keyword is None:
+            keyword = first_keyword
+        if keyword is None:
+            raise AliasClauseNotSupported(f"Unexpected clause: {_text(code)}")
+        if keyword in ("WITH", "RETURN"):
+            clauses.append(_parse_projection(keyword, clause_tokens))
+        else:
+            clauses.append(_Clause(keyword=keyword, tokens=clause_tokens))
+    return clauses
+
+
+def _get_subquery_returned_aliases(clause: _Clause) -> set[str] | None:
+    """
+    Returns the aliases returned by a CALL subquery if it always returns exactly one row, otherwise None.
+
+    This is the case when the subquery aggregates all rows at some stage, and only projects them afterwards.
+    A subquery combining several queries with UNION returns the rows of all of them, so it is never pruned.
+    """
+    code = _code(clause.tokens)
+    if len(code) < 3 or code[1].text != "{" or code[-1].text != "}":
+        return None
+    body = clause.tokens[
+        clause.tokens.index(code[1]) + 1 : clause.tokens.index(code[-1])
+    ]
+    clauses = _parse_clauses(body, first_keyword=None)
+    if (
+        not clauses
+        or clauses[-1].keyword != "RETURN"
+        or any(subquery_clause.keyword == "UNION" for subquery_clause in clauses)
+    ):
+        return None
+
+    one_row = False
+    for subquery_clause in clauses:
+        if one_row:
+            if not subquery_clause.is_projection or subquery_clause.is_filtering:
+                one_row = False
+        if (
+            subquery_clause.is_projection
+            and not subquery_clause.is_filtering
+            and subquery_clause.items
+            and all(_is_aggregating(item.tokens) for item in subquery_clause.items)
+        ):
+            one_row = True
+    return clauses[-1].aliases if one_row else None
+
+
+class AliasPlanner:
+    """
+    Splits the alias clause of a `CypherQueryBuilder` into its clauses, to build alias clauses
+    reduced to the aliases referenced by given Cypher fragments.
+    """
+
+    def __init__(self, alias_clause: str):
+        self.alias_clause = alias_clause
+        try:
+            self.clauses = _parse_clauses(_tokenize(alias_clause), first_keyword="WITH")
+            if not self.clauses or self.clauses[-1].keyword != "WITH":
+                raise AliasClauseNotSupported(
+                    "The alias clause must end with a projection"
+                )
+        except AliasClauseNotSupported as exc:
+            log.debug("Alias clause is not pruned: %s", exc)
+            self.clauses = None
+
+    def prune(self, *referencing_clauses: str) -> str:
+        """
+        Returns the alias clause, without the aliases not needed by given Cypher fragments.
+
+        Args:
+            *referencing_clauses (str): The Cypher fragments following the alias clause,
+                e.g. the filter clause and the header column.
+
+        Returns:
+            str: The pruned alias clause, or the full alias clause if it cannot be pruned.
+        """
+        if self.clauses is None:
+            return self.alias_clause
+
+        needed = set()
+        for referencing_clause in referencing_clauses:
+            needed |= get_identifiers(referencing_clause)
+
+        # needed is None when all variables are needed, e.g. by a DISTINCT *
+        rendered = []
+        for clause in reversed(self.clauses):
+            if clause.is_projection:
+                items, needed = self._prune_projection(clause, needed)
+                rendered.append(
+                    clause.render(items)
+                    if clause is self.clauses[0]
+                    else f"{clause.keyword} {clause.render(items)}"
+                )
+            else:
+                if clause.keyword == "CALL" and needed is not None:
+                    returned_aliases = _get_subquery_returned_aliases(clause)
+                    if returned_aliases is not None and not returned_aliases & needed:
+                        continue
+                if needed is not None:
+                    needed |= get_identifiers(clause.tokens)
+                rendered.append(clause.render())
+        return " ".join(reversed(rendered))
+
+    @staticmethod
+    def _prune_projection(
+        clause: _Clause, needed: set[str] | None
+    ) -> tuple[list[_ProjectionItem], set[str] | None]:
+        """Returns the items of a projection to keep, and the variables needed from the previous clauses"""
+        star = any(item.is_star for item in clause.items)
+        if needed is None or clause.distinct or clause.is_aggregating:
+            items = clause.items
+        else:
+            stage_needed = needed | get_identifiers(clause.tail)
+            items = [
+                item
+                for item in clause.items
+                if item.is_star or item.alias in stage_needed
+            ]
+            if not items:
+                # a projection needs an item, the cheapest one is kept
+                items = [
+                    next(
+                        (item for item in clause.items if item.is_variable),
+                        clause.items[0],
+                    )
+                ]
+
+        if star and (needed is None or clause.distinct):
+            return items, None
+        previous_needed = get_identifiers(clause.tail)
+        if star:
+            # variables passed through by the star, and not projected by the other items
+            previous_needed |= needed - clause.aliases
+        for item in items:
+            if not item.is_star:
+                previous_needed |= get_identifiers(item.expression)
+        return items, previous_needed
@@ -15,6 +15,7 @@ from clinical_mdr_api import config, exceptions
 from clinical_mdr_api.models.concepts.concept import VersionProperties
 from clinical_mdr_api.models.controlled_terminologies.ct_term import SimpleTermModel
 from clinical_mdr_api.models.standard_data_models.sponsor_model import SponsorModelBase
+from clinical_mdr_api.repositories._alias_planner import AliasPlanner
 
 # Re-used regex
 nested_regex = re.compile(r"\.")
@@ -424,6 +425,8 @@ class CypherQueryBuilder:
             method definition for more details.
         count_query : Cypher query with match, filter clauses, and results count. See
             build_count_query method definition for more details.
+            Count and header queries only evaluate the aliases referenced by the filter clause
+            and by the header, see `AliasPlanner`.
         parameters : Parameters object to pass along with the cypher query.
 
     Internal properties :
@@ -470,6 +473,7 @@ class CypherQueryBuilder:
         self.sort_clause = ""
         self.pagination_clause = ""
         self.parameters = {}
+        self.alias_planner = AliasPlanner(alias_clause)
 
         # Auto-generate internal clauses
         if filter_by and len(self.filter_by.elements) > 0:
@@ -846,8 +850,9 @@ class CypherQueryBuilder:
             > WITH alias_clause caller-provided
             > WHERE filter_clause using aliases
             > RETURN results count
+        Aliases not referenced by the filter clause are pruned from the alias clause.
         """
-        _with_alias_clause = f"WITH {self.alias_clause}"
+        _with_alias_clause = f"WITH {self.alias_planner.prune(self.filter_clause)}"
         _return_count_clause = "RETURN count(*) AS total_count"
 
         # Set clause
@@ -885,8 +890,9 @@ class CypherQueryBuilder:
             > WITH alias_clause caller-provided
             > WHERE filter_clause using aliases
             > RETURN list of possible headers for given alias, ordered, with a limit
+        Aliases referenced neither by the filter clause nor by the header are pruned from the alias clause.
         """
-        _with_alias_clause = f"WITH {self.alias_clause}"
+        self.parameters["result_count"] = result_count
 
         # support header clause for nested properties
         _escaped_header_alias = self.escape_alias(header_alias)
@@ -909,8 +915,11 @@ class CypherQueryBuilder:
 
         if not alias_clause:
             alias_clause = header_alias
+        _with_alias_clause = (
+            f"WITH {self.alias_planner.prune(self.filter_clause, alias_clause)}"
+        )
         _return_header_clause = f"""WITH DISTINCT {alias_clause} AS
-        {_escaped_header_alias} ORDER BY {_escaped_header_alias} LIMIT {result_count} 
+        {_escaped_header_alias} ORDER BY {_escaped_header_alias} LIMIT $result_count
         RETURN apoc.coll.toSet(apoc.coll.flatten(collect(DISTINCT {_escaped_header_alias}))) AS values"""
 
         return " ".join(
@@ -1,5 +1,10 @@
+from threading import Lock
+
+from cachetools import TTLCache, cached
 from neomodel import db
 
+from clinical_mdr_api import config
+
 CODELIST_DATA_RETRIEVAL_SPECIFIC_QUERY = """
 MATCH (old_package:CTPackage {name:$old_package_name})-[:CONTAINS_CODELIST]->(package_codelist:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
 (codelist_attr_val)<-[old_versions:HAS_VERSION]-(codelist_attr_root)<-[:HAS_ATTRIBUTES_ROOT]-(old_codelist_root {uid:$codelist_uid})
@@ -150,6 +155,91 @@ WITH old_items_map, new_items_map, added_items, removed_items, common_items, com
 """
 
 
+CHANGE_SET_RETRIEVAL_QUERY = """
+MATCH (:CTPackage {name:$old_package_name})-[:HAS_CHANGE_SET]->(change_set:CTPackageChangeSet)
+    -[:CHANGE_SET_TO]->(:CTPackage {name:$new_package_name})
+RETURN [(change_set)-[:HAS_CHANGE]->(change:CTPackageChange) | change {
+    .*,
+    old_value_node: head([(change)-[:OLD_VALUE]->(value) | value]),
+    new_value_node: head([(change)-[:NEW_VALUE]->(value) | value])
+}] AS changes
+"""
+
+CHANGE_SET_COUNTS_RETRIEVAL_QUERY = """
+MATCH (:CTPackage {name:$old_package_name})-[:HAS_CHANGE_SET]->(change_set:CTPackageChangeSet)
+    -[:CHANGE_SET_TO]->(:CTPackage {name:$new_package_name})
+RETURN change_set {
+    .added_codelists, .deleted_codelists, .updated_codelists, .added_terms, .deleted_terms, .updated_terms
+}
+"""
+
+# Each changed codelist or term is a CTPackageChange node, linked to its attributes value in the old package
+# and/or in the new package, from which the differences are computed again when the change set is read.
+CHANGE_SET_UPDATE_QUERY = """
+MATCH (old_package:CTPackage {name:$old_package_name})
+MATCH (new_package:CTPackage {name:$new_package_name})
+MERGE (old_package)-[:HAS_CHANGE_SET]->(change_set:CTPackageChangeSet)-[:CHANGE_SET_TO]->(new_package)
+SET
+  change_set.added_terms=$added_terms,
+  change_set.deleted_terms=$deleted_terms,
+  change_set.updated_terms=$updated_terms,
+  change_set.added_codelists=$added_codelists,
+  change_set.deleted_codelists=$deleted_codelists,
+  change_set.updated_codelists=$updated_codelists,
+  change_set.last_refresh=datetime()
+WITH change_set
+OPTIONAL MATCH (change_set)-[:HAS_CHANGE]->(stale_change:CTPackageChange)
+DETACH DELETE stale_change
+WITH DISTINCT change_set
+UNWIND $changes AS change
+CREATE (change_set)-[:HAS_CHANGE]->(change_node:CTPackageChange)
+SET change_node = change.properties
+WITH change_node, change
+OPTIONAL MATCH (old_value) WHERE elementId(old_value) = change.old_value_node_id
+OPTIONAL MATCH (new_value) WHERE elementId(new_value) = change.new_value_node_id
+FOREACH (_ IN CASE WHEN old_value IS NOT NULL THEN [1] ELSE [] END |
+    CREATE (change_node)-[:OLD_VALUE]->(old_value))
+FOREACH (_ IN CASE WHEN new_value IS NOT NULL THEN [1] ELSE [] END |
+    CREATE (change_node)-[:NEW_VALUE]->(new_value))
+"""
+
+# Same statistics as maintained by neo4j-mdr-db/update_ct_stats.py
+NEXT_PACKAGE_STATS_UPDATE_QUERY = """
+MATCH (old_package:CTPackage {name:$old_package_name})
+MATCH (new_package:CTPackage {name:$new_package_name})
+MERGE (old_package)-[rel:NEXT_PACKAGE]->(new_package)
+SET
+  rel.added_terms=$added_terms,
+  rel.deleted_terms=$deleted_terms,
+  rel.updated_terms=$updated_terms,
+  rel.added_codelists=$added_codelists,
+  rel.deleted_codelists=$deleted_codelists,
+  rel.updated_codelists=$updated_codelists,
+  rel.last_refresh=datetime()
+"""
+
+# Consecutive standard packages of each catalogue, ordered by effective date.
+# Sponsor packages are left out, as they don't contain snapshots of codelists and terms to compare.
+CONSECUTIVE_PACKAGES_QUERY = """
+MATCH (catalogue:CTCatalogue)-[:CONTAINS_PACKAGE]->(package:CTPackage)
+WHERE NOT (package)-[:EXTENDS_PACKAGE]->() AND ($catalogue_name IS NULL OR catalogue.name=$catalogue_name)
+WITH catalogue, package ORDER BY catalogue.name, package.effective_date
+WITH catalogue, collect(package.name) AS package_names
+UNWIND range(0, size(package_names) - 2) AS idx
+RETURN package_names[idx] AS old_package_name, package_names[idx + 1] AS new_package_name
+"""
+
+# Keys of the changes returned by get_ct_packages_changes, by type of item and type of change
+CHANGE_SET_KEYS = {
+    ("codelist", "added"): "new_codelists",
+    ("codelist", "deleted"): "deleted_codelists",
+    ("codelist", "updated"): "updated_codelists",
+    ("term", "added"): "new_terms",
+    ("term", "deleted"): "deleted_terms",
+    ("term", "updated"): "updated_terms",
+}
+
+
 @db.transaction
 def get_ct_packages_codelist_changes(
     old_package_name: str, new_package_name: str, codelist_uid: str
@@ -292,6 +382,8 @@ def term_diff(left_term, right_term):
         "change_date": right_term["change_date"],
         "codelists": right_term["codelists"],
         "value_node": value_diff,
+        "old_value_node": left_value,
+        "new_value_node": right_value,
     }
     return result
 
@@ -305,6 +397,8 @@ def codelist_diff(left_cl, right_cl):
         "uid": right_cl["uid"],
         "change_date": right_cl["change_date"],
         "value_node": value_diff,
+        "old_value_node": left_value,
+        "new_value_node": right_value,
     }
     return result
 
@@ -403,6 +497,13 @@ def get_ct_packages_changes(old_package_name: str, new_package_name: str) -> dic
     return output
 
 
+cache_store_package_changes_by_year = TTLCache(maxsize=1, ttl=config.CACHE_TTL)
+lock_store_package_changes_by_year = Lock()
+
+
+@cached(
+    cache=cache_store_package_changes_by_year, lock=lock_store_package_changes_by_year
+)
 @db.transaction
 def get_package_changes_by_year():
     query = """
@@ -433,6 +534,205 @@ def get_package_changes_by_year():
     return output
 
 
+@db.transaction
+def get_ct_packages_change_set(
+    old_package_name: str, new_package_name: str
+) -> dict | None:
+    """
+    Returns the materialized changes between two packages, if they were already computed.
+
+    Args:
+        old_package_name (str): The name of the old package.
+        new_package_name (str): The name of the new package.
+
+    Returns:
+        dict | None: The changes, in the same format as returned by `get_ct_packages_changes`,
+        or None if no change set is stored.
+    """
+    result, _ = db.cypher_query(
+        CHANGE_SET_RETRIEVAL_QUERY,
+        {"old_package_name": old_package_name, "new_package_name": new_package_name},
+    )
+    return change_set_to_changes(result[0][0]) if result else None
+
+
+@db.transaction
+def get_ct_packages_change_set_counts(
+    old_package_name: str, new_package_name: str
+) -> dict[str, int] | None:
+    """
+    Returns the number of changes between two packages, if their change set was already computed.
+
+    Args:
+        old_package_name (str): The name of the old package.
+        new_package_name (str): The name of the new package.
+
+    Returns:
+        dict[str, int] | None: Number of added, deleted and updated codelists and terms,
+        or None if no change set is stored.
+    """
+    result, _ = db.cypher_query(
+        CHANGE_SET_COUNTS_RETRIEVAL_QUERY,
+        {"old_package_name": old_package_name, "new_package_name": new_package_name},
+    )
+    return result[0][0] if result else None
+
+
+@db.transaction
+def save_ct_packages_change_set(
+    old_package_name: str, new_package_name: str, changes: dict
+) -> dict[str, int]:
+    """
+    Stores the changes between two packages in a `CTPackageChangeSet` node,
+    with a `CTPackageChange` node for each changed codelist and term.
+    Packages are immutable once imported, so the stored changes never go stale.
+
+    Args:
+        old_package_name (str): The name of the old package.
+        new_package_name (str): The name of the new package.
+        changes (dict): The changes, as returned by `get_ct_packages_changes`.
+
+    Returns:
+        dict[str, int]: Number of added, deleted and updated codelists and terms.
+    """
+    counts = get_change_counts(changes)
+    db.cypher_query(
+        CHANGE_SET_UPDATE_QUERY,
+        {
+            "old_package_name": old_package_name,
+            "new_package_name": new_package_name,
+            "changes": changes_to_change_set(changes),
+            **counts,
+        },
+    )
+    return counts
+
+
+@db.transaction
+def save_next_package_stats(
+    old_package_name: str, new_package_name: str, counts: dict[str, int]
+) -> None:
+    """
+    Updates the package statistics of the `NEXT_PACKAGE` relationship between two consecutive packages.
+
+    Args:
+        old_package_name (str): The name of the old package.
+        new_package_name (str): The name of the new package.
+        counts (dict[str, int]): Number of added, deleted and updated codelists and terms.
+    """
+    db.cypher_query(
+        NEXT_PACKAGE_STATS_UPDATE_QUERY,
+        {
+            "old_package_name": old_package_name,
+            "new_package_name": new_package_name,
+            **counts,
+        },
+    )
+    cache_store_package_changes_by_year.clear()
+
+
+@db.transaction
+def get_consecutive_ct_packages(catalogue_name: str | None = None) -> list[tuple]:
+    """
+    Returns the pairs of consecutive standard packages, per catalogue.
+
+    Args:
+        catalogue_name (str | None): Restricts the pairs to the packages of given catalogue.
+
+    Returns:
+        list[tuple]: Tuples of old and new package names.
+    """
+    result, _ = db.cypher_query(
+        CONSECUTIVE_PACKAGES_QUERY, {"catalogue_name": catalogue_name}
+    )
+    return [tuple(row) for row in result]
+
+
+def get_change_counts(changes: dict) -> dict[str, int]:
+    return {
+        "added_codelists": len(changes["new_codelists"]),
+        "deleted_codelists": len(changes["deleted_codelists"]),
+        "updated_codelists": len(changes["updated_codelists"]),
+        "added_terms": len(changes["new_terms"]),
+        "deleted_terms": len(changes["deleted_terms"]),
+        "updated_terms": len(changes["updated_terms"]),
+    }
+
+
+def changes_to_change_set(changes: dict) -> list[dict]:
+    """
+    Converts the changes returned by `get_ct_packages_changes` to the parameters of `CHANGE_SET_UPDATE_QUERY`:
+    the properties of each change, and the element ids of the attributes values it refers to.
+    """
+    change_set = []
+    for (item_type, change_type), key in CHANGE_SET_KEYS.items():
+        for item in changes[key]:
+            properties = {
+                "uid": item["uid"],
+                "item_type": item_type,
+                "change_type": change_type,
+                "change_date": item["change_date"],
+            }
+            if item_type == "term":
+                properties["codelists"] = item["codelists"]
+            elif "is_change_of_codelist" in item:
+                properties["is_change_of_codelist"] = item["is_change_of_codelist"]
+
+            # Updated items hold the difference of both values, or the new value
+            # for codelists that are only updated because some of their terms changed
+            old_value_node = item.get(
+                "old_value_node",
+                item["value_node"] if change_type == "deleted" else None,
+            )
+            new_value_node = item.get(
+                "new_value_node",
+                item["value_node"] if change_type != "deleted" else None,
+            )
+
+            change_set.append(
+                {
+                    "properties": properties,
+                    "old_value_node_id": getattr(old_value_node, "element_id", None),
+                    "new_value_node_id": getattr(new_value_node, "element_id", None),
+                }
+            )
+    return change_set
+
+
+def change_set_to_changes(change_set: list[dict]) -> dict:
+    """
+    Converts the changes read by `CHANGE_SET_RETRIEVAL_QUERY` back to the format returned by `get_ct_packages_changes`.
+    """
+    changes = {key: [] for key in CHANGE_SET_KEYS.values()}
+    for change in change_set:
+        old_value_node = change.get("old_value_node")
+        new_value_node = change.get("new_value_node")
+        if old_value_node is not None and new_value_node is not None:
+            value_node = diff_dicts(old_value_node, new_value_node)
+        else:
+            value_node = (
+                new_value_node if new_value_node is not None else old_value_node
+            )
+
+        item = {
+            "uid": change["uid"],
+            "value_node": value_node,
+            "change_date": change["change_date"],
+        }
+        if change["item_type"] == "term":
+            item["codelists"] = change["codelists"]
+        elif "is_change_of_codelist" in change:
+            item["is_change_of_codelist"] = change["is_change_of_codelist"]
+
+        changes[CHANGE_SET_KEYS[(change["item_type"], change["change_type"])]].append(
+            item
+        )
+
+    for items in changes.values():
+        items.sort(key=lambda item: item["change_date"])
+    return changes
+
+
 def update_modified_codelists(output: dict, all_codelists_in_package: list[dict]):
     """
     The following function adds codelists that contains some terms from the
@@ -134,6 +134,7 @@ from clinical_mdr_api.routers.listings.listings_sdtm import (
 from clinical_mdr_api.routers.listings.listings_study import (
     router as study_listing_router,
 )
+from clinical_mdr_api.routers.lookups import router as lookups_router
 from clinical_mdr_api.routers.projects.projects import router as projects_router
 from clinical_mdr_api.routers.standard_data_models.data_model_igs import (
     router as data_model_igs_router,
@@ -310,6 +311,7 @@ __all__ = [
     "ctr_xml_router",
     "dictionary_codelists_router",
     "dictionary_terms_router",
+    "lookups_router",
     "activity_instructions_router",
     "activity_instruction_pre_instances_router",
     "footnote_pre_instances_router",
@@ -3,8 +3,12 @@ from typing import Any
 from fastapi import APIRouter, Query
 
 from clinical_mdr_api.oauth import rbac
+from clinical_mdr_api.oauth.dependencies import jwks_service
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.services._meta_repository import MetaRepository
+from clinical_mdr_api.telemetry.query_canonicalizer import QueryPlanAudit
+from clinical_mdr_api.telemetry.query_profiler import QueryProfiler
+from clinical_mdr_api.telemetry.startup_report import get_startup_report
 
 # Prefixed with "/admin"
 router = APIRouter()
@@ -28,7 +32,9 @@ CACHE_STORE_NAMES = [
 )
 def get_caches(show_items: bool | None = Query(False)) -> list[dict]:
     all_repos = _get_all_repos()
-    return [_get_cache_info(x, show_items) for x in all_repos]
+    return [_get_cache_info(x, show_items) for x in all_repos] + [
+        _get_claims_cache_info()
+    ]
 
 
 @router.delete(
@@ -48,10 +54,124 @@ def clear_caches() -> list[dict]:
             cache_store = getattr(repo, store_name, None)
             if cache_store is not None:
                 cache_store.clear()
+    jwks_service.clear_claims_cache()
 
     return get_caches()
 
 
+@router.get(
+    "/startup-report",
+    dependencies=[rbac.ADMIN_READ],
+    summary="Returns the startup report of the API worker process serving the request",
+    description="""
+Reports the time the worker process took to boot, the number of modules loaded and the memory usage (RSS)
+after boot and now, and which of the deferred imports of rarely used export modules were loaded since.
+
+Time spent importing each module is only measured when the `STARTUP_REPORT_IMPORT_TIMES` environment variable is enabled.
+""",
+    status_code=200,
+    responses={
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_worker_startup_report(
+    slowest_imports: int
+    | None = Query(
+        25, ge=0, description="Number of modules slowest to import to be listed"
+    ),
+) -> dict:
+    return get_startup_report(slowest_imports=slowest_imports)
+
+
+@router.get(
+    "/query-profile",
+    dependencies=[rbac.ADMIN_READ],
+    summary="Returns the per-route profile of the requests served by the API worker process serving the request",
+    description="""
+For each route, reports the number of requests served, and the histograms and percentiles of latency,
+number of Cypher queries and database time (in seconds) of its most recent requests (`window_size`).
+Also lists the most frequent queries of each route, normalized so that queries only differing by literal values are the same,
+and the most recent requests that ran the same query more than `n_plus_one_threshold` times (N+1 query patterns).
+
+Routes are ordered by the total time spent serving their most recent requests. Profiling requires tracing and can be
+disabled with the `QUERY_PROFILING_ENABLED` environment variable.
+""",
+    status_code=200,
+    responses={
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_query_profile(
+    route: str
+    | None = Query(
+        None,
+        description="Only report routes containing this text, e.g. `/study-activities`",
+    ),
+    top_queries: int
+    | None = Query(
+        10, ge=0, description="Number of the most frequent queries listed per route"
+    ),
+) -> dict:
+    return QueryProfiler.get_report(route=route, top_queries=top_queries)
+
+
+@router.delete(
+    "/query-profile",
+    dependencies=[rbac.ADMIN_WRITE],
+    summary="Clears the per-route profile of the API worker process serving the request",
+    status_code=200,
+    responses={
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def clear_query_profile() -> dict:
+    QueryProfiler.reset()
+    return QueryProfiler.get_report()
+
+
+@router.get(
+    "/query-plan-audit",
+    dependencies=[rbac.ADMIN_READ],
+    summary="Returns the audit of the query plans of the API worker process serving the request",
+    description="""
+For each query, identified by its fingerprint so that queries only differing by literal values are the same,
+reports the number of runs, the number of distinct texts generated by the code (`texts`) and the number of distinct
+texts sent to the database once literal values are moved into parameters (`plans`). The database caches one plan
+per distinct text, so queries with many `plans` are planned again and again.
+
+Queries are ordered by their number of `plans`. Canonicalization can be disabled with the
+`QUERY_CANONICALIZATION_ENABLED` environment variable, and the audit with the `QUERY_PROFILING_ENABLED` environment variable.
+""",
+    status_code=200,
+    responses={
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_query_plan_audit(
+    top_queries: int
+    | None = Query(
+        50,
+        ge=0,
+        description="Number of queries listed, those with the most plans first",
+    ),
+) -> dict:
+    return QueryPlanAudit.get_report(top_queries=top_queries)
+
+
+@router.delete(
+    "/query-plan-audit",
+    dependencies=[rbac.ADMIN_WRITE],
+    summary="Clears the audit of the query plans of the API worker process serving the request",
+    status_code=200,
+    responses={
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def clear_query_plan_audit() -> dict:
+    QueryPlanAudit.reset()
+    return QueryPlanAudit.get_report()
+
+
 def _get_all_repos():
     meta_repository = MetaRepository()
     all_repos = []
@@ -83,6 +203,20 @@ def _get_cache_info(repo: Any, show_items: bool = False) -> dict:
     return ret
 
 
+def _get_claims_cache_info() -> dict:
+    # validated access token claims, keyed by token hash, so items are never shown
+    return {
+        "class": str(jwks_service.__class__),
+        "cache_stores": [
+            {
+                "store_name": "claims_cache",
+                "items": None,
+                **jwks_service.get_claims_cache_info(),
+            }
+        ],
+    }
+
+
 def _get_cache_item_info(items):
     ret = []
     for key in items.keys():
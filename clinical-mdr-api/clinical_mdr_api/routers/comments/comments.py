@@ -111,6 +111,45 @@ def get_comment_threads(
     )
 
 
+@router.get(
+    "/comment-threads/changes",
+    dependencies=[rbac.ANY],
+    summary="Returns the comment threads changed after the specified change",
+    description="""Returns the comment threads that were created, edited or deleted, or whose replies were,
+    after the change with the specified sequence number. To poll for changes, pass the returned `change_sequence` as `since` of the next request.""",
+    response_model=models.CommentThreadChanges,
+    status_code=200,
+    responses={
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def get_comment_thread_changes(
+    since: int = Query(
+        0,
+        ge=0,
+        description="Only comment threads changed after the change with this sequence number are returned. "
+        "If 0, all comment threads are returned.",
+    ),
+    topic_path: str
+    | None = Query(
+        None,
+        min_length=1,
+        description="The topic path of the comment threads. If not specified, comment threads associated with any topic are returned.",
+    ),
+    topic_path_partial_match: bool
+    | None = Query(
+        False,
+        description="""If `false`, only comment threads whose topic path is equal to the specified `topic_path` are returned.
+        If `true`, comment threads whose topic path partially matches the specified `topic_path` are returned.""",
+    ),
+) -> models.CommentThreadChanges:
+    return Service().get_comment_thread_changes(
+        since=since,
+        topic_path=topic_path,
+        topic_path_partial_match=topic_path_partial_match,
+    )
+
+
 @router.get(
     "/comment-threads/{uid}",
     dependencies=[rbac.ANY],
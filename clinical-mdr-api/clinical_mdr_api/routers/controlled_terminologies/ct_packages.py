@@ -59,6 +59,13 @@ def get_packages(
     "/packages/changes",
     dependencies=[rbac.LIBRARY_READ],
     summary="Returns changes between codelists and terms inside two different packages.",
+    description="""
+The changes between consecutive standard packages are read from the change sets stored by the
+`/ct/packages/changes/materialize` endpoint. The changes between other packages are computed on each request,
+and never stored by this endpoint.
+
+Sponsor packages don't contain codelists and terms of their own, so there are no changes between them.
+""",
     response_model=models.CTPackageChanges,
     status_code=200,
     responses={
@@ -169,3 +176,36 @@ def create(
 ):
     ct_package_service = CTPackageService()
     return ct_package_service.create_sponsor_ct_package(extends_package, effective_date)
+
+
+@router.post(
+    "/packages/changes/materialize",
+    dependencies=[rbac.LIBRARY_WRITE],
+    summary="Computes and stores the changes between consecutive packages.",
+    description="""
+Packages are immutable once imported, so the changes between two packages are computed only once
+and stored as change sets, from which the `/ct/packages/changes` and `/ct/stats` endpoints are served.
+
+This endpoint computes the change sets between all consecutive standard packages of each catalogue that were not computed yet,
+and refreshes the package statistics from them. It is called by the import after new packages are imported.
+
+Sponsor packages are not included: they only extend a standard package, without codelists and terms of their own to compare.
+""",
+    response_model=list[models.CTPackageChangeSet],
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def materialize_packages_changes(
+    catalogue_name: str
+    | None = Query(
+        None,
+        description="If specified, only the changes between packages of given catalogue are computed.",
+    ),
+):
+    ct_package_service = CTPackageService()
+    return ct_package_service.materialize_ct_packages_changes(
+        catalogue_name=catalogue_name
+    )
@@ -66,6 +66,7 @@ def create(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 @decorators.allow_exports(
     {
         "defaults": [
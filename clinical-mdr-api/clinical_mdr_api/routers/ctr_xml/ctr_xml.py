@@ -6,7 +6,12 @@ from fastapi.responses import Response
 from clinical_mdr_api.oauth import rbac
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.routers.studies.study import router
-from clinical_mdr_api.services.ctr_xml.ctr_xml_service import CTRXMLService
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+# The CTR XML service loads the large generated ctrxml module, only needed for this rarely used endpoint
+CTRXMLService = deferred_import(
+    "clinical_mdr_api.services.ctr_xml.ctr_xml_service", "CTRXMLService"
+)
 
 StudyUID = Path(None, description="The unique id of the study.")
 
@@ -28,5 +33,10 @@ class XMLResponse(Response):
 )
 def get_odm_xml(
     uid: str = StudyUID,
+    study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
 ) -> XMLResponse:
-    return XMLResponse(content=CTRXMLService().get_ctr_odm(uid))
+    return XMLResponse(
+        content=CTRXMLService().get_ctr_odm(
+            uid, study_value_version=study_value_version
+        )
+    )
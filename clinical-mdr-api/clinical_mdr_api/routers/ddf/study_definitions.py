@@ -36,7 +36,10 @@ Possible errors:
 )
 def get_study(
     study_uid: str = Path(..., description="The unique uid of the study."),
+    study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
 ) -> USDMStudy:
     usdm_service = USDMService(study_uid=study_uid)
-    ddf_study = usdm_service.get_by_uid(study_uid)
+    ddf_study = usdm_service.get_by_uid(
+        study_uid, study_value_version=study_value_version
+    )
     return ddf_study
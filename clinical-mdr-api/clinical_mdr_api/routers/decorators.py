@@ -2,5 +2,48 @@
 
 # pylint: disable=unused-import
 
+import functools
+import inspect
+
+from starlette.responses import Response
+
+from clinical_mdr_api.models.utils import FastJSONResponse
 from clinical_mdr_api.routers.export import allow_exports
 from clinical_mdr_api.services.decorators import validate_if_study_is_not_locked
+
+
+def fast_json_response(exclude_unset: bool = False):
+    """
+    Decorator returning the result of a list type endpoint as a `FastJSONResponse`.
+
+    FastAPI validates the result of an endpoint again against its `response_model` and encodes it
+    with `jsonable_encoder`, which takes most of the request time for large pages.
+    Only use it on endpoints returning instances of their response model, built by the service layer.
+    The response model of the route is still used for the OpenAPI schema.
+    Must be applied above `allow_exports`, so that exports are returned as they are.
+
+    Args:
+        exclude_unset (bool): Must match `response_model_exclude_unset` of the route.
+    """
+
+    def to_response(result):
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result, exclude_unset=exclude_unset)
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return to_response(await func(*args, **kwargs))
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return to_response(func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
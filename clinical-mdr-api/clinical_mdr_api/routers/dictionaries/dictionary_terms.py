@@ -157,6 +157,85 @@ def get_distinct_values_for_header(
     )
 
 
+@router.get(
+    "/terms/lookup",
+    dependencies=[rbac.LIBRARY_READ],
+    summary="Searches the terms of a dictionary codelist by name, for typeahead",
+    description="""
+Business logic:
+ - Returns the terms of the dictionary codelist whose name contains the search string, case-insensitively.
+ - Names starting with the search string are returned first, then names containing it elsewhere, both in alphabetical order.
+ - Search strings shorter than three characters only match the start of names.
+ - The terms are searched in an index kept in memory, which is refreshed after any term of the codelist is saved.
+
+State after:
+ - No change
+
+Possible errors:
+ - Invalid codelist_uid
+""",
+    response_model=list[models.DictionaryTermLookupItem],
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def lookup_terms(
+    codelist_uid: str = Query(
+        ..., description="The unique id of the DictionaryCodelist"
+    ),
+    search_string: str = Query(..., description="The text to search for in names"),
+    result_count: int
+    | None = Query(
+        10,
+        ge=1,
+        le=config.MAX_PAGE_SIZE,
+        description="The maximum number of terms to return",
+    ),
+):
+    dictionary_term_service = DictionaryTermGenericService()
+    return dictionary_term_service.lookup_dictionary_terms(
+        codelist_uid=codelist_uid,
+        search_string=search_string,
+        result_count=result_count,
+    )
+
+
+@router.post(
+    "/terms/lookup",
+    dependencies=[rbac.LIBRARY_READ],
+    summary="Looks up the terms of a dictionary codelist with the given names",
+    description="""
+Business logic:
+ - Returns, for each of the given names, the terms of the dictionary codelist with exactly this name.
+ - A name without terms is returned with an empty list.
+ - The terms are looked up in an index kept in memory, which is refreshed after any term of the codelist is saved.
+
+State after:
+ - No change
+
+Possible errors:
+ - Invalid codelist_uid
+""",
+    response_model=dict[str, list[models.DictionaryTermLookupItem]],
+    status_code=200,
+    responses={
+        404: _generic_descriptions.ERROR_404,
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def lookup_terms_by_names(
+    lookup_input: models.DictionaryTermLookupInput = Body(
+        description="The codelist and the names of the terms to look up."
+    ),
+):
+    dictionary_term_service = DictionaryTermGenericService()
+    return dictionary_term_service.lookup_dictionary_terms_by_names(
+        codelist_uid=lookup_input.codelist_uid, names=lookup_input.names
+    )
+
+
 @router.post(
     "/terms",
     dependencies=[rbac.LIBRARY_WRITE],
@@ -7,10 +7,12 @@ from typing import Any
 import yaml
 from dict2xml import dict2xml
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook
 
 from clinical_mdr_api.models import utils
 from clinical_mdr_api.models.utils import BaseModel
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+Workbook = deferred_import("openpyxl", "Workbook")
 
 REGISTERED_EXPORT_FORMATS = {}
 
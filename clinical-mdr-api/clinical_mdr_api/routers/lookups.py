@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Body
+
+from clinical_mdr_api import models
+from clinical_mdr_api.models.error import ErrorResponse
+from clinical_mdr_api.oauth import rbac
+from clinical_mdr_api.routers import _generic_descriptions
+from clinical_mdr_api.services import lookups as service
+
+# Prefixed with "/lookups"
+router = APIRouter()
+
+
+@router.post(
+    "",
+    dependencies=[rbac.LIBRARY_READ],
+    summary="Looks up the uids of many library items by name in a single request",
+    description="""
+Business logic:
+ - Returns, for each of the given items, the uid of the item of the given type with exactly this name, or null if there is none.
+ - Items are CT codelists, CT terms, dictionary terms, activities, activity groups, activity subgroups, activity instances, compounds, compound aliases and unit definitions.
+ - CT terms are looked up by sponsor preferred name, in the codelist with the given uid or name.
+ - Dictionary terms are looked up in the dictionary codelist with the given uid, from an index kept in memory.
+ - Other items are looked up by the name of their latest version.
+ - If several items have the same name, the lowest uid is returned.
+ - The results are returned in the order of the given items.
+
+State after:
+ - No change
+
+Possible errors:
+ - CT term without codelist_uid nor codelist_name
+ - Dictionary term without codelist_uid
+""",
+    response_model=list[models.LookupResult],
+    status_code=200,
+    responses={
+        400: {
+            "model": ErrorResponse,
+            "description": "ValidationException - Reasons include e.g.: \n"
+            "- A CT term is given without codelist_uid nor codelist_name.\n"
+            "- A dictionary term is given without codelist_uid.\n",
+        },
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def resolve_uids(
+    lookup_input: models.LookupInput = Body(description="The items to look up."),
+):
+    return service.resolve_uids(lookup_input.items)
@@ -692,6 +692,58 @@ def copy_simple_form_from_another_study(
     )
 
 
+@router.post(
+    "/{uid}/clone",
+    dependencies=[rbac.STUDY_WRITE],
+    summary="Creates a new Study as a copy of the selections of an existing Study",
+    description="""
+State before:
+ - uid must exist
+ - study_value_version, if provided, must be a released version of the study
+
+Business logic:
+ - A new DRAFT Study Definition is created with the identification data provided in the request body.
+ - The study selections of the latest or the given released version of the study referenced by uid
+ (arms, branch arms, cohorts, epochs, visits, elements, design cells, objectives, endpoints, criteria, compounds,
+ compound dosings, activities with their groupings, activity instances, schedules and instructions, SoA footnotes,
+ disease milestones and standard versions) are copied into the new study with new uids.
+ - A single audit trail entry is recorded per copied component.
+
+State after:
+ - The new study holds a copy of the selections of the study referenced by uid.
+""",
+    response_model=Study,
+    response_model_exclude_unset=True,
+    status_code=201,
+    responses={
+        201: {"description": "Created - The study was successfully cloned."},
+        400: {
+            "model": ErrorResponse,
+            "description": "Some application/business rules forbid to process the request. Expect more detailed"
+            " information in response body.",
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Not Found - The study with the specified 'uid' (and version) wasn't found.",
+        },
+        500: _generic_descriptions.ERROR_500,
+    },
+)
+def clone(
+    uid: str = StudyUID,
+    study_create_input: StudyCreateInput = Body(
+        description="Identification data of the new study."
+    ),
+    study_value_version: str | None = _generic_descriptions.STUDY_VALUE_VERSION_QUERY,
+) -> Study:
+    study_service = StudyService()
+    return study_service.clone(
+        uid=uid,
+        study_create_input=study_create_input,
+        study_value_version=study_value_version,
+    )
+
+
 @router.get(
     "/{uid}/time-units",
     dependencies=[rbac.STUDY_READ],
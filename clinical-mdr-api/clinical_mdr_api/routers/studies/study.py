@@ -83,6 +83,7 @@ PROJECT_NUMBER = Query(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_objectives_for_all_studies(
     no_brackets: bool = Query(
         False,
@@ -654,6 +655,7 @@ def sync_latest_version(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_endpoints_for_all_studies(
     no_brackets: bool = Query(
         False,
@@ -1358,6 +1360,7 @@ def get_all_selected_objectives_and_endpoints_standard_html(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_compounds_for_all_studies(
     project_name: str | None = PROJECT_NAME,
     project_number: str | None = PROJECT_NUMBER,
@@ -2087,6 +2090,7 @@ def patch_objective_accept_version(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_criteria_for_all_studies(
     no_brackets: bool = Query(
         False,
@@ -2909,6 +2913,7 @@ def patch_criteria_accept_version(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_activity_instances_for_all_studies(
     project_name: str | None = PROJECT_NAME,
     project_number: str | None = PROJECT_NUMBER,
@@ -3377,6 +3382,7 @@ def patch_study_activity_instance_sync_to_latest_activity_instance(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_activities_for_all_studies(
     project_name: str | None = PROJECT_NAME,
     project_number: str | None = PROJECT_NUMBER,
@@ -4147,6 +4153,7 @@ def get_distinct_arm_values_for_header(
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_selected_arms_for_all_studies(
     project_name: str | None = PROJECT_NAME,
     project_number: str | None = PROJECT_NUMBER,
@@ -6,7 +6,7 @@ from clinical_mdr_api.models.error import ErrorResponse
 from clinical_mdr_api.models.utils import CustomPage
 from clinical_mdr_api.oauth import rbac
 from clinical_mdr_api.repositories._utils import FilterOperator
-from clinical_mdr_api.routers import _generic_descriptions
+from clinical_mdr_api.routers import _generic_descriptions, decorators
 from clinical_mdr_api.routers import study_router as router
 from clinical_mdr_api.routers.studies import utils
 from clinical_mdr_api.services.studies.study_activity_instruction import (
@@ -26,6 +26,7 @@ from clinical_mdr_api.services.studies.study_activity_instruction import (
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response(exclude_unset=True)
 def get_all_activity_instructions_for_all_studies(
     sort_by: Json = Query(None, description=_generic_descriptions.SORT_BY),
     page_number: int
@@ -21,8 +21,9 @@ from clinical_mdr_api.services.studies.study_flowchart import (
     StudyFlowchartService,
 )
 from clinical_mdr_api.services.utils.table_f import (
+    COMPACT_TABLE_MODEL,
     TableWithFootnotes,
-    table_to_docx,
+    table_to_docx_stream,
     table_to_html,
 )
 
@@ -190,6 +191,7 @@ def get_study_flowchart_docx(
         study_value_version=study_value_version,
         operational=operational,
         hide_soa_groups=not (detailed or operational),
+        table_model=COMPACT_TABLE_MODEL,
     )
 
     if detailed or operational:
@@ -199,11 +201,12 @@ def get_study_flowchart_docx(
 
     # Add Protocol Section column
     if not operational:
-        StudyFlowchartService.add_protocol_section_column(table)
+        StudyFlowchartService.add_protocol_section_column(
+            table, table_model=COMPACT_TABLE_MODEL
+        )
 
     # convert flowchart to DOCX document applying styles
-    docx = table_to_docx(table, styles=DOCX_STYLES)
-    stream = docx.get_document_stream()
+    stream = table_to_docx_stream(table, styles=DOCX_STYLES)
 
     # determine the size of the binary DOCX document for HTTP header
     size = stream.seek(0, os.SEEK_END)
@@ -31,6 +31,7 @@ from clinical_mdr_api.services.studies.study_soa_footnote import StudySoAFootnot
         500: _generic_descriptions.ERROR_500,
     },
 )
+@decorators.fast_json_response()
 def get_all_study_soa_footnotes_from_all_studies(
     sort_by: Json = Query(None, description=_generic_descriptions.SORT_BY),
     page_number: int
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query
 
-from clinical_mdr_api import models
+from clinical_mdr_api import config, models
 from clinical_mdr_api.oauth import rbac
 from clinical_mdr_api.routers import _generic_descriptions
 from clinical_mdr_api.services import template_parameters as service
@@ -29,6 +29,7 @@ def get_all_template_parameters():
     "/{name}/terms",
     dependencies=[rbac.LIBRARY_READ],
     summary="Return all terms available for the given template parameter.",
+    description="The returned terms are ordered by\n0. name ascending",
     response_model=list[models.TemplateParameterTerm],
     status_code=200,
     responses={
@@ -37,6 +38,22 @@ def get_all_template_parameters():
     },
 )
 def get_template_parameter_terms(
-    name: str = Query(..., description="Name of the template parameter")
+    name: str = Query(..., description="Name of the template parameter"),
+    search_string: str
+    | None = Query(
+        None,
+        description="Optionally, only return the terms whose name contains this text, ignoring case.",
+    ),
+    page_number: int
+    | None = Query(1, ge=1, description=_generic_descriptions.PAGE_NUMBER),
+    page_size: int
+    | None = Query(
+        0,
+        ge=0,
+        le=config.MAX_PAGE_SIZE,
+        description="Number of terms to be returned per page. By default, all terms are returned.",
+    ),
 ):
-    return service.get_template_parameter_terms(name)
+    return service.get_template_parameter_terms(
+        name, search_string=search_string, page_number=page_number, page_size=page_size
+    )
@@ -68,6 +68,30 @@ class CommentsService:
         finally:
             self.repos.close()
 
+    def get_comment_thread_changes(
+        self,
+        since: int,
+        topic_path: str | None = None,
+        topic_path_partial_match: bool = False,
+    ) -> models.CommentThreadChanges:
+        try:
+            (
+                items,
+                deleted_thread_uids,
+                change_sequence,
+            ) = self.repos.comments_repository.find_comment_threads_changed_since(
+                since=since,
+                topic_path=topic_path,
+                topic_path_partial_match=topic_path_partial_match,
+            )
+            return models.CommentThreadChanges(
+                threads=[models.CommentThread.from_ar(item_ar) for item_ar in items],
+                deleted_thread_uids=deleted_thread_uids,
+                change_sequence=change_sequence,
+            )
+        finally:
+            self.repos.close()
+
     def get_comment_thread(self, uid: str) -> models.CommentThread:
         repos = MetaRepository()
         try:
@@ -1,12 +1,19 @@
+import json
 from datetime import datetime, timezone
+from hashlib import sha256
+from io import BytesIO
+from threading import Lock
 from time import time
 from typing import Any
 from xml.dom.minidom import Document
+from xml.sax.saxutils import XMLGenerator
 
+from cachetools import TTLCache
+from cachetools.keys import hashkey
 from fastapi import UploadFile
-from lxml import etree
-from weasyprint import HTML
+from neomodel import db
 
+from clinical_mdr_api import config
 from clinical_mdr_api.domains._utils import ObjectStatus, get_iso_lang_data
 from clinical_mdr_api.domains.concepts.odms.odm_xml_definition import (
     ODM,
@@ -53,10 +60,44 @@ from clinical_mdr_api.services.concepts.odms.odm_xml_stylesheets import (
     OdmXmlStylesheetService,
 )
 from clinical_mdr_api.services.utils.odm_xml_mapper import map_xml
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+HTML = deferred_import("weasyprint", "HTML")
+
+# The relationships of the exported ODM elements and of the library items they link to,
+# which change whenever a new version of any of them is created or a link between them is changed.
+RENDERED_RELATIONSHIPS_QUERY = """
+MATCH (target:{target_label} {{uid: $target_uid}})-[:FORM_REF|ITEM_GROUP_REF|ITEM_REF*0..3]->(element)
+WITH DISTINCT element
+MATCH (element)-[link]->(linked)
+WHERE type(link) <> "HAS_VERSION"
+RETURN
+    elementId(link),
+    elementId(linked),
+    properties(link),
+    [
+        path = (linked)-[:HAS_ATTRIBUTES_ROOT|HAS_NAME_ROOT|HAS_TERM*0..2]->()-[:LATEST]->()
+        | [rel IN relationships(path) | [elementId(rel), properties(rel)]]
+    ]
+"""
+
+# Conditions and methods are looked up by OID and all vendor namespaces are exported
+RENDERED_GENERATION_QUERY = """
+CALL { MATCH (:OdmConditionRoot)-[r:HAS_VERSION]->() RETURN count(r) AS conditions }
+CALL { MATCH (:OdmMethodRoot)-[r:HAS_VERSION]->() RETURN count(r) AS methods }
+CALL { MATCH (:OdmFormalExpressionRoot)-[r:HAS_VERSION]->() RETURN count(r) AS formal_expressions }
+CALL { MATCH (:OdmDescriptionRoot)-[r:HAS_VERSION]->() RETURN count(r) AS descriptions }
+CALL { MATCH (:OdmAliasRoot)-[r:HAS_VERSION]->() RETURN count(r) AS aliases }
+CALL { MATCH (:OdmVendorNamespaceRoot)-[r:HAS_VERSION]->() RETURN count(r) AS vendor_namespaces }
+RETURN conditions, methods, formal_expressions, descriptions, aliases, vendor_namespaces
+"""
 
 
 class OdmXmlExporterService:
     odm_data_extractor: OdmDataExtractor
+    target_uid: str
+    target_type: TargetType
+    status: ObjectStatus
     xml_document: Document
     odm: ODM
     used_vendor_namespaces: dict[str, dict]
@@ -66,6 +107,23 @@ class OdmXmlExporterService:
 
     mapper_file: UploadFile | None = None
 
+    # Rendered documents of final ODM elements, shared by all requests of the process
+    cache_store_rendered_document = TTLCache(
+        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    )
+    lock_store_rendered_document = Lock()
+
+    # Rendered with placeholders, replaced on each response, so that rendered documents can be shared
+    FILE_OID_PLACEHOLDER = "__ODM_FILE_OID__"
+    CREATION_DATE_TIME_PLACEHOLDER = "__ODM_CREATION_DATE_TIME__"
+
+    TARGET_LABELS = {
+        TargetType.STUDY_EVENT: "OdmStudyEventRoot",
+        TargetType.FORM: "OdmFormRoot",
+        TargetType.ITEM_GROUP: "OdmItemGroupRoot",
+        TargetType.ITEM: "OdmItemRoot",
+    }
+
     XML_LANG = "xml:lang"
     OSB_VERSION = "osb:version"
     OSB_INSTRUCTION = "osb:instruction"
@@ -99,17 +157,26 @@ class OdmXmlExporterService:
         Returns:
             None
         """
-        self.odm_data_extractor = OdmDataExtractor(
-            target_uid,
-            target_type,
-            status.name,
-            unit_definition_service,
-        )
+        self.target_uid = target_uid
+        self.target_type = target_type
+        self.status = status
         self.mapper_file = mapper_file
         self.allowed_namespaces = allowed_namespaces
         self.used_vendor_namespaces = {}
         self.pdf = pdf
         self.stylesheet = stylesheet
+        self.unit_definition_service = unit_definition_service
+
+    def _extract_odm(self):
+        """
+        Fetches the ODM elements to export from the database and builds the ODM object and XML document of them.
+        """
+        self.odm_data_extractor = OdmDataExtractor(
+            self.target_uid,
+            self.target_type,
+            self.status.name,
+            self.unit_definition_service,
+        )
 
         for uid, ext in self.odm_data_extractor.odm_vendor_namespaces.items():
             if not self.allowed_namespaces:
@@ -124,7 +191,7 @@ class OdmXmlExporterService:
         if self.stylesheet:
             self.xml_document.appendChild(
                 self.xml_document.createProcessingInstruction(
-                    "xml-stylesheet", f'type="text/xsl" href="{stylesheet}"'
+                    "xml-stylesheet", f'type="text/xsl" href="{self.stylesheet}"'
                 )
             )
 
@@ -132,37 +199,224 @@ class OdmXmlExporterService:
         """
         Gets an ODM XML document and applies a mapper file to it.
 
+        Without a mapper file the XML is written element by element to an in-memory buffer,
+        instead of building an intermediate DOM tree.
+        Rendered documents of final ODM elements are cached and reused for identical requests:
+        the XML document, the HTML it is transformed to with the stylesheet and the PDF printed from the HTML.
+        The cache is looked up before the ODM elements are fetched from the database,
+        and the `FileOID` and `CreationDateTime` of the document are stamped on each response.
+
         Returns:
             Any: The generated document as a pretty-printed XML string, or as a PDF if `self.pdf` is True.
 
         Raises:
             BusinessLogicException: If an error occurs while generating the PDF.
         """
-        doc = self._generate_odm_xml(self.odm, self.xml_document)
+        cache_key = self._get_rendered_document_cache_key()
+        stamps = {
+            self.FILE_OID_PLACEHOLDER: f"OID.{int(time() * 1_000)}",
+            self.CREATION_DATE_TIME_PLACEHOLDER: str(datetime.now(timezone.utc)),
+        }
+
+        xml = self._get_rendered_document(cache_key, "xml", self._get_odm_xml)
+        if not self.pdf:
+            return self._stamp_document(xml, stamps)
+
+        try:
+            html = self._get_rendered_document(
+                cache_key,
+                "html",
+                lambda: OdmXmlStylesheetService.transform(self.stylesheet, xml),
+            )
+            stamped_html = self._stamp_document(html, stamps)
+            if stamped_html != html:
+                # The stylesheet shows the FileOID or CreationDateTime, so the PDF differs on each response
+                return HTML(string=stamped_html).write_pdf()
 
-        map_xml(self.xml_document, self.mapper_file)
+            return self._get_rendered_document(
+                cache_key, "pdf", lambda: HTML(string=html).write_pdf()
+            )
+        except Exception as exc:
+            raise BusinessLogicException(exc.args[0]) from exc
 
-        rs = doc.toprettyxml(encoding="utf-8")
+    @staticmethod
+    def _stamp_document(document: bytes, stamps: dict[str, str]) -> bytes:
+        """
+        Replaces the placeholders of the values that differ on each response in a rendered document.
 
-        if self.pdf:
-            try:
-                stylesheet_filename = OdmXmlStylesheetService.get_xml_filename_by_name(
-                    self.stylesheet
-                )
+        Args:
+            document (bytes): The rendered document.
+            stamps (dict[str, str]): The values of the response, by placeholder.
 
-                parser = etree.XMLParser(resolve_entities=False)
-                dom = etree.fromstring(rs, parser=parser)
-                xslt = etree.parse(stylesheet_filename, parser=parser)
-                transform = etree.XSLT(
-                    xslt, access_control=etree.XSLTAccessControl.DENY_ALL
-                )
+        Returns:
+            bytes: The document of the response.
+        """
+        for placeholder, value in stamps.items():
+            document = document.replace(
+                placeholder.encode("utf-8"), value.encode("utf-8")
+            )
+        return document
 
-                rs = HTML(string=etree.tostring(transform(dom))).write_pdf()
-            except Exception as exc:
-                raise BusinessLogicException(exc.args[0]) from exc
+    def _get_rendered_document(self, cache_key, output: str, render):
+        """
+        Returns the document rendered to the given output, from the cache if it was already rendered.
+
+        Args:
+            cache_key (tuple | None): The key of the rendered documents, None if they must not be cached.
+            output (str): The output the document is rendered to, one of `xml`, `html` or `pdf`.
+            render (Callable[[], bytes]): Renders the document if it is not cached.
 
+        Returns:
+            bytes: The rendered document.
+        """
+        if cache_key is None:
+            return render()
+
+        key = hashkey(output, *cache_key)
+        with self.lock_store_rendered_document:
+            rs = self.cache_store_rendered_document.get(key)
+        if rs is None:
+            rs = render()
+            with self.lock_store_rendered_document:
+                self.cache_store_rendered_document[key] = rs
         return rs
 
+    def _get_odm_xml(self) -> bytes:
+        """
+        Fetches the ODM elements and generates the ODM XML document, applying the mapper file if there is one.
+
+        Returns:
+            bytes: The generated document as a pretty-printed XML string.
+        """
+        self._extract_odm()
+
+        if self.mapper_file:
+            doc = self._generate_odm_xml(self.odm, self.xml_document)
+
+            map_xml(self.xml_document, self.mapper_file)
+
+            return doc.toprettyxml(encoding="utf-8")
+
+        return self._write_odm_xml_document()
+
+    def _get_rendered_document_cache_key(self):
+        """
+        Returns the key under which the rendered document is cached,
+        or None if the document must not be cached.
+
+        Only documents of final ODM elements without a mapper file are cached.
+        The key is computed without fetching the ODM elements: it contains a fingerprint of the relationships
+        of the exported study event, forms, item groups and items, including those to their versions,
+        descriptions, aliases, vendor extensions, unit definitions, codelists and CT terms,
+        and the number of versions of the conditions, methods and vendor namespaces,
+        so that any change to what the document renders results in a new key.
+
+        Returns:
+            tuple | None: The cache key.
+        """
+        if (
+            self.mapper_file
+            or self.status != ObjectStatus.LATEST_FINAL
+            or self.target_type not in self.TARGET_LABELS
+        ):
+            return None
+
+        rendered_relationships, _ = db.cypher_query(
+            RENDERED_RELATIONSHIPS_QUERY.format(
+                target_label=self.TARGET_LABELS[self.target_type]
+            ),
+            {"target_uid": self.target_uid},
+        )
+        if not rendered_relationships:
+            return None
+        rendered_generation, _ = db.cypher_query(RENDERED_GENERATION_QUERY)
+
+        fingerprint = sha256(
+            "\n".join(
+                sorted(
+                    json.dumps(row, default=str, sort_keys=True)
+                    for row in rendered_relationships
+                )
+            ).encode("utf-8")
+        ).hexdigest()
+
+        return hashkey(
+            self.target_uid,
+            self.target_type.value,
+            self.stylesheet,
+            tuple(sorted(self.allowed_namespaces)),
+            fingerprint,
+            tuple(rendered_generation[0]),
+        )
+
+    def _write_odm_xml_document(self) -> bytes:
+        """
+        Writes the ODM XML document element by element to an in-memory buffer, without building a DOM tree.
+        The document is pretty-printed the same way as `Document.toprettyxml`.
+
+        Returns:
+            bytes: The generated XML document.
+        """
+        buffer = BytesIO()
+        writer = XMLGenerator(buffer, encoding="utf-8", short_empty_elements=True)
+
+        writer.startDocument()
+        if self.stylesheet:
+            writer.processingInstruction(
+                "xml-stylesheet", f'type="text/xsl" href="{self.stylesheet}"'
+            )
+            writer.ignorableWhitespace("\n")
+        self._write_odm_xml(self.odm, writer)
+        writer.endDocument()
+
+        return buffer.getvalue()
+
+    def _write_odm_xml(self, odm_element, writer: XMLGenerator, indent: str = ""):
+        """
+        Writes an ODM element and all of its sub-elements to the given XML writer.
+        Produces the same elements and attributes as `_generate_odm_xml`.
+
+        Args:
+            odm_element: The ODM element to write.
+            writer (XMLGenerator): The XML writer to write to.
+            indent (str): The indentation of the element.
+        """
+        if hasattr(odm_element, "_custom_element_name") and isinstance(
+            odm_element._custom_element_name, str
+        ):
+            element_name = odm_element._custom_element_name
+        else:
+            element_name = odm_element.__class__.__name__
+
+        attributes = {}
+        children = []
+        for attribute_name, attribute_value in vars(odm_element).items():
+            if isinstance(attribute_value, Attribute):
+                attributes[attribute_value.name] = str(attribute_value.value)
+            elif isinstance(attribute_value, list):
+                children.extend(attribute_value)
+            elif attribute_name != "_custom_element_name":
+                children.append(attribute_value)
+
+        writer.ignorableWhitespace(indent)
+        writer.startElement(element_name, attributes)
+
+        if len(children) == 1 and isinstance(children[0], str):
+            writer.characters(children[0])
+        elif children:
+            writer.ignorableWhitespace("\n")
+            for child in children:
+                if isinstance(child, str):
+                    writer.ignorableWhitespace(indent + "\t")
+                    writer.characters(child)
+                    writer.ignorableWhitespace("\n")
+                else:
+                    self._write_odm_xml(child, writer, indent + "\t")
+            writer.ignorableWhitespace(indent)
+
+        writer.endElement(element_name)
+        writer.ignorableWhitespace("\n")
+
     def _generate_odm_xml(self, odm_element, current_xml_element):
         """
         Generates an ODM XML document from an ODM element.
@@ -939,9 +1193,9 @@ class OdmXmlExporterService:
             odm_ns=Attribute("xmlns:odm", "http://www.cdisc.org/ns/odm/v1.3"),
             odm_version=Attribute("ODMVersion", "1.3.2"),
             file_type=Attribute("FileType", "Snapshot"),
-            file_oid=Attribute("FileOID", f"OID.{int(time() * 1_000)}"),
+            file_oid=Attribute("FileOID", self.FILE_OID_PLACEHOLDER),
             creation_date_time=Attribute(
-                "CreationDateTime", datetime.now(timezone.utc)
+                "CreationDateTime", self.CREATION_DATE_TIME_PLACEHOLDER
             ),
             granularity=Attribute("Granularity", "All"),
             study=Study(
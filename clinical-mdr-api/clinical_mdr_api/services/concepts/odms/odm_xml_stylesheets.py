@@ -1,11 +1,25 @@
 import re
 from os import listdir, path
+from threading import local
+
+from lxml import etree
 
 from clinical_mdr_api.config import XML_STYLESHEET_DIR_PATH
 from clinical_mdr_api.exceptions import BusinessLogicException, ValidationException
 
 
+class CompiledStylesheets(local):
+    def __init__(self):
+        self.by_filename: dict[str, tuple[float, etree.XSLT]] = {}
+
+
 class OdmXmlStylesheetService:
+    # Compiled XSLT objects are kept per thread, as a single XSLT object must not be applied
+    # from several threads at the same time, and are reused by all requests handled by the thread.
+    # Keyed by stylesheet filename, each entry holds the file modification time it was compiled from
+    # so that a changed stylesheet file is recompiled on next use.
+    compiled_stylesheets = CompiledStylesheets()
+
     @staticmethod
     def get_available_stylesheet_names():
         """
@@ -70,3 +84,55 @@ class OdmXmlStylesheetService:
             encoding="utf-8",
         ) as file:
             return file.read()
+
+    @staticmethod
+    def get_compiled_stylesheet(stylesheet: str) -> etree.XSLT:
+        """
+        Returns the compiled XSLT of the XML stylesheet with the given name.
+
+        The stylesheet is parsed and compiled only once per thread and is recompiled if its file has changed.
+
+        Args:
+            stylesheet (str): The name of the XML stylesheet.
+
+        Returns:
+            etree.XSLT: The compiled XML stylesheet.
+
+        Raises:
+            ValidationException: If the stylesheet name contains characters other than letters, numbers, and hyphens.
+            BusinessLogicException: If the stylesheet with the given name is not found.
+        """
+        filename = OdmXmlStylesheetService.get_xml_filename_by_name(stylesheet)
+        modified = path.getmtime(filename)
+
+        compiled_stylesheets = OdmXmlStylesheetService.compiled_stylesheets.by_filename
+        compiled = compiled_stylesheets.get(filename)
+        if compiled is None or compiled[0] != modified:
+            parser = etree.XMLParser(resolve_entities=False)
+            xslt = etree.parse(filename, parser=parser)
+            compiled = (
+                modified,
+                etree.XSLT(xslt, access_control=etree.XSLTAccessControl.DENY_ALL),
+            )
+            compiled_stylesheets[filename] = compiled
+
+        return compiled[1]
+
+    @staticmethod
+    def transform(stylesheet: str, xml: bytes) -> bytes:
+        """
+        Applies the XML stylesheet with the given name to the given XML document.
+
+        Args:
+            stylesheet (str): The name of the XML stylesheet.
+            xml (bytes): The XML document to transform.
+
+        Returns:
+            bytes: The result of the transformation.
+        """
+        transform = OdmXmlStylesheetService.get_compiled_stylesheet(stylesheet)
+
+        parser = etree.XMLParser(resolve_entities=False)
+        dom = etree.fromstring(xml, parser=parser)
+
+        return etree.tostring(transform(dom))
@@ -1,16 +1,24 @@
 from datetime import date
 
+from neomodel import db
+
 from clinical_mdr_api import exceptions, models
 from clinical_mdr_api.models import (
     CTPackage,
     CTPackageChanges,
+    CTPackageChangeSet,
     CTPackageChangesSpecificCodelist,
     CTPackageDates,
 )
 from clinical_mdr_api.oauth.user import user
 from clinical_mdr_api.repositories.ct_packages import (
+    get_consecutive_ct_packages,
+    get_ct_packages_change_set,
+    get_ct_packages_change_set_counts,
     get_ct_packages_changes,
     get_ct_packages_codelist_changes,
+    save_ct_packages_change_set,
+    save_next_package_stats,
 )
 from clinical_mdr_api.services._meta_repository import MetaRepository  # type: ignore
 from clinical_mdr_api.services._utils import normalize_string
@@ -79,6 +87,7 @@ class CTPackageService:
         finally:
             self._close_all_repos()
 
+    @db.transaction
     def create_sponsor_ct_package(
         self, extends_package: str, effective_date: date
     ) -> models.CTPackage:
@@ -104,19 +113,80 @@ class CTPackageService:
                 new_package_date=new_package_date,
             )
 
-            result = get_ct_packages_changes(
-                old_package_name=old_package.name,
-                new_package_name=new_package.name,
+            # Change sets are materialized when packages are imported, this read never writes them
+            changes = get_ct_packages_change_set(
+                old_package_name=old_package.name, new_package_name=new_package.name
             )
-
+            if changes is None:
+                changes = get_ct_packages_changes(
+                    old_package_name=old_package.name,
+                    new_package_name=new_package.name,
+                )
             return CTPackageChanges.from_repository_output(
                 old_package_name=old_package.name,
                 new_package_name=new_package.name,
-                query_output=result,
+                query_output=changes,
             )
         finally:
             self._close_all_repos()
 
+    def materialize_ct_packages_changes(
+        self, catalogue_name: str | None = None
+    ) -> list[CTPackageChangeSet]:
+        """
+        Computes and stores the changes between all consecutive standard packages,
+        and refreshes the package statistics from them.
+        Change sets that were already computed are not computed again.
+
+        Args:
+            catalogue_name (str | None): Restricts the materialization to the packages of given catalogue.
+
+        Returns:
+            list[CTPackageChangeSet]: Number of changes between each pair of consecutive packages.
+        """
+        try:
+            if (
+                catalogue_name is not None
+                and not self._repos.ct_catalogue_repository.catalogue_exists(
+                    normalize_string(catalogue_name)
+                )
+            ):
+                raise exceptions.BusinessLogicException(
+                    f"There is no catalogue identified by provided catalogue name ({catalogue_name})"
+                )
+
+            change_sets = []
+            for old_package_name, new_package_name in get_consecutive_ct_packages(
+                catalogue_name=catalogue_name
+            ):
+                counts = get_ct_packages_change_set_counts(
+                    old_package_name=old_package_name, new_package_name=new_package_name
+                )
+                if counts is None:
+                    counts = save_ct_packages_change_set(
+                        old_package_name=old_package_name,
+                        new_package_name=new_package_name,
+                        changes=get_ct_packages_changes(
+                            old_package_name=old_package_name,
+                            new_package_name=new_package_name,
+                        ),
+                    )
+                save_next_package_stats(
+                    old_package_name=old_package_name,
+                    new_package_name=new_package_name,
+                    counts=counts,
+                )
+                change_sets.append(
+                    CTPackageChangeSet(
+                        from_package=old_package_name,
+                        to_package=new_package_name,
+                        **counts,
+                    )
+                )
+            return change_sets
+        finally:
+            self._close_all_repos()
+
     def get_ct_package_by_uid(
         self,
         ct_package_uid: str,
@@ -1,13 +1,18 @@
 from datetime import datetime, timezone
-from functools import cached_property
+from functools import cached_property, partial
+from threading import Lock
 from types import MappingProxyType
 
 # pylint: disable=wrong-import-order # disagreement between isort and pylint
 import ctrxml
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from neomodel import db
 from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 from xsdata.models.datatype import XmlDateTime
 
+from clinical_mdr_api import config
 from clinical_mdr_api.domains._utils import get_iso_lang_data
 from clinical_mdr_api.domains.study_definition_aggregates.study_metadata import (
     StudyComponentEnum,
@@ -38,6 +43,20 @@ from clinical_mdr_api.services.controlled_terminologies.ct_codelist_attributes i
 from clinical_mdr_api.services.projects.project import ProjectService
 from clinical_mdr_api.services.studies.study import StudyService
 from clinical_mdr_api.services.studies.study_visit import StudyVisitService
+from clinical_mdr_api.services.utils.concurrent_reads import gather_concurrently
+
+# The ODM forms, item groups and items and the codelists of a document are read from the library in their latest version.
+# Every new version of them adds a HAS_VERSION relationship and linking them adds ITEM_GROUP_REF or ITEM_REF
+# relationships. These counts are read from the counts store of the database, in constant time.
+LIBRARY_GENERATION_QUERY = """
+CALL { MATCH (:OdmFormRoot)-[r:HAS_VERSION]->() RETURN count(r) AS forms }
+CALL { MATCH (:OdmItemGroupRoot)-[r:HAS_VERSION]->() RETURN count(r) AS item_groups }
+CALL { MATCH (:OdmItemRoot)-[r:HAS_VERSION]->() RETURN count(r) AS items }
+CALL { MATCH (:CTCodelistAttributesRoot)-[r:HAS_VERSION]->() RETURN count(r) AS codelists }
+CALL { MATCH ()-[r:ITEM_GROUP_REF]->() RETURN count(r) AS item_group_refs }
+CALL { MATCH ()-[r:ITEM_REF]->() RETURN count(r) AS item_refs }
+RETURN forms, item_groups, items, codelists, item_group_refs, item_refs
+"""
 
 
 def iso639_shortest(code: str) -> str:
@@ -59,8 +78,33 @@ class CTRXMLService:
         }
     )
 
-    def get_ctr_odm(self, study_uid: str):
-        odm_builder = ODMBuilder(study_uid)
+    # Rendered documents of locked and released study versions, per generation of the library items they contain.
+    # Changes of these items that don't add versions or references, e.g. the order of the items of a group,
+    # are shown once the document expires.
+    cache_store_ctr_odm_by_version = TTLCache(
+        maxsize=config.STUDY_DOCUMENT_CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    )
+    lock_store_ctr_odm_by_version = Lock()
+
+    def get_ctr_odm(self, study_uid: str, study_value_version: str | None = None):
+        if study_value_version is None:
+            return self._render_ctr_odm(study_uid)
+
+        library_generation, _ = db.cypher_query(LIBRARY_GENERATION_QUERY)
+        key = hashkey(study_uid, study_value_version, tuple(library_generation[0]))
+        with self.lock_store_ctr_odm_by_version:
+            document = self.cache_store_ctr_odm_by_version.get(key)
+        if document is None:
+            document = self._render_ctr_odm(
+                study_uid, study_value_version=study_value_version
+            )
+            with self.lock_store_ctr_odm_by_version:
+                self.cache_store_ctr_odm_by_version[key] = document
+        return document
+
+    def _render_ctr_odm(self, study_uid: str, study_value_version: str | None = None):
+        odm_builder = ODMBuilder(study_uid, study_value_version=study_value_version)
+        odm_builder.prefetch()
         odm = odm_builder.get_odm()
         # noinspection PyTypeChecker
         return self.serializer.render(odm, ns_map=self.namespaces)
@@ -68,9 +112,20 @@ class CTRXMLService:
 
 class ODMBuilder:
     study_uid: str
+    study_value_version: str | None
 
-    def __init__(self, study_uid: str):
+    def __init__(self, study_uid: str, study_value_version: str | None = None):
         self.study_uid = study_uid
+        self.study_value_version = study_value_version
+
+    def prefetch(self) -> None:
+        """Reads the study, its visits and the ODM forms concurrently, ahead of building the document"""
+        gather_concurrently(
+            {
+                name: partial(getattr, self, name)
+                for name in ("study_metadata", "study_visits", "odm_forms")
+            }
+        )
 
     @cached_property
     def project(self) -> Project:
@@ -90,7 +145,9 @@ class ODMBuilder:
             StudyComponentEnum.STUDY_INTERVENTION,
         ]
         study = StudyService().get_by_uid(
-            uid=self.study_uid, include_sections=include_sections
+            uid=self.study_uid,
+            include_sections=include_sections,
+            study_value_version=self.study_value_version,
         )
         if study.current_metadata is None:
             raise BusinessLogicException("Missing study metadata")
@@ -98,9 +155,9 @@ class ODMBuilder:
 
     @cached_property
     def study_visits(self) -> list[StudyVisit]:
-        result = StudyVisitService(study_uid=self.study_uid).get_all_visits(
-            self.study_uid
-        )
+        result = StudyVisitService(
+            study_uid=self.study_uid, study_value_version=self.study_value_version
+        ).get_all_visits(self.study_uid, study_value_version=self.study_value_version)
         return result.items
 
     @property
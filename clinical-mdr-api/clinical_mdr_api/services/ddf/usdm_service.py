@@ -1,5 +1,12 @@
+from functools import partial
+from threading import Lock
+from typing import Any, Callable
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
 from usdm_model import Study as USDMStudy
 
+from clinical_mdr_api import config
 from clinical_mdr_api.domains.study_definition_aggregates.study_metadata import (
     StudyComponentEnum,
 )
@@ -23,36 +30,116 @@ from clinical_mdr_api.services.studies.study_endpoint_selection import (
 )
 from clinical_mdr_api.services.studies.study_epoch import StudyEpochService
 from clinical_mdr_api.services.studies.study_visit import StudyVisitService
+from clinical_mdr_api.services.utils.concurrent_reads import gather_concurrently
+
+
+def _prefetched(result: Any) -> Callable:
+    return lambda *_args, **_kwargs: result
 
 
 class USDMService:
-    _usdm_mapper: USDMMapper
+    # Mapped locked and released study versions. The library items they refer to can still change,
+    # so they are only kept for a limited time.
+    cache_store_usdm_study_by_version = TTLCache(
+        maxsize=config.STUDY_DOCUMENT_CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    )
+    lock_store_usdm_study_by_version = Lock()
 
     def __init__(self, study_uid: str):
-        self._usdm_mapper = USDMMapper(
-            get_osb_study_design_cells=StudyDesignCellService().get_all_design_cells,
-            get_osb_study_arms=StudyArmSelectionService().get_all_selection,
-            get_osb_study_epochs=StudyEpochService().get_all_epochs,
-            get_osb_study_elements=StudyElementSelectionService().get_all_selection,
-            get_osb_study_endpoints=StudyEndpointSelectionService().get_all_selection,
-            get_osb_study_visits=StudyVisitService(study_uid=study_uid).get_all_visits,
-            get_osb_study_activities=StudyActivitySelectionService().get_all_selection,
-            get_osb_activity_schedules=StudyActivityScheduleService().get_all_schedules,
+        self.study_uid = study_uid
+
+    def get_by_uid(self, uid: str, study_value_version: str | None = None) -> USDMStudy:
+        if study_value_version is None:
+            return self._get_by_uid(uid)
+
+        key = hashkey(uid, study_value_version)
+        with self.lock_store_usdm_study_by_version:
+            usdm_study = self.cache_store_usdm_study_by_version.get(key)
+        if usdm_study is None:
+            usdm_study = self._get_by_uid(uid, study_value_version=study_value_version)
+            with self.lock_store_usdm_study_by_version:
+                self.cache_store_usdm_study_by_version[key] = usdm_study
+        return usdm_study
+
+    def _get_by_uid(
+        self, uid: str, study_value_version: str | None = None
+    ) -> USDMStudy:
+        # The study and its selections are independent reads, gathered concurrently from the same study version
+        osb_data = gather_concurrently(
+            {
+                "study": partial(
+                    StudyService().get_by_uid,
+                    uid,
+                    include_sections=[
+                        StudyComponentEnum.IDENTIFICATION_METADATA,
+                        StudyComponentEnum.REGISTRY_IDENTIFIERS,
+                        StudyComponentEnum.VERSION_METADATA,
+                        StudyComponentEnum.STUDY_DESCRIPTION,
+                        StudyComponentEnum.STUDY_DESIGN,
+                        StudyComponentEnum.STUDY_INTERVENTION,
+                        StudyComponentEnum.STUDY_POPULATION,
+                    ],
+                    study_value_version=study_value_version,
+                ),
+                "design_cells": partial(
+                    StudyDesignCellService().get_all_design_cells,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+                "arms": partial(
+                    StudyArmSelectionService().get_all_selection,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+                "epochs": partial(
+                    StudyEpochService().get_all_epochs,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+                "elements": partial(
+                    StudyElementSelectionService().get_all_selection,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+                "endpoints": partial(
+                    StudyEndpointSelectionService().get_all_selection,
+                    uid,
+                    no_brackets=True,
+                    study_value_version=study_value_version,
+                ),
+                "visits": partial(
+                    self._get_osb_study_visits,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+                "activities": partial(
+                    StudyActivitySelectionService().get_all_selection,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+                "activity_schedules": partial(
+                    StudyActivityScheduleService().get_all_schedules,
+                    uid,
+                    study_value_version=study_value_version,
+                ),
+            }
         )
 
-    def get_by_uid(self, uid: str) -> USDMStudy:
-        osb_study = StudyService().get_by_uid(
-            uid,
-            include_sections=[
-                StudyComponentEnum.IDENTIFICATION_METADATA,
-                StudyComponentEnum.REGISTRY_IDENTIFIERS,
-                StudyComponentEnum.VERSION_METADATA,
-                StudyComponentEnum.STUDY_DESCRIPTION,
-                StudyComponentEnum.STUDY_DESIGN,
-                StudyComponentEnum.STUDY_INTERVENTION,
-                StudyComponentEnum.STUDY_POPULATION,
-            ],
+        usdm_mapper = USDMMapper(
+            get_osb_study_design_cells=_prefetched(osb_data["design_cells"]),
+            get_osb_study_arms=_prefetched(osb_data["arms"]),
+            get_osb_study_epochs=_prefetched(osb_data["epochs"]),
+            get_osb_study_elements=_prefetched(osb_data["elements"]),
+            get_osb_study_endpoints=_prefetched(osb_data["endpoints"]),
+            get_osb_study_visits=_prefetched(osb_data["visits"]),
+            get_osb_study_activities=_prefetched(osb_data["activities"]),
+            get_osb_activity_schedules=_prefetched(osb_data["activity_schedules"]),
         )
+        return usdm_mapper.map(osb_data["study"])
 
-        usdm_study = self._usdm_mapper.map(osb_study)
-        return usdm_study
+    @staticmethod
+    def _get_osb_study_visits(uid: str, study_value_version: str | None = None):
+        # the visit service reads the CT terms of the study standard version on initialization
+        return StudyVisitService(
+            study_uid=uid, study_value_version=study_value_version
+        ).get_all_visits(uid, study_value_version=study_value_version)
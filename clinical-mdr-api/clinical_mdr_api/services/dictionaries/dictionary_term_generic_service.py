@@ -5,6 +5,9 @@ from neomodel import db
 from pydantic import BaseModel
 
 from clinical_mdr_api import exceptions, models
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_lookup_index import (
+    DictionaryTermLookupIndex,
+)
 from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_repository import (
     DictionaryTermGenericRepository,
 )
@@ -16,7 +19,11 @@ from clinical_mdr_api.domains.versioned_object_aggregate import (
     LibraryVO,
     VersioningException,
 )
-from clinical_mdr_api.models import DictionaryTerm, DictionaryTermVersion
+from clinical_mdr_api.models import (
+    DictionaryTerm,
+    DictionaryTermLookupItem,
+    DictionaryTermVersion,
+)
 from clinical_mdr_api.models.utils import GenericFilteringReturn
 from clinical_mdr_api.oauth.user import user
 from clinical_mdr_api.repositories._utils import FilterOperator
@@ -154,6 +161,34 @@ class DictionaryTermGenericService(Generic[_AggregateRootType], ABC):
         )
         return header_values
 
+    def _get_lookup_index_or_raise_not_found(
+        self, codelist_uid: str
+    ) -> DictionaryTermLookupIndex:
+        index = self.repository.get_lookup_index(codelist_uid)
+        if index is None:
+            raise exceptions.NotFoundException(
+                f"There is no dictionary codelist identified by provided uid ({codelist_uid})"
+            )
+        return index
+
+    def lookup_dictionary_terms(
+        self, codelist_uid: str, search_string: str, result_count: int = 10
+    ) -> list[DictionaryTermLookupItem]:
+        index = self._get_lookup_index_or_raise_not_found(codelist_uid)
+        return [
+            DictionaryTermLookupItem(**entry._asdict())
+            for entry in index.search(search_string, result_count=result_count)
+        ]
+
+    def lookup_dictionary_terms_by_names(
+        self, codelist_uid: str, names: list[str]
+    ) -> dict[str, list[DictionaryTermLookupItem]]:
+        index = self._get_lookup_index_or_raise_not_found(codelist_uid)
+        return {
+            name: [DictionaryTermLookupItem(**entry._asdict()) for entry in entries]
+            for name, entries in index.find_by_names(names).items()
+        }
+
     @db.transaction
     def get_by_uid(self, term_uid: str) -> DictionaryTerm:
         item = self._find_by_uid_or_raise_not_found(term_uid=term_uid)
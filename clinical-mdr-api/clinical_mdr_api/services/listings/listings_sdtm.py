@@ -1,15 +1,117 @@
+import json
+import logging
+from typing import Callable, Sequence, TypeVar
+
 from neomodel import db
+from pydantic import BaseModel
 
 from clinical_mdr_api import models
 from clinical_mdr_api.listings.query_service import QueryService
 from clinical_mdr_api.models.utils import GenericFilteringReturn
 from clinical_mdr_api.repositories._utils import FilterOperator
 from clinical_mdr_api.services._utils import service_level_generic_filtering
+from clinical_mdr_api.services.studies.study_version_artefacts import (
+    schedule_sdtm_datasets,
+)
+
+log = logging.getLogger(__name__)
+
+_T = TypeVar("_T", bound=BaseModel)
 
 
 class SDTMListingsService:
+    """
+    Lists the SDTM trial design datasets of a study.
+
+    Datasets of released and locked study versions can never change, so they are stored
+    in the background once the version is committed and served from the stored copy.
+    Datasets of the draft study, and of versions whose datasets are not stored yet, are computed live.
+    """
+
     def __init__(self):
         self._query_service = QueryService()
+        # domain -> (query computing the dataset, model of a row)
+        self._datasets: dict[str, tuple[Callable[..., list], type[BaseModel]]] = {
+            "TV": (self._query_service.get_tv, models.StudyVisitListing),
+            "TA": (self._query_service.get_ta, models.StudyArmListing),
+            "TI": (self._query_service.get_ti, models.StudyCriterionListing),
+            "TS": (self._query_service.get_ts, models.StudySummaryListing),
+            "TE": (self._query_service.get_te, models.StudyElementListing),
+            "TDM": (self._query_service.get_tdm, models.StudyDiseaseMilestoneListing),
+        }
+
+    def _compute_dataset(
+        self, domain: str, study_uid: str, study_value_version: str | None
+    ) -> list[BaseModel]:
+        query, model = self._datasets[domain]
+        data = query(study_uid=study_uid, study_value_version=study_value_version)
+        return list(map(model.from_query, data))
+
+    def _materialize_dataset(
+        self, domain: str, study_uid: str, study_value_version: str
+    ) -> list[BaseModel]:
+        items = self._compute_dataset(domain, study_uid, study_value_version)
+        self._query_service.save_materialized_dataset(
+            study_uid=study_uid,
+            study_value_version=study_value_version,
+            domain=domain,
+            # only the fields set by the query are stored, to return the same response as for a live query
+            rows=[json.loads(item.json(exclude_unset=True)) for item in items],
+        )
+        return items
+
+    def _get_dataset(
+        self,
+        domain: str,
+        model: type[_T],
+        study_uid: str,
+        study_value_version: str | None,
+    ) -> list[_T]:
+        if not study_value_version:
+            return self._compute_dataset(domain, study_uid, study_value_version)
+
+        rows = self._query_service.get_materialized_dataset(
+            study_uid=study_uid, study_value_version=study_value_version, domain=domain
+        )
+        if rows is not None:
+            return [model.parse_obj(row) for row in rows]
+
+        # versions released before the datasets were materialized are stored in the background,
+        # so that listing them doesn't write to the database
+        log.info(
+            "Scheduling materialization of SDTM %s dataset of study %s version %s",
+            domain,
+            study_uid,
+            study_value_version,
+        )
+        schedule_sdtm_datasets([study_uid], study_value_version, domains=[domain])
+        return self._compute_dataset(domain, study_uid, study_value_version)
+
+    def materialize_datasets(
+        self,
+        study_uid: str,
+        study_value_version: str,
+        domains: Sequence[str] | None = None,
+    ) -> None:
+        """
+        Computes and stores the SDTM trial design datasets of a released or locked study version
+        that are not stored yet.
+
+        Args:
+            study_uid (str): The uid of the study.
+            study_value_version (str): The released or locked version of the study.
+            domains (Sequence[str] | None): The SDTM domains of the datasets, all of them if not given.
+        """
+        for domain in domains or self._datasets:
+            if (
+                self._query_service.get_materialized_dataset(
+                    study_uid=study_uid,
+                    study_value_version=study_value_version,
+                    domain=domain,
+                )
+                is None
+            ):
+                self._materialize_dataset(domain, study_uid, study_value_version)
 
     @db.transaction
     def list_tv(
@@ -23,10 +125,12 @@ class SDTMListingsService:
         total_count: bool = False,
         study_value_version: str | None = None,
     ) -> GenericFilteringReturn[models.StudyVisitListing]:
-        data = self._query_service.get_tv(
-            study_uid=study_uid, study_value_version=study_value_version
+        result = self._get_dataset(
+            domain="TV",
+            model=models.StudyVisitListing,
+            study_uid=study_uid,
+            study_value_version=study_value_version,
         )
-        result = list(map(models.StudyVisitListing.from_query, data))
 
         filtered_items = service_level_generic_filtering(
             items=result,
@@ -52,10 +156,12 @@ class SDTMListingsService:
         total_count: bool = False,
         study_value_version: str | None = None,
     ) -> GenericFilteringReturn[models.StudyArmListing]:
-        data = self._query_service.get_ta(
-            study_uid=study_uid, study_value_version=study_value_version
+        result = self._get_dataset(
+            domain="TA",
+            model=models.StudyArmListing,
+            study_uid=study_uid,
+            study_value_version=study_value_version,
         )
-        result = list(map(models.StudyArmListing.from_query, data))
 
         filtered_items = service_level_generic_filtering(
             items=result,
@@ -81,10 +187,12 @@ class SDTMListingsService:
         total_count: bool = False,
         study_value_version: str | None = None,
     ) -> GenericFilteringReturn[models.StudyCriterionListing]:
-        data = self._query_service.get_ti(
-            study_uid=study_uid, study_value_version=study_value_version
+        result = self._get_dataset(
+            domain="TI",
+            model=models.StudyCriterionListing,
+            study_uid=study_uid,
+            study_value_version=study_value_version,
         )
-        result = list(map(models.StudyCriterionListing.from_query, data))
 
         filtered_items = service_level_generic_filtering(
             items=result,
@@ -110,10 +218,12 @@ class SDTMListingsService:
         total_count: bool = False,
         study_value_version: str | None = None,
     ) -> GenericFilteringReturn[models.StudySummaryListing]:
-        data = self._query_service.get_ts(
-            study_uid=study_uid, study_value_version=study_value_version
+        result = self._get_dataset(
+            domain="TS",
+            model=models.StudySummaryListing,
+            study_uid=study_uid,
+            study_value_version=study_value_version,
         )
-        result = list(map(models.StudySummaryListing.from_query, data))
 
         filtered_items = service_level_generic_filtering(
             items=result,
@@ -139,10 +249,12 @@ class SDTMListingsService:
         total_count: bool = False,
         study_value_version: str | None = None,
     ) -> GenericFilteringReturn[models.StudyElementListing]:
-        data = self._query_service.get_te(
-            study_uid=study_uid, study_value_version=study_value_version
+        result = self._get_dataset(
+            domain="TE",
+            model=models.StudyElementListing,
+            study_uid=study_uid,
+            study_value_version=study_value_version,
         )
-        result = list(map(models.StudyElementListing.from_query, data))
 
         filtered_items = service_level_generic_filtering(
             items=result,
@@ -168,10 +280,12 @@ class SDTMListingsService:
         total_count: bool = False,
         study_value_version: str | None = None,
     ) -> GenericFilteringReturn[models.StudyDiseaseMilestoneListing]:
-        data = self._query_service.get_tdm(
-            study_uid=study_uid, study_value_version=study_value_version
+        result = self._get_dataset(
+            domain="TDM",
+            model=models.StudyDiseaseMilestoneListing,
+            study_uid=study_uid,
+            study_value_version=study_value_version,
         )
-        result = list(map(models.StudyDiseaseMilestoneListing.from_query, data))
 
         filtered_items = service_level_generic_filtering(
             items=result,
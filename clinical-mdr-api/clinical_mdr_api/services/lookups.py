@@ -0,0 +1,131 @@
+from clinical_mdr_api import exceptions
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_repository import (
+    DictionaryTermGenericRepository,
+)
+from clinical_mdr_api.domain_repositories.lookups.lookup_repository import (
+    LookupRepository,
+)
+from clinical_mdr_api.models.lookups import LookupItem, LookupResult, LookupType
+
+repository = LookupRepository()
+
+# Labels of the root and value nodes of each type of concept
+CONCEPT_LABELS = {
+    LookupType.ACTIVITY: ("ActivityRoot", "ActivityValue"),
+    LookupType.ACTIVITY_GROUP: ("ActivityGroupRoot", "ActivityGroupValue"),
+    LookupType.ACTIVITY_SUBGROUP: ("ActivitySubGroupRoot", "ActivitySubGroupValue"),
+    LookupType.ACTIVITY_INSTANCE: ("ActivityInstanceRoot", "ActivityInstanceValue"),
+    LookupType.COMPOUND: ("CompoundRoot", "CompoundValue"),
+    LookupType.COMPOUND_ALIAS: ("CompoundAliasRoot", "CompoundAliasValue"),
+    LookupType.UNIT_DEFINITION: ("UnitDefinitionRoot", "UnitDefinitionValue"),
+}
+
+
+def _find_ct_term_uids(items: list[LookupItem]) -> dict[tuple[str, str, str], str]:
+    codelist_uids = repository.find_ct_codelist_uids(
+        {item.codelist_name for item in items if not item.codelist_uid}
+    )
+    codelist_uids_by_key = {
+        (item.codelist_uid, item.codelist_name): item.codelist_uid
+        or codelist_uids.get(item.codelist_name)
+        for item in items
+    }
+    term_uids = repository.find_ct_term_uids(
+        {
+            (codelist_uids_by_key[item.codelist_uid, item.codelist_name], item.name)
+            for item in items
+            if codelist_uids_by_key[item.codelist_uid, item.codelist_name]
+        }
+    )
+    return {
+        (item.codelist_uid, item.codelist_name, item.name): term_uids.get(
+            (codelist_uids_by_key[item.codelist_uid, item.codelist_name], item.name)
+        )
+        for item in items
+    }
+
+
+def _find_dictionary_term_uids(
+    items: list[LookupItem],
+) -> dict[tuple[str, str, str], str]:
+    dictionary_term_repository = DictionaryTermGenericRepository()
+    uids = {}
+    for codelist_uid in {item.codelist_uid for item in items}:
+        index = dictionary_term_repository.get_lookup_index(codelist_uid)
+        if index is None:
+            continue
+        names = {item.name for item in items if item.codelist_uid == codelist_uid}
+        for name, entries in index.find_by_names(names).items():
+            if entries:
+                uids[codelist_uid, None, name] = entries[0].term_uid
+    return uids
+
+
+def resolve_uids(items: list[LookupItem]) -> list[LookupResult]:
+    """
+    Looks up the uids of many items by name, with one query per type of item rather than one request per item.
+
+    Args:
+        items (list[LookupItem]): The items to look up.
+
+    Returns:
+        list[LookupResult]: The items in the given order, with the uid of the item with this name,
+        or None if there is no such item. If several items have the same name, the lowest uid is returned.
+    """
+    for item in items:
+        if item.type == LookupType.CT_TERM and not (
+            item.codelist_uid or item.codelist_name
+        ):
+            raise exceptions.ValidationException(
+                f"Either codelist_uid or codelist_name must be given to look up CT term '{item.name}'."
+            )
+        if item.type == LookupType.DICTIONARY_TERM and not item.codelist_uid:
+            raise exceptions.ValidationException(
+                f"codelist_uid must be given to look up dictionary term '{item.name}'."
+            )
+
+    items_by_type: dict[LookupType, list[LookupItem]] = {}
+    for item in items:
+        items_by_type.setdefault(item.type, []).append(item)
+
+    uids: dict[tuple[LookupType, str | None, str | None, str], str] = {}
+    for lookup_type, typed_items in items_by_type.items():
+        if lookup_type == LookupType.CT_CODELIST:
+            found = {
+                (None, None, name): uid
+                for name, uid in repository.find_ct_codelist_uids(
+                    {item.name for item in typed_items}
+                ).items()
+            }
+        elif lookup_type == LookupType.CT_TERM:
+            found = _find_ct_term_uids(typed_items)
+        elif lookup_type == LookupType.DICTIONARY_TERM:
+            found = _find_dictionary_term_uids(typed_items)
+        else:
+            root_label, value_label = CONCEPT_LABELS[lookup_type]
+            found = {
+                (None, None, name): uid
+                for name, uid in repository.find_concept_uids(
+                    root_label, value_label, {item.name for item in typed_items}
+                ).items()
+            }
+        uids.update({(lookup_type, *key): uid for key, uid in found.items()})
+
+    return [
+        LookupResult(
+            type=item.type,
+            name=item.name,
+            codelist_uid=item.codelist_uid,
+            codelist_name=item.codelist_name,
+            uid=uids.get(_result_key(item)),
+        )
+        for item in items
+    ]
+
+
+def _result_key(item: LookupItem) -> tuple[LookupType, str | None, str | None, str]:
+    if item.type == LookupType.CT_TERM:
+        return item.type, item.codelist_uid, item.codelist_name, item.name
+    if item.type == LookupType.DICTIONARY_TERM:
+        return item.type, item.codelist_uid, None, item.name
+    return item.type, None, None, item.name
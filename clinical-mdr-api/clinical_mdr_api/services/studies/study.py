@@ -1,4 +1,6 @@
 import functools
+import logging
+import time
 from copy import copy
 from datetime import datetime
 from string import ascii_lowercase
@@ -14,6 +16,9 @@ from clinical_mdr_api.config import (
     WEEK_UNIT_NAME,
 )
 from clinical_mdr_api.domain_repositories.models._utils import CustomNodeSet
+from clinical_mdr_api.domain_repositories.study_definitions.study_clone_repository import (
+    StudyCloneRepository,
+)
 from clinical_mdr_api.domains.clinical_programmes.clinical_programme import (
     ClinicalProgrammeAR,
 )
@@ -76,6 +81,12 @@ from clinical_mdr_api.services._utils import (  # type: ignore
     service_level_generic_filtering,
     service_level_generic_header_filtering,
 )
+from clinical_mdr_api.services.studies.study_version_artefacts import (
+    schedule_sdtm_datasets,
+    schedule_study_version_artefacts,
+)
+
+log = logging.getLogger(__name__)
 
 
 def validate_if_study_is_not_locked(
@@ -298,45 +309,110 @@ class StudyService:
         finally:
             self._close_all_repos()
 
-    @db.transaction
-    def lock(self, uid: str, change_description: str) -> Study:
-        try:
-            study_definition = self._repos.study_definition_repository.find_by_uid(
-                uid, for_update=True
+    def _lock_or_release_with_subparts(
+        self,
+        uid: str,
+        action: str,
+        transition: Callable[[StudyDefinitionAR], None],
+    ) -> StudyDefinitionAR:
+        """
+        Locks or releases a study together with its subparts, in the calling transaction.
+
+        The study and all its subparts are loaded and transitioned before any of them is saved,
+        so that a subpart which can't be locked or released fails the operation before anything is written.
+        The time spent in each phase is logged.
+
+        Args:
+            uid (str): The unique identifier of the study parent part.
+            action (str): "locked" or "released", for the error messages.
+            transition (Callable[[StudyDefinitionAR], None]): Locks or releases one study.
+
+        Returns:
+            StudyDefinitionAR: The locked or released study parent part.
+        """
+        timings = {}
+        started = time.perf_counter()
+
+        study_definition = self._repos.study_definition_repository.find_by_uid(
+            uid, for_update=True
+        )
+        if study_definition is None:
+            raise exceptions.NotFoundException(f"StudyDefinition '{uid}' not found.")
+        if study_definition.study_parent_part_uid:
+            raise exceptions.BusinessLogicException(
+                f"Study Subparts cannot be {action} independently from its Study Parent Part with uid ({study_definition.study_parent_part_uid})."
             )
-            if study_definition is None:
-                raise exceptions.NotFoundException(
-                    f"StudyDefinition '{uid}' not found."
-                )
-            if study_definition.study_parent_part_uid:
-                raise exceptions.BusinessLogicException(
-                    f"Study Subparts cannot be locked independently from its Study Parent Part with uid ({study_definition.study_parent_part_uid})."
-                )
-            study_definition.lock(
-                version_description=change_description,
-                version_author=self.user,
+        study_definitions = [study_definition] + [
+            self._repos.study_definition_repository.find_by_uid(
+                study_subpart_uid, for_update=True
             )
-            self._repos.study_definition_repository.save(study_definition)
+            for study_subpart_uid in study_definition.study_subpart_uids or []
+        ]
+        for item in study_definitions:
+            transition(item)
+        timings["load"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for item in study_definitions:
+            self._repos.study_definition_repository.save(item)
+        timings["snapshot"] = time.perf_counter() - started
+
+        log.info(
+            "Study %s %s with %d subparts: %s",
+            uid,
+            action,
+            len(study_definitions) - 1,
+            ", ".join(f"{phase} {seconds:.3f} s" for phase, seconds in timings.items()),
+        )
+        return study_definition
 
-            if study_definition.study_subpart_uids:
-                for study_subpart_uid in study_definition.study_subpart_uids:
-                    study_subpart = self._repos.study_definition_repository.find_by_uid(
-                        study_subpart_uid, for_update=True
-                    )
-                    study_subpart.lock(
-                        version_description=change_description,
-                        version_author=self.user,
-                    )
-                    self._repos.study_definition_repository.save(study_subpart)
+    def _schedule_study_version_artefacts(
+        self, study_definition: StudyDefinitionAR
+    ) -> None:
+        study_uids = [study_definition.uid] + list(
+            study_definition.study_subpart_uids or []
+        )
+        study_value_version = str(
+            study_definition.released_metadata.ver_metadata.version_number
+        )
+        # the trial design datasets of the new version can never change anymore
+        schedule_sdtm_datasets(study_uids, study_value_version)
+        schedule_study_version_artefacts(study_uids, study_value_version)
 
-            return self._models_study_from_study_definition_ar(
-                study_definition_ar=study_definition,
-                find_project_by_project_number=self._repos.project_repository.find_by_project_number,
-                find_clinical_programme_by_uid=self._repos.clinical_programme_repository.find_by_uid,
-                find_all_study_time_units=self._repos.unit_definition_repository.find_all,
-                find_study_parent_part_by_uid=self._repos.study_definition_repository.find_by_uid,
-                find_term_by_uid=self._repos.ct_term_name_repository.find_by_uid,
-                find_dictionary_term_by_uid=self._repos.dictionary_term_generic_repository.find_by_uid,
+    def _get_locked_or_released_study(
+        self, study_definition: StudyDefinitionAR
+    ) -> Study:
+        return self._models_study_from_study_definition_ar(
+            study_definition_ar=study_definition,
+            find_project_by_project_number=self._repos.project_repository.find_by_project_number,
+            find_clinical_programme_by_uid=self._repos.clinical_programme_repository.find_by_uid,
+            find_all_study_time_units=self._repos.unit_definition_repository.find_all,
+            find_study_parent_part_by_uid=self._repos.study_definition_repository.find_by_uid,
+            find_term_by_uid=self._repos.ct_term_name_repository.find_by_uid,
+            find_dictionary_term_by_uid=self._repos.dictionary_term_generic_repository.find_by_uid,
+        )
+
+    def lock(self, uid: str, change_description: str) -> Study:
+        study_definition, study = self._lock(uid, change_description)
+        # the documents of the locked version are read once it is committed
+        self._schedule_study_version_artefacts(study_definition)
+        return study
+
+    @db.transaction
+    def _lock(
+        self, uid: str, change_description: str
+    ) -> tuple[StudyDefinitionAR, Study]:
+        try:
+            study_definition = self._lock_or_release_with_subparts(
+                uid,
+                "locked",
+                lambda item: item.lock(
+                    version_description=change_description,
+                    version_author=self.user,
+                ),
+            )
+            return study_definition, self._get_locked_or_released_study(
+                study_definition
             )
         finally:
             self._close_all_repos()
@@ -378,39 +454,23 @@ class StudyService:
         finally:
             self._close_all_repos()
 
-    @db.transaction
     def release(self, uid: str, change_description: str | None) -> Study:
+        study_definition, study = self._release(uid, change_description)
+        self._schedule_study_version_artefacts(study_definition)
+        return study
+
+    @db.transaction
+    def _release(
+        self, uid: str, change_description: str | None
+    ) -> tuple[StudyDefinitionAR, Study]:
         try:
-            study_definition = self._repos.study_definition_repository.find_by_uid(
-                uid, for_update=True
+            study_definition = self._lock_or_release_with_subparts(
+                uid,
+                "released",
+                lambda item: item.release(change_description=change_description),
             )
-            if study_definition is None:
-                raise exceptions.NotFoundException(
-                    f"StudyDefinition '{uid}' not found."
-                )
-            if study_definition.study_parent_part_uid:
-                raise exceptions.BusinessLogicException(
-                    f"Study Subparts cannot be released independently from its Study Parent Part with uid ({study_definition.study_parent_part_uid})."
-                )
-            study_definition.release(change_description=change_description)
-            self._repos.study_definition_repository.save(study_definition)
-
-            if study_definition.study_subpart_uids:
-                for study_subpart_uid in study_definition.study_subpart_uids:
-                    study_subpart = self._repos.study_definition_repository.find_by_uid(
-                        study_subpart_uid, for_update=True
-                    )
-                    study_subpart.release(change_description=change_description)
-                    self._repos.study_definition_repository.save(study_subpart)
-
-            return self._models_study_from_study_definition_ar(
-                study_definition_ar=study_definition,
-                find_project_by_project_number=self._repos.project_repository.find_by_project_number,
-                find_clinical_programme_by_uid=self._repos.clinical_programme_repository.find_by_uid,
-                find_all_study_time_units=self._repos.unit_definition_repository.find_all,
-                find_study_parent_part_by_uid=self._repos.study_definition_repository.find_by_uid,
-                find_term_by_uid=self._repos.ct_term_name_repository.find_by_uid,
-                find_dictionary_term_by_uid=self._repos.dictionary_term_generic_repository.find_by_uid,
+            return study_definition, self._get_locked_or_released_study(
+                study_definition
             )
         finally:
             self._close_all_repos()
@@ -1617,6 +1677,43 @@ class StudyService:
                     )
         return study
 
+    def clone(
+        self,
+        uid: str,
+        study_create_input: StudyCreateInput,
+        study_value_version: str | None = None,
+    ) -> Study:
+        """
+        Creates a new study holding a copy of the selections of an existing study version.
+
+        The new study is created first, then the selections (arms, epochs, visits, elements, design cells,
+        objectives, endpoints, criteria, compounds, activities, schedules, instructions, footnotes ...)
+        are copied into it server-side in bounded batches, see `StudyCloneRepository`.
+        The new study is deleted again if copying the selections fails.
+
+        Args:
+            uid (str): The uid of the study to clone.
+            study_create_input (StudyCreateInput): The identification of the new study.
+            study_value_version (str | None): The released version of the study to clone, if not the latest.
+
+        Returns:
+            Study: The new study.
+        """
+        self.check_if_study_uid_and_version_exists(
+            study_uid=uid, study_value_version=study_value_version
+        )
+        study = self.create(study_create_input)
+        try:
+            StudyCloneRepository(author=self.user).clone(
+                source_study_uid=uid,
+                target_study_uid=study.uid,
+                study_value_version=study_value_version,
+            )
+        except Exception:
+            self.soft_delete(study.uid)
+            raise
+        return study
+
     def check_if_study_is_locked(self, study_uid: str):
         return self._repos.study_definition_repository.check_if_study_is_locked(
             study_uid=study_uid
@@ -1,11 +1,14 @@
 import logging
 import os
 from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
 from typing import Mapping, MutableMapping
 
 import yattag
+from cachetools import LRUCache
+from cachetools.keys import hashkey
 from colour import Color
-from PIL import ImageFont
 
 from clinical_mdr_api import config, models
 from clinical_mdr_api.services.studies.study_arm_selection import (
@@ -19,6 +22,9 @@ from clinical_mdr_api.services.studies.study_epoch import StudyEpochService
 
 # Page and margin sizes (horizontal, vertical) in millimeters
 from clinical_mdr_api.services.studies.study_visit import StudyVisitService
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+ImageFont = deferred_import("PIL.ImageFont")
 
 # A4 page size (width, height) in millimeters
 A4_PORTRAIT_SIZE = (210, 297)  # https://en.wikipedia.org/wiki/ISO_216#A_series
@@ -56,6 +62,8 @@ FONT_NAME = "Times New Roman"
 FONT_FILE_NAME = "clinical_mdr_api/services/utils/LiberationSerif-Regular.ttf"
 FONT_SIZE = 12  # in points
 FONT_SIZE_POINT_TO_PIXELS_RATIO = PPI / DPI
+TEXT_SIZE_CACHE_MAX_SIZE = 10000
+SVG_CACHE_MAX_SIZE = 100
 LINE_SPACING = 3
 TEXT_BOTTOM_EXTRA_PADDING = int(FONT_SIZE / 3)
 TEXT_COLOR_LIGHT = Color("white")
@@ -119,6 +127,30 @@ STYLES = {
 log = logging.getLogger(__name__)
 
 
+# Process-wide registry of loaded fonts, keyed by (font file path, size in pixels)
+_fonts: dict[tuple[str, int], "ImageFont.FreeTypeFont"] = {}
+_fonts_lock = Lock()
+
+
+def get_font(font_path: str, size: int) -> "ImageFont.FreeTypeFont":
+    """Returns a TrueType font of given size, loading the font file only once per process"""
+    with _fonts_lock:
+        font = _fonts.get((font_path, size))
+        if font is None:
+            font = ImageFont.truetype(font_path, size)
+            _fonts[(font_path, size)] = font
+        return font
+
+
+@lru_cache(maxsize=TEXT_SIZE_CACHE_MAX_SIZE)
+def get_text_size_px(font_path: str, size: int, text: str) -> tuple[int, int]:
+    """Returns width and height (in pixels) of given text if rendered with font and size, results are memoized"""
+    font = get_font(font_path, size)
+    # FreeType faces are not safe to use from multiple threads at once
+    with _fonts_lock:
+        return tuple(font.getbbox(text)[2:4])
+
+
 class StudyDesignFigureService:
     """Draws an SVG image of Study Design Figure
 
@@ -128,21 +160,47 @@ class StudyDesignFigureService:
     First row and column are headers.
     """
 
+    # Drawings of locked and released study versions, which never change, keyed by (study_uid, study_value_version)
+    cache_store_svg_by_study_version = LRUCache(maxsize=SVG_CACHE_MAX_SIZE)
+    lock_store_svg_by_study_version = Lock()
+
     def __init__(self):
-        font_path = os.path.join(config.APP_ROOT_DIR, FONT_FILE_NAME)
+        self.font_path = os.path.join(config.APP_ROOT_DIR, FONT_FILE_NAME)
         # Although ImageFont.truetype() expects point size, it seems we need to scale it up for calculations in pixels
         self.font_size = int(round(FONT_SIZE * FONT_SIZE_POINT_TO_PIXELS_RATIO))
-        self.font = ImageFont.truetype(font_path, self.font_size)
+        self.font = get_font(self.font_path, self.font_size)
 
-    def get_svg_document(self, study_uid: str):
-        """Fetches necessary data and returns the SVG drawing as text"""
+    def get_svg_document(self, study_uid: str, study_value_version: str | None = None):
+        """Fetches necessary data and returns the SVG drawing as text
 
+        Drawings of a specific (locked or released) study version are cached, as these versions are immutable.
+        """
+
+        if not study_value_version:
+            return self._draw_svg_document(study_uid)
+
+        key = hashkey(study_uid, study_value_version)
+        with self.lock_store_svg_by_study_version:
+            svg = self.cache_store_svg_by_study_version.get(key)
+
+        if svg is None:
+            svg = self._draw_svg_document(study_uid, study_value_version)
+            with self.lock_store_svg_by_study_version:
+                self.cache_store_svg_by_study_version[key] = svg
+
+        return svg
+
+    def _draw_svg_document(
+        self, study_uid: str, study_value_version: str | None = None
+    ) -> str:
         # fetch data
-        study_arms = self._get_study_arms(study_uid)
-        study_epochs = self._get_study_epochs(study_uid)
-        study_elements = self._get_study_elements(study_uid)
-        study_design_cells = self._get_study_design_cells(study_uid)
-        study_visits = self._get_study_visits(study_uid)
+        study_arms = self._get_study_arms(study_uid, study_value_version)
+        study_epochs = self._get_study_epochs(study_uid, study_value_version)
+        study_elements = self._get_study_elements(study_uid, study_value_version)
+        study_design_cells = self._get_study_design_cells(
+            study_uid, study_value_version
+        )
+        study_visits = self._get_study_visits(study_uid, study_value_version)
 
         # organise the data
         table = self._mk_data_matrix(
@@ -169,21 +227,25 @@ class StudyDesignFigureService:
         return self.draw_svg(table, timeline, doc_width, doc_height)
 
     def _get_study_arms(
-        self, study_uid
+        self, study_uid, study_value_version: str | None = None
     ) -> Mapping[str, models.StudySelectionArmWithConnectedBranchArms]:
         """Returns Study Arms as an ordered dictionary of {uid: arm}"""
         study_arms = StudyArmSelectionService().get_all_selection(
-            study_uid=study_uid, sort_by={"order": True}
+            study_uid=study_uid,
+            sort_by={"order": True},
+            study_value_version=study_value_version,
         )
         study_arms = OrderedDict((arm.arm_uid, arm) for arm in study_arms.items)
         return study_arms
 
     def _get_study_epochs(
-        self, study_uid
+        self, study_uid, study_value_version: str | None = None
     ) -> Mapping[str, models.study_selections.study_epoch.StudyEpoch]:
         """Returns Study Epochs as an ordered dictionary of {uid: epoch}"""
         study_epochs = StudyEpochService().get_all_epochs(
-            study_uid=study_uid, sort_by={"order": True}
+            study_uid=study_uid,
+            sort_by={"order": True},
+            study_value_version=study_value_version,
         )
         study_epochs = OrderedDict(
             (epoch.uid, epoch)
@@ -193,27 +255,33 @@ class StudyDesignFigureService:
         return study_epochs
 
     def _get_study_elements(
-        self, study_uid
+        self, study_uid, study_value_version: str | None = None
     ) -> Mapping[str, models.StudySelectionElement]:
         """Returns Study Elements as an ordered dictionary of {uid: element}"""
         study_elements = StudyElementSelectionService().get_all_selection(
-            study_uid=study_uid
+            study_uid=study_uid, study_value_version=study_value_version
         )
         study_elements = OrderedDict(
             (element.element_uid, element) for element in study_elements.items
         )
         return study_elements
 
-    def _get_study_design_cells(self, study_uid) -> list[models.StudyDesignCell]:
+    def _get_study_design_cells(
+        self, study_uid, study_value_version: str | None = None
+    ) -> list[models.StudyDesignCell]:
         """Returns a list of Study Design Cells"""
-        study_design_cells = StudyDesignCellService().get_all_design_cells(study_uid)
+        study_design_cells = StudyDesignCellService().get_all_design_cells(
+            study_uid, study_value_version=study_value_version
+        )
         return study_design_cells
 
     def _get_study_visits(
-        self, study_uid: str
+        self, study_uid: str, study_value_version: str | None = None
     ) -> Mapping[str, models.study_selections.study_visit.StudyVisit]:
         """Returns Study Visits as an ordered dictionary of {uid: visit}"""
-        study_visits = StudyVisitService(study_uid=study_uid).get_all_visits(study_uid)
+        study_visits = StudyVisitService(
+            study_uid=study_uid, study_value_version=study_value_version
+        ).get_all_visits(study_uid, study_value_version=study_value_version)
         study_visits = OrderedDict((visit.uid, visit) for visit in study_visits.items)
         return study_visits
 
@@ -703,7 +771,7 @@ class StudyDesignFigureService:
 
     def _get_text_size_px(self, text: str) -> tuple[int, int]:
         """Returns width and height (in pixels) of given text if rendered with font and size"""
-        return self.font.getbbox(text)[2:4]
+        return get_text_size_px(self.font_path, self.font_size, text)
 
     def _get_words_size_px(self, text: str) -> tuple[tuple[str, int, int]]:
         """Returns a tuple of (word, width, height) in pixels of each word of a text if rendered with font and size"""
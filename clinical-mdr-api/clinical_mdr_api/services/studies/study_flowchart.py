@@ -1,6 +1,9 @@
 import logging
+from threading import Lock
 from typing import Iterable, Mapping, Sequence
 
+from cachetools import LRUCache
+from cachetools.keys import hashkey
 from docx.enum.style import WD_STYLE_TYPE
 from neomodel import db
 
@@ -33,9 +36,11 @@ from clinical_mdr_api.services.studies.study_activity_selection import (
 from clinical_mdr_api.services.studies.study_soa_footnote import StudySoAFootnoteService
 from clinical_mdr_api.services.studies.study_visit import StudyVisitService
 from clinical_mdr_api.services.utils.table_f import (
-    Ref,
+    FULL_TABLE_MODEL,
+    CompactTable,
     SimpleFootnote,
     TableCell,
+    TableModel,
     TableRow,
     TableWithFootnotes,
 )
@@ -82,6 +87,10 @@ DOCX_STYLES = {
 class StudyFlowchartService:
     """Assemble Study Protocol SoA Flowchart"""
 
+    # Tables of locked and released study versions, which never change
+    cache_store_table_by_version = LRUCache(maxsize=config.CACHE_MAX_SIZE)
+    lock_store_table_by_version = Lock()
+
     def __init__(self) -> None:
         self.user = user().id()
 
@@ -430,20 +439,68 @@ class StudyFlowchartService:
         study_value_version: str | None = None,
         operational: bool = False,
         hide_soa_groups: bool = False,
-    ) -> TableWithFootnotes:
+        table_model: TableModel = FULL_TABLE_MODEL,
+    ) -> TableWithFootnotes | CompactTable:
         """
         Builds protocol or operational SoA flowchart table
 
+        Tables of a specific (locked or released) study version are cached, as these versions are immutable.
+        A copy is returned, which the caller may modify.
+
         Args:
             study_uid (str): The unique identifier of the study.
             time_unit (str): The preferred time unit, either "day" or "week".
             study_value_version (str | None): The version of the study to check. Defaults to None.
             operational (bool): Defaults to False, gets protocol SoA, or operational SoA when True.
+            table_model (TableModel): The classes the table is built from. Defaults to the validated models,
+                `COMPACT_TABLE_MODEL` builds a table that is only rendered to a document.
 
         Returns:
-            TableWithFootnotes: Protocol SoA flowchart table with footnotes.
+            TableWithFootnotes | CompactTable: Protocol SoA flowchart table with footnotes.
         """
+        if not study_value_version:
+            return self._build_flowchart_table(
+                study_uid,
+                time_unit=time_unit,
+                operational=operational,
+                hide_soa_groups=hide_soa_groups,
+                table_model=table_model,
+            )
+
+        key = hashkey(
+            study_uid,
+            study_value_version,
+            time_unit,
+            operational,
+            hide_soa_groups,
+            table_model,
+        )
+        with self.lock_store_table_by_version:
+            table = self.cache_store_table_by_version.get(key)
+
+        if table is None:
+            table = self._build_flowchart_table(
+                study_uid,
+                time_unit=time_unit,
+                study_value_version=study_value_version,
+                operational=operational,
+                hide_soa_groups=hide_soa_groups,
+                table_model=table_model,
+            )
+            with self.lock_store_table_by_version:
+                self.cache_store_table_by_version[key] = table
+
+        return table.copy(deep=True)
 
+    def _build_flowchart_table(
+        self,
+        study_uid: str,
+        time_unit: str | None = None,
+        study_value_version: str | None = None,
+        operational: bool = False,
+        hide_soa_groups: bool = False,
+        table_model: TableModel = FULL_TABLE_MODEL,
+    ) -> TableWithFootnotes | CompactTable:
         soa_preferences = self._get_soa_preferences(
             study_uid, study_value_version=study_value_version
         )
@@ -495,7 +552,7 @@ class StudyFlowchartService:
 
         # first 4 rows of protocol SoA flowchart contains epochs & visits
         header_rows = self._get_header_rows(
-            grouped_visits, time_unit, soa_preferences, operational
+            grouped_visits, time_unit, soa_preferences, operational, table_model
         )
 
         # activity rows with grouping headers and check-marks
@@ -505,9 +562,10 @@ class StudyFlowchartService:
             grouped_visits,
             operational,
             hide_soa_groups=hide_soa_groups,
+            table_model=table_model,
         )
 
-        table = TableWithFootnotes(
+        table = table_model.table(
             rows=header_rows + activity_rows,
             num_header_rows=len(header_rows),
             num_header_cols=1,
@@ -530,6 +588,7 @@ class StudyFlowchartService:
         time_unit: str,
         soa_preferences: StudySoaPreferencesInput,
         operational: bool = False,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ) -> list[TableRow]:
         """Builds the 4 header rows of protocol SoA flowchart"""
 
@@ -543,31 +602,39 @@ class StudyFlowchartService:
         else:
             visit_timing_prop = "study_week_number"
 
-        rows = [TableRow() for _i in range(4)]
+        rows = [table_model.row() for _i in range(4)]
 
         # Header line-1: Epoch names
-        rows[0].cells.append(TableCell(text=_("study_epoch"), style="header1"))
+        rows[0].cells.append(table_model.cell(text=_("study_epoch"), style="header1"))
         rows[0].hide = not soa_preferences.show_epochs
 
         # Header line-2: Visit names
-        rows[1].cells.append(TableCell(text=_("visit_short_name"), style="header2"))
+        rows[1].cells.append(
+            table_model.cell(text=_("visit_short_name"), style="header2")
+        )
 
         # Header line-3: Visit timing day/week sequence
         if time_unit == "day":
-            rows[2].cells.append(TableCell(text=_("study_day"), style="header3"))
+            rows[2].cells.append(table_model.cell(text=_("study_day"), style="header3"))
         else:
-            rows[2].cells.append(TableCell(text=_("study_week"), style="header3"))
+            rows[2].cells.append(
+                table_model.cell(text=_("study_week"), style="header3")
+            )
 
         # Header line-4: Visit window
-        rows[3].cells.append(TableCell(text=_("visit_window"), style="header4"))
+        rows[3].cells.append(table_model.cell(text=_("visit_window"), style="header4"))
 
         # Add Operation SoA's extra columns
         if operational:
-            rows[0].cells.append(TableCell(text=_("topic_code"), style="header2"))
-            rows[0].cells.append(TableCell(text=_("adam_param_code"), style="header2"))
+            rows[0].cells.append(
+                table_model.cell(text=_("topic_code"), style="header2")
+            )
+            rows[0].cells.append(
+                table_model.cell(text=_("adam_param_code"), style="header2")
+            )
             for i in range(1, 4):
                 for _j in range(NUM_OPERATIONAL_CODE_ROWS):
-                    rows[i].cells.append(TableCell())
+                    rows[i].cells.append(table_model.cell())
 
         perv_study_epoch_uid = None
         for study_epoch_uid, visit_groups in grouped_visits.items():
@@ -579,12 +646,12 @@ class StudyFlowchartService:
                     perv_study_epoch_uid = study_epoch_uid
 
                     rows[0].cells.append(
-                        TableCell(
+                        table_model.cell(
                             text=visit.study_epoch_name,
                             span=len(visit_groups),
                             style="header1",
                             refs=[
-                                Ref(
+                                table_model.ref(
                                     type_=SoAItemType.STUDY_EPOCH.value,
                                     uid=visit.study_epoch_uid,
                                 )
@@ -594,7 +661,7 @@ class StudyFlowchartService:
 
                 else:
                     # Add empty cells after Epoch cell with span > 1
-                    rows[0].cells.append(TableCell(span=0))
+                    rows[0].cells.append(table_model.cell(span=0))
 
                 visit_timing = ""
 
@@ -617,18 +684,20 @@ class StudyFlowchartService:
 
                 # Visit name cell
                 rows[1].cells.append(
-                    TableCell(
+                    table_model.cell(
                         visit_name,
                         style="header2",
                         refs=[
-                            Ref(type_=SoAItemType.STUDY_VISIT.value, uid=vis.uid)
+                            table_model.ref(
+                                type_=SoAItemType.STUDY_VISIT.value, uid=vis.uid
+                            )
                             for vis in group
                         ],
                     )
                 )
 
                 # Visit timing cell
-                rows[2].cells.append(TableCell(visit_timing, style="header3"))
+                rows[2].cells.append(table_model.cell(visit_timing, style="header3"))
 
                 # Visit window
                 visit_window = ""
@@ -647,7 +716,7 @@ class StudyFlowchartService:
                         visit_window = f"{visit.min_visit_window_value:+d}/{visit.max_visit_window_value:+d}"
 
                 # Visit window cell
-                rows[3].cells.append(TableCell(visit_window, style="header4"))
+                rows[3].cells.append(table_model.cell(visit_window, style="header4"))
 
         return rows
 
@@ -661,6 +730,7 @@ class StudyFlowchartService:
         grouped_visits: dict[str, dict[str, list[StudyVisit]]],
         operational: bool = False,
         hide_soa_groups: bool = False,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ) -> list[TableRow]:
         """Builds activity rows also adding various group header rows when required"""
 
@@ -710,7 +780,7 @@ class StudyFlowchartService:
                     prev_study_selection_id = False
 
                     soa_group_row = cls._get_soa_group_row(
-                        study_selection_activity, num_cols
+                        study_selection_activity, num_cols, table_model
                     )
                     rows.append(soa_group_row)
 
@@ -718,7 +788,7 @@ class StudyFlowchartService:
                     # Reference uids of all StudySoAGroups
                     soa_group_row.cells[0].refs.insert(
                         1,
-                        Ref(
+                        table_model.ref(
                             type_=SoAItemType.STUDY_SOA_GROUP.value,
                             uid=study_selection_activity.study_soa_group.study_soa_group_uid,
                         ),
@@ -743,7 +813,7 @@ class StudyFlowchartService:
                 prev_study_selection_id = False
 
                 activity_group_row = cls._get_activity_group_row(
-                    study_selection_activity, num_cols
+                    study_selection_activity, num_cols, table_model
                 )
                 rows.append(activity_group_row)
 
@@ -755,7 +825,7 @@ class StudyFlowchartService:
                     # Reference uids of all StudyActivityGroups
                     activity_group_row.cells[0].refs.insert(
                         1,
-                        Ref(
+                        table_model.ref(
                             type_=SoAItemType.STUDY_ACTIVITY_GROUP.value,
                             uid=study_selection_activity.study_activity_group.study_activity_group_uid,
                         ),
@@ -779,7 +849,7 @@ class StudyFlowchartService:
                 prev_study_selection_id = False
 
                 activity_subgroup_row = cls._get_activity_subgroup_row(
-                    study_selection_activity, num_cols
+                    study_selection_activity, num_cols, table_model
                 )
                 rows.append(activity_subgroup_row)
 
@@ -791,7 +861,7 @@ class StudyFlowchartService:
                     # Reference uids of all StudyActivitySubGroups
                     activity_subgroup_row.cells[0].refs.insert(
                         1,
-                        Ref(
+                        table_model.ref(
                             type_=SoAItemType.STUDY_ACTIVITY_SUBGROUP.value,
                             uid=study_selection_activity.study_activity_subgroup.study_activity_subgroup_uid,
                         ),
@@ -811,7 +881,9 @@ class StudyFlowchartService:
             if prev_study_selection_id != study_selection_id:
                 prev_study_selection_id = study_selection_id
 
-                row = cls._get_activity_row(study_selection_activity, operational)
+                row = cls._get_activity_row(
+                    study_selection_activity, operational, table_model
+                )
 
                 rows.append(row)
 
@@ -820,11 +892,14 @@ class StudyFlowchartService:
                     visible_visit_uids_ordered,
                     study_activity_schedules_mapping,
                     study_selection_activity.study_activity_uid,
+                    table_model,
                 )
 
             # Add Activity Instance row
             if getattr(study_selection_activity, "activity_instance", None):
-                row = cls._get_activity_instance_row(study_selection_activity)
+                row = cls._get_activity_instance_row(
+                    study_selection_activity, table_model
+                )
 
                 rows.append(row)
 
@@ -833,15 +908,20 @@ class StudyFlowchartService:
                     visible_visit_uids_ordered,
                     study_activity_schedules_mapping,
                     study_selection_activity.study_activity_instance_uid,
+                    table_model,
                 )
 
         return rows
 
     @staticmethod
-    def _get_activity_row(study_selection_activity, operational):
+    def _get_activity_row(
+        study_selection_activity,
+        operational,
+        table_model: TableModel = FULL_TABLE_MODEL,
+    ):
         """returns TableRow for Activity"""
 
-        row = TableRow(
+        row = table_model.row(
             hide=not getattr(
                 study_selection_activity,
                 "show_activity_in_protocol_flowchart",
@@ -851,15 +931,15 @@ class StudyFlowchartService:
 
         # Activity name cell (Activity row first column)
         row.cells.append(
-            TableCell(
+            table_model.cell(
                 study_selection_activity.activity.name,
                 style="activity",
                 refs=[
-                    Ref(
+                    table_model.ref(
                         type_=SoAItemType.STUDY_ACTIVITY.value,
                         uid=study_selection_activity.study_activity_uid,
                     ),
-                    Ref(
+                    table_model.ref(
                         type_="Activity",
                         uid=study_selection_activity.activity.uid,
                     ),
@@ -869,7 +949,7 @@ class StudyFlowchartService:
 
         if operational:
             for _ in range(NUM_OPERATIONAL_CODE_ROWS):
-                row.cells.append(TableCell())
+                row.cells.append(table_model.cell())
 
         return row
 
@@ -879,6 +959,7 @@ class StudyFlowchartService:
         visible_visit_uids_ordered,
         study_activity_schedules_mapping,
         activity_id,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ):
         """appends TableCells to TableRow with crosses based on Activity Schedules to StudyVisit mapping"""
 
@@ -891,11 +972,11 @@ class StudyFlowchartService:
             # Append a cell with tick-mark if Activity was scheduled
             if study_activity_schedule:
                 row.cells.append(
-                    TableCell(
+                    table_model.cell(
                         SOA_CHECK_MARK,
                         style="activitySchedule",
                         refs=[
-                            Ref(
+                            table_model.ref(
                                 type_=SoAItemType.STUDY_ACTIVITY_SCHEDULE.value,
                                 uid=study_activity_schedule.study_activity_schedule_uid,
                             )
@@ -905,15 +986,16 @@ class StudyFlowchartService:
 
             # Append an empty cell if activity was not scheduled
             else:
-                row.cells.append(TableCell())
+                row.cells.append(table_model.cell())
 
     @staticmethod
     def _get_activity_instance_row(
         study_selection_activity: StudySelectionActivityInstance,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ):
         """returns TableRow for Activity Instance row"""
 
-        row = TableRow(
+        row = table_model.row(
             hide=not getattr(
                 study_selection_activity,
                 "show_activity_instance_in_protocol_flowchart",
@@ -923,11 +1005,11 @@ class StudyFlowchartService:
 
         # Activity name cell (Activity row first column)
         row.cells.append(
-            TableCell(
+            table_model.cell(
                 study_selection_activity.activity_instance.name,
                 style="activityInstance",
                 refs=[
-                    Ref(
+                    table_model.ref(
                         type_=SoAItemType.STUDY_ACTIVITY_INSTANCE.value,
                         uid=study_selection_activity.study_activity_instance_uid,
                     )
@@ -936,10 +1018,14 @@ class StudyFlowchartService:
         )
 
         row.cells.append(
-            TableCell(study_selection_activity.activity_instance.topic_code or "")
+            table_model.cell(
+                study_selection_activity.activity_instance.topic_code or ""
+            )
         )
         row.cells.append(
-            TableCell(study_selection_activity.activity_instance.adam_param_code or "")
+            table_model.cell(
+                study_selection_activity.activity_instance.adam_param_code or ""
+            )
         )
 
         return row
@@ -948,25 +1034,26 @@ class StudyFlowchartService:
     def _get_soa_group_row(
         study_selection_activity: StudySelectionActivity,
         num_cols: int,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ) -> TableRow:
         """returns TableRow for SoA Group row"""
 
-        row = TableRow(
+        row = table_model.row(
             hide=not getattr(
                 study_selection_activity, "show_soa_group_in_protocol_flowchart", True
             )
         )
 
         row.cells.append(
-            TableCell(
+            table_model.cell(
                 study_selection_activity.study_soa_group.soa_group_name,
                 style="soaGroup",
                 refs=[
-                    Ref(
+                    table_model.ref(
                         type_=SoAItemType.STUDY_SOA_GROUP.value,
                         uid=study_selection_activity.study_soa_group.study_soa_group_uid,
                     ),
-                    Ref(
+                    table_model.ref(
                         type_="CTTerm",
                         uid=study_selection_activity.study_soa_group.soa_group_term_uid,
                     ),
@@ -975,7 +1062,7 @@ class StudyFlowchartService:
         )
 
         # fill the row with empty cells for visits #
-        row.cells += [TableCell() for _ in range(num_cols - 1)]
+        row.cells += [table_model.cell() for _ in range(num_cols - 1)]
 
         return row
 
@@ -983,6 +1070,7 @@ class StudyFlowchartService:
     def _get_activity_group_row(
         study_selection_activity: StudySelectionActivity,
         num_cols: int,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ) -> TableRow:
         """returns TableRow for Activity Group row"""
 
@@ -1000,7 +1088,7 @@ class StudyFlowchartService:
                 group_name = a_g.activity_group_name
                 break
 
-        row = TableRow(
+        row = table_model.row(
             hide=not getattr(
                 study_selection_activity,
                 "show_activity_group_in_protocol_flowchart",
@@ -1009,16 +1097,16 @@ class StudyFlowchartService:
         )
 
         row.cells.append(
-            TableCell(
+            table_model.cell(
                 group_name,
                 style="group",
                 refs=(
                     [
-                        Ref(
+                        table_model.ref(
                             type_=SoAItemType.STUDY_ACTIVITY_GROUP.value,
                             uid=study_selection_activity.study_activity_group.study_activity_group_uid,
                         ),
-                        Ref(
+                        table_model.ref(
                             type_="ActivityGroup",
                             uid=study_selection_activity.study_activity_group.activity_group_uid,
                         ),
@@ -1030,7 +1118,7 @@ class StudyFlowchartService:
         )
 
         # fill the row with empty cells for visits #
-        row.cells += [TableCell() for _ in range(num_cols - 1)]
+        row.cells += [table_model.cell() for _ in range(num_cols - 1)]
 
         return row
 
@@ -1038,6 +1126,7 @@ class StudyFlowchartService:
     def _get_activity_subgroup_row(
         study_selection_activity: StudySelectionActivity,
         num_cols: int,
+        table_model: TableModel = FULL_TABLE_MODEL,
     ) -> TableRow:
         """returns TableRow for Activity SubGroup row"""
 
@@ -1055,7 +1144,7 @@ class StudyFlowchartService:
                 group_name = a_g.activity_subgroup_name
                 break
 
-        row = TableRow(
+        row = table_model.row(
             hide=not getattr(
                 study_selection_activity,
                 "show_activity_subgroup_in_protocol_flowchart",
@@ -1064,16 +1153,16 @@ class StudyFlowchartService:
         )
 
         row.cells.append(
-            TableCell(
+            table_model.cell(
                 group_name,
                 style="subGroup",
                 refs=(
                     [
-                        Ref(
+                        table_model.ref(
                             type_=SoAItemType.STUDY_ACTIVITY_SUBGROUP.value,
                             uid=study_selection_activity.study_activity_subgroup.study_activity_subgroup_uid,
                         ),
-                        Ref(
+                        table_model.ref(
                             type_="ActivitySubGroup",
                             uid=study_selection_activity.study_activity_subgroup.activity_subgroup_uid,
                         ),
@@ -1085,7 +1174,7 @@ class StudyFlowchartService:
         )
 
         # fill the row with empty cells for visits #
-        row.cells += [TableCell() for _ in range(num_cols - 1)]
+        row.cells += [table_model.cell() for _ in range(num_cols - 1)]
 
         return row
 
@@ -1182,17 +1271,20 @@ class StudyFlowchartService:
 
     @staticmethod
     @trace_calls
-    def add_protocol_section_column(table: TableWithFootnotes):
+    def add_protocol_section_column(
+        table: TableWithFootnotes | CompactTable,
+        table_model: TableModel = FULL_TABLE_MODEL,
+    ):
         """Add Protocol Section column to table, updates table in place"""
 
         table.rows[0].cells.insert(
             table.num_header_cols,
-            TableCell(text=_("protocol_section"), style="header1"),
+            table_model.cell(text=_("protocol_section"), style="header1"),
         )
 
         row: TableRow
         for row in table.rows[1:]:
-            row.cells.insert(table.num_header_cols, TableCell())
+            row.cells.insert(table.num_header_cols, table_model.cell())
 
     @staticmethod
     @trace_calls
@@ -0,0 +1,122 @@
+import logging
+from threading import Lock
+from typing import Iterable, Mapping, Sequence
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from neomodel import db
+
+from clinical_mdr_api import config
+from clinical_mdr_api.domains.study_selections.study_soa_footnote import (
+    StudySoAFootnoteVO,
+)
+
+log = logging.getLogger(__name__)
+
+# Every change of a study item (activity, visit, schedule, grouping, epoch ...) adds a StudyAction to the audit trail
+# of the study. Changes of SoA footnotes are left out, as footnotes have no position in the SoA table themselves,
+# so that numbering a batch of footnotes does not invalidate the coordinates it is numbered from.
+GENERATION_QUERY = """
+MATCH (:StudyRoot {uid: $study_uid})-[:AUDIT_TRAIL]->(action:StudyAction)
+WHERE NOT (action)-[:AFTER]->(:StudySoAFootnote)
+RETURN count(action)
+"""
+
+Coordinates = Mapping[str, tuple[int, int]]
+
+
+def get_footnote_number(
+    coordinates: Coordinates,
+    all_soa_footnotes: Sequence[StudySoAFootnoteVO],
+    referenced_item_uids: Iterable[str],
+) -> int:
+    """
+    Returns the number of a footnote referencing given items, among the footnotes of a study.
+
+    Footnotes are numbered in the order of the first position in the SoA table of the items they reference,
+    by row then by column. Footnotes referencing the same first position keep the order they are given in.
+    A footnote referencing no item shown in the SoA table is numbered after all other footnotes.
+
+    Args:
+        coordinates (Coordinates): Mapping of item uid to [row, column] position in the protocol SoA table.
+        all_soa_footnotes (Sequence[StudySoAFootnoteVO]): The other footnotes of the study, in their current order.
+        referenced_item_uids (Iterable[str]): The uids of the items referenced by the footnote.
+
+    Returns:
+        int: The number of the footnote, starting at 1.
+    """
+    own_position = min(
+        (coordinates[uid] for uid in referenced_item_uids if uid in coordinates),
+        default=None,
+    )
+    if own_position is None:
+        return len(all_soa_footnotes) + 1
+
+    number = 1
+    for footnote in all_soa_footnotes:
+        position = min(
+            (
+                coordinates[item.item_uid]
+                for item in footnote.referenced_items
+                if item.item_uid in coordinates
+            ),
+            default=None,
+        )
+        # the footnote is numbered after existing footnotes starting at the same position
+        if position is not None and position <= own_position:
+            number += 1
+    return number
+
+
+class StudySoACoordinateIndex:
+    """
+    Index of the [row, column] positions of study items in the protocol SoA table, kept per study.
+
+    Numbering SoA footnotes needs the position of the items they reference, which takes loading all activities,
+    visits and schedules of the study. The positions are kept per study and per generation of the study items,
+    so that changing activities, visits or schedules (in any worker) makes the next footnote operation rebuild
+    the positions, while any number of footnotes can be numbered from the same positions in between.
+    """
+
+    cache_store_coordinates = TTLCache(
+        maxsize=config.CACHE_MAX_SIZE, ttl=config.CACHE_TTL
+    )
+    lock_store_coordinates = Lock()
+
+    @classmethod
+    def get_generation(cls, study_uid: str) -> int:
+        result, _ = db.cypher_query(GENERATION_QUERY, {"study_uid": study_uid})
+        return result[0][0] if result else 0
+
+    @classmethod
+    def get_coordinates(cls, study_uid: str) -> Coordinates:
+        """
+        Returns the positions of the items of the latest draft of a study in the protocol SoA table.
+
+        Args:
+            study_uid (str): The unique identifier of the study.
+
+        Returns:
+            Coordinates: Mapping of item uid to [row, column] position in the protocol SoA table,
+            as returned by `StudyFlowchartService.get_flowchart_item_uid_coordinates`. Must not be altered.
+        """
+        key = hashkey(study_uid, cls.get_generation(study_uid))
+        with cls.lock_store_coordinates:
+            coordinates = cls.cache_store_coordinates.get(key)
+        if coordinates is not None:
+            return coordinates
+
+        # local import to avoid circular import
+        # pylint: disable=import-outside-toplevel
+        from clinical_mdr_api.services.studies.study_flowchart import (
+            StudyFlowchartService,
+        )
+
+        log.debug("Indexing SoA coordinates of study '%s'", study_uid)
+        coordinates = StudyFlowchartService().get_flowchart_item_uid_coordinates(
+            study_uid=study_uid
+        )
+
+        with cls.lock_store_coordinates:
+            cls.cache_store_coordinates[key] = coordinates
+        return coordinates
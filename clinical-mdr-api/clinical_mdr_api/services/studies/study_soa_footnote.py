@@ -39,6 +39,11 @@ from clinical_mdr_api.services._utils import (
     service_level_generic_filtering,
     service_level_generic_header_filtering,
 )
+from clinical_mdr_api.services.studies.study_soa_coordinate_index import (
+    Coordinates,
+    StudySoACoordinateIndex,
+    get_footnote_number,
+)
 from clinical_mdr_api.services.syntax_instances.footnotes import FootnoteService
 from clinical_mdr_api.telemetry import trace_calls
 
@@ -199,54 +204,23 @@ class StudySoAFootnoteService:
         study_uid: str,
         referenced_items: list[ReferencedItem],
         all_soa_footnotes: list[StudySoAFootnoteVO],
+        coordinates: Coordinates | None = None,
     ):
-        # local import to avoid circular import
-        from clinical_mdr_api.services.studies.study_flowchart import (
-            StudyFlowchartService,
-        )
-
-        # substitute for uid of current footnote
-        current_footnote_uid = "_CURRENT_FOOTNOTE_"
-
         # shortcuts
         if not all_soa_footnotes:
             return 1
         if not referenced_items:
             return len(all_soa_footnotes) + 1
 
-        # get coordinates mapping uid -> [row, column] position of items in protocol SoA flowchart table
-        uid_coordinates_in_flowchart = (
-            StudyFlowchartService().get_flowchart_item_uid_coordinates(
-                study_uid=study_uid
-            )
-        )
-
-        # collect coordinates of items referenced by existing footnotes
-        footnote_coordinates = []
-        for footnote in all_soa_footnotes:
-            for item in footnote.referenced_items:
-                if coordinates := uid_coordinates_in_flowchart.get(item.item_uid):
-                    footnote_coordinates.append((footnote.uid, coordinates))
-
-        # add coordinates of items referenced by the current footnote
-        for item in referenced_items:
-            if coordinates := uid_coordinates_in_flowchart.get(item.item_uid):
-                footnote_coordinates.append((current_footnote_uid, coordinates))
+        # mapping uid -> [row, column] position of items in protocol SoA flowchart table
+        if coordinates is None:
+            coordinates = StudySoACoordinateIndex.get_coordinates(study_uid)
 
-        # sort by coordinates
-        footnote_coordinates.sort(key=lambda uid_coordinates: uid_coordinates[1])
-
-        # find the current footnotes order
-        unique_footnote_uids = set()
-        for uid, _ in footnote_coordinates:
-            # add uid to a set, so practically the length of the set is the order of the current footnote of the loop
-            unique_footnote_uids.add(uid)
-
-            # If current edited footnote, length of set is the order
-            if uid == current_footnote_uid:
-                return len(unique_footnote_uids)
-
-        return len(all_soa_footnotes) + 1
+        return get_footnote_number(
+            coordinates=coordinates,
+            all_soa_footnotes=all_soa_footnotes,
+            referenced_item_uids=[item.item_uid for item in referenced_items],
+        )
 
     def instantiate_study_soa_vo(
         self,
@@ -293,6 +267,17 @@ class StudySoAFootnoteService:
     def create_with_underlying_footnote(
         self, study_uid: str, footnote_input: StudySoAFootnoteCreateFootnoteInput
     ) -> StudySoAFootnote:
+        return self.manage_create(
+            study_uid=study_uid,
+            footnote_input=self._create_underlying_footnote(
+                study_uid=study_uid, footnote_input=footnote_input
+            ),
+        )
+
+    def _create_underlying_footnote(
+        self, study_uid: str, footnote_input: StudySoAFootnoteCreateFootnoteInput
+    ) -> StudySoAFootnoteCreateInput:
+        """Creates the footnote instantiating the template if needed, returns the input of the SoA footnote"""
         footnote_template = self._repos.footnote_template_repository.find_by_uid(
             uid=footnote_input.footnote_data.footnote_template_uid
         )
@@ -309,62 +294,73 @@ class StudySoAFootnoteService:
                 or len(footnote_input.footnote_data.parameter_terms) == 0
             )
         ):
-            soa_footnote = self.manage_create(
-                study_uid=study_uid,
-                footnote_input=StudySoAFootnoteCreateInput(
-                    footnote_template_uid=footnote_template.uid,
-                    referenced_items=footnote_input.referenced_items,
-                ),
+            return StudySoAFootnoteCreateInput(
+                footnote_template_uid=footnote_template.uid,
+                referenced_items=footnote_input.referenced_items,
             )
+        parameter_terms = (
+            footnote_input.footnote_data.parameter_terms
+            if footnote_input.footnote_data.parameter_terms is not None
+            else []
+        )
+        footnote_create_input = FootnoteCreateInput(
+            footnote_template_uid=footnote_input.footnote_data.footnote_template_uid,
+            parameter_terms=parameter_terms,
+            library_name=footnote_input.footnote_data.library_name,
+        )
+        footnote_service = FootnoteService()
+        footnote_ar = footnote_service.create_ar_from_input_values(
+            footnote_create_input,
+            study_uid=study_uid,
+        )
+        footnote_uid = footnote_ar.uid
+        if not footnote_service.repository.check_exists_by_name(footnote_ar.name):
+            footnote_ar.approve(author=self.author)
+            footnote_service.repository.save(footnote_ar)
         else:
-            parameter_terms = (
-                footnote_input.footnote_data.parameter_terms
-                if footnote_input.footnote_data.parameter_terms is not None
-                else []
-            )
-            footnote_create_input = FootnoteCreateInput(
-                footnote_template_uid=footnote_input.footnote_data.footnote_template_uid,
-                parameter_terms=parameter_terms,
-                library_name=footnote_input.footnote_data.library_name,
+            footnote_uid = footnote_service.repository.find_uid_by_name(
+                name=footnote_ar.name
             )
-            footnote_service = FootnoteService()
-            footnote_ar = footnote_service.create_ar_from_input_values(
-                footnote_create_input,
-                study_uid=study_uid,
-            )
-            footnote_uid = footnote_ar.uid
-            if not footnote_service.repository.check_exists_by_name(footnote_ar.name):
-                footnote_ar.approve(author=self.author)
-                footnote_service.repository.save(footnote_ar)
-            else:
-                footnote_uid = footnote_service.repository.find_uid_by_name(
-                    name=footnote_ar.name
+            if footnote_uid is None:
+                raise NotFoundException(
+                    f"Could not find node with label FootnoteValue and name {footnote_ar.name}"
                 )
-                if footnote_uid is None:
-                    raise NotFoundException(
-                        f"Could not find node with label FootnoteValue and name {footnote_ar.name}"
-                    )
-            footnote_ar = footnote_service.repository.find_by_uid(
-                footnote_uid, for_update=True
-            )
-            soa_footnote = self.manage_create(
-                study_uid=study_uid,
-                footnote_input=StudySoAFootnoteCreateInput(
-                    footnote_uid=footnote_ar.uid,
-                    referenced_items=footnote_input.referenced_items,
-                ),
-            )
-        return soa_footnote
+        footnote_ar = footnote_service.repository.find_by_uid(
+            footnote_uid, for_update=True
+        )
+        return StudySoAFootnoteCreateInput(
+            footnote_uid=footnote_ar.uid,
+            referenced_items=footnote_input.referenced_items,
+        )
 
     def manage_create(
         self, study_uid: str, footnote_input: StudySoAFootnoteCreateInput
     ) -> StudySoAFootnote:
         all_soa_footnotes = self.repository.find_all_footnotes(study_uids=study_uid)
+        footnote_vo = self._insert_footnote(
+            study_uid=study_uid,
+            footnote_input=footnote_input,
+            all_soa_footnotes=all_soa_footnotes,
+        )
+        self.repository.save(footnote_vo)
+        self.synchronize_footnotes(
+            footnotes_to_fix=all_soa_footnotes,
+        )
+        return self._transform_vo_to_pydantic_model(footnote_vo)
 
+    def _insert_footnote(
+        self,
+        study_uid: str,
+        footnote_input: StudySoAFootnoteCreateInput,
+        all_soa_footnotes: list[StudySoAFootnoteVO],
+        coordinates: Coordinates | None = None,
+    ) -> StudySoAFootnoteVO:
+        """Instantiates and validates a new SoA footnote, inserting it at the position of its number"""
         footnote_number = self.derive_footnote_number(
             study_uid=study_uid,
             referenced_items=footnote_input.referenced_items,
             all_soa_footnotes=all_soa_footnotes,
+            coordinates=coordinates,
         )
         footnote_vo = self.instantiate_study_soa_vo(
             study_uid=study_uid,
@@ -379,12 +375,8 @@ class StudySoAFootnoteService:
             all_soa_footnotes=all_soa_footnotes,
             soa_footnote_uid=footnote_vo.uid,
         )
-        self.repository.save(footnote_vo)
         all_soa_footnotes.insert(footnote_vo.footnote_number - 1, footnote_vo)
-        self.synchronize_footnotes(
-            footnotes_to_fix=all_soa_footnotes,
-        )
-        return self._transform_vo_to_pydantic_model(footnote_vo)
+        return footnote_vo
 
     @db.transaction
     def create(
@@ -405,13 +397,33 @@ class StudySoAFootnoteService:
     def batch_create(
         self, study_uid: str, footnote_input: list[StudySoAFootnoteCreateFootnoteInput]
     ) -> list[StudySoAFootnote]:
-        soa_footnotes = []
-        for soa_footnote_input in footnote_input:
-            soa_footnote = self.create_with_underlying_footnote(
-                study_uid=study_uid, footnote_input=soa_footnote_input
+        # All footnotes of the batch are numbered from the same SoA positions, in memory,
+        # then each footnote is saved once with its final number.
+        all_soa_footnotes = self.repository.find_all_footnotes(study_uids=study_uid)
+        coordinates = StudySoACoordinateIndex.get_coordinates(study_uid)
+        new_footnote_vos = [
+            self._insert_footnote(
+                study_uid=study_uid,
+                footnote_input=self._create_underlying_footnote(
+                    study_uid=study_uid, footnote_input=soa_footnote_input
+                ),
+                all_soa_footnotes=all_soa_footnotes,
+                coordinates=coordinates,
             )
-            soa_footnotes.append(soa_footnote)
-        return soa_footnotes
+            for soa_footnote_input in footnote_input
+        ]
+        new_footnote_uids = {footnote_vo.uid for footnote_vo in new_footnote_vos}
+        for footnote_number, footnote_vo in enumerate(all_soa_footnotes, start=1):
+            if footnote_vo.uid in new_footnote_uids:
+                footnote_vo.footnote_number = footnote_number
+                self.repository.save(footnote_vo)
+            elif footnote_vo.footnote_number != footnote_number:
+                footnote_vo.footnote_number = footnote_number
+                self.repository.save(footnote_vo, create=False)
+        return [
+            self._transform_vo_to_pydantic_model(footnote_vo)
+            for footnote_vo in new_footnote_vos
+        ]
 
     @db.transaction
     def delete(self, study_uid: str, study_soa_footnote_uid: str):
@@ -0,0 +1,181 @@
+"""Precomputation of the documents of study versions that become immutable when a study is locked or released.
+
+The USDM and CTR ODM documents are not precomputed: they also show library items that can still change,
+so they are only cached for a limited time, in a few entries that are kept for the documents actually requested.
+
+The SDTM trial design datasets of the version are stored in the database, also when precomputing is disabled.
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Sequence
+
+from clinical_mdr_api import config
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+log = logging.getLogger(__name__)
+
+# These services import the study service, and the export stacks of some of them are only loaded when needed
+StudyFlowchartService = deferred_import(
+    "clinical_mdr_api.services.studies.study_flowchart", "StudyFlowchartService"
+)
+StudyDesignFigureService = deferred_import(
+    "clinical_mdr_api.services.studies.study_design_figure",
+    "StudyDesignFigureService",
+)
+SDTMListingsService = deferred_import(
+    "clinical_mdr_api.services.listings.listings_sdtm", "SDTMListingsService"
+)
+
+# A single worker, so that precomputing never takes more than one database session away from requests
+_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="study-version-artefacts"
+)
+
+
+def get_study_version_artefacts(
+    study_uid: str, study_value_version: str
+) -> dict[str, Callable[[], Any]]:
+    """
+    Returns the functions building each document of a study version that is cached once built.
+
+    Args:
+        study_uid (str): The unique identifier of the study.
+        study_value_version (str): The locked or released version of the study.
+
+    Returns:
+        dict[str, Callable[[], Any]]: Functions without arguments, by name of the document.
+    """
+    return {
+        "protocol flowchart": lambda: StudyFlowchartService().get_flowchart_table(
+            study_uid, study_value_version=study_value_version, hide_soa_groups=True
+        ),
+        "detailed flowchart": lambda: StudyFlowchartService().get_flowchart_table(
+            study_uid, study_value_version=study_value_version
+        ),
+        "operational flowchart": lambda: StudyFlowchartService().get_flowchart_table(
+            study_uid, study_value_version=study_value_version, operational=True
+        ),
+        "design figure": lambda: StudyDesignFigureService().get_svg_document(
+            study_uid, study_value_version=study_value_version
+        ),
+    }
+
+
+def precompute_study_version_artefacts(
+    study_uids: Sequence[str], study_value_version: str
+) -> dict[str, float]:
+    """
+    Builds the documents of a study version and of its subparts, so that they are served from the cache.
+
+    A document that can't be built is logged and skipped, it is then built by the first request for it.
+
+    Args:
+        study_uids (Sequence[str]): The unique identifiers of the study and of its subparts.
+        study_value_version (str): The version of the studies that was just locked or released.
+
+    Returns:
+        dict[str, float]: The seconds taken to build each document, by study uid and name of the document.
+    """
+    timings = {}
+    for study_uid in study_uids:
+        for name, build in get_study_version_artefacts(
+            study_uid, study_value_version
+        ).items():
+            started = time.perf_counter()
+            try:
+                build()
+            except Exception:  # pylint: disable=broad-exception-caught
+                log.exception(
+                    "Precomputing %s of study %s version %s failed",
+                    name,
+                    study_uid,
+                    study_value_version,
+                )
+                continue
+            timings[f"{study_uid} {name}"] = time.perf_counter() - started
+
+    log.info(
+        "Precomputed %d documents of version %s of studies %s in %.3f s: %s",
+        len(timings),
+        study_value_version,
+        ", ".join(study_uids),
+        sum(timings.values()),
+        ", ".join(f"{name} {seconds:.3f} s" for name, seconds in timings.items()),
+    )
+    return timings
+
+
+def schedule_study_version_artefacts(
+    study_uids: Sequence[str], study_value_version: str
+) -> None:
+    """
+    Precomputes the documents of a study version in the background, if enabled by `PRECOMPUTE_STUDY_VERSIONS`.
+
+    Must be called once the new version is committed, the documents are read in a separate database session.
+    The request context, e.g. the authenticated user, is passed on to the background thread.
+    """
+    if not config.PRECOMPUTE_STUDY_VERSIONS:
+        return
+    _executor.submit(
+        contextvars.copy_context().run,
+        precompute_study_version_artefacts,
+        list(study_uids),
+        study_value_version,
+    )
+
+
+def materialize_sdtm_datasets(
+    study_uids: Sequence[str],
+    study_value_version: str,
+    domains: Sequence[str] | None = None,
+) -> None:
+    """
+    Stores the SDTM trial design datasets of a study version and of its subparts that are not stored yet.
+
+    Datasets that can't be stored are logged and skipped, they are then computed live when requested.
+
+    Args:
+        study_uids (Sequence[str]): The unique identifiers of the study and of its subparts.
+        study_value_version (str): The locked or released version of the studies.
+        domains (Sequence[str] | None): The SDTM domains of the datasets, all of them if not given.
+    """
+    for study_uid in study_uids:
+        started = time.perf_counter()
+        try:
+            SDTMListingsService().materialize_datasets(
+                study_uid, study_value_version, domains=domains
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception(
+                "Materializing SDTM datasets of study %s version %s failed",
+                study_uid,
+                study_value_version,
+            )
+            continue
+        log.info(
+            "Materialized SDTM datasets of study %s version %s in %.3f s",
+            study_uid,
+            study_value_version,
+            time.perf_counter() - started,
+        )
+
+
+def schedule_sdtm_datasets(
+    study_uids: Sequence[str],
+    study_value_version: str,
+    domains: Sequence[str] | None = None,
+) -> None:
+    """
+    Stores the SDTM trial design datasets of a study version in the background.
+
+    Must be called once the version is committed, the datasets are computed and stored in a separate database session.
+    """
+    _executor.submit(
+        contextvars.copy_context().run,
+        materialize_sdtm_datasets,
+        list(study_uids),
+        study_value_version,
+        list(domains) if domains is not None else None,
+    )
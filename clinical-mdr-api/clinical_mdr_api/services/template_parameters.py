@@ -9,5 +9,12 @@ def get_all():
     return repository.find_all_with_samples()
 
 
-def get_template_parameter_terms(name: str):
-    return repository.find_values(name)
+def get_template_parameter_terms(
+    name: str,
+    search_string: str | None = None,
+    page_number: int = 1,
+    page_size: int = 0,
+):
+    return repository.find_values(
+        name, search_string=search_string, page_number=page_number, page_size=page_size
+    )
@@ -0,0 +1,42 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Mapping
+
+from clinical_mdr_api import config
+
+# Worker threads are kept alive between requests,
+# as Neomodel maintains a separate driver with its own connection pool for each thread
+_executor = ThreadPoolExecutor(
+    max_workers=config.CONCURRENT_READS_MAX_WORKERS,
+    thread_name_prefix="concurrent-reads",
+)
+
+
+def gather_concurrently(reads: Mapping[str, Callable[[], Any]]) -> dict[str, Any]:
+    """
+    Runs independent reads concurrently, each in a separate thread and thereby in a separate database session.
+
+    The reads run in a copy of the context of the caller, so request context such as the authenticated user
+    is available to them. A read must not depend on the result of another read of the same call, and should
+    read one consistent version of the data, e.g. by passing the same `study_value_version` to all reads.
+
+    Args:
+        reads (Mapping[str, Callable[[], Any]]): Functions without arguments, by name.
+
+    Returns:
+        dict[str, Any]: The results of the reads, by the same names.
+
+    Raises:
+        Exception: An exception raised by any of the reads is re-raised in the calling thread.
+    """
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, read)
+        for name, read in reads.items()
+    }
+
+    try:
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        # don't start the pending reads after a failure
+        for future in futures.values():
+            future.cancel()
@@ -0,0 +1,243 @@
+import io
+import logging
+import zipfile
+from threading import Lock
+from typing import Iterable, Mapping
+from xml.sax.saxutils import escape
+
+from docx.shared import Emu, Length
+
+from clinical_mdr_api.services.utils.docx_builder import DocxBuilder
+from clinical_mdr_api.telemetry import trace_calls
+
+log = logging.getLogger(__name__)
+
+DOCUMENT_XML_FILENAME = "word/document.xml"
+
+TABLE_LOOK = (
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+    'w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+)
+REPEAT_HEADER_ROW = '<w:trPr><w:tblHeader w:val="true"/></w:trPr>'
+SUPERSCRIPT_RUN_PROPERTIES = '<w:rPr><w:vertAlign w:val="superscript"/></w:rPr>'
+
+
+class DocxTemplate:
+    """An empty DOCX document with styles and page layout applied, split around the body contents"""
+
+    def __init__(self, builder: DocxBuilder):
+        document = builder.document
+        section = document.sections[-1]
+
+        # width available for a table between the page margins, as python-docx calculates it
+        self.block_width = Emu(
+            section.page_width - section.left_margin - section.right_margin
+        )
+
+        # paragraphs and tables refer to styles by their id, not by their name
+        self.style_ids = {
+            key: document.styles[name].style_id
+            for key, (name, _typ) in builder.styles.items()
+        }
+
+        self.package = builder.get_document_stream().getvalue()
+
+        with zipfile.ZipFile(io.BytesIO(self.package)) as package:
+            document_xml = package.read(DOCUMENT_XML_FILENAME).decode("utf-8")
+
+        # the document is cleared, so the body contains nothing but the final section properties
+        split_at = document_xml.index("<w:sectPr", document_xml.index("<w:body"))
+        self.head = document_xml[:split_at]
+        self.tail = document_xml[split_at:]
+
+
+class DocxTableWriter:
+    """
+    Writes a table with footnotes into a DOCX document, without building the document with python-docx.
+
+    The table is rendered as WordprocessingML directly into the `word/document.xml` entry of the zip package,
+    row by row, while styles, page layout and all other parts of the package are copied over from
+    a template prepared once per process with `DocxBuilder`.
+    """
+
+    # Prepared templates are shared by all requests of the process, keyed by styles, orientation and margins
+    templates: dict[tuple, DocxTemplate] = {}
+    lock_templates = Lock()
+
+    def __init__(
+        self,
+        styles: Mapping[str, tuple] | None = None,
+        landscape: bool | None = False,
+        margins: list[float] | None = None,
+        first_column_width: Length | None = None,
+    ):
+        self.styles = styles or {}
+        self.first_column_width = first_column_width
+        self.template = self.get_template(self.styles, landscape, margins)
+
+    @classmethod
+    def get_template(
+        cls,
+        styles: Mapping[str, tuple],
+        landscape: bool | None,
+        margins: list[float] | None,
+    ) -> DocxTemplate:
+        key = (
+            tuple(sorted((key, name) for key, (name, _typ) in styles.items())),
+            bool(landscape),
+            tuple(margins or ()),
+        )
+
+        with cls.lock_templates:
+            template = cls.templates.get(key)
+            if template is None:
+                log.debug("Preparing DOCX template for styles: %s", key[0])
+                template = DocxTemplate(
+                    DocxBuilder(styles=styles, landscape=landscape, margins=margins)
+                )
+                cls.templates[key] = template
+
+        return template
+
+    @trace_calls
+    def write(self, table) -> io.BytesIO:
+        """
+        Writes a `CompactTable` into a new DOCX document.
+
+        Args:
+            table (CompactTable): The table with footnotes to write.
+
+        Returns:
+            io.BytesIO: The DOCX document, positioned at the start.
+        """
+        stream = io.BytesIO()
+
+        with zipfile.ZipFile(io.BytesIO(self.template.package)) as template_package:
+            with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as package:
+                for item in template_package.infolist():
+                    if item.filename != DOCUMENT_XML_FILENAME:
+                        package.writestr(item, template_package.read(item))
+                        continue
+
+                    document_xml_info = zipfile.ZipInfo(
+                        item.filename, date_time=item.date_time
+                    )
+                    document_xml_info.compress_type = zipfile.ZIP_DEFLATED
+
+                    with package.open(document_xml_info, "w") as document_xml:
+                        document_xml.write(self.template.head.encode("utf-8"))
+                        for chunk in self._iter_body(table):
+                            document_xml.write(chunk.encode("utf-8"))
+                        document_xml.write(self.template.tail.encode("utf-8"))
+
+        stream.seek(0)
+        return stream
+
+    def _iter_body(self, table) -> Iterable[str]:
+        rows = [row for row in table.rows if not row.hide]
+
+        if rows:
+            # assume horizontal table dimension from number of cells in first row
+            num_cols = sum(cell.span for cell in rows[0].cells)
+            col_width = Emu(self.template.block_width // num_cols).twips
+
+            yield self._table_start(num_cols, col_width)
+
+            for r, row in enumerate(rows):
+                yield self._row(row, num_cols, col_width, r < table.num_header_rows)
+
+            yield "</w:tbl>"
+
+        footnote_style = self.template.style_ids.get("footnote")
+        for symbol, footnote in (table.footnotes or {}).items():
+            # each footnote is a new paragraph after the table, with the symbol in superscript
+            yield (
+                f"<w:p>{self._paragraph_properties(footnote_style)}"
+                f"{self._run(symbol, superscript=True)}{self._run(f': {footnote.text_plain}')}</w:p>"
+            )
+
+    def _table_start(self, num_cols: int, col_width: int) -> str:
+        table_style = self.template.style_ids.get("table")
+        table_style = f'<w:tblStyle w:val="{table_style}"/>' if table_style else ""
+
+        grid = [col_width] * num_cols
+        if self.first_column_width is not None:
+            grid[0] = Emu(self.first_column_width).twips
+        grid = "".join(f'<w:gridCol w:w="{width:d}"/>' for width in grid)
+
+        return (
+            f'<w:tbl><w:tblPr>{table_style}<w:tblW w:type="auto" w:w="0"/>'
+            f'<w:tblLayout w:type="autofit"/>{TABLE_LOOK}</w:tblPr>'
+            f"<w:tblGrid>{grid}</w:tblGrid>"
+        )
+
+    def _row(self, row, num_cols: int, col_width: int, is_header: bool) -> str:
+        xml = ["<w:tr>"]
+
+        if is_header:
+            # set header row to repeat on each page
+            xml.append(REPEAT_HEADER_ROW)
+
+        num_grid_cols = 0
+        for cell in row.cells:
+            # skip cells merged into a preceding spanning cell
+            if cell.span < 1:
+                continue
+
+            num_grid_cols += cell.span
+            xml.append(self._cell(cell, col_width))
+
+        # fill up the row with empty cells if it has fewer columns than the table
+        for _ in range(num_cols - num_grid_cols):
+            xml.append(
+                f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width:d}"/></w:tcPr><w:p/></w:tc>'
+            )
+
+        xml.append("</w:tr>")
+        return "".join(xml)
+
+    def _cell(self, cell, col_width: int) -> str:
+        xml = [f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width * cell.span:d}"/>']
+
+        if cell.span > 1:
+            xml.append(f'<w:gridSpan w:val="{cell.span:d}"/>')
+
+        if cell.vertical:
+            xml.append('<w:textDirection w:val="btLr"/>')
+
+        xml.append("</w:tcPr><w:p>")
+        xml.append(self._paragraph_properties(self.template.style_ids.get(cell.style)))
+
+        if cell.text:
+            xml.append(self._run(cell.text))
+
+        # a new superscript run for each footnote symbol, with spacing in the run
+        for symbol in cell.footnotes or []:
+            xml.append(self._run(f" {symbol}", superscript=True))
+
+        xml.append("</w:p></w:tc>")
+        return "".join(xml)
+
+    @staticmethod
+    def _paragraph_properties(style_id: str | None) -> str:
+        return f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ""
+
+    @staticmethod
+    def _run(text: str, superscript: bool = False) -> str:
+        xml = ["<w:r>"]
+
+        if superscript:
+            xml.append(SUPERSCRIPT_RUN_PROPERTIES)
+
+        # line-feeds and tabs become breaks and tabs, like python-docx does when setting text
+        for i, line in enumerate(text.split("\n")):
+            if i:
+                xml.append("<w:br/>")
+            for j, part in enumerate(line.split("\t")):
+                if j:
+                    xml.append("<w:tab/>")
+                if part:
+                    xml.append(f'<w:t xml:space="preserve">{escape(part)}</w:t>')
+
+        xml.append("</w:r>")
+        return "".join(xml)
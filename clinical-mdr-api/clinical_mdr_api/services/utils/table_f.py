@@ -1,10 +1,13 @@
-from typing import Any, Mapping
+import io
+from copy import deepcopy
+from typing import Any, Mapping, NamedTuple
 
 import yattag
 from docx.shared import Inches
 from pydantic import BaseModel, Field
 
 from clinical_mdr_api.services.utils.docx_builder import DocxBuilder
+from clinical_mdr_api.services.utils.docx_table_writer import DocxTableWriter
 from clinical_mdr_api.telemetry import trace_calls
 
 
@@ -61,6 +64,153 @@ class TableWithFootnotes(BaseModel):
     id: str | None = Field(None, title="Table id (when rendered to HTML)")
 
 
+class CompactRef:
+    """Lightweight reference to an item, see `Ref`"""
+
+    __slots__ = ("type", "uid")
+
+    def __init__(self, type_: str | None = None, uid: str | None = None):
+        self.type = type_
+        self.uid = uid
+
+
+class CompactTableCell:
+    """Lightweight table cell for rendering: no validation, no per-instance __dict__"""
+
+    __slots__ = ("text", "span", "style", "refs", "footnotes", "vertical")
+
+    def __init__(
+        self,
+        text: str | None = None,
+        span: int = 1,
+        style: str | None = None,
+        refs: list[CompactRef] | None = None,
+        footnotes: list[str] | None = None,
+        vertical: bool | None = None,
+    ):
+        self.text = text if text is not None else ""
+        self.span = span
+        self.style = style
+        self.refs = refs
+        self.footnotes = footnotes
+        self.vertical = vertical
+
+
+class CompactTableRow:
+    __slots__ = ("cells", "hide")
+
+    def __init__(self, cells: list[CompactTableCell] | None = None, hide: bool = False):
+        self.cells = cells if cells is not None else []
+        self.hide = hide
+
+
+class CompactTable:
+    """Lightweight representation of a TableWithFootnotes, holding only what is needed for rendering"""
+
+    __slots__ = ("rows", "footnotes", "num_header_rows", "num_header_cols", "title")
+
+    def __init__(
+        self,
+        rows: list[CompactTableRow] | None = None,
+        footnotes: dict[str, SimpleFootnote] | None = None,
+        num_header_rows: int = 0,
+        num_header_cols: int = 0,
+        title: str | None = None,
+    ):
+        self.rows = rows if rows is not None else []
+        self.footnotes = footnotes
+        self.num_header_rows = num_header_rows
+        self.num_header_cols = num_header_cols
+        self.title = title
+
+    def copy(self, deep: bool = False) -> "CompactTable":
+        """Returns a copy of the table, like `BaseModel.copy` does for a `TableWithFootnotes`"""
+        if deep:
+            return deepcopy(self)
+        return CompactTable(
+            self.rows,
+            self.footnotes,
+            self.num_header_rows,
+            self.num_header_cols,
+            self.title,
+        )
+
+    @classmethod
+    def from_table(cls, table: TableWithFootnotes) -> "CompactTable":
+        """
+        Adapts an already built `TableWithFootnotes` for rendering.
+
+        Tables that are only built to be rendered should rather be built with `COMPACT_TABLE_MODEL` directly.
+        """
+        return cls(
+            rows=[
+                CompactTableRow(
+                    cells=[
+                        CompactTableCell(
+                            cell.text,
+                            cell.span,
+                            cell.style,
+                            footnotes=cell.footnotes,
+                            vertical=cell.vertical,
+                        )
+                        for cell in row.cells
+                    ],
+                    hide=row.hide,
+                )
+                for row in table.rows
+            ],
+            footnotes=table.footnotes,
+            num_header_rows=table.num_header_rows,
+            num_header_cols=table.num_header_cols,
+            title=table.title,
+        )
+
+
+class TableModel(NamedTuple):
+    """The classes a table is built from"""
+
+    table: type
+    row: type
+    cell: type
+    ref: type
+
+
+# Validated models, for tables returned by the API
+FULL_TABLE_MODEL = TableModel(TableWithFootnotes, TableRow, TableCell, Ref)
+
+# Lightweight classes, for tables that are only rendered to a document
+COMPACT_TABLE_MODEL = TableModel(
+    CompactTable, CompactTableRow, CompactTableCell, CompactRef
+)
+
+
+@trace_calls
+def table_to_docx_stream(
+    table: TableWithFootnotes | CompactTable,
+    styles: Mapping[str, tuple[str, Any]] = None,
+) -> io.BytesIO:
+    """
+    Renders a table with footnotes into a DOCX document in landscape orientation.
+
+    Same layout as `table_to_docx` but the table is written as OOXML directly into the document package,
+    which is much faster and uses far less memory for large tables than building it cell by cell with python-docx.
+
+    Returns:
+        io.BytesIO: The DOCX document, positioned at the start.
+    """
+    if isinstance(table, TableWithFootnotes):
+        table = CompactTable.from_table(table)
+
+    writer = DocxTableWriter(
+        styles=styles,
+        landscape=True,
+        margins=[0.5, 0.5, 0.5, 0.5],
+        first_column_width=Inches(4),
+    )
+
+    return writer.write(table)
+
+
 @trace_calls()
 def table_to_docx(
     table: TableWithFootnotes, styles: Mapping[str, tuple[str, Any]] = None
@@ -0,0 +1,257 @@
+"""Canonicalization of Cypher queries, moving their literal values into parameters, with an audit of the query plans."""
+import hashlib
+import logging
+import re
+import time
+from functools import wraps
+from threading import Lock
+from typing import Any, Mapping
+
+import neomodel
+from cachetools import LRUCache, cached
+
+from clinical_mdr_api import config
+from clinical_mdr_api.telemetry.query_profiler import fingerprint_query, normalize_query
+
+log = logging.getLogger(__name__)
+
+PARAMETER_PREFIX = "__literal_"
+
+_TOKEN = re.compile(
+    r"""
+    (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    |(?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<identifier>`[^`]*`|\$?[A-Za-z_]\w*)
+    |(?P<number>\d+(?:\.\d+)?)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+# Schema and administration commands don't accept parameters everywhere
+_COMMAND = re.compile(
+    r"""
+    ^\s*(?:
+        (?:CREATE|DROP)\s+(?:OR\s+REPLACE\s+)?(?:\w+\s+)?(?:INDEX|CONSTRAINT|DATABASE|ALIAS|USER|ROLE)\b
+        |SHOW|ALTER|START|STOP|GRANT|DENY|REVOKE|USE|TERMINATE
+    )\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+# The batch size of CALL { ... } IN TRANSACTIONS must be a literal
+_ROWS = re.compile(r"\s*ROWS\b", re.IGNORECASE)
+
+
+def _is_parameterizable_number(query: str, start: int, end: int) -> bool:
+    # bounds of variable length relationships (e.g. [*1..3]) and list ranges can't be parameters,
+    # nor can the digits of a numbered parameter (e.g. $0)
+    index = start - 1
+    while index >= 0 and query[index].isspace():
+        index -= 1
+    if index >= 0 and query[index] in "*.$":
+        return False
+    after = query[end:]
+    if after.startswith("..") or after[:1].isalpha() or after[:1] == "_":
+        return False
+    return not _ROWS.match(after)
+
+
+@cached(cache=LRUCache(maxsize=config.CACHE_MAX_SIZE), lock=Lock())
+def _canonicalize(query: str) -> tuple[str, tuple[Any, ...]]:
+    if _COMMAND.match(query):
+        return query, ()
+
+    parts = []
+    values = []
+    position = 0
+    for match in _TOKEN.finditer(query):
+        token = match.group()
+        if match.lastgroup == "string":
+            # keep strings with escape sequences as they are, rather than unescaping them
+            if "\\" in token:
+                continue
+            value = token[1:-1]
+        elif match.lastgroup == "number":
+            if not _is_parameterizable_number(query, match.start(), match.end()):
+                continue
+            value = float(token) if "." in token else int(token)
+        else:
+            continue
+        parts.append(query[position : match.start()])
+        parts.append(f"${PARAMETER_PREFIX}{len(values)}")
+        values.append(value)
+        position = match.end()
+    parts.append(query[position:])
+
+    return "".join(parts), tuple(values)
+
+
+def canonicalize_query(
+    query: str, params: Mapping[str, Any] | None = None
+) -> tuple[str, dict[str, Any] | None]:
+    """
+    Moves the string and number literals of a Cypher query into parameters.
+
+    Queries generated with different literal values then have the same text, and the database plans them once
+    and reuses the cached plan, instead of planning every variation.
+
+    Args:
+        query (str): The Cypher query.
+        params (Mapping[str, Any] | None): The parameters of the query.
+
+    Returns:
+        tuple[str, dict[str, Any] | None]: The query with a `$__literal_<n>` parameter in place of each literal,
+        and its parameters, including the literal values. The query and parameters are returned unchanged
+        if the query has no literals or already uses such parameter names.
+    """
+    canonical_query, values = _canonicalize(query)
+    if not values or any(name.startswith(PARAMETER_PREFIX) for name in params or {}):
+        return query, params
+    return canonical_query, dict(params or {}) | {
+        f"{PARAMETER_PREFIX}{index}": value for index, value in enumerate(values)
+    }
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+class _AuditedFingerprint:
+    def __init__(self):
+        self.count = 0
+        # hashes of the distinct texts as generated, and as sent to the database
+        self.texts: set[str] = set()
+        self.plans: set[str] = set()
+
+    def add(self, text_hash: str, plan_hash: str) -> None:
+        self.count += 1
+        if len(self.texts) < config.QUERY_PLAN_AUDIT_MAX_TEXTS:
+            self.texts.add(text_hash)
+        if len(self.plans) < config.QUERY_PLAN_AUDIT_MAX_TEXTS:
+            self.plans.add(plan_hash)
+
+
+class QueryPlanAudit:
+    """
+    Counts, per fingerprint of the queries run by this worker, the distinct query texts generated by the code
+    and the distinct texts sent to the database once canonicalized.
+
+    The database caches one plan per distinct query text, so a fingerprint with many distinct texts sent
+    (e.g. because a value is formatted into the query in a way canonicalization can't handle)
+    is planned again and again, and is a candidate for using parameters.
+    """
+
+    lock = Lock()
+    fingerprints: dict[str, _AuditedFingerprint] = {}
+    queries: dict[str, str] = {}
+    started = time.time()
+
+    @classmethod
+    def record(cls, query: str, canonical_query: str) -> None:
+        """
+        Records a query run.
+
+        Args:
+            query (str): The query as generated.
+            canonical_query (str): The query as sent to the database.
+        """
+        fingerprint = fingerprint_query(query)
+        text_hash = _hash(query)
+        plan_hash = text_hash if canonical_query is query else _hash(canonical_query)
+
+        with cls.lock:
+            audited = cls.fingerprints.get(fingerprint)
+            if audited is None:
+                if len(cls.fingerprints) >= config.CACHE_MAX_SIZE:
+                    # make room by dropping the least frequent query
+                    least_frequent = min(
+                        cls.fingerprints, key=lambda key: cls.fingerprints[key].count
+                    )
+                    del cls.fingerprints[least_frequent]
+                    del cls.queries[least_frequent]
+                audited = cls.fingerprints[fingerprint] = _AuditedFingerprint()
+                cls.queries[fingerprint] = normalize_query(query)
+            audited.add(text_hash, plan_hash)
+
+    @classmethod
+    def get_report(cls, top_queries: int = 50) -> dict[str, Any]:
+        """
+        Returns the audit of the queries run by this worker.
+
+        Args:
+            top_queries (int): Number of queries to report, those sent with the most distinct texts first.
+
+        Returns:
+            dict[str, Any]: The totals of distinct texts generated and sent, and per query,
+            the number of runs and of distinct texts generated and sent.
+        """
+        with cls.lock:
+            audited = [
+                (fingerprint, item.count, len(item.texts), len(item.plans))
+                for fingerprint, item in cls.fingerprints.items()
+            ]
+            queries = dict(cls.queries)
+
+        audited.sort(key=lambda item: (item[3], item[2], item[1]), reverse=True)
+        return {
+            "since": cls.started,
+            "canonicalization_enabled": config.QUERY_CANONICALIZATION_ENABLED,
+            "fingerprint_count": len(audited),
+            "text_count": sum(item[2] for item in audited),
+            "plan_count": sum(item[3] for item in audited),
+            "queries": [
+                {
+                    "fingerprint": fingerprint,
+                    "count": count,
+                    "texts": texts,
+                    "plans": plans,
+                    "query": queries.get(fingerprint),
+                }
+                for fingerprint, count, texts, plans in audited[:top_queries]
+            ],
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls.lock:
+            cls.fingerprints.clear()
+            cls.queries.clear()
+            cls.started = time.time()
+
+
+def patch_neomodel_query_canonicalization():
+    """Monkey-patch neomodel.core.db singleton to canonicalize Cypher queries, and audit their plans"""
+
+    def wrap(func):
+        @wraps(func)
+        def _run_cypher_query(
+            self,
+            session,
+            query,
+            params,
+            handle_unique,
+            retry_on_session_expire,
+            resolve_objects,
+        ):
+            canonical_query, canonical_params = (
+                canonicalize_query(query, params)
+                if config.QUERY_CANONICALIZATION_ENABLED
+                else (query, params)
+            )
+            if config.QUERY_PROFILING_ENABLED:
+                QueryPlanAudit.record(query, canonical_query)
+            return func(
+                self,
+                session=session,
+                query=canonical_query,
+                params=canonical_params,
+                handle_unique=handle_unique,
+                retry_on_session_expire=retry_on_session_expire,
+                resolve_objects=resolve_objects,
+            )
+
+        return _run_cypher_query
+
+    log.info("Patching neomodel.util.Database for query canonicalization")
+
+    neomodel.util.Database._run_cypher_query = wrap(
+        neomodel.util.Database._run_cypher_query
+    )
@@ -0,0 +1,303 @@
+"""Per-route profiling of requests and their Cypher queries, with detection of N+1 query patterns."""
+import hashlib
+import logging
+import re
+import statistics
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Iterable
+
+from cachetools import LRUCache, cached
+from starlette.types import Scope
+
+from clinical_mdr_api import config
+from clinical_mdr_api.telemetry.request_metrics import RequestMetrics
+
+log = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?(?![\w])")
+_LIST_OF_LITERALS = re.compile(r"\[\s*\?(?:\s*,\s*\?)+\s*\]")
+_WHITESPACE = re.compile(r"\s+")
+
+# Upper bounds of the histogram buckets of each measure, the last bucket counting everything above
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CYPHER_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+DB_TIME_BUCKETS = LATENCY_BUCKETS
+
+
+@cached(cache=LRUCache(maxsize=config.CACHE_MAX_SIZE), lock=Lock())
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a Cypher query, so that queries only differing by literal values or formatting are the same.
+
+    Args:
+        query (str): The Cypher query.
+
+    Returns:
+        str: The query on a single line, without comments, and with string, number and list literals replaced by `?`.
+    """
+    query = _STRING_LITERAL.sub("?", query)
+    query = _COMMENT.sub(" ", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _LIST_OF_LITERALS.sub("[?]", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def fingerprint_query(query: str) -> str:
+    """Returns a short identifier of the normalized query, see `normalize_query`."""
+    return hashlib.sha1(
+        normalize_query(query).encode("utf-8"), usedforsecurity=False
+    ).hexdigest()[:16]
+
+
+def _summarize(samples: Iterable[float], buckets: tuple[float, ...]) -> dict[str, Any]:
+    samples = sorted(samples)
+    if not samples:
+        return {"count": 0}
+
+    def percentile(fraction: float) -> float:
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    histogram = []
+    remaining = samples
+    for upper_bound in buckets:
+        in_bucket = [sample for sample in remaining if sample <= upper_bound]
+        histogram.append({"le": upper_bound, "count": len(in_bucket)})
+        remaining = remaining[len(in_bucket) :]
+    histogram.append({"le": "+Inf", "count": len(remaining)})
+
+    return {
+        "count": len(samples),
+        "mean": statistics.fmean(samples),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": samples[-1],
+        "histogram": histogram,
+    }
+
+
+class _RouteProfile:
+    def __init__(self):
+        self.request_count = 0
+        self.flagged_request_count = 0
+        # (latency, cypher count, database time) of the most recent requests
+        self.samples: deque[tuple[float, int, float]] = deque(
+            maxlen=config.QUERY_PROFILING_WINDOW_SIZE
+        )
+        # fingerprint: [query count, database time]
+        self.fingerprints: dict[str, list] = {}
+
+    def add_fingerprint(self, fingerprint: str, count: int, db_time: float) -> None:
+        if fingerprint not in self.fingerprints:
+            if len(self.fingerprints) >= config.QUERY_PROFILING_MAX_FINGERPRINTS:
+                # make room by dropping the least frequent query
+                del self.fingerprints[
+                    min(self.fingerprints, key=lambda key: self.fingerprints[key][0])
+                ]
+            self.fingerprints[fingerprint] = [0, 0.0]
+        self.fingerprints[fingerprint][0] += count
+        self.fingerprints[fingerprint][1] += db_time
+
+
+class QueryProfiler:
+    """
+    Collects per-route latency, Cypher query counts and database time of the requests served by this worker.
+
+    The measures of the most recent requests of each route are kept as a rolling window, along with the
+    frequencies of the normalized Cypher queries (fingerprints) each route runs. Requests running the same
+    fingerprint more than `QUERY_PROFILING_N_PLUS_ONE_THRESHOLD` times are flagged as N+1 query patterns.
+    """
+
+    lock = Lock()
+    routes: dict[str, _RouteProfile] = {}
+    queries: dict[str, str] = {}
+    flagged_requests: deque[dict[str, Any]] = deque(
+        maxlen=config.QUERY_PROFILING_FLAGGED_REQUESTS
+    )
+    started = time.time()
+
+    @staticmethod
+    def get_route_name(scope: Scope) -> str:
+        route = scope.get("route")
+        path = getattr(route, "path", None) or "<unmatched>"
+        return f"{scope.get('method')} {path}"
+
+    @classmethod
+    def record_request(
+        cls, scope: Scope, latency: float, metrics: RequestMetrics
+    ) -> None:
+        """
+        Records the measures of a served request.
+
+        Args:
+            scope (Scope): ASGI scope of the request, after routing.
+            latency (float): Time in seconds the request took to serve.
+            metrics (RequestMetrics): Cypher queries the request ran.
+        """
+        route_name = cls.get_route_name(scope)
+
+        # queries only differing by literal values count as the same query
+        query_fingerprints: dict[str, list] = {}
+        for query, (count, db_time) in metrics.queries.items():
+            fingerprint = cls.record_query(query)
+            counts = query_fingerprints.setdefault(fingerprint, [0, 0.0])
+            counts[0] += count
+            counts[1] += db_time
+        repeated = {
+            fingerprint: counts
+            for fingerprint, counts in query_fingerprints.items()
+            if counts[0] > config.QUERY_PROFILING_N_PLUS_ONE_THRESHOLD
+        }
+
+        with cls.lock:
+            profile = cls.routes.get(route_name)
+            if profile is None:
+                profile = cls.routes[route_name] = _RouteProfile()
+            profile.request_count += 1
+            profile.samples.append(
+                (latency, metrics.cypher_count, metrics.cypher_times)
+            )
+            for fingerprint, (count, db_time) in query_fingerprints.items():
+                profile.add_fingerprint(fingerprint, count, db_time)
+
+            if repeated:
+                profile.flagged_request_count += 1
+                cls.flagged_requests.append(
+                    {
+                        "route": route_name,
+                        "path": scope.get("path"),
+                        "time": time.time(),
+                        "latency": latency,
+                        "cypher_count": metrics.cypher_count,
+                        "repeated_queries": [
+                            {
+                                "fingerprint": fingerprint,
+                                "count": count,
+                                "db_time": db_time,
+                            }
+                            for fingerprint, (count, db_time) in sorted(
+                                repeated.items(),
+                                key=lambda item: item[1][0],
+                                reverse=True,
+                            )
+                        ],
+                    }
+                )
+
+        if repeated:
+            log.info(
+                "Possible N+1 queries in %s: %s",
+                route_name,
+                ", ".join(
+                    f"{fingerprint} ran {counts[0]} times"
+                    for fingerprint, counts in repeated.items()
+                ),
+            )
+
+    @classmethod
+    def record_query(cls, query: str) -> str:
+        """Returns the fingerprint of a query, keeping its normalized text for the report."""
+        fingerprint = fingerprint_query(query)
+        if fingerprint not in cls.queries:
+            with cls.lock:
+                if len(cls.queries) >= config.CACHE_MAX_SIZE:
+                    cls.queries.pop(next(iter(cls.queries)))
+                cls.queries[fingerprint] = normalize_query(query)
+        return fingerprint
+
+    @classmethod
+    def get_report(
+        cls, route: str | None = None, top_queries: int = 10
+    ) -> dict[str, Any]:
+        """
+        Returns the profile of the routes served by this worker.
+
+        Args:
+            route (str | None): Only report routes containing this text, e.g. `/study-activities`.
+            top_queries (int): Number of the most frequent queries to report per route.
+
+        Returns:
+            dict[str, Any]: Per route, the number of requests, the histograms and percentiles of latency,
+            Cypher query count and database time over the most recent requests, and the most frequent queries.
+            Also the most recent requests flagged for running the same query repeatedly.
+        """
+        with cls.lock:
+            routes = {
+                name: (
+                    profile.request_count,
+                    profile.flagged_request_count,
+                    list(profile.samples),
+                    sorted(
+                        profile.fingerprints.items(),
+                        key=lambda item: item[1][0],
+                        reverse=True,
+                    )[:top_queries],
+                )
+                for name, profile in cls.routes.items()
+                if not route or route in name
+            }
+            flagged_requests = [
+                request
+                for request in cls.flagged_requests
+                if not route or route in request["route"]
+            ]
+            queries = dict(cls.queries)
+
+        report = []
+        for name, (request_count, flagged_count, samples, fingerprints) in sorted(
+            routes.items(),
+            key=lambda item: sum(sample[0] for sample in item[1][2]),
+            reverse=True,
+        ):
+            report.append(
+                {
+                    "route": name,
+                    "request_count": request_count,
+                    "flagged_request_count": flagged_count,
+                    "latency": _summarize((s[0] for s in samples), LATENCY_BUCKETS),
+                    "cypher_count": _summarize(
+                        (s[1] for s in samples), CYPHER_COUNT_BUCKETS
+                    ),
+                    "db_time": _summarize((s[2] for s in samples), DB_TIME_BUCKETS),
+                    "queries": [
+                        {
+                            "fingerprint": fingerprint,
+                            "count": count,
+                            "per_request": count / request_count,
+                            "db_time": db_time,
+                            "query": queries.get(fingerprint),
+                        }
+                        for fingerprint, (count, db_time) in fingerprints
+                    ],
+                }
+            )
+
+        return {
+            "since": cls.started,
+            "window_size": config.QUERY_PROFILING_WINDOW_SIZE,
+            "n_plus_one_threshold": config.QUERY_PROFILING_N_PLUS_ONE_THRESHOLD,
+            "routes": report,
+            "flagged_requests": [
+                request
+                | {
+                    "repeated_queries": [
+                        query | {"query": queries.get(query["fingerprint"])}
+                        for query in request["repeated_queries"]
+                    ]
+                }
+                for request in reversed(flagged_requests)
+            ],
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls.lock:
+            cls.routes.clear()
+            cls.queries.clear()
+            cls.flagged_requests.clear()
+            cls.started = time.time()
@@ -41,6 +41,11 @@ class RequestMetrics(BaseModel):
         alias="cypher.slowest.query.params",
         title="Parameters of the slowest cypher query",
     )
+    queries: dict[str, list] = Field(
+        default_factory=dict,
+        exclude=True,
+        title="Number of runs and cumulative walltime of each cypher query, for query profiling",
+    )
 
 
 def init_request_metrics():
@@ -88,6 +93,11 @@ def cypher_tracing(query: str, params: Mapping):
         delta_time = time.time() - start_time
         metrics.cypher_times += delta_time
 
+        if config.QUERY_PROFILING_ENABLED:
+            query_stats = metrics.queries.setdefault(query, [0, 0.0])
+            query_stats[0] += 1
+            query_stats[1] += delta_time
+
         # find the slowest query of the request
         if delta_time > metrics.cypher_slowest_time:
             metrics.cypher_slowest_time = delta_time
@@ -0,0 +1,155 @@
+"""Startup report of an API worker: boot time, time spent importing modules and memory usage."""
+import importlib.abc
+import logging
+import os
+import resource
+import sys
+import time
+from importlib.machinery import ModuleSpec
+from typing import Any
+
+from clinical_mdr_api import config
+from clinical_mdr_api.utils.deferred_import import DeferredImport
+
+log = logging.getLogger(__name__)
+
+_state: dict[str, Any] = {}
+
+
+class _TimedLoader:
+    """Wraps a module loader to measure the time spent executing the module, including its own imports"""
+
+    def __init__(self, loader, import_times: dict[str, float]):
+        self._loader = loader
+        self._import_times = import_times
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: ModuleSpec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._import_times[module.__name__] = time.perf_counter() - started
+            # hand the original loader back to the module once imported
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportTimingFinder(importlib.abc.MetaPathFinder):
+    """Finds modules with the other finders, and wraps the loaders of modules loaded from files"""
+
+    def __init__(self):
+        self.import_times: dict[str, float] = {}
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and spec.has_location:
+                spec.loader = _TimedLoader(spec.loader, self.import_times)
+            return spec
+        return None
+
+
+def get_rss_bytes() -> int | None:
+    """Returns the current resident set size of the process, if available on the platform"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def get_peak_rss_bytes() -> int:
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def start() -> None:
+    """
+    Marks the start of the boot of the API.
+
+    When `STARTUP_REPORT_IMPORT_TIMES` is enabled, also starts measuring the time spent importing each module.
+    """
+    _state.clear()
+    _state["started"] = time.perf_counter()
+    _state["modules_before_boot"] = len(sys.modules)
+
+    if config.STARTUP_REPORT_IMPORT_TIMES:
+        finder = _ImportTimingFinder()
+        sys.meta_path.insert(0, finder)
+        _state["finder"] = finder
+
+
+def finish() -> None:
+    """Marks the end of the boot of the API, after all routers were included."""
+    _state["boot_seconds"] = time.perf_counter() - _state.get(
+        "started", time.perf_counter()
+    )
+    _state["modules_after_boot"] = len(sys.modules)
+    _state["rss_bytes_after_boot"] = get_rss_bytes()
+
+    finder = _state.get("finder")
+    if finder is not None and finder in sys.meta_path:
+        sys.meta_path.remove(finder)
+
+
+def get_startup_report(slowest_imports: int = 25) -> dict[str, Any]:
+    """
+    Returns the startup report of this worker process.
+
+    Args:
+        slowest_imports (int): Number of modules slowest to import to include in the report.
+
+    Returns:
+        dict[str, Any]: Boot time, number of modules loaded, memory usage after boot and now,
+        slowest imports (cumulative, including the imports they make) and whether deferred imports were loaded.
+    """
+    finder = _state.get("finder")
+    import_times = finder.import_times if finder is not None else {}
+
+    return {
+        "pid": os.getpid(),
+        "boot_seconds": _state.get("boot_seconds"),
+        "modules_before_boot": _state.get("modules_before_boot"),
+        "modules_after_boot": _state.get("modules_after_boot"),
+        "modules_now": len(sys.modules),
+        "rss_bytes_after_boot": _state.get("rss_bytes_after_boot"),
+        "rss_bytes_now": get_rss_bytes(),
+        "peak_rss_bytes": get_peak_rss_bytes(),
+        "slowest_imports": [
+            {"module": name, "seconds": seconds}
+            for name, seconds in sorted(
+                import_times.items(), key=lambda item: item[1], reverse=True
+            )[:slowest_imports]
+        ],
+        "deferred_imports": [
+            {"module": deferred.name, "loaded": deferred.loaded}
+            for deferred in DeferredImport.registry
+        ],
+    }
+
+
+def log_startup_report() -> None:
+    report = get_startup_report(slowest_imports=10)
+    rss = report["rss_bytes_after_boot"]
+
+    log.info(
+        "Worker %s booted in %.2f s with %s modules loaded, RSS %s MiB",
+        report["pid"],
+        report["boot_seconds"] or 0,
+        report["modules_after_boot"],
+        f"{rss / 2**20:.1f}" if rss is not None else "unknown",
+    )
+    for item in report["slowest_imports"]:
+        log.info("Imported %s in %.3f s", item["module"], item["seconds"])
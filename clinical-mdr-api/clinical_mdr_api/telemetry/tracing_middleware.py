@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Iterable
 
 from opencensus.log import get_log_attrs
@@ -19,7 +20,9 @@ from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette_context import context
 
 from clinical_mdr_api import config
+from clinical_mdr_api.telemetry.query_profiler import QueryProfiler
 from clinical_mdr_api.telemetry.request_metrics import (
+    get_request_metrics,
     include_request_metrics,
     init_request_metrics,
 )
@@ -131,7 +134,17 @@ class TracingMiddleware:
 
             self.add_attributes_form_request_scope(span, scope, headers=headers)
 
-            await self.app(scope, _receive, _send)
+            started = time.perf_counter()
+            try:
+                await self.app(scope, _receive, _send)
+            finally:
+                if config.QUERY_PROFILING_ENABLED and (
+                    metrics := get_request_metrics()
+                ):
+                    # the scope holds the matched route after routing
+                    QueryProfiler.record_request(
+                        scope, time.perf_counter() - started, metrics
+                    )
 
     @staticmethod
     def add_attributes_form_request_scope(
@@ -250,3 +250,53 @@ async def test_token_invalid_issuer(jwk_service, jwk_good_key):
     token = mk_jwt(claims, jwk_good_key)
     with pytest.raises(authlib.jose.errors.InvalidClaimError, match='"iss"'):
         await jwk_service.validate_jwt(token)
+
+
+async def test_validated_claims_are_cached(jwk_service, jwk_good_key):
+    jwk_service.clear_claims_cache()
+    claims_in = mk_claims()
+    token = mk_jwt(claims_in, jwk_good_key)
+    hits = jwk_service.claims_cache_hits
+
+    claims = await jwk_service.validate_jwt(token)
+    cached_claims = await jwk_service.validate_jwt(token)
+
+    assert cached_claims == claims == claims_in
+    assert cached_claims is not claims
+    assert jwk_service.claims_cache_hits == hits + 1
+    assert jwk_service.get_claims_cache_info()["size"] == 1
+
+
+async def test_invalid_token_is_not_cached(jwk_service, jwk_good_key):
+    jwk_service.clear_claims_cache()
+    token = mk_jwt(mk_claims(audience="pink-panther"), jwk_good_key)
+
+    for _ in range(2):
+        with pytest.raises(authlib.jose.errors.InvalidClaimError):
+            await jwk_service.validate_jwt(token)
+
+    assert jwk_service.get_claims_cache_info()["size"] == 0
+
+
+async def test_cached_claims_expire_with_token(jwk_service, jwk_good_key, monkeypatch):
+    jwk_service.clear_claims_cache()
+    now = time.time()
+    token = mk_jwt(mk_claims(now=now, exp=300), jwk_good_key)
+    await jwk_service.validate_jwt(token)
+    assert jwk_service.get_claims_cache_info()["size"] == 1
+
+    # still valid within leeway, but no longer served from the cache
+    monkeypatch.setattr(time, "time", lambda: now + 300 + jwk_service.leeway / 2)
+    misses = jwk_service.claims_cache_misses
+    await jwk_service.validate_jwt(token)
+    assert jwk_service.claims_cache_misses == misses + 1
+
+
+async def test_cached_claims_dropped_on_key_refresh(jwk_service, jwk_good_key):
+    token = mk_jwt(mk_claims(), jwk_good_key)
+    await jwk_service.validate_jwt(token)
+    assert jwk_service.get_claims_cache_info()["size"] > 0
+
+    await jwk_service.fetch_jwk_set()
+
+    assert jwk_service.get_claims_cache_info()["size"] == 0
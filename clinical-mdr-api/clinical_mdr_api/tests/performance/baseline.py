@@ -0,0 +1,161 @@
+"""
+Benchmark results of the API as a JSON baseline, and comparison of results against a baseline.
+
+A baseline records, per benchmarked endpoint, the latency percentiles, the number of Cypher queries,
+the database time and the peak memory allocated while serving a request, along with the parameters
+of the synthetic data the endpoints were timed against.
+"""
+import json
+import statistics
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+# Measures compared between a baseline and a new benchmark run: (measure, statistic)
+COMPARED_MEASURES = (
+    ("latency", "p50"),
+    ("latency", "p95"),
+    ("cypher_count", "median"),
+    ("peak_memory_bytes", None),
+)
+
+
+@dataclass(frozen=True)
+class Regression:
+    endpoint: str
+    measure: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.endpoint}: {self.measure} {self.baseline:g} -> {self.current:g}"
+            f" ({self.ratio - 1:+.0%})"
+        )
+
+
+def summarize(samples: Iterable[float]) -> dict[str, float | int]:
+    """
+    Summarizes the measures of repeated requests.
+
+    Args:
+        samples (Iterable[float]): The measure of each request.
+
+    Returns:
+        dict[str, float | int]: The number of samples, mean, median, nearest-rank percentiles and maximum.
+    """
+    samples = sorted(samples)
+    if not samples:
+        return {"count": 0}
+
+    def percentile(fraction: float) -> float:
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    return {
+        "count": len(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": samples[-1],
+    }
+
+
+def _get_measure(result: dict[str, Any], measure: str, stat: str | None) -> Any:
+    value = result.get(measure)
+    if stat is not None and isinstance(value, dict):
+        value = value.get(stat)
+    return value
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerance: float = 0.2,
+) -> list[Regression]:
+    """
+    Compares benchmark results against a baseline.
+
+    Latency and memory may grow by `tolerance` before being reported, as they vary between runs,
+    while any additional Cypher query is reported.
+    Endpoints missing from either result, and measures that were not recorded, are not compared.
+
+    Args:
+        baseline (dict[str, Any]): The baseline, as returned by `load_results`.
+        current (dict[str, Any]): The results of the new benchmark run.
+        tolerance (float): The relative growth of latency and memory to tolerate, e.g. 0.2 for 20%.
+
+    Returns:
+        list[Regression]: The measures of the endpoints that regressed.
+    """
+    if baseline.get("parameters") != current.get("parameters"):
+        raise ValueError(
+            "Benchmark results were measured with different synthetic data parameters: "
+            f"{baseline.get('parameters')} and {current.get('parameters')}"
+        )
+
+    regressions = []
+    for endpoint, result in current.get("endpoints", {}).items():
+        baseline_result = baseline.get("endpoints", {}).get(endpoint)
+        if baseline_result is None:
+            continue
+        for measure, stat in COMPARED_MEASURES:
+            baseline_value = _get_measure(baseline_result, measure, stat)
+            current_value = _get_measure(result, measure, stat)
+            if baseline_value is None or current_value is None:
+                continue
+            allowed = (
+                baseline_value
+                if measure == "cypher_count"
+                else baseline_value * (1 + tolerance)
+            )
+            if current_value > allowed:
+                regressions.append(
+                    Regression(
+                        endpoint=endpoint,
+                        measure=f"{measure}.{stat}" if stat else measure,
+                        baseline=baseline_value,
+                        current=current_value,
+                    )
+                )
+    return regressions
+
+
+def format_results(results: dict[str, Any]) -> str:
+    """Returns the results of a benchmark run as a table, one endpoint per line."""
+    lines = [
+        f"{'endpoint':<28}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+        f"{'queries':>10}{'db ms':>10}{'peak MiB':>10}{'KiB':>10}"
+    ]
+    for endpoint, result in results.get("endpoints", {}).items():
+        latency = result.get("latency", {})
+        cypher_count = _get_measure(result, "cypher_count", "median")
+        db_time = _get_measure(result, "db_time", "median")
+        peak_memory = result.get("peak_memory_bytes")
+        lines.append(
+            f"{endpoint:<28}"
+            f"{latency.get('p50', 0) * 1000:>10.1f}"
+            f"{latency.get('p95', 0) * 1000:>10.1f}"
+            f"{latency.get('max', 0) * 1000:>10.1f}"
+            f"{cypher_count if cypher_count is not None else '-':>10}"
+            f"{f'{db_time * 1000:.1f}' if db_time is not None else '-':>10}"
+            f"{f'{peak_memory / 2**20:.1f}' if peak_memory is not None else '-':>10}"
+            f"{result.get('response_bytes', 0) / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def save_results(results: dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True, default=str)
+        file.write("\n")
+
+
+def load_results(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
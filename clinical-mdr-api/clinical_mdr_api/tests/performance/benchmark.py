@@ -0,0 +1,345 @@
+"""
+Benchmark of key API endpoints against a synthetic study of production scale.
+
+Seeds a dedicated Neo4j database with a synthetic study (see `synthetic_study`), then times each endpoint
+over repeated requests after a warm-up request, recording latency percentiles, the number of Cypher queries
+and database time per request (when tracing is enabled, see `QueryProfiler`), and the peak memory allocated
+while serving a request. Results can be saved as a JSON baseline, and compared against a previous baseline.
+
+Requires a Neo4j server, configured as for the integration tests, and OAuth to be disabled.
+
+Seed a database and save a baseline:
+    `python -m clinical_mdr_api.tests.performance.benchmark --seed --output baseline.json`
+Benchmark the seeded database again, comparing against the baseline:
+    `python -m clinical_mdr_api.tests.performance.benchmark --compare baseline.json`
+"""
+import argparse
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import urljoin
+
+import neo4j.exceptions
+from fastapi.testclient import TestClient
+from neomodel import config as neoconfig
+from neomodel import db
+
+from clinical_mdr_api import config
+from clinical_mdr_api.telemetry.query_profiler import QueryProfiler
+from clinical_mdr_api.telemetry.startup_report import get_rss_bytes
+from clinical_mdr_api.tests.performance.baseline import (
+    compare_results,
+    format_results,
+    load_results,
+    save_results,
+    summarize,
+)
+from clinical_mdr_api.tests.performance.synthetic_study import (
+    SyntheticStudy,
+    SyntheticStudyParameters,
+    generate_synthetic_study,
+    get_synthetic_study,
+)
+
+log = logging.getLogger(__name__)
+
+CSV_MEDIA_TYPE = "text/csv"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DATABASE_AVAILABLE_TRIES = 10
+
+
+@dataclass(frozen=True)
+class BenchmarkedEndpoint:
+    name: str
+    path: str
+    method: str = "GET"
+    params: dict[str, Any] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+    json: dict[str, Any] | None = None
+
+
+def get_benchmarked_endpoints(
+    synthetic_study: SyntheticStudy,
+) -> list[BenchmarkedEndpoint]:
+    study_uid = synthetic_study.study_uid
+    return [
+        BenchmarkedEndpoint(name="studies", path="/studies", params={"page_size": 100}),
+        BenchmarkedEndpoint(
+            name="study_activities",
+            path=f"/studies/{study_uid}/study-activities",
+            params={"page_size": 0},
+        ),
+        BenchmarkedEndpoint(
+            name="flowchart_protocol",
+            path=f"/studies/{study_uid}/flowchart",
+            params={"detailed": False},
+        ),
+        BenchmarkedEndpoint(
+            name="flowchart_operational",
+            path=f"/studies/{study_uid}/flowchart",
+            params={"operational": True},
+        ),
+        BenchmarkedEndpoint(
+            name="flowchart_docx",
+            path=f"/studies/{study_uid}/flowchart.docx",
+        ),
+        BenchmarkedEndpoint(
+            name="ct_terms",
+            path="/ct/terms",
+            params={"codelist_uid": synthetic_study.codelist_uid, "page_size": 1000},
+        ),
+        BenchmarkedEndpoint(
+            name="template_parameters",
+            path=f"/objective-templates/{synthetic_study.objective_template_uid}/parameters",
+        ),
+        BenchmarkedEndpoint(
+            name="template_instantiation",
+            method="POST",
+            path=f"/studies/{study_uid}/study-objectives/preview",
+            json={
+                "objective_data": {
+                    "objective_template_uid": synthetic_study.objective_template_uid,
+                    "parameter_terms": [
+                        {
+                            "position": 1,
+                            "conjunction": "",
+                            "terms": [
+                                {
+                                    "index": 1,
+                                    "uid": synthetic_study.text_value_uid,
+                                    "name": synthetic_study.text_value_name,
+                                    "type": "TextValue",
+                                }
+                            ],
+                        }
+                    ],
+                    "library_name": "Sponsor",
+                }
+            },
+        ),
+        BenchmarkedEndpoint(
+            name="study_activities_csv",
+            path=f"/studies/{study_uid}/study-activities",
+            params={"page_size": 0},
+            headers={"Accept": CSV_MEDIA_TYPE},
+        ),
+        BenchmarkedEndpoint(
+            name="study_activities_xlsx",
+            path=f"/studies/{study_uid}/study-activities",
+            params={"page_size": 0},
+            headers={"Accept": XLSX_MEDIA_TYPE},
+        ),
+    ]
+
+
+def connect_database(database_name: str, replace: bool) -> None:
+    """Connects to the benchmark database, creating it empty if `replace`."""
+    os.environ["NEO4J_DATABASE"] = database_name
+    config.settings = config.Settings()
+    if replace:
+        db.set_connection(config.settings.neo4j_dsn)
+        db.cypher_query("CREATE OR REPLACE DATABASE $db", {"db": database_name})
+
+    full_dsn = urljoin(config.settings.neo4j_dsn, f"/{database_name}")
+    neoconfig.DATABASE_URL = full_dsn
+    for _ in range(DATABASE_AVAILABLE_TRIES):
+        try:
+            # a created database takes a couple of seconds to become available
+            db.set_connection(full_dsn)
+            db.cypher_query(
+                "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Counter) REQUIRE (c.counterId) IS NODE KEY"
+            )
+            return
+        except (
+            neo4j.exceptions.ClientError,
+            neo4j.exceptions.DatabaseUnavailable,
+        ) as exc:
+            log.info(
+                "database '%s' not available, %s, pausing for 2 seconds",
+                database_name,
+                exc.code,
+            )
+            time.sleep(2)
+    raise RuntimeError(f"database {database_name} is not available")
+
+
+def time_endpoint(
+    client: TestClient, endpoint: BenchmarkedEndpoint, repeat: int
+) -> dict[str, Any]:
+    """
+    Times repeated requests of an endpoint.
+
+    Args:
+        client (TestClient): The client of the API application.
+        endpoint (BenchmarkedEndpoint): The endpoint and the request to time.
+        repeat (int): The number of timed requests, after a warm-up request.
+
+    Returns:
+        dict[str, Any]: The request, and the summaries of its latency, Cypher query count and database time.
+        Also its peak memory allocation and response size, measured on a separate request.
+    """
+
+    def request():
+        return client.request(
+            endpoint.method,
+            endpoint.path,
+            params=endpoint.params,
+            headers=endpoint.headers,
+            json=endpoint.json,
+        )
+
+    response = request()
+    result = {
+        "method": endpoint.method,
+        "path": endpoint.path,
+        "params": endpoint.params,
+        "accept": endpoint.headers.get("Accept"),
+        "status_code": response.status_code,
+        "response_bytes": len(response.content),
+    }
+    if response.status_code >= 400:
+        log.warning(
+            "%s returned %s: %s",
+            endpoint.name,
+            response.status_code,
+            response.text[:500],
+        )
+        return result
+
+    QueryProfiler.reset()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request()
+        latencies.append(time.perf_counter() - started)
+    result["latency"] = summarize(latencies)
+
+    routes = QueryProfiler.get_report(top_queries=0)["routes"]
+    if config.QUERY_PROFILING_ENABLED and len(routes) == 1:
+        result["cypher_count"] = {
+            "median": routes[0]["cypher_count"]["p50"],
+            "max": routes[0]["cypher_count"]["max"],
+        }
+        result["db_time"] = {
+            "median": routes[0]["db_time"]["p50"],
+            "max": routes[0]["db_time"]["max"],
+        }
+
+    tracemalloc.start()
+    try:
+        request()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    result["rss_bytes"] = get_rss_bytes()
+
+    return result
+
+
+def run_benchmark(
+    client: TestClient,
+    synthetic_study: SyntheticStudy,
+    repeat: int,
+    endpoint_names: list[str] | None = None,
+) -> dict[str, Any]:
+    # pylint: disable=import-outside-toplevel
+    from clinical_mdr_api.services.system import get_system_information
+
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "system": get_system_information().dict(),
+        "python": platform.python_version(),
+        "parameters": asdict(synthetic_study.parameters),
+        "counts": synthetic_study.counts,
+        "repeat": repeat,
+        "endpoints": {},
+    }
+    for endpoint in get_benchmarked_endpoints(synthetic_study):
+        if endpoint_names and endpoint.name not in endpoint_names:
+            continue
+        log.info("benchmarking %s", endpoint.name)
+        results["endpoints"][endpoint.name] = time_endpoint(client, endpoint, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database", default="benchmark")
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="Create or replace the database, and seed it with a synthetic study",
+    )
+    for parameter in fields(SyntheticStudyParameters):
+        parser.add_argument(
+            f"--{parameter.name.replace('_', '-')}",
+            type=int,
+            default=parameter.default,
+            help=f"Number of {parameter.name.replace('_', ' ')} to seed",
+        )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        dest="endpoints",
+        help="Only benchmark this endpoint, can be given multiple times",
+    )
+    parser.add_argument("--output", help="Save the results as a JSON baseline")
+    parser.add_argument("--compare", help="Compare the results against a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative growth of latency and memory tolerated when comparing",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    connect_database(args.database, replace=args.seed)
+    if args.seed:
+        synthetic_study = generate_synthetic_study(
+            SyntheticStudyParameters(
+                **{
+                    parameter.name: getattr(args, parameter.name)
+                    for parameter in fields(SyntheticStudyParameters)
+                }
+            )
+        )
+    else:
+        synthetic_study = get_synthetic_study()
+        if synthetic_study is None:
+            parser.error(
+                f"Database '{args.database}' has no synthetic study, run with --seed"
+            )
+
+    # the application runs database queries when imported
+    # pylint: disable=import-outside-toplevel
+    from clinical_mdr_api.main import app
+
+    results = run_benchmark(
+        TestClient(app), synthetic_study, args.repeat, args.endpoints
+    )
+    print(format_results(results))
+
+    if args.output:
+        save_results(results, args.output)
+    if args.compare:
+        regressions = compare_results(
+            load_results(args.compare), results, args.tolerance
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
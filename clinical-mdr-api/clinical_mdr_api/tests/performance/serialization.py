@@ -0,0 +1,116 @@
+"""
+Benchmark of the serialization of large list responses, without database.
+
+Times a page of CT terms returned through the `response_model` of a route, as FastAPI does by default,
+against the same page returned as a `FastJSONResponse`, as done by routes decorated with `fast_json_response`.
+
+Run with `python -m clinical_mdr_api.tests.performance.serialization [--page-size 1000] [--repeat 20]`.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from clinical_mdr_api.models.controlled_terminologies.ct_term import (
+    CTTermNameAndAttributes,
+)
+from clinical_mdr_api.models.utils import CustomPage, FastJSONResponse
+
+
+def generate_ct_terms(count: int) -> list[CTTermNameAndAttributes]:
+    start_date = datetime(2023, 3, 31, 12, 0, tzinfo=timezone.utc)
+    common = {
+        "start_date": start_date,
+        "end_date": None,
+        "status": "Final",
+        "version": "1.0",
+        "change_description": "Imported",
+        "user_initials": "BENCHMARK",
+        "possible_actions": ["inactivate", "new_version"],
+    }
+    return [
+        CTTermNameAndAttributes(
+            term_uid=f"C{index:06d}",
+            catalogue_name="SDTM CT",
+            codelists=[{"codelist_uid": "C66737", "order": index}],
+            library_name="CDISC",
+            name={
+                "sponsor_preferred_name": f"Term {index}",
+                "sponsor_preferred_name_sentence_case": f"term {index}",
+                "order": index,
+                **common,
+            },
+            attributes={
+                "concept_id": f"C{index:06d}",
+                "code_submission_value": f"TERM{index}",
+                "name_submission_value": f"Term {index}",
+                "nci_preferred_name": f"Benchmark Term {index}",
+                "definition": "A term generated for benchmarking the serialization of list responses.",
+                **common,
+            },
+        )
+        for index in range(count)
+    ]
+
+
+def get_benchmark_client(items: list[CTTermNameAndAttributes]) -> TestClient:
+    app = FastAPI()
+
+    def get_page() -> CustomPage:
+        return CustomPage.create(items=items, total=len(items), page=1, size=len(items))
+
+    @app.get(
+        "/validated",
+        response_model=CustomPage[CTTermNameAndAttributes],
+        response_model_exclude_unset=True,
+    )
+    def get_validated():
+        return get_page()
+
+    @app.get(
+        "/fast",
+        response_model=CustomPage[CTTermNameAndAttributes],
+        response_model_exclude_unset=True,
+    )
+    def get_fast():
+        return FastJSONResponse(get_page(), exclude_unset=True)
+
+    return TestClient(app)
+
+
+def time_route(client: TestClient, path: str, repeat: int) -> list[float]:
+    # first request warms up the route
+    client.get(path).raise_for_status()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(path).raise_for_status()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    client = get_benchmark_client(generate_ct_terms(args.page_size))
+    assert client.get("/fast").json() == client.get("/validated").json()
+
+    medians = {}
+    for path in ("/validated", "/fast"):
+        timings = time_route(client, path, args.repeat)
+        medians[path] = statistics.median(timings)
+        print(
+            f"{path:<12} median {medians[path] * 1000:8.1f} ms"
+            f"   min {min(timings) * 1000:8.1f} ms   max {max(timings) * 1000:8.1f} ms"
+        )
+    print(f"Speedup: {medians['/validated'] / medians['/fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
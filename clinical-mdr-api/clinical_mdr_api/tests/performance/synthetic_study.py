@@ -0,0 +1,314 @@
+"""
+Generator of synthetic data of production scale, for benchmarking the API.
+
+Seeds the connected database through the services, as the integration tests do, with a study of
+the given number of activities, visits and activity schedules, a large sponsor codelist,
+library items (text values used as template parameter terms, and objective templates), and further studies.
+The generated data is deterministic for given parameters, so that benchmark results can be compared.
+"""
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+
+from neomodel import db
+from starlette_context import request_cycle_context
+
+from clinical_mdr_api import config
+from clinical_mdr_api.oauth.dependencies import (
+    dummy_access_token_claims,
+    dummy_auth_object,
+)
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+log = logging.getLogger(__name__)
+
+# The test utilities load the application, which queries the database when imported,
+# so they are only imported once the benchmark is connected to its database.
+TestUtils = deferred_import(
+    "clinical_mdr_api.tests.integration.utils.utils", "TestUtils"
+)
+data_library = deferred_import("clinical_mdr_api.tests.integration.utils.data_library")
+flowchart_data = deferred_import(
+    "clinical_mdr_api.tests.integration.services.test_study_flowchart"
+)
+
+EPOCHS = {
+    "Screening": {"color_hash": "#80DEEAFF"},
+    "Treatment": {"color_hash": "#C5E1A5FF"},
+    "Follow-Up": {"color_hash": "#BCAAA4FF"},
+}
+# Number of visits at the end of the study allocated to the follow-up epoch
+FOLLOW_UP_VISITS = 3
+TEXT_VALUE_PARAMETER = "TextValue"
+
+# The generated study is recorded in the database, so that it can be benchmarked again without seeding
+SAVE_SYNTHETIC_STUDY_QUERY = """
+MERGE (synthetic_study:SyntheticStudy)
+SET synthetic_study.data = $data
+"""
+GET_SYNTHETIC_STUDY_QUERY = """
+MATCH (synthetic_study:SyntheticStudy)
+RETURN synthetic_study.data
+"""
+
+
+@dataclass(frozen=True)
+class SyntheticStudyParameters:
+    activities: int = 500
+    activity_groups: int = 25
+    visits: int = 60
+    schedules: int = 20000
+    ct_terms: int = 2000
+    text_values: int = 1000
+    objective_templates: int = 50
+    studies: int = 100
+
+
+@dataclass
+class SyntheticStudy:
+    parameters: SyntheticStudyParameters
+    study_uid: str
+    codelist_uid: str
+    objective_template_uid: str
+    text_value_uid: str
+    text_value_name: str
+    counts: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0
+
+
+def _create_study_visits(
+    parameters: SyntheticStudyParameters, study_uid: str, study_epochs: dict
+) -> list:
+    day_uid = TestUtils.get_unit_uid_by_name(config.DAY_UNIT_NAME)
+    visit_type_terms = flowchart_data.create_visit_type_terms()
+    visit_contact_terms = flowchart_data.create_visit_contact_terms()
+    visit_timeref_terms = flowchart_data.create_visit_timeref_terms()
+
+    study_visits = []
+    for index in range(parameters.visits):
+        if index == 0:
+            epoch = study_epochs["Screening"]
+        elif index < parameters.visits - FOLLOW_UP_VISITS:
+            epoch = study_epochs["Treatment"]
+        else:
+            epoch = study_epochs["Follow-Up"]
+
+        study_visits.append(
+            TestUtils.create_study_visit(
+                study_uid=study_uid,
+                study_epoch_uid=epoch.uid,
+                visit_type_uid=visit_type_terms["V_Treatment"].term_uid,
+                time_reference_uid=visit_timeref_terms["Global anchor visit"].term_uid,
+                time_value=index * 7,
+                time_unit_uid=day_uid,
+                show_visit=True,
+                min_visit_window_value=-1 if index else -7,
+                max_visit_window_value=1,
+                visit_window_unit_uid=day_uid,
+                visit_contact_mode_uid=visit_contact_terms["On Site Visit"].term_uid,
+                visit_class="SINGLE_VISIT",
+                visit_subclass="SINGLE_VISIT",
+                is_global_anchor_visit=index == 0,
+            )
+        )
+    log.info("created %s study visits", len(study_visits))
+    return study_visits
+
+
+def _create_study_activities(
+    parameters: SyntheticStudyParameters, study_uid: str
+) -> list:
+    soa_group_terms = [
+        term
+        for name, term in flowchart_data.create_soa_group_terms().items()
+        if name != "HIDDEN"
+    ]
+
+    groupings = []
+    for index in range(parameters.activity_groups):
+        activity_group = TestUtils.create_activity_group(
+            name=f"Benchmark group {index + 1}"
+        )
+        activity_subgroup = TestUtils.create_activity_subgroup(
+            name=f"Benchmark subgroup {index + 1}",
+            activity_groups=[activity_group.uid],
+        )
+        groupings.append((activity_group.uid, activity_subgroup.uid))
+
+    study_activities = []
+    for index in range(parameters.activities):
+        activity_group_uid, activity_subgroup_uid = groupings[index % len(groupings)]
+        activity = TestUtils.create_activity(
+            name=f"Benchmark activity {index + 1}",
+            activity_groups=[activity_group_uid],
+            activity_subgroups=[activity_subgroup_uid],
+        )
+        study_activities.append(
+            TestUtils.create_study_activity(
+                study_uid=study_uid,
+                activity_uid=activity.uid,
+                activity_group_uid=activity_group_uid,
+                activity_subgroup_uid=activity_subgroup_uid,
+                soa_group_term_uid=soa_group_terms[
+                    index % len(soa_group_terms)
+                ].term_uid,
+            )
+        )
+        if (index + 1) % 100 == 0:
+            log.info("created %s study activities", index + 1)
+    return study_activities
+
+
+def _create_study_activity_schedules(
+    parameters: SyntheticStudyParameters,
+    study_uid: str,
+    study_activities: list,
+    study_visits: list,
+) -> int:
+    if not study_activities or not study_visits:
+        return 0
+
+    # each activity is scheduled for a run of consecutive visits, shifted by one visit per activity
+    visits_per_activity = min(
+        len(study_visits), -(-parameters.schedules // len(study_activities))
+    )
+    count = 0
+    for activity_index, study_activity in enumerate(study_activities):
+        for offset in range(visits_per_activity):
+            if count >= parameters.schedules:
+                return count
+            study_visit = study_visits[(activity_index + offset) % len(study_visits)]
+            TestUtils.create_study_activity_schedule(
+                study_uid=study_uid,
+                study_activity_uid=study_activity.study_activity_uid,
+                study_visit_uid=study_visit.uid,
+            )
+            count += 1
+        if (activity_index + 1) % 50 == 0:
+            log.info("created %s study activity schedules", count)
+    return count
+
+
+def _create_ct_terms(parameters: SyntheticStudyParameters) -> str:
+    codelist = TestUtils.create_ct_codelist(
+        name="Benchmark codelist",
+        sponsor_preferred_name="Benchmark codelist",
+        submission_value="BENCHMARK",
+        extensible=True,
+        approve=True,
+    )
+    for index in range(parameters.ct_terms):
+        TestUtils.create_ct_term(
+            codelist_uid=codelist.codelist_uid,
+            code_submission_value=f"BENCHMARK{index + 1}",
+            name_submission_value=f"Benchmark term {index + 1}",
+            sponsor_preferred_name=f"Benchmark term {index + 1}",
+            sponsor_preferred_name_sentence_case=f"benchmark term {index + 1}",
+            order=index + 1,
+        )
+        if (index + 1) % 500 == 0:
+            log.info("created %s CT terms", index + 1)
+    return codelist.codelist_uid
+
+
+def _create_library_items(parameters: SyntheticStudyParameters) -> tuple:
+    TestUtils.create_template_parameter(TEXT_VALUE_PARAMETER)
+    text_values = [
+        TestUtils.create_text_value(
+            name=f"benchmark value {index + 1}",
+            name_sentence_case=f"benchmark value {index + 1}",
+            definition=f"Benchmark value {index + 1}",
+            abbreviation=f"BV{index + 1}",
+        )
+        for index in range(max(parameters.text_values, 1))
+    ]
+    objective_templates = [
+        TestUtils.create_objective_template(
+            name=f"Benchmark objective {index + 1} to evaluate [{TEXT_VALUE_PARAMETER}]"
+        )
+        for index in range(max(parameters.objective_templates, 1))
+    ]
+    log.info(
+        "created %s text values and %s objective templates",
+        len(text_values),
+        len(objective_templates),
+    )
+    return text_values[0], objective_templates[0].uid
+
+
+def generate_synthetic_study(
+    parameters: SyntheticStudyParameters,
+) -> SyntheticStudy:
+    """
+    Seeds the connected, empty database with a synthetic study and library.
+
+    Args:
+        parameters (SyntheticStudyParameters): The size of the data to generate.
+
+    Returns:
+        SyntheticStudy: The uids of the generated items the benchmarked endpoints are called with.
+    """
+    started = time.perf_counter()
+    with request_cycle_context(
+        {"auth": dummy_auth_object(dummy_access_token_claims())}
+    ):
+        study = data_library.inject_base_data()
+        project_number = study.current_metadata.identification_metadata.project_number
+
+        study_epochs = flowchart_data.create_study_epochs(
+            EPOCHS, study, flowchart_data.create_epoch_terms()
+        )
+        study_visits = _create_study_visits(parameters, study.uid, study_epochs)
+        TestUtils.lock_and_unlock_study(study.uid)
+        study_activities = _create_study_activities(parameters, study.uid)
+        schedule_count = _create_study_activity_schedules(
+            parameters, study.uid, study_activities, study_visits
+        )
+
+        codelist_uid = _create_ct_terms(parameters)
+        text_value, objective_template_uid = _create_library_items(parameters)
+
+        for index in range(parameters.studies):
+            TestUtils.create_study(
+                number=str(1000 + index),
+                acronym=f"Benchmark study {index + 1}",
+                project_number=project_number,
+                description=f"Benchmark study {index + 1}",
+            )
+
+    synthetic_study = SyntheticStudy(
+        parameters=parameters,
+        study_uid=study.uid,
+        codelist_uid=codelist_uid,
+        objective_template_uid=objective_template_uid,
+        text_value_uid=text_value.uid,
+        text_value_name=text_value.name,
+        counts={
+            "study_visits": len(study_visits),
+            "study_activities": len(study_activities),
+            "study_activity_schedules": schedule_count,
+            "studies": parameters.studies + 1,
+        },
+        seconds=time.perf_counter() - started,
+    )
+    db.cypher_query(
+        SAVE_SYNTHETIC_STUDY_QUERY, {"data": json.dumps(asdict(synthetic_study))}
+    )
+    log.info(
+        "generated synthetic study %s in %.0f s: %s",
+        synthetic_study.study_uid,
+        synthetic_study.seconds,
+        synthetic_study.counts,
+    )
+    return synthetic_study
+
+
+def get_synthetic_study() -> SyntheticStudy | None:
+    """Returns the synthetic study the connected database was seeded with, if any."""
+    result, _ = db.cypher_query(GET_SYNTHETIC_STUDY_QUERY)
+    if not result:
+        return None
+    data = json.loads(result[0][0])
+    data["parameters"] = SyntheticStudyParameters(**data["parameters"])
+    return SyntheticStudy(**data)
@@ -1,6 +1,7 @@
 import unittest
 
 import pytest
+from bs4 import BeautifulSoup
 from parameterized import parameterized
 
 from clinical_mdr_api import exceptions
@@ -88,6 +89,41 @@ class TestServiceUtils(unittest.TestCase):
     def test_strip_html(self, html, expected):
         assert _utils.strip_html(html) == expected
 
+    @parameterized.expand(
+        [
+            ("Plain text",),
+            ("  leading and trailing whitespace  ",),
+            ("<p>Some <b>bold</b> and <em>emphasized</em> text.</p>",),
+            ('<p class="ql-align-center"><span style="color: red">Red</span></p>',),
+            ("<p>Line<br>break<br/>and<BR /> more</p>",),
+            ("<ul> <li>First</li> <li>Second</li> </ul>",),
+            ('<a href="https://example.com/?a=1&b=2">Link</a>',),
+            ("<p>5 &lt; x &amp;&amp; y &gt; 3&nbsp;mg &#169; &#x41;</p>",),
+            ("<p>[Parameter] with x<sup>2</sup> and H<sub>2</sub>O</p>",),
+        ]
+    )
+    def test_strip_editor_html_matches_html_parser(self, html):
+        text = _utils._strip_editor_html(html)
+        assert text is not None
+        assert text == BeautifulSoup(html, "lxml").text
+
+    @parameterized.expand(
+        [
+            ("<title>Title</title>",),
+            ("<p>Unclosed paragraph",),
+            ("<b><i>Misnested</b></i>",),
+            ("<p>Comment<!-- comment --></p>",),
+            ("<table><tr><td>Cell</td></tr></table>",),
+            ("<p>Unknown &entity; and bare & ampersand</p>",),
+            ("x < y",),
+            ("<p>a</p>\t<p>b</p>",),
+            ("Carriage\r\nreturn",),
+        ]
+    )
+    def test_strip_editor_html_leaves_other_html_to_parser(self, html):
+        assert _utils._strip_editor_html(html) is None
+        assert _utils.strip_html(html) == BeautifulSoup(html, "lxml").text
+
     @parameterized.expand(
         [
             ("text with [parameter]", "text with parameter"),
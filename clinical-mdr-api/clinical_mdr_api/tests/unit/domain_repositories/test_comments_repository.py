@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+import pytest
+
+from clinical_mdr_api.domain_repositories.comments import comments_repository
+from clinical_mdr_api.domain_repositories.comments.comments_repository import (
+    INCREMENT_VERSIONS_QUERY,
+    VERSIONS_QUERY,
+    CommentsRepository,
+)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.version = 3
+        self.topic_version = None
+        self.queries = []
+        self.params = []
+
+    def cypher_query(self, query, params=None):
+        self.queries.append(query)
+        self.params.append(params)
+        if query == VERSIONS_QUERY:
+            # by default, no topic with the exact path, the version of all comments is used
+            return [[self.version, self.topic_version]], None
+        if "RETURN COUNT(thread) as total" in query:
+            return [[0]], None
+        if "$since" in query:
+            assert params["since"] in (0, 2)
+            return [[None, None, "CommentThread_000001"] + [None] * 9 + [True, []]], [
+                "topic.uid",
+                "topic.topic_path",
+                "thread.uid",
+                "thread.text",
+                "thread.author",
+                "thread.author_display_name",
+                "thread.status",
+                "thread.created_at",
+                "thread.modified_at",
+                "thread.status_modified_at",
+                "thread.status_modified_by",
+                "thread.deleted_at",
+                "thread.is_deleted",
+                "replies",
+            ]
+        return [], []
+
+    def list_queries(self):
+        return [
+            query for query in self.queries if "ORDER BY thread.created_at" in query
+        ]
+
+
+@pytest.fixture(name="database")
+def fixture_database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(comments_repository.db, "cypher_query", database.cypher_query)
+    CommentsRepository.cache_store_lists.clear()
+    CommentsRepository.cache_store_versions.clear()
+    yield database
+    CommentsRepository.cache_store_lists.clear()
+    CommentsRepository.cache_store_versions.clear()
+
+
+def test_threads_are_read_once_per_version(database):
+    repository = CommentsRepository()
+
+    repository.find_all_comment_threads(topic_path="studies/Study_000001")
+    repository.find_all_comment_threads(topic_path="studies/Study_000001")
+    assert len(database.list_queries()) == 1
+    # the version is reused within the staleness bound
+    assert database.queries.count(VERSIONS_QUERY) == 1
+
+    # other parameters are listed separately
+    repository.find_all_comment_threads(topic_path="studies/Study_000001", page_size=10)
+    assert len(database.list_queries()) == 2
+
+    # a change made through another worker, seen once the version is read again
+    database.version += 1
+    CommentsRepository.cache_store_versions.clear()
+    repository.find_all_comment_threads(topic_path="studies/Study_000001")
+    assert len(database.list_queries()) == 3
+
+
+def test_threads_of_a_topic_are_read_again_once_it_has_a_version(database):
+    repository = CommentsRepository()
+    database.version = 1
+    repository.find_all_comment_threads(topic_path="T")
+
+    # the first thread created on the topic, its version is now the former version of all comments
+    database.version = 2
+    database.topic_version = 1
+    CommentsRepository.cache_store_versions.clear()
+    repository.find_all_comment_threads(topic_path="T")
+
+    assert len(database.list_queries()) == 2
+
+
+@pytest.mark.parametrize(
+    "since, expected_deleted_thread_uids, expected_change_sequence",
+    [
+        # all threads
+        (0, ["CommentThread_000001"], 3),
+        (2, ["CommentThread_000001"], 3),
+        # nothing changed after the last change
+        (3, [], 3),
+        # sequence read from another worker, this one didn't see the change yet
+        (4, [], 4),
+    ],
+)
+def test_find_comment_threads_changed_since(
+    database, since, expected_deleted_thread_uids, expected_change_sequence
+):
+    (
+        threads,
+        deleted_thread_uids,
+        change_sequence,
+    ) = CommentsRepository().find_comment_threads_changed_since(since=since)
+
+    assert not threads
+    assert deleted_thread_uids == expected_deleted_thread_uids
+    assert change_sequence == expected_change_sequence
+    assert len([query for query in database.queries if "$since" in query]) == len(
+        expected_deleted_thread_uids
+    )
+
+
+def test_reply_changes_write_the_change_sequence_of_the_reply(database, monkeypatch):
+    node = SimpleNamespace(
+        reply_to=SimpleNamespace(single=lambda: SimpleNamespace(uid="Thread_1")),
+        save=lambda: None,
+    )
+    monkeypatch.setattr(
+        comments_repository.CommentReply,
+        "nodes",
+        SimpleNamespace(first_or_none=lambda uid: node),
+    )
+
+    CommentsRepository().delete_comment_reply("Reply_1")
+
+    assert database.queries == [INCREMENT_VERSIONS_QUERY]
+    assert database.params == [{"thread_uid": "Thread_1", "reply_uid": "Reply_1"}]
+    assert node.is_deleted
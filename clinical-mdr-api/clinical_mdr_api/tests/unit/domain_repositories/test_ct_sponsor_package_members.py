@@ -0,0 +1,106 @@
+import pytest
+
+from clinical_mdr_api.domain_repositories.controlled_terminologies import (
+    ct_sponsor_package_members,
+)
+from clinical_mdr_api.domain_repositories.controlled_terminologies.ct_sponsor_package_members import (
+    CREATE_CODELIST_MEMBERS_QUERY,
+    CREATE_TERM_MEMBERS_QUERY,
+    DELETE_CODELIST_MEMBERS_QUERY,
+    DELETE_TERM_MEMBERS_QUERY,
+    REFRESH_CODELIST_MEMBERS_QUERY,
+    REFRESH_TERM_MEMBERS_QUERY,
+    create_sponsor_package_members,
+    get_codelist_members_match_clause,
+    get_term_members_match_clause,
+    refresh_sponsor_package_codelist_members,
+    refresh_sponsor_package_term_members,
+)
+
+
+@pytest.mark.parametrize(
+    "library_name, expected_filter",
+    [
+        ("Sponsor", "AND member.in_sponsor_library"),
+        ("CDISC", "AND member.in_parent_package"),
+        (None, None),
+    ],
+)
+@pytest.mark.parametrize(
+    "get_match_clause, member_label",
+    [
+        (get_term_members_match_clause, "CTPackageSponsorTerm"),
+        (get_codelist_members_match_clause, "CTPackageSponsorCodelist"),
+    ],
+)
+def test_members_match_clause_filters_library(
+    get_match_clause, member_label, library_name, expected_filter
+):
+    match_clause = get_match_clause(library_name)
+
+    assert f"(member:{member_label})" in match_clause
+    assert "package.name=$package_name" in match_clause
+    if expected_filter:
+        assert expected_filter in match_clause
+    else:
+        assert "AND member." not in match_clause
+
+
+@pytest.fixture(name="queries")
+def fixture_queries(monkeypatch):
+    queries = []
+    monkeypatch.setattr(
+        ct_sponsor_package_members.db,
+        "cypher_query",
+        lambda query, params=None: queries.append((query, params)),
+    )
+    return queries
+
+
+def test_create_sponsor_package_members(queries):
+    create_sponsor_package_members("Sponsor SDTM CT 2020-06-26")
+
+    assert queries == [
+        (CREATE_TERM_MEMBERS_QUERY, {"package_name": "Sponsor SDTM CT 2020-06-26"}),
+        (
+            CREATE_CODELIST_MEMBERS_QUERY,
+            {"package_name": "Sponsor SDTM CT 2020-06-26"},
+        ),
+    ]
+    assert ":CONTAINS_SPONSOR_TERM]->(member:CTPackageSponsorTerm" in queries[0][0]
+    assert (
+        ":CONTAINS_SPONSOR_CODELIST]->(member:CTPackageSponsorCodelist" in queries[1][0]
+    )
+    # The members are resolved as of the end of the effective date, also when it has not passed yet
+    assert "exact_datetime >= datetime()" not in queries[0][0]
+    assert "$uid" not in queries[0][0]
+
+
+@pytest.mark.parametrize(
+    "refresh, delete_query, refresh_query",
+    [
+        (
+            refresh_sponsor_package_term_members,
+            DELETE_TERM_MEMBERS_QUERY,
+            REFRESH_TERM_MEMBERS_QUERY,
+        ),
+        (
+            refresh_sponsor_package_codelist_members,
+            DELETE_CODELIST_MEMBERS_QUERY,
+            REFRESH_CODELIST_MEMBERS_QUERY,
+        ),
+    ],
+)
+def test_refresh_sponsor_package_members(queries, refresh, delete_query, refresh_query):
+    refresh("C12345")
+
+    assert queries == [
+        (delete_query, {"uid": "C12345"}),
+        (refresh_query, {"uid": "C12345"}),
+    ]
+    for query, _ in queries:
+        # Only in the packages whose effective date has not passed
+        assert "exact_datetime >= datetime()" in query
+        assert "$package_name" not in query
+    # Only the members of the saved item, in both the parent package and the Sponsor library
+    assert refresh_query.count("AND root.uid = $uid") == 2
@@ -0,0 +1,146 @@
+import pytest
+
+from clinical_mdr_api.domain_repositories.dictionaries import dictionary_term_repository
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_lookup_index import (
+    DictionaryTermLookupEntry,
+    DictionaryTermLookupIndex,
+)
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_repository import (
+    INCREMENT_LOOKUP_VERSION_QUERY,
+    LOOKUP_TERMS_QUERY,
+    LOOKUP_VERSION_QUERY,
+    DictionaryTermGenericRepository,
+)
+
+TERMS = [
+    ("Term_000001", "Hypertension", "38341003"),
+    ("Term_000002", "Pulmonary hypertension", "70995007"),
+    ("Term_000003", "Hypertensive disorder", "38341004"),
+    ("Term_000004", "Hypotension", "45007003"),
+    ("Term_000005", "Essential hypertension", "59621000"),
+    ("Term_000006", "Hypertension", None),
+]
+
+
+@pytest.fixture(name="index")
+def fixture_index():
+    return DictionaryTermLookupIndex(DictionaryTermLookupEntry(*term) for term in TERMS)
+
+
+def _uids(entries):
+    return [entry.term_uid for entry in entries]
+
+
+def test_search_returns_names_starting_with_search_string_first(index):
+    assert _uids(index.search("HYPERTENS")) == [
+        "Term_000001",
+        "Term_000006",
+        "Term_000003",
+        "Term_000005",
+        "Term_000002",
+    ]
+
+
+def test_search_limits_results(index):
+    assert _uids(index.search("hyp", result_count=2)) == [
+        "Term_000001",
+        "Term_000006",
+    ]
+    assert _uids(index.search("tension", result_count=1)) == ["Term_000005"]
+
+
+def test_search_with_short_search_string_only_matches_start_of_names(index):
+    assert _uids(index.search("hy")) == [
+        "Term_000001",
+        "Term_000006",
+        "Term_000003",
+        "Term_000004",
+    ]
+    assert not index.search("te")
+    assert not index.search("unknown")
+
+
+def test_find_by_names_matches_exact_names(index):
+    found = index.find_by_names(["Hypertension", "hypotension", "Unknown"])
+
+    assert _uids(found["Hypertension"]) == ["Term_000001", "Term_000006"]
+    assert not found["hypotension"]
+    assert not found["Unknown"]
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.version = 0
+        self.queries = []
+
+    def cypher_query(self, query, params=None):
+        self.queries.append(query)
+        if query == LOOKUP_VERSION_QUERY:
+            if params["codelist_uid"] != "DictionaryCodelist_000001":
+                return [], None
+            return [[self.version]], None
+        if query == LOOKUP_TERMS_QUERY:
+            return [list(term) for term in TERMS], None
+        if query == INCREMENT_LOOKUP_VERSION_QUERY:
+            self.version += 1
+        return [], None
+
+
+@pytest.fixture(name="database")
+def fixture_database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(
+        dictionary_term_repository.db, "cypher_query", database.cypher_query
+    )
+    DictionaryTermGenericRepository.cache_store_lookup_indexes.clear()
+    DictionaryTermGenericRepository.cache_store_lookup_versions.clear()
+    yield database
+    DictionaryTermGenericRepository.cache_store_lookup_indexes.clear()
+    DictionaryTermGenericRepository.cache_store_lookup_versions.clear()
+
+
+def test_lookup_index_is_read_once_per_version(database):
+    repository = DictionaryTermGenericRepository()
+
+    index = repository.get_lookup_index("DictionaryCodelist_000001")
+    assert len(index) == len(TERMS)
+    assert repository.get_lookup_index("DictionaryCodelist_000001") is index
+    assert database.queries.count(LOOKUP_TERMS_QUERY) == 1
+
+    # a term saved through this worker invalidates the index
+    repository._increment_lookup_version("DictionaryCodelist_000001")
+    DictionaryTermGenericRepository.cache_store_lookup_versions.clear()
+
+    assert repository.get_lookup_index("DictionaryCodelist_000001") is not index
+    assert database.queries.count(LOOKUP_TERMS_QUERY) == 2
+    # the index of the codelist is replaced
+    assert list(DictionaryTermGenericRepository.cache_store_lookup_indexes) == [
+        "DictionaryCodelist_000001"
+    ]
+
+
+def test_previous_lookup_index_is_served_while_read_again(database):
+    repository = DictionaryTermGenericRepository()
+    index = repository.get_lookup_index("DictionaryCodelist_000001")
+
+    repository._increment_lookup_version("DictionaryCodelist_000001")
+    DictionaryTermGenericRepository.cache_store_lookup_versions.clear()
+
+    # another request is reading the index again
+    read_lock = DictionaryTermGenericRepository.lock_store_lookup_index_reads[
+        "DictionaryCodelist_000001"
+    ]
+    with read_lock:
+        assert repository.get_lookup_index("DictionaryCodelist_000001") is index
+    assert database.queries.count(LOOKUP_TERMS_QUERY) == 1
+
+    assert repository.get_lookup_index("DictionaryCodelist_000001") is not index
+    assert database.queries.count(LOOKUP_TERMS_QUERY) == 2
+
+
+def test_lookup_index_of_unknown_codelist(database):
+    assert (
+        DictionaryTermGenericRepository().get_lookup_index("DictionaryCodelist_999")
+        is None
+    )
+    assert LOOKUP_TERMS_QUERY not in database.queries
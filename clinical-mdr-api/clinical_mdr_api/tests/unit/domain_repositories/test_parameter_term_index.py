@@ -0,0 +1,107 @@
+from clinical_mdr_api.config import OPERATOR_PARAMETER_NAME
+from clinical_mdr_api.domain_repositories.template_parameters import (
+    parameter_term_index,
+)
+from clinical_mdr_api.domain_repositories.template_parameters.parameter_term_index import (
+    GENERATION_QUERY,
+    PARAMETER_TERMS_QUERY,
+    TemplateParameterTermIndex,
+    _index_parameter,
+    _ParameterTerm,
+)
+
+
+def _term(uid, name, parameter, **kwargs):
+    values = {
+        "uid": uid,
+        "name": name,
+        "name_sentence_case": None,
+        "numeric_value": None,
+        "type": parameter,
+        "is_direct_term": parameter == "Intervention",
+        "is_ct_term": False,
+        "is_requested": False,
+    }
+    values.update(kwargs)
+    return _ParameterTerm(**values)
+
+
+ROWS = [
+    _term("Compound_000002", "Metformin", "Compound"),
+    _term("Compound_000001", "Insulin", "Compound", name_sentence_case="insulin"),
+    _term("Compound_000003", "Aspirin", "Intervention"),
+    # also a term of the child parameter, only listed once
+    _term("Compound_000003", "Aspirin", "Compound"),
+    _term("Compound_000004", "Requested", "Compound", is_requested=True),
+]
+
+
+def test_index_parameter_template_terms():
+    indexed = _index_parameter("Intervention", ROWS)
+
+    assert list(indexed.template_terms) == [
+        {"uid": "Compound_000003", "name": "Aspirin", "type": "Intervention"},
+        {"uid": "Compound_000002", "name": "Metformin", "type": "Compound"},
+        {"uid": "Compound_000001", "name": "insulin", "type": "Compound"},
+    ]
+
+
+def test_index_parameter_values():
+    indexed = _index_parameter("Intervention", ROWS)
+
+    assert [value["name"] for value in indexed.values] == [
+        "Aspirin",
+        "Insulin",
+        "Metformin",
+    ]
+    assert indexed.folded_names == ("aspirin", "insulin", "metformin")
+
+
+def test_index_parameter_orders_numeric_values_by_value():
+    rows = [
+        _term(f"NumericValue_{value}", str(value), "NumericValue", numeric_value=value)
+        for value in (10, 2, 1.5)
+    ]
+
+    indexed = _index_parameter("NumericValue", rows)
+
+    assert [term["name"] for term in indexed.template_terms] == ["1.5", "2", "10"]
+
+
+def test_index_parameter_operators_are_direct_ct_terms():
+    rows = [
+        _term("C1", "=", OPERATOR_PARAMETER_NAME, is_direct_term=True, is_ct_term=True),
+        _term("C2", "<", OPERATOR_PARAMETER_NAME, is_direct_term=True, is_ct_term=True),
+        _term("X1", "about", OPERATOR_PARAMETER_NAME, is_direct_term=True),
+    ]
+
+    indexed = _index_parameter(OPERATOR_PARAMETER_NAME, rows)
+
+    assert [term["uid"] for term in indexed.template_terms] == ["C2", "C1"]
+
+
+def test_terms_are_indexed_again_after_a_new_ct_term_version(monkeypatch):
+    generation = {"term_versions": 10, "ct_term_versions": 20}
+    names = ["Week"]
+
+    def cypher_query(query, params=None):
+        if query == GENERATION_QUERY:
+            return [[generation["term_versions"], generation["ct_term_versions"]]], None
+        assert query == PARAMETER_TERMS_QUERY
+        assert params == {"name": "TimeUnit"}
+        return [
+            ["CTTerm_000001_name", names[0], None, None, "TimeUnit", True, True, False]
+        ], None
+
+    monkeypatch.setattr(parameter_term_index.db, "cypher_query", cypher_query)
+    TemplateParameterTermIndex.cache_store_terms.clear()
+
+    assert TemplateParameterTermIndex.get_values("TimeUnit")[0]["name"] == "Week"
+
+    # a new final version of the name of the CT term
+    names[0] = "Weeks"
+    assert TemplateParameterTermIndex.get_values("TimeUnit")[0]["name"] == "Week"
+    generation["ct_term_versions"] += 1
+    assert TemplateParameterTermIndex.get_values("TimeUnit")[0]["name"] == "Weeks"
+
+    TemplateParameterTermIndex.cache_store_terms.clear()
@@ -0,0 +1,161 @@
+import re
+
+import pytest
+
+from clinical_mdr_api.domain_repositories.study_definitions import (
+    study_clone_repository,
+)
+from clinical_mdr_api.domain_repositories.study_definitions.study_clone_repository import (
+    CLONE_NODES_QUERY,
+    CLONE_RELATIONSHIPS_QUERY,
+    REMOVE_CLONE_TRACKING_QUERY,
+    REMOVE_CLONES_QUERY,
+    StudyCloneRepository,
+    format_uid,
+)
+from clinical_mdr_api.domain_repositories.study_selections.study_activity_schedule_repository import (
+    StudyActivityScheduleRepository,
+)
+
+SOURCE_IDS = {
+    "StudyArm": ["arm_1", "arm_2", "arm_3"],
+    "StudyVisit": ["visit_1"],
+    "StudySoAGroup": ["soa_group_1"],
+}
+SCHEDULE_SOURCE_IDS = {
+    "StudyActivity": ["activity_1", "activity_2"],
+    "StudyActivitySchedule": ["schedule_1"],
+}
+
+
+class FakeDatabase:
+    def __init__(self, fail_on_relationships=False):
+        self.fail_on_relationships = fail_on_relationships
+        self.source_ids = SOURCE_IDS
+        self.counters = {"StudyArm": 10}
+        self.queries = []
+
+    def cypher_query(self, query, params=None):
+        params = params or {}
+        self.queries.append((query, params))
+        if "-[:LATEST]->" in query:
+            return [[f"{params['study_uid']}_value"]], None
+        if "RETURN DISTINCT elementId(source)" in query:
+            label = query.split("(source:")[1].split(")")[0]
+            return [[source_id] for source_id in self.source_ids.get(label, [])], None
+        if "apoc.atomic.add" in query:
+            label = re.search(r"counterId: ?'(\w+)Counter'", query).group(1)
+            self.counters[label] = self.counters.get(label, 0) + params.get("count", 1)
+            if "apoc.text.lpad" in query:
+                # ClinicalMdrNodeWithUID.get_next_free_uid_and_increment_counter
+                return [[format_uid(label, self.counters[label])]], None
+            return [[self.counters[label]]], None
+        if ":AUDIT_TRAIL]->" in query:
+            return [[f"action_{len(self.queries)}"]], None
+        if query == CLONE_RELATIONSHIPS_QUERY and self.fail_on_relationships:
+            raise RuntimeError("Connection lost")
+        return [], None
+
+    def params_of(self, query):
+        return [params for run_query, params in self.queries if run_query == query]
+
+
+@pytest.fixture(name="database")
+def fixture_database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(
+        study_clone_repository.db, "cypher_query", database.cypher_query
+    )
+    return database
+
+
+def test_format_uid():
+    assert format_uid("StudyArm", 42) == "StudyArm_000042"
+
+
+def test_clone_copies_components_in_batches(database):
+    counts = StudyCloneRepository(author="unknown-user", batch_size=2).clone(
+        source_study_uid="Study_000001", target_study_uid="Study_000002"
+    )
+
+    assert counts["StudyArm"] == 3
+    assert counts["StudyVisit"] == 1
+    assert counts["StudyObjective"] == 0
+
+    clone_batches = [
+        params["batch"]
+        for query, params in database.queries
+        if "CREATE (source)-[:CLONED_TO" in query
+    ]
+    # new uids follow the existing counter, in bounded batches
+    assert clone_batches[:2] == [
+        [
+            {"source_id": "arm_1", "uid": "StudyArm_000011"},
+            {"source_id": "arm_2", "uid": "StudyArm_000012"},
+        ],
+        [{"source_id": "arm_3", "uid": "StudyArm_000013"}],
+    ]
+    assert clone_batches[2] == [{"source_id": "visit_1", "uid": "StudyVisit_000001"}]
+
+    # a single audit record per copied component
+    audit_queries = [
+        query for query, _ in database.queries if ":AUDIT_TRAIL]->" in query
+    ]
+    assert len(audit_queries) == 3
+
+    # activity groupings are not linked to the study value
+    assert any(
+        "CREATE (sv)-[:HAS_STUDY_ARM]->(clone)" in query
+        for query, _ in database.queries
+    )
+    assert CLONE_NODES_QUERY.format(link_to_study_value="") in [
+        query for query, _ in database.queries
+    ]
+
+    assert (
+        sum(
+            len(params["batch"])
+            for params in database.params_of(REMOVE_CLONE_TRACKING_QUERY)
+        )
+        == 5
+    )
+    assert not database.params_of(REMOVE_CLONES_QUERY)
+
+
+def test_clone_removes_copies_on_failure(database):
+    database.fail_on_relationships = True
+
+    with pytest.raises(RuntimeError):
+        StudyCloneRepository(author="unknown-user").clone(
+            source_study_uid="Study_000001", target_study_uid="Study_000002"
+        )
+
+    assert (
+        sum(len(params["batch"]) for params in database.params_of(REMOVE_CLONES_QUERY))
+        == 5
+    )
+    assert not database.params_of(REMOVE_CLONE_TRACKING_QUERY)
+
+
+def test_clone_reserves_uids_from_the_counters_of_the_repositories(database):
+    database.source_ids = SCHEDULE_SOURCE_IDS
+
+    StudyCloneRepository(author="unknown-user").clone(
+        source_study_uid="Study_000001", target_study_uid="Study_000002"
+    )
+    clone_uids = [
+        item["uid"]
+        for query, params in database.queries
+        if "CREATE (source)-[:CLONED_TO" in query
+        for item in params["batch"]
+    ]
+    # schedules are numbered with the study activities, as by their repository
+    assert clone_uids == [
+        "StudyActivity_000001",
+        "StudyActivity_000002",
+        "StudyActivity_000003",
+    ]
+    assert "StudyActivitySchedule" not in database.counters
+
+    # the next schedule created through its repository doesn't reuse a cloned uid
+    assert StudyActivityScheduleRepository().generate_uid() == "StudyActivity_000004"
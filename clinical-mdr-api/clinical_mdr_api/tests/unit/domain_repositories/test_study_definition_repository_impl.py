@@ -0,0 +1,42 @@
+from clinical_mdr_api.domain_repositories.study_definitions.study_definition_repository_impl import (
+    StudyDefinitionRepositoryImpl,
+    _UsedStudyField,
+)
+
+USED_STUDY_FIELDS = [
+    _UsedStudyField("4:a:1", "confirmed_response_minimum_duration", 1, []),
+    _UsedStudyField("4:a:2", "is_extension_trial", True, []),
+    _UsedStudyField("4:a:3", "study_acronym", "ACR", []),
+    _UsedStudyField("4:a:4", "study_acronym", None, ["C48660", "C17998"]),
+]
+
+
+def test_find_study_field_used_in_study_by_value():
+    find = StudyDefinitionRepositoryImpl._find_study_field_used_in_study
+
+    assert find(USED_STUDY_FIELDS, "study_acronym", "ACR") == "4:a:3"
+    assert find(USED_STUDY_FIELDS, "study_acronym", "OTHER") is None
+    assert find(USED_STUDY_FIELDS, "is_extension_trial", True) == "4:a:2"
+    # as in Cypher, booleans don't equal to integers
+    assert find(USED_STUDY_FIELDS, "is_extension_trial", 1) is None
+    assert find(USED_STUDY_FIELDS, "confirmed_response_minimum_duration", True) is None
+    # a missing value never matches
+    assert find(USED_STUDY_FIELDS, "study_acronym", None) is None
+
+
+def test_find_study_field_used_in_study_by_null_value_code():
+    find = StudyDefinitionRepositoryImpl._find_study_field_used_in_study
+
+    assert find(USED_STUDY_FIELDS, "study_acronym", None, "C17998") == "4:a:4"
+    assert find(USED_STUDY_FIELDS, "study_acronym", "ACR", "C17998") == "4:a:4"
+    assert find(USED_STUDY_FIELDS, "is_extension_trial", None, "C17998") is None
+
+
+def test_get_study_field_audit_action():
+    get_action = StudyDefinitionRepositoryImpl._get_study_field_audit_action
+
+    assert get_action(has_before=False, has_after=True, to_delete=False) == "Create"
+    assert get_action(has_before=True, has_after=True, to_delete=False) == "Edit"
+    assert get_action(has_before=True, has_after=True, to_delete=True) == "Delete"
+    assert get_action(has_before=True, has_after=False, to_delete=False) == "Delete"
+    assert get_action(has_before=False, has_after=False, to_delete=False) is None
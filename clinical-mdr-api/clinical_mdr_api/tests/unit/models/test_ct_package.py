@@ -0,0 +1,158 @@
+from neo4j.time import DateTime
+
+from clinical_mdr_api.models.controlled_terminologies.ct_package import CTPackageChanges
+from clinical_mdr_api.repositories.ct_packages import (
+    change_set_to_changes,
+    changes_to_change_set,
+    codelist_diff,
+    get_change_counts,
+    term_diff,
+    update_modified_codelists,
+)
+
+OLD_DATE = DateTime(2022, 12, 16, 12, 0, 0)
+NEW_DATE = DateTime(2023, 3, 31, 12, 0, 0)
+
+
+class FakeNode(dict):
+    def __init__(self, element_id, **properties):
+        super().__init__(**properties)
+        self.element_id = element_id
+
+
+def _get_ct_packages_changes() -> dict:
+    # Same format as returned by get_ct_packages_changes
+    codelists = {
+        "C66737": {
+            "uid": "C66737",
+            "value_node": FakeNode("4:cl:2", name="Trial Phase", extensible=True),
+            "change_date": NEW_DATE,
+        },
+        "C66742": {
+            "uid": "C66742",
+            "value_node": FakeNode("4:cl:3", name="No Yes Response", extensible=False),
+            "change_date": OLD_DATE,
+        },
+    }
+    output = {
+        "new_codelists": [],
+        "deleted_codelists": [
+            {
+                "uid": "C66738",
+                "value_node": FakeNode("4:cl:4", name="Trial Summary Parameter"),
+                "change_date": OLD_DATE,
+            }
+        ],
+        "updated_codelists": [
+            codelist_diff(
+                {
+                    "uid": "C66737",
+                    "value_node": FakeNode(
+                        "4:cl:1", name="Trial Phase Response", extensible=True
+                    ),
+                    "change_date": OLD_DATE,
+                },
+                codelists["C66737"],
+            )
+        ],
+        "new_terms": [
+            {
+                "uid": "C49487",
+                "value_node": FakeNode("4:term:1", code_submission_value="N"),
+                "change_date": NEW_DATE,
+                "codelists": ["C66742"],
+            }
+        ],
+        "deleted_terms": [],
+        "updated_terms": [
+            term_diff(
+                {
+                    "uid": "C15600",
+                    "value_node": FakeNode("4:term:2", code_submission_value="PHASE I"),
+                    "change_date": OLD_DATE,
+                    "codelists": ["C66737"],
+                },
+                {
+                    "uid": "C15600",
+                    "value_node": FakeNode(
+                        "4:term:3", code_submission_value="PHASE I TRIAL"
+                    ),
+                    "change_date": NEW_DATE,
+                    "codelists": ["C66737"],
+                },
+            )
+        ],
+    }
+    update_modified_codelists(output=output, all_codelists_in_package=codelists)
+    return output
+
+
+def _store_and_read(change_set: list[dict], nodes: dict[str, FakeNode]) -> list[dict]:
+    # What CHANGE_SET_UPDATE_QUERY stores and CHANGE_SET_RETRIEVAL_QUERY reads back
+    return [
+        {
+            **change["properties"],
+            "old_value_node": nodes.get(change["old_value_node_id"]),
+            "new_value_node": nodes.get(change["new_value_node_id"]),
+        }
+        for change in change_set
+    ]
+
+
+def test_ct_packages_changes_round_trip_through_change_set():
+    changes = _get_ct_packages_changes()
+    nodes = {}
+    for items in changes.values():
+        for item in items:
+            for key in ["value_node", "old_value_node", "new_value_node"]:
+                if isinstance(item.get(key), FakeNode):
+                    nodes[item[key].element_id] = item[key]
+
+    change_set = changes_to_change_set(changes)
+    stored_changes = change_set_to_changes(_store_and_read(change_set, nodes))
+
+    assert len(change_set) == 5
+    assert CTPackageChanges.from_repository_output(
+        old_package_name="SDTM CT 2022-12-16",
+        new_package_name="SDTM CT 2023-03-31",
+        query_output=stored_changes,
+    ) == CTPackageChanges.from_repository_output(
+        old_package_name="SDTM CT 2022-12-16",
+        new_package_name="SDTM CT 2023-03-31",
+        query_output=changes,
+    )
+
+
+def test_ct_packages_change_set_links_values():
+    change_set = changes_to_change_set(_get_ct_packages_changes())
+
+    assert [
+        (
+            change["properties"]["item_type"],
+            change["properties"]["change_type"],
+            change["properties"]["uid"],
+            change["old_value_node_id"],
+            change["new_value_node_id"],
+        )
+        for change in change_set
+    ] == [
+        ("codelist", "deleted", "C66738", "4:cl:4", None),
+        ("codelist", "updated", "C66737", "4:cl:1", "4:cl:2"),
+        ("codelist", "updated", "C66742", None, "4:cl:3"),
+        ("term", "added", "C49487", None, "4:term:1"),
+        ("term", "updated", "C15600", "4:term:2", "4:term:3"),
+    ]
+    assert "is_change_of_codelist" not in change_set[1]["properties"]
+    assert change_set[2]["properties"]["is_change_of_codelist"] is False
+    assert change_set[3]["properties"]["codelists"] == ["C66742"]
+
+
+def test_ct_packages_change_counts():
+    assert get_change_counts(_get_ct_packages_changes()) == {
+        "added_codelists": 0,
+        "deleted_codelists": 1,
+        "updated_codelists": 2,
+        "added_terms": 1,
+        "deleted_terms": 0,
+        "updated_terms": 1,
+    }
@@ -0,0 +1,109 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import Field
+
+from clinical_mdr_api.models.utils import BaseModel, CustomPage, FastJSONResponse
+
+
+class Status(Enum):
+    DRAFT = "Draft"
+    FINAL = "Final"
+
+
+class Term(BaseModel):
+    uid: str
+    name: str | None = None
+
+
+class Item(BaseModel):
+    uid: str
+    name: str
+    status: Status
+    start_date: datetime
+    effective_date: date | None = None
+    version: Decimal | None = None
+    tags: set[str] = Field(default_factory=set)
+    term: Term | None = None
+    terms: list[Term] = Field(default_factory=list)
+    author_initials: str | None = None
+
+
+def _get_items() -> list[Item]:
+    return [
+        Item(
+            uid="Item_000001",
+            name="<p>Some [text] – ünïcode</p>",
+            status=Status.FINAL,
+            start_date=datetime(2023, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            effective_date=date(2023, 5, 2),
+            version=Decimal("1.5"),
+            tags={"a"},
+            term=Term(uid="Term_000001"),
+            terms=[Term(uid="Term_000002", name="Term 2")],
+        ),
+        Item(
+            uid="Item_000002",
+            name="Name",
+            status=Status.DRAFT,
+            start_date=datetime(2023, 5, 1),
+            author_initials=None,
+        ),
+    ]
+
+
+def _get_client(exclude_unset: bool) -> TestClient:
+    app = FastAPI()
+
+    @app.get(
+        "/validated",
+        response_model=CustomPage[Item],
+        response_model_exclude_unset=exclude_unset,
+    )
+    def get_validated():
+        return CustomPage.create(items=_get_items(), total=2, page=1, size=10)
+
+    @app.get(
+        "/fast",
+        response_model=CustomPage[Item],
+        response_model_exclude_unset=exclude_unset,
+    )
+    def get_fast():
+        # as returned by routes decorated with `fast_json_response`
+        return FastJSONResponse(
+            CustomPage.create(items=_get_items(), total=2, page=1, size=10),
+            exclude_unset=exclude_unset,
+        )
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("exclude_unset", [False, True])
+def test_fast_json_response_matches_validated_response(exclude_unset):
+    client = _get_client(exclude_unset)
+
+    validated = client.get("/validated")
+    fast = client.get("/fast")
+
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers["content-type"] == validated.headers["content-type"]
+    assert fast.json() == validated.json()
+
+
+def test_fast_json_response_schema_unchanged():
+    schema = _get_client(exclude_unset=True).get("/openapi.json").json()
+
+    assert (
+        schema["paths"]["/fast"]["get"]["responses"]
+        == schema["paths"]["/validated"]["get"]["responses"]
+    )
+
+
+def test_fast_json_response_falls_back_for_big_integers():
+    response = FastJSONResponse({"value": 2**70})
+
+    assert response.body == b'{"value":1180591620717411303424}'
@@ -12,6 +12,7 @@ from clinical_mdr_api.services.utils.table_f import (
     TableRow,
     TableWithFootnotes,
     table_to_docx,
+    table_to_docx_stream,
     table_to_html,
 )
 
@@ -334,6 +335,29 @@ def test_table_to_docx(test_table: TableWithFootnotes):
         compare_docx_footnotes(docx_doc, test_table.footnotes, DOCX_STYLES)
 
 
+@pytest.mark.parametrize("test_table", [TEST_TABLE])
+def test_table_to_docx_stream(test_table: TableWithFootnotes):
+    """Tests table_to_docx_stream() by comparing DOCX document to TableWithFootnotes input"""
+
+    docx_doc: docx.Document = docx.Document(
+        table_to_docx_stream(test_table, styles=DOCX_STYLES)
+    )
+
+    # THEN the document contains exactly one table
+    assert len(docx_doc.tables) == 1, "expected exactly 1 table in DOCX SoA"
+
+    compare_docx_table(docx_doc.tables[0], test_table, DOCX_STYLES)
+
+    if test_table.footnotes:
+        compare_docx_footnotes(docx_doc, test_table.footnotes, DOCX_STYLES)
+
+    # THEN header rows are repeated on each page
+    for row_idx, rowx in enumerate(docx_doc.tables[0].rows):
+        assert bool(rowx._tr.xpath("./w:trPr/w:tblHeader")) == (
+            row_idx < test_table.num_header_rows
+        ), f"unexpected repeat header setting in row {row_idx}"
+
+
 def compare_docx_table(
     tablex: docx.table.Table,
     test_table: TableWithFootnotes,
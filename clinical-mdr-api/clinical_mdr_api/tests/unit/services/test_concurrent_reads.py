@@ -0,0 +1,36 @@
+import contextvars
+import threading
+
+import pytest
+
+from clinical_mdr_api.services.utils.concurrent_reads import gather_concurrently
+
+request_id = contextvars.ContextVar("request_id")
+
+
+def test_gather_concurrently_returns_results_by_name():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def read(value):
+        # all reads must be running at the same time to pass the barrier
+        barrier.wait()
+        return value, request_id.get(), threading.current_thread().name
+
+    request_id.set("abc")
+    results = gather_concurrently(
+        {name: lambda name=name: read(name) for name in "xyz"}
+    )
+
+    assert list(results) == ["x", "y", "z"]
+    for name, (value, context_value, thread_name) in results.items():
+        assert value == name
+        assert context_value == "abc"
+        assert thread_name != threading.current_thread().name
+
+
+def test_gather_concurrently_raises_exception_of_failing_read():
+    def fail():
+        raise ValueError("failed read")
+
+    with pytest.raises(ValueError, match="failed read"):
+        gather_concurrently({"ok": lambda: 1, "fail": fail})
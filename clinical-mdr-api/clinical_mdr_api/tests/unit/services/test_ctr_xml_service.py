@@ -0,0 +1,50 @@
+import pytest
+
+from clinical_mdr_api.services.ctr_xml import ctr_xml_service
+from clinical_mdr_api.services.ctr_xml.ctr_xml_service import (
+    LIBRARY_GENERATION_QUERY,
+    CTRXMLService,
+)
+
+
+@pytest.fixture(name="renders")
+def fixture_renders(monkeypatch):
+    renders = []
+
+    def render_ctr_odm(_self, study_uid, study_value_version=None):
+        renders.append((study_uid, study_value_version))
+        return f"<ODM>{len(renders)}</ODM>"
+
+    monkeypatch.setattr(CTRXMLService, "_render_ctr_odm", render_ctr_odm)
+    CTRXMLService.cache_store_ctr_odm_by_version.clear()
+    yield renders
+    CTRXMLService.cache_store_ctr_odm_by_version.clear()
+
+
+def test_ctr_odm_is_rendered_again_when_the_library_changes(renders, monkeypatch):
+    generation = [10, 20, 30, 40, 50, 60]
+
+    def cypher_query(query, _params=None):
+        assert query == LIBRARY_GENERATION_QUERY
+        return [list(generation)], None
+
+    monkeypatch.setattr(ctr_xml_service.db, "cypher_query", cypher_query)
+    service = CTRXMLService()
+
+    assert service.get_ctr_odm("Study_000001", "1") == "<ODM>1</ODM>"
+    assert service.get_ctr_odm("Study_000001", "1") == "<ODM>1</ODM>"
+
+    # a new version of an ODM item
+    generation[2] += 1
+    assert service.get_ctr_odm("Study_000001", "1") == "<ODM>2</ODM>"
+    assert renders == [("Study_000001", "1"), ("Study_000001", "1")]
+
+
+def test_ctr_odm_of_the_latest_study_version_is_not_cached(renders, monkeypatch):
+    monkeypatch.setattr(ctr_xml_service.db, "cypher_query", None)
+    service = CTRXMLService()
+
+    service.get_ctr_odm("Study_000001")
+    service.get_ctr_odm("Study_000001")
+
+    assert renders == [("Study_000001", None), ("Study_000001", None)]
@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from clinical_mdr_api import models
+from clinical_mdr_api.listings.query_service import QueryService
+from clinical_mdr_api.services.listings.listings_sdtm import SDTMListingsService
+
+TE_ROW = {
+    "STUDYID": "CDISC DEV-0",
+    "DOMAIN": "TE",
+    "ETCD": 1,
+    "ELEMENT": "Screening",
+    "TESTRL": "Informed consent",
+    "TEENRL": None,
+    "TEDUR": "P14D",
+}
+
+
+@patch.object(QueryService, "save_materialized_dataset")
+@patch.object(QueryService, "get_materialized_dataset")
+@patch.object(QueryService, "get_te", return_value=[TE_ROW])
+def test_draft_datasets_are_computed_live(get_te, get_materialized, save_materialized):
+    items = SDTMListingsService()._get_dataset(
+        "TE", models.StudyElementListing, "Study_000001", None
+    )
+
+    assert items == [models.StudyElementListing.from_query(TE_ROW)]
+    get_te.assert_called_once_with(study_uid="Study_000001", study_value_version=None)
+    get_materialized.assert_not_called()
+    save_materialized.assert_not_called()
+
+
+@patch("clinical_mdr_api.services.listings.listings_sdtm.schedule_sdtm_datasets")
+@patch.object(QueryService, "save_materialized_dataset")
+@patch.object(QueryService, "get_materialized_dataset", return_value=None)
+@patch.object(QueryService, "get_te", return_value=[TE_ROW])
+def test_released_datasets_not_stored_yet_are_computed_live(
+    get_te, get_materialized, save_materialized, schedule
+):
+    items = SDTMListingsService()._get_dataset(
+        "TE", models.StudyElementListing, "Study_000001", "1.0"
+    )
+
+    assert items == [models.StudyElementListing.from_query(TE_ROW)]
+    get_materialized.assert_called_once()
+    get_te.assert_called_once()
+    # listing never writes, the dataset is stored in the background
+    save_materialized.assert_not_called()
+    schedule.assert_called_once_with(["Study_000001"], "1.0", domains=["TE"])
+
+
+@patch.object(QueryService, "save_materialized_dataset")
+@patch.object(QueryService, "get_materialized_dataset", return_value=None)
+@patch.object(QueryService, "get_te", return_value=[TE_ROW])
+def test_stored_datasets_are_served_from_the_stored_copy(
+    get_te, get_materialized, save_materialized
+):
+    service = SDTMListingsService()
+    service.materialize_datasets("Study_000001", "1.0", domains=["TE"])
+    items = [models.StudyElementListing.from_query(TE_ROW)]
+    save_materialized.assert_called_once()
+    stored_rows = save_materialized.call_args.kwargs["rows"]
+    assert stored_rows[0]["ELEMENT"] == "Screening"
+
+    # the stored copy parses back into the same response
+    get_materialized.return_value = stored_rows
+    get_te.reset_mock()
+    stored_items = service._get_dataset(
+        "TE", models.StudyElementListing, "Study_000001", "1.0"
+    )
+
+    assert [item.dict(exclude_unset=True) for item in stored_items] == [
+        item.dict(exclude_unset=True) for item in items
+    ]
+    get_te.assert_not_called()
+
+
+@patch.object(QueryService, "save_materialized_dataset")
+@patch.object(
+    QueryService,
+    "get_materialized_dataset",
+    side_effect=lambda domain, **_: [] if domain == "TS" else None,
+)
+@patch.object(QueryService, "get_ts", return_value=[])
+@patch.object(QueryService, "get_te", return_value=[TE_ROW])
+@patch.object(QueryService, "get_tdm", return_value=[])
+@patch.object(QueryService, "get_ti", return_value=[])
+@patch.object(QueryService, "get_ta", return_value=[])
+@patch.object(QueryService, "get_tv", return_value=[])
+def test_materialize_datasets_stores_all_domains_not_stored_yet(*mocks):
+    save_materialized = mocks[-1]
+
+    SDTMListingsService().materialize_datasets("Study_000001", "1.0")
+
+    assert [call.kwargs["domain"] for call in save_materialized.call_args_list] == [
+        "TV",
+        "TA",
+        "TI",
+        "TE",
+        "TDM",
+    ]
@@ -0,0 +1,131 @@
+import pytest
+
+from clinical_mdr_api import exceptions
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_lookup_index import (
+    DictionaryTermLookupEntry,
+    DictionaryTermLookupIndex,
+)
+from clinical_mdr_api.domain_repositories.dictionaries.dictionary_term_repository import (
+    DictionaryTermGenericRepository,
+)
+from clinical_mdr_api.domain_repositories.lookups import lookup_repository
+from clinical_mdr_api.domain_repositories.lookups.lookup_repository import (
+    CT_CODELIST_UIDS_QUERY,
+    CT_TERM_UIDS_QUERY,
+)
+from clinical_mdr_api.models.lookups import LookupItem, LookupType
+from clinical_mdr_api.services import lookups
+
+CODELISTS = {"Unit": "C71620", "Unit Subset": "C66781"}
+TERMS = {
+    ("C71620", "mg"): "C28253_MG",
+    ("C71620", "kg"): "C28252_KG",
+    ("C66781", "Dose Unit"): "C66781_DOSE",
+}
+ACTIVITIES = {"Weight": "Activity_000001", "Height": "Activity_000002"}
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.queries = []
+
+    def cypher_query(self, query, params=None):
+        self.queries.append(query)
+        if query == CT_CODELIST_UIDS_QUERY:
+            return [
+                [name, CODELISTS[name]] for name in params["names"] if name in CODELISTS
+            ], None
+        if query == CT_TERM_UIDS_QUERY:
+            keys = [(item["codelist_uid"], item["name"]) for item in params["items"]]
+            return [[*key, TERMS[key]] for key in keys if key in TERMS], None
+        if "(value:ActivityValue)" in query and "(root:ActivityRoot)" in query:
+            return [
+                [name, ACTIVITIES[name]]
+                for name in params["names"]
+                if name in ACTIVITIES
+            ], None
+        return [], None
+
+
+@pytest.fixture(name="database")
+def fixture_database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(lookup_repository.db, "cypher_query", database.cypher_query)
+    return database
+
+
+def test_resolve_uids_with_one_query_per_type(database):
+    items = [
+        LookupItem(type=LookupType.ACTIVITY, name="Weight"),
+        LookupItem(type=LookupType.CT_TERM, name="mg", codelist_name="Unit"),
+        LookupItem(type=LookupType.CT_TERM, name="kg", codelist_uid="C71620"),
+        LookupItem(type=LookupType.CT_TERM, name="Dose Unit", codelist_name="Unit"),
+        LookupItem(
+            type=LookupType.CT_TERM, name="Dose Unit", codelist_name="Unit Subset"
+        ),
+        LookupItem(type=LookupType.CT_TERM, name="mg", codelist_name="Unknown"),
+        LookupItem(type=LookupType.ACTIVITY, name="Height"),
+        LookupItem(type=LookupType.ACTIVITY, name="Unknown"),
+        LookupItem(type=LookupType.CT_CODELIST, name="Unit Subset"),
+        LookupItem(type=LookupType.COMPOUND, name="Weight"),
+    ]
+
+    results = lookups.resolve_uids(items)
+
+    assert [result.uid for result in results] == [
+        "Activity_000001",
+        "C28253_MG",
+        "C28252_KG",
+        None,
+        "C66781_DOSE",
+        None,
+        "Activity_000002",
+        None,
+        "C66781",
+        None,
+    ]
+    assert [(result.type, result.name) for result in results] == [
+        (item.type, item.name) for item in items
+    ]
+    # codelist names of terms, terms, activities, codelists and compounds
+    assert len(database.queries) == 5
+
+
+def test_resolve_dictionary_term_uids_from_lookup_index(database, monkeypatch):
+    index = DictionaryTermLookupIndex(
+        [
+            DictionaryTermLookupEntry("Term_000001", "mg", None),
+            DictionaryTermLookupEntry("Term_000002", "kg", None),
+        ]
+    )
+    monkeypatch.setattr(
+        DictionaryTermGenericRepository,
+        "get_lookup_index",
+        lambda self, codelist_uid: index if codelist_uid == "UCUM" else None,
+    )
+
+    results = lookups.resolve_uids(
+        [
+            LookupItem(type=LookupType.DICTIONARY_TERM, name="kg", codelist_uid="UCUM"),
+            LookupItem(type=LookupType.DICTIONARY_TERM, name="mL", codelist_uid="UCUM"),
+            LookupItem(
+                type=LookupType.DICTIONARY_TERM, name="kg", codelist_uid="SNOMED"
+            ),
+        ]
+    )
+
+    assert [result.uid for result in results] == ["Term_000002", None, None]
+    assert not database.queries
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        LookupItem(type=LookupType.CT_TERM, name="mg"),
+        LookupItem(type=LookupType.DICTIONARY_TERM, name="kg", codelist_name="UCUM"),
+    ],
+)
+def test_resolve_uids_requires_codelist(item, database):
+    with pytest.raises(exceptions.ValidationException):
+        lookups.resolve_uids([item])
+    assert not database.queries
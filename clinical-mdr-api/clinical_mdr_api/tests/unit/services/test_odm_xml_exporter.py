@@ -0,0 +1,186 @@
+import xml.etree.ElementTree as ET
+from threading import Thread
+from xml.dom.minidom import Document
+
+from clinical_mdr_api.domains._utils import ObjectStatus
+from clinical_mdr_api.domains.concepts.odms.odm_xml_definition import (
+    Alias,
+    Attribute,
+    Description,
+    Element,
+    TranslatedText,
+)
+from clinical_mdr_api.domains.concepts.utils import TargetType
+from clinical_mdr_api.services.concepts.odms import odm_xml_exporter
+from clinical_mdr_api.services.concepts.odms.odm_xml_exporter import (
+    RENDERED_GENERATION_QUERY,
+    OdmXmlExporterService,
+)
+from clinical_mdr_api.services.concepts.odms.odm_xml_stylesheets import (
+    OdmXmlStylesheetService,
+)
+from clinical_mdr_api.tests.utils.utils import xml_diff
+
+
+def _get_exporter(stylesheet: str | None = None) -> OdmXmlExporterService:
+    # Bypass __init__ as it fetches the ODM elements from the database
+    exporter = OdmXmlExporterService.__new__(OdmXmlExporterService)
+    exporter.stylesheet = stylesheet
+    exporter.xml_document = Document()
+    return exporter
+
+
+def _get_odm_element(name: str = 'Form <1> & "quoted"'):
+    return Element(
+        _custom_element_name="FormDef",
+        osb_ns=Attribute("xmlns:osb", "http://openstudybuilder.org"),
+        oid=Attribute("OID", "F.1"),
+        name=Attribute("Name", name),
+        version=Attribute("osb:version", 1.0),
+        description=Description(
+            [
+                TranslatedText("description & text", lang=Attribute("xml:lang", "en")),
+                TranslatedText("beskrivelse", lang=Attribute("xml:lang", "da")),
+            ]
+        ),
+        aliases=[
+            Alias(name=Attribute("Name", "alias"), context=Attribute("Context", "ctx"))
+        ],
+        domain_color=Element(_custom_element_name="osb:DomainColor", _string="#fff"),
+    )
+
+
+def test_written_odm_xml_matches_dom_output():
+    dom_exporter = _get_exporter()
+    dom_xml = dom_exporter._generate_odm_xml(
+        _get_odm_element(), dom_exporter.xml_document
+    ).toprettyxml(encoding="utf-8")
+
+    written_exporter = _get_exporter()
+    written_exporter.odm = _get_odm_element()
+    written_xml = written_exporter._write_odm_xml_document()
+
+    xml_diff(ET.fromstring(dom_xml), ET.fromstring(written_xml))
+
+
+def test_written_odm_xml_includes_stylesheet():
+    exporter = _get_exporter(stylesheet="sdtm")
+    exporter.odm = _get_odm_element()
+
+    rs = exporter._write_odm_xml_document().decode("utf-8")
+
+    assert rs.startswith('<?xml version="1.0" encoding="utf-8"?>')
+    assert '<?xml-stylesheet type="text/xsl" href="sdtm"?>' in rs
+    assert ET.fromstring(rs).attrib["Name"] == 'Form <1> & "quoted"'
+
+
+def test_written_odm_xml_is_pretty_printed_like_dom_output():
+    dom_exporter = _get_exporter()
+    dom_xml = dom_exporter._generate_odm_xml(
+        _get_odm_element("Form <1>"), dom_exporter.xml_document
+    ).toprettyxml(encoding="utf-8")
+
+    written_exporter = _get_exporter()
+    written_exporter.odm = _get_odm_element("Form <1>")
+
+    assert written_exporter._write_odm_xml_document() == dom_xml
+
+
+def test_rendered_documents_are_cached_per_output():
+    exporter = _get_exporter()
+    exporter.cache_store_rendered_document.clear()
+    renders = []
+
+    def render(output):
+        def _render():
+            renders.append(output)
+            return output.encode("utf-8")
+
+        return _render
+
+    cache_key = ("F.1", "form")
+    for output in ["xml", "html", "pdf", "xml", "html", "pdf"]:
+        assert exporter._get_rendered_document(
+            cache_key, output, render(output)
+        ) == output.encode("utf-8")
+    exporter._get_rendered_document(None, "xml", render("xml"))
+
+    assert renders == ["xml", "html", "pdf", "xml"]
+
+
+def test_cached_odm_xml_is_served_without_fetching_odm_elements(monkeypatch):
+    relationships = [["5:link:1", "4:value:1", {}, []]]
+
+    def cypher_query(query, params=None):
+        if query == RENDERED_GENERATION_QUERY:
+            return [[1, 2, 3, 4, 5, 6]], None
+        assert "OdmFormRoot {uid: $target_uid}" in query
+        assert params == {"target_uid": "OdmForm_000001"}
+        return [list(row) for row in relationships], None
+
+    extractions = []
+
+    def extract_odm(exporter):
+        extractions.append(exporter.target_uid)
+        exporter.odm = Element(
+            _custom_element_name="ODM",
+            file_oid=Attribute("FileOID", exporter.FILE_OID_PLACEHOLDER),
+            creation_date_time=Attribute(
+                "CreationDateTime", exporter.CREATION_DATE_TIME_PLACEHOLDER
+            ),
+        )
+
+    monkeypatch.setattr(odm_xml_exporter.db, "cypher_query", cypher_query)
+    monkeypatch.setattr(OdmXmlExporterService, "_extract_odm", extract_odm)
+    OdmXmlExporterService.cache_store_rendered_document.clear()
+
+    def export():
+        return ET.fromstring(
+            OdmXmlExporterService(
+                "OdmForm_000001",
+                TargetType.FORM,
+                ObjectStatus.LATEST_FINAL,
+                [],
+                False,
+                None,
+                None,
+                None,
+            ).get_odm_document()
+        )
+
+    first, second = export(), export()
+    assert extractions == ["OdmForm_000001"]
+    # Stamped on each response
+    for document in [first, second]:
+        assert document.attrib["FileOID"].startswith("OID.")
+        assert document.attrib["CreationDateTime"] != (
+            OdmXmlExporterService.CREATION_DATE_TIME_PLACEHOLDER
+        )
+
+    # e.g. a new version of an item of the form
+    relationships.append(["5:link:2", "4:value:2", {}, []])
+    export()
+    assert extractions == ["OdmForm_000001", "OdmForm_000001"]
+
+    OdmXmlExporterService.cache_store_rendered_document.clear()
+
+
+def test_compiled_stylesheets_are_not_shared_between_threads():
+    compiled = []
+    threads = [
+        Thread(
+            target=lambda: compiled.append(
+                OdmXmlStylesheetService.get_compiled_stylesheet("blank")
+            )
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert compiled[0] is not compiled[1]
+    assert OdmXmlStylesheetService.get_compiled_stylesheet(
+        "blank"
+    ) is OdmXmlStylesheetService.get_compiled_stylesheet("blank")
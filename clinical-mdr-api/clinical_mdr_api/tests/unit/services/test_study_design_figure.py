@@ -2076,3 +2076,25 @@ def test_get_svg_document():
     assert "markerWidth" in doc, '"markerWidth" found, missing arrowhead markers?'
 
     assert doc == SVG_DOCUMENT
+
+
+def test_get_svg_document_caches_study_versions():
+    calls = []
+
+    class CountingStudyDesignFigureService(MockStudyDesignFigureService):
+        def _draw_svg_document(self, study_uid, study_value_version=None):
+            calls.append((study_uid, study_value_version))
+            return super()._draw_svg_document(study_uid, study_value_version)
+
+    service = CountingStudyDesignFigureService()
+    CountingStudyDesignFigureService.cache_store_svg_by_study_version.clear()
+
+    # WHEN drawing a specific study version twice THEN it is drawn only once
+    doc = service.get_svg_document(STUDY_UID, study_value_version="1")
+    assert service.get_svg_document(STUDY_UID, study_value_version="1") == doc
+    assert calls == [(STUDY_UID, "1")]
+
+    # WHEN drawing the latest (draft) version THEN it is always drawn
+    service.get_svg_document(STUDY_UID)
+    service.get_svg_document(STUDY_UID)
+    assert calls == [(STUDY_UID, "1"), (STUDY_UID, None), (STUDY_UID, None)]
@@ -31,6 +31,8 @@ from clinical_mdr_api.models.study_selections.study_soa_footnote import (
 from clinical_mdr_api.models.syntax_instances.footnote import FootnoteTemplateWithType
 from clinical_mdr_api.services.studies.study_flowchart import StudyFlowchartService
 from clinical_mdr_api.services.utils.table_f import (
+    COMPACT_TABLE_MODEL,
+    CompactTable,
     Ref,
     SimpleFootnote,
     TableCell,
@@ -192,6 +194,51 @@ def test_get_flowchart_table(study_flowchart_service):
     assert table.dict() == DETAILED_SOA_TABLE.dict()
 
 
+def _rendered_contents(table: TableWithFootnotes | CompactTable):
+    return (
+        [
+            (
+                row.hide,
+                [
+                    (
+                        cell.text,
+                        cell.span,
+                        cell.style,
+                        [(ref.type, ref.uid) for ref in cell.refs or []],
+                        cell.footnotes,
+                        cell.vertical,
+                    )
+                    for cell in row.cells
+                ],
+            )
+            for row in table.rows
+        ],
+        table.footnotes,
+        table.num_header_rows,
+        table.num_header_cols,
+        table.title,
+    )
+
+
+def test_get_compact_flowchart_table(study_flowchart_service):
+    table = study_flowchart_service.get_flowchart_table(study_uid="", time_unit="day")
+    compact_table = study_flowchart_service.get_flowchart_table(
+        study_uid="", time_unit="day", table_model=COMPACT_TABLE_MODEL
+    )
+
+    assert isinstance(compact_table, CompactTable)
+    assert _rendered_contents(compact_table) == _rendered_contents(table)
+
+    StudyFlowchartService.propagate_hidden_rows(table)
+    StudyFlowchartService.add_protocol_section_column(table)
+    StudyFlowchartService.propagate_hidden_rows(compact_table)
+    StudyFlowchartService.add_protocol_section_column(
+        compact_table, table_model=COMPACT_TABLE_MODEL
+    )
+
+    assert _rendered_contents(compact_table) == _rendered_contents(table)
+
+
 def test_propagate_hidden_rows():
     table = deepcopy(DETAILED_SOA_TABLE)
     StudyFlowchartService.propagate_hidden_rows(table)
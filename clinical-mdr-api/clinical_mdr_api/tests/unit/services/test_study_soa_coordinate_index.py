@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from clinical_mdr_api.services.studies.study_flowchart import StudyFlowchartService
+from clinical_mdr_api.services.studies.study_soa_coordinate_index import (
+    StudySoACoordinateIndex,
+    get_footnote_number,
+)
+
+COORDINATES = {
+    "StudyEpoch_000001": (0, 1),
+    "StudyVisit_000001": (1, 1),
+    "StudyVisit_000002": (1, 2),
+    "StudyActivity_000001": (5, 0),
+    "StudyActivitySchedule_000001": (5, 1),
+    "StudyActivity_000002": (6, 0),
+    "StudyActivitySchedule_000002": (6, 2),
+}
+
+
+def _footnote(uid, *item_uids):
+    return SimpleNamespace(
+        uid=uid,
+        referenced_items=[SimpleNamespace(item_uid=item_uid) for item_uid in item_uids],
+    )
+
+
+FOOTNOTES = [
+    _footnote("StudySoAFootnote_000001", "StudyVisit_000002"),
+    _footnote(
+        "StudySoAFootnote_000002", "StudyActivity_000002", "StudyActivity_000001"
+    ),
+    _footnote("StudySoAFootnote_000003", "StudyActivitySchedule_000002"),
+    # references a removed activity only
+    _footnote("StudySoAFootnote_000004", "StudyActivity_000003"),
+]
+
+
+@pytest.mark.parametrize(
+    "referenced_item_uids, expected_number",
+    [
+        (["StudyEpoch_000001"], 1),
+        (["StudyVisit_000001", "StudyActivity_000002"], 1),
+        # footnotes referencing the same first item are numbered after existing ones
+        (["StudyVisit_000002"], 2),
+        (["StudyActivitySchedule_000001"], 3),
+        (["StudyActivitySchedule_000002", "StudyActivity_000001"], 3),
+        (["StudyActivitySchedule_000002"], 4),
+        (["StudyActivity_000003"], 5),
+        ([], 5),
+    ],
+)
+def test_get_footnote_number(referenced_item_uids, expected_number):
+    assert (
+        get_footnote_number(COORDINATES, FOOTNOTES, referenced_item_uids)
+        == expected_number
+    )
+
+
+def test_get_footnote_number_without_footnotes():
+    assert get_footnote_number(COORDINATES, [], ["StudyActivity_000002"]) == 1
+
+
+def test_get_coordinates_per_generation(monkeypatch):
+    generation = {"Study_000001": 10}
+    built = []
+
+    def get_flowchart_item_uid_coordinates(_self, study_uid):
+        built.append(study_uid)
+        return dict(COORDINATES)
+
+    monkeypatch.setattr(
+        StudySoACoordinateIndex,
+        "get_generation",
+        classmethod(lambda cls, study_uid: generation[study_uid]),
+    )
+    monkeypatch.setattr(
+        StudyFlowchartService, "__init__", lambda self: None, raising=False
+    )
+    monkeypatch.setattr(
+        StudyFlowchartService,
+        "get_flowchart_item_uid_coordinates",
+        get_flowchart_item_uid_coordinates,
+    )
+    StudySoACoordinateIndex.cache_store_coordinates.clear()
+
+    assert StudySoACoordinateIndex.get_coordinates("Study_000001") == COORDINATES
+    StudySoACoordinateIndex.get_coordinates("Study_000001")
+    assert built == ["Study_000001"]
+
+    # activities, visits or schedules of the study were changed
+    generation["Study_000001"] = 11
+    StudySoACoordinateIndex.get_coordinates("Study_000001")
+    assert built == ["Study_000001", "Study_000001"]
+
+    StudySoACoordinateIndex.cache_store_coordinates.clear()
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+from clinical_mdr_api.services.studies import study_version_artefacts
+from clinical_mdr_api.services.studies.study_version_artefacts import (
+    precompute_study_version_artefacts,
+)
+
+
+def test_precompute_study_version_artefacts(monkeypatch):
+    built = []
+
+    def fail():
+        raise ValueError("No study visits")
+
+    def get_study_version_artefacts(study_uid, study_value_version):
+        return {
+            "flowchart": lambda: built.append((study_uid, study_value_version)),
+            "design figure": fail,
+        }
+
+    monkeypatch.setattr(
+        study_version_artefacts,
+        "get_study_version_artefacts",
+        get_study_version_artefacts,
+    )
+
+    timings = precompute_study_version_artefacts(["Study_000001", "Study_000002"], "1")
+
+    assert built == [("Study_000001", "1"), ("Study_000002", "1")]
+    # a document that can't be built doesn't stop the others
+    assert list(timings) == ["Study_000001 flowchart", "Study_000002 flowchart"]
+
+
+def test_schedule_study_version_artefacts_when_disabled(monkeypatch):
+    monkeypatch.setattr(
+        study_version_artefacts.config, "PRECOMPUTE_STUDY_VERSIONS", False
+    )
+    monkeypatch.setattr(study_version_artefacts, "_executor", None)
+
+    study_version_artefacts.schedule_study_version_artefacts(["Study_000001"], "1")
+
+
+def test_materialize_sdtm_datasets(monkeypatch):
+    materialized = []
+
+    class SDTMListingsService:
+        def materialize_datasets(self, study_uid, study_value_version, domains=None):
+            if study_uid == "Study_000001":
+                raise ValueError("No study visits")
+            materialized.append((study_uid, study_value_version, domains))
+
+    monkeypatch.setattr(
+        study_version_artefacts, "SDTMListingsService", SDTMListingsService
+    )
+
+    study_version_artefacts.materialize_sdtm_datasets(
+        ["Study_000001", "Study_000002"], "1", domains=["TS"]
+    )
+
+    # the datasets of a study that can't be stored don't stop the others
+    assert materialized == [("Study_000002", "1", ["TS"])]
+
+
+def test_deferred_services_resolve_in_fresh_interpreter():
+    # ctr_xml_service imports the study service, which imports this module and its deferred imports,
+    # these used to deadlock when resolved while a deferred import was being resolved
+    code = """
+from clinical_mdr_api.utils.deferred_import import deferred_import
+deferred_import("clinical_mdr_api.services.ctr_xml.ctr_xml_service", "CTRXMLService").resolve()
+from clinical_mdr_api.services.studies import study_version_artefacts
+for service in (
+    study_version_artefacts.StudyFlowchartService,
+    study_version_artefacts.StudyDesignFigureService,
+):
+    print(service.resolve().__name__)
+"""
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=os.environ | {"PYTHONPATH": os.pathsep.join(sys.path)},
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+
+    assert result.stdout.split() == [
+        "StudyFlowchartService",
+        "StudyDesignFigureService",
+    ]
@@ -0,0 +1,129 @@
+import re
+
+import pytest
+
+from clinical_mdr_api.models.utils import BaseModel
+from clinical_mdr_api.repositories._alias_planner import AliasPlanner, get_identifiers
+from clinical_mdr_api.repositories._utils import CypherQueryBuilder, FilterDict
+
+MATCH_CLAUSE = (
+    "MATCH (concept_root:ConceptRoot)-[:LATEST]->(concept_value:ConceptValue)"
+)
+
+ALIAS_CLAUSE = """
+    DISTINCT concept_root, concept_value,
+    head([(library)-[:CONTAINS_CONCEPT]->(concept_root) | library]) AS library
+    CALL {
+        WITH concept_root, concept_value
+        MATCH (concept_root)-[hv:HAS_VERSION]-(concept_value)
+        WITH hv ORDER BY hv.start_date ASC
+        WITH collect(hv) AS hvs
+        RETURN last(hvs) AS version_rel
+    }
+    WITH
+        concept_root.uid AS uid,
+        concept_value,
+        library.name AS library_name,
+        version_rel
+    WITH *,
+        concept_value.name AS name,
+        concept_value.order AS order,
+        version_rel.status AS status,
+        [(concept_value)-[:HAS_UNIT]->(unit) | {uid: unit.uid, name: unit.name}] AS units
+"""
+
+
+class Concept(BaseModel):
+    uid: str
+    name: str | None
+    library_name: str | None
+    status: str | None
+    units: list[dict] = []
+
+
+def _normalize(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def test_get_identifiers():
+    assert get_identifiers(
+        "WHERE toLower(name) CONTAINS $name_0 AND library.name STARTS WITH 'uid'"
+    ) == {"WHERE", "toLower", "name", "CONTAINS", "AND", "library", "STARTS", "WITH"}
+
+
+def test_prune_keeps_aliases_referenced_by_filter():
+    pruned = AliasPlanner(ALIAS_CLAUSE).prune("WHERE order > $order_0")
+
+    assert _normalize(pruned) == (
+        "DISTINCT concept_root, concept_value, "
+        "head([(library)-[:CONTAINS_CONCEPT]->(concept_root) | library]) AS library "
+        "WITH concept_value WITH *, concept_value.order AS order"
+    )
+
+
+def test_prune_keeps_subquery_returning_referenced_alias():
+    pruned = AliasPlanner(ALIAS_CLAUSE).prune("", "status")
+
+    assert "CALL {" in pruned
+    assert _normalize(pruned).endswith(
+        "WITH version_rel WITH *, version_rel.status AS status"
+    )
+
+
+def test_prune_keeps_one_item_without_reference():
+    pruned = AliasPlanner(ALIAS_CLAUSE).prune("")
+
+    assert _normalize(pruned).endswith("WITH concept_value WITH *")
+
+
+@pytest.mark.parametrize(
+    "alias_clause, expected",
+    [
+        # aggregation groups by the other aliases
+        (
+            "concept_value.name AS name, count(concept_value) AS count",
+            "concept_value.name AS name, count(concept_value) AS count",
+        ),
+        # a subquery that may return any number of rows
+        (
+            "concept_value CALL { WITH concept_value MATCH (concept_value)-->(x) RETURN x } "
+            "WITH concept_value.name AS name, x",
+            "concept_value CALL { WITH concept_value MATCH (concept_value)-->(x) RETURN x } "
+            "WITH concept_value.name AS name",
+        ),
+        # a subquery returning one row per query combined with UNION
+        (
+            "concept_value CALL { WITH concept_value MATCH (concept_value)-->(x) RETURN count(x) AS x "
+            "UNION WITH concept_value MATCH (concept_value)<--(x) RETURN count(x) AS x } "
+            "WITH concept_value.name AS name, x",
+            "concept_value CALL { WITH concept_value MATCH (concept_value)-->(x) RETURN count(x) AS x "
+            "UNION WITH concept_value MATCH (concept_value)<--(x) RETURN count(x) AS x } "
+            "WITH concept_value.name AS name",
+        ),
+    ],
+)
+def test_prune_keeps_projections_changing_row_count(alias_clause, expected):
+    pruned = AliasPlanner(alias_clause).prune("WHERE name = $name_0")
+
+    assert _normalize(pruned) == expected
+
+
+def test_count_and_header_queries_are_pruned():
+    query = CypherQueryBuilder(
+        match_clause=MATCH_CLAUSE,
+        alias_clause=ALIAS_CLAUSE,
+        filter_by=FilterDict(elements={"library_name": {"v": ["Sponsor"]}}),
+        sort_by={"name": True},
+        return_model=Concept,
+    )
+
+    assert "units" in query.full_query
+    assert "ORDER BY toLower(name) ASC" in query.full_query
+    assert "units" not in query.count_query
+    assert "version_rel" not in query.count_query
+    assert "library.name AS library_name" in query.count_query
+    assert query.count_query.endswith("RETURN count(*) AS total_count")
+
+    header_query = query.build_header_query(header_alias="units", result_count=10)
+    assert "AS units" in header_query
+    assert "version_rel" not in header_query
@@ -0,0 +1,96 @@
+import pytest
+
+from clinical_mdr_api.tests.performance.baseline import (
+    Regression,
+    compare_results,
+    format_results,
+    load_results,
+    save_results,
+    summarize,
+)
+
+PARAMETERS = {"activities": 500, "visits": 60, "schedules": 20000}
+
+
+def _get_results(
+    p50: float, p95: float, cypher_count: int | None, peak_memory: int
+) -> dict:
+    result = {
+        "status_code": 200,
+        "response_bytes": 2048,
+        "latency": {"p50": p50, "p95": p95, "max": p95},
+        "peak_memory_bytes": peak_memory,
+    }
+    if cypher_count is not None:
+        result["cypher_count"] = {"median": cypher_count, "max": cypher_count}
+        result["db_time"] = {"median": p50 / 2, "max": p95 / 2}
+    return {"parameters": PARAMETERS, "endpoints": {"flowchart": result}}
+
+
+def test_summarize():
+    summary = summarize([0.5, 0.1, 0.4, 0.2, 0.3])
+
+    assert summary["count"] == 5
+    assert summary["mean"] == pytest.approx(0.3)
+    assert summary["median"] == 0.3
+    assert summary["p50"] == 0.3
+    assert summary["p95"] == 0.5
+    assert summary["max"] == 0.5
+    assert summarize([]) == {"count": 0}
+
+
+def test_compare_results_within_tolerance():
+    baseline = _get_results(p50=1.0, p95=2.0, cypher_count=40, peak_memory=1000)
+    current = _get_results(p50=1.15, p95=1.5, cypher_count=40, peak_memory=1100)
+
+    assert not compare_results(baseline, current, tolerance=0.2)
+
+
+def test_compare_results_reports_regressions():
+    baseline = _get_results(p50=1.0, p95=2.0, cypher_count=40, peak_memory=1000)
+    current = _get_results(p50=1.5, p95=2.2, cypher_count=41, peak_memory=2000)
+
+    regressions = compare_results(baseline, current, tolerance=0.2)
+
+    assert regressions == [
+        Regression("flowchart", "latency.p50", 1.0, 1.5),
+        Regression("flowchart", "cypher_count.median", 40, 41),
+        Regression("flowchart", "peak_memory_bytes", 1000, 2000),
+    ]
+    assert str(regressions[0]) == "flowchart: latency.p50 1 -> 1.5 (+50%)"
+
+
+def test_compare_results_skips_missing_measures():
+    baseline = _get_results(p50=1.0, p95=2.0, cypher_count=None, peak_memory=1000)
+    current = _get_results(p50=1.0, p95=2.0, cypher_count=400, peak_memory=1000)
+    current["endpoints"]["new_endpoint"] = current["endpoints"]["flowchart"]
+
+    assert not compare_results(baseline, current)
+
+
+def test_compare_results_requires_same_parameters():
+    baseline = _get_results(p50=1.0, p95=2.0, cypher_count=40, peak_memory=1000)
+    current = _get_results(p50=1.0, p95=2.0, cypher_count=40, peak_memory=1000)
+    current["parameters"] = PARAMETERS | {"visits": 10}
+
+    with pytest.raises(ValueError):
+        compare_results(baseline, current)
+
+
+def test_save_and_load_results(tmp_path):
+    results = _get_results(p50=1.0, p95=2.0, cypher_count=40, peak_memory=2**20)
+    path = str(tmp_path / "baseline.json")
+
+    save_results(results, path)
+
+    assert load_results(path) == results
+    assert format_results(results).splitlines()[1].split() == [
+        "flowchart",
+        "1000.0",
+        "2000.0",
+        "2000.0",
+        "40",
+        "500.0",
+        "1.0",
+        "2.0",
+    ]
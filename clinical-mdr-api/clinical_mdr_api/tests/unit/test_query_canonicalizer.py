@@ -0,0 +1,92 @@
+import pytest
+
+from clinical_mdr_api.telemetry.query_canonicalizer import (
+    QueryPlanAudit,
+    canonicalize_query,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_query_plan_audit():
+    QueryPlanAudit.reset()
+    yield
+    QueryPlanAudit.reset()
+
+
+def test_canonicalize_query_moves_literals_into_parameters():
+    query, params = canonicalize_query(
+        """
+        MATCH (root:ActivityRoot {uid: $uid})-[:LATEST]->(value) // latest 'version'
+        WHERE value.name = 'Weight' AND value.`order 1` > 2.5 AND size(value.synonyms) > 2
+        RETURN value SKIP 20 LIMIT 10
+        """,
+        {"uid": "Activity_000001"},
+    )
+
+    assert "'Weight'" not in query
+    assert "// latest 'version'" in query
+    assert "value.`order 1` > $__literal_1" in query
+    assert "SKIP $__literal_3 LIMIT $__literal_4" in query
+    assert params == {
+        "uid": "Activity_000001",
+        "__literal_0": "Weight",
+        "__literal_1": 2.5,
+        "__literal_2": 2,
+        "__literal_3": 20,
+        "__literal_4": 10,
+    }
+
+
+def test_canonicalize_query_gives_same_text_for_different_literals():
+    first, first_params = canonicalize_query(
+        "MATCH (n:Study) WHERE n.uid = 'a' RETURN n"
+    )
+    second, second_params = canonicalize_query(
+        "MATCH (n:Study) WHERE n.uid = 'b' RETURN n", None
+    )
+
+    assert first == second
+    assert first_params == {"__literal_0": "a"}
+    assert second_params == {"__literal_0": "b"}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "MATCH (a)-[:HAS*1..3]->(b) RETURN b",
+        "MATCH p = shortestPath((a)-[*..5]-(b)) RETURN p",
+        "RETURN $items[0..2] AS items, $0 AS first",
+        "RETURN 'it\\'s' AS text",
+        "CALL { MATCH (n) DETACH DELETE n } IN TRANSACTIONS OF 500 ROWS",
+        "CREATE INDEX study_uid IF NOT EXISTS FOR (n:Study) ON (n.uid)",
+        "SHOW INDEXES YIELD name WHERE name = 'study_uid'",
+        "RETURN 1e5 AS big, 0x1F AS hex",
+    ],
+)
+def test_canonicalize_query_keeps_literals_that_cannot_be_parameters(query):
+    assert canonicalize_query(query, {"x": 1}) == (query, {"x": 1})
+
+
+def test_canonicalize_query_keeps_queries_using_literal_parameter_names():
+    query = "MATCH (n) WHERE n.uid = 'a' RETURN n"
+    params = {"__literal_0": "b"}
+
+    assert canonicalize_query(query, params) == (query, params)
+
+
+def test_query_plan_audit_counts_texts_and_plans():
+    for uid in ("a", "b", "c"):
+        query = f"MATCH (n:Study) WHERE n.uid = '{uid}' RETURN n"
+        QueryPlanAudit.record(query, canonicalize_query(query)[0])
+    for uid in ("a", "b"):
+        query = f"MATCH (n:Study) WHERE n.uid = '{uid}\\n' RETURN n"
+        QueryPlanAudit.record(query, canonicalize_query(query)[0])
+
+    report = QueryPlanAudit.get_report()
+
+    assert report["fingerprint_count"] == 1
+    assert report["text_count"] == 5
+    # the escaped strings can't be canonicalized, so they are planned separately
+    assert report["plan_count"] == 3
+    assert report["queries"][0]["count"] == 5
+    assert report["queries"][0]["plans"] == 3
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import pytest
+
+from clinical_mdr_api import config
+from clinical_mdr_api.telemetry.query_profiler import (
+    QueryProfiler,
+    fingerprint_query,
+    normalize_query,
+)
+from clinical_mdr_api.telemetry.request_metrics import RequestMetrics
+
+ACTIVITY_QUERY = """
+    MATCH (root:ActivityRoot {uid: $uid})-[:LATEST]->(value) // latest version
+    WHERE value.name = 'Weight' AND size(value.synonyms) > 2
+    RETURN value LIMIT 10
+"""
+
+
+@pytest.fixture(autouse=True)
+def reset_query_profiler():
+    QueryProfiler.reset()
+    yield
+    QueryProfiler.reset()
+
+
+def _get_scope(path: str, route_path: str | None = None) -> dict:
+    scope = {"type": "http", "method": "GET", "path": path}
+    if route_path:
+        scope["route"] = SimpleNamespace(path=route_path)
+    return scope
+
+
+def _get_metrics(queries: dict[str, int]) -> RequestMetrics:
+    metrics = RequestMetrics()
+    for query, count in queries.items():
+        metrics.queries[query] = [count, count * 0.001]
+        metrics.cypher_count += count
+        metrics.cypher_times += count * 0.001
+    return metrics
+
+
+def test_normalize_query_replaces_literals_and_formatting():
+    assert normalize_query(ACTIVITY_QUERY) == (
+        "MATCH (root:ActivityRoot {uid: $uid})-[:LATEST]->(value) "
+        "WHERE value.name = ? AND size(value.synonyms) > ? RETURN value LIMIT ?"
+    )
+    assert normalize_query(
+        "MATCH (n:StudyRoot) WHERE n.uid IN ['Study_000001', 'Study_000002'] RETURN n"
+    ) == normalize_query('MATCH (n:StudyRoot) WHERE n.uid IN ["Study_000003"] RETURN n')
+    assert fingerprint_query(ACTIVITY_QUERY) == fingerprint_query(
+        ACTIVITY_QUERY.replace("'Weight'", "'Height'").replace("10", "20")
+    )
+    assert fingerprint_query(ACTIVITY_QUERY) != fingerprint_query(
+        ACTIVITY_QUERY.replace("ActivityRoot", "ActivityInstanceRoot")
+    )
+
+
+def test_normalize_query_keeps_identifiers_with_digits():
+    assert (
+        normalize_query("MATCH (v1)-[:HAS_VERSION*0..]->(v2) RETURN v1.x, $param1")
+        == "MATCH (v1)-[:HAS_VERSION*?..]->(v2) RETURN v1.x, $param1"
+    )
+
+
+def test_query_profiler_reports_routes():
+    for latency in (0.1, 0.2, 0.3):
+        QueryProfiler.record_request(
+            _get_scope(
+                "/studies/Study_000001/study-activities",
+                "/studies/{uid}/study-activities",
+            ),
+            latency,
+            _get_metrics({ACTIVITY_QUERY: 1, "MATCH (n) RETURN n": 2}),
+        )
+    QueryProfiler.record_request(_get_scope("/unknown"), 0.01, _get_metrics({}))
+
+    report = QueryProfiler.get_report()
+
+    routes = {route["route"]: route for route in report["routes"]}
+    assert set(routes) == {"GET /studies/{uid}/study-activities", "GET <unmatched>"}
+    activities = routes["GET /studies/{uid}/study-activities"]
+    assert activities["request_count"] == 3
+    assert activities["flagged_request_count"] == 0
+    assert activities["latency"]["count"] == 3
+    assert activities["latency"]["p50"] == 0.2
+    assert activities["latency"]["max"] == 0.3
+    assert sum(bucket["count"] for bucket in activities["latency"]["histogram"]) == 3
+    assert activities["cypher_count"]["max"] == 3
+    assert [query["count"] for query in activities["queries"]] == [6, 3]
+    assert activities["queries"][1]["query"] == normalize_query(ACTIVITY_QUERY)
+    assert activities["queries"][1]["per_request"] == 1
+    assert report["flagged_requests"] == []
+
+    assert [
+        route["route"]
+        for route in QueryProfiler.get_report(route="study-activities")["routes"]
+    ] == ["GET /studies/{uid}/study-activities"]
+
+
+def test_query_profiler_flags_repeated_queries():
+    threshold = config.QUERY_PROFILING_N_PLUS_ONE_THRESHOLD
+    # the same query with different literal values, as built in a loop
+    queries = {
+        ACTIVITY_QUERY.replace("'Weight'", f"'Activity {index}'"): 1
+        for index in range(threshold + 1)
+    }
+    QueryProfiler.record_request(
+        _get_scope("/studies/Study_000001/flowchart", "/studies/{uid}/flowchart"),
+        1.5,
+        _get_metrics(queries),
+    )
+
+    report = QueryProfiler.get_report()
+
+    assert report["routes"][0]["flagged_request_count"] == 1
+    (flagged,) = report["flagged_requests"]
+    assert flagged["route"] == "GET /studies/{uid}/flowchart"
+    assert flagged["path"] == "/studies/Study_000001/flowchart"
+    assert flagged["cypher_count"] == threshold + 1
+    assert flagged["repeated_queries"] == [
+        {
+            "fingerprint": fingerprint_query(ACTIVITY_QUERY),
+            "count": threshold + 1,
+            "db_time": pytest.approx((threshold + 1) * 0.001),
+            "query": normalize_query(ACTIVITY_QUERY),
+        }
+    ]
+
+
+def test_request_metrics_queries_not_traced():
+    metrics = _get_metrics({ACTIVITY_QUERY: 1})
+
+    assert "queries" not in metrics.dict(by_alias=True, exclude_none=True)
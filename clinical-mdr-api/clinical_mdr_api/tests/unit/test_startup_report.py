@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+
+from clinical_mdr_api import config
+from clinical_mdr_api.telemetry import startup_report
+from clinical_mdr_api.utils.deferred_import import deferred_import
+
+
+def test_deferred_import_loads_module_on_first_use():
+    sys.modules.pop("colorsys", None)
+    hls_to_rgb = deferred_import("colorsys", "hls_to_rgb")
+
+    assert not hls_to_rgb.loaded
+    assert "colorsys" not in sys.modules
+
+    assert hls_to_rgb(0, 1, 0) == (1, 1, 1)
+    assert hls_to_rgb.loaded
+    assert "colorsys" in sys.modules
+
+
+def test_deferred_import_of_module_forwards_attributes():
+    textwrap = deferred_import("textwrap")
+
+    assert textwrap.dedent("  x\n  y") == "x\ny"
+
+
+def test_deferred_import_of_module_with_deferred_imports(tmp_path):
+    (tmp_path / "deferring_module.py").write_text(
+        "from clinical_mdr_api.utils.deferred_import import deferred_import\n"
+        "dedent = deferred_import('textwrap', 'dedent')\n"
+    )
+    code = (
+        "from clinical_mdr_api.utils.deferred_import import deferred_import\n"
+        "print(deferred_import('deferring_module', 'dedent')('  x'))\n"
+    )
+
+    # in a fresh interpreter, so that a deadlock fails the test instead of hanging the test run
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env=os.environ | {"PYTHONPATH": os.pathsep.join([str(tmp_path), *sys.path])},
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+    assert result.stdout == "x\n"
+
+
+def test_startup_report_measures_import_times(monkeypatch):
+    monkeypatch.setattr(config, "STARTUP_REPORT_IMPORT_TIMES", True)
+    sys.modules.pop("fractions", None)
+    statistics = deferred_import("statistics")
+
+    startup_report.start()
+    try:
+        # pylint: disable=import-outside-toplevel,unused-import
+        import fractions  # noqa: F401
+    finally:
+        startup_report.finish()
+
+    report = startup_report.get_startup_report()
+
+    assert report["boot_seconds"] >= 0
+    assert report["modules_after_boot"] >= report["modules_before_boot"]
+    assert report["peak_rss_bytes"] > 0
+    assert "fractions" in [item["module"] for item in report["slowest_imports"]]
+    assert not isinstance(
+        sys.modules["fractions"].__loader__, startup_report._TimedLoader
+    )
+    assert {"module": "colorsys.hls_to_rgb", "loaded": True} in report[
+        "deferred_imports"
+    ]
+    assert statistics.name in [item["module"] for item in report["deferred_imports"]]
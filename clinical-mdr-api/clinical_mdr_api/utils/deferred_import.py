@@ -0,0 +1,77 @@
+"""Deferred imports of modules only needed by a few, rarely used endpoints."""
+import importlib
+import logging
+import sys
+from threading import Lock
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+class DeferredImport:
+    """
+    Stands in for a module, or for an attribute of a module, until it is first used.
+
+    The module is imported on first attribute access or call, so that export stacks like
+    weasyprint or openpyxl are only loaded into the workers that actually serve such requests.
+    """
+
+    # All deferred imports of the process, for the startup report
+    registry: list["DeferredImport"] = []
+    registry_lock = Lock()
+
+    def __init__(self, module_name: str, attribute: str | None = None):
+        self.module_name = module_name
+        self.attribute = attribute
+        self._target = None
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.module_name}.{self.attribute}"
+            if self.attribute
+            else self.module_name
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None or self.module_name in sys.modules
+
+    def resolve(self) -> Any:
+        target = self._target
+        if target is None:
+            # No lock is held while importing: the import system already serializes the import
+            # of each module, and the module may itself create deferred imports.
+            # Threads resolving concurrently all get the same module from sys.modules.
+            log.info("Importing deferred module %s", self.module_name)
+            target = importlib.import_module(self.module_name)
+            if self.attribute:
+                target = getattr(target, self.attribute)
+            self._target = target
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name} loaded={self.loaded}>"
+
+
+def deferred_import(module_name: str, attribute: str | None = None) -> Any:
+    """
+    Returns a stand-in for a module, or for an attribute of a module, that is imported on first use.
+
+    Args:
+        module_name (str): The fully qualified name of the module, e.g. `openpyxl`.
+        attribute (str | None): The name of a class or function of the module, e.g. `Workbook`.
+
+    Returns:
+        Any: The stand-in, which forwards attribute access and calls to the imported module or attribute.
+    """
+    deferred = DeferredImport(module_name, attribute)
+    with DeferredImport.registry_lock:
+        DeferredImport.registry.append(deferred)
+    return deferred
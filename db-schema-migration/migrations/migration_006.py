@@ -3,6 +3,7 @@ from math import ceil, floor
 import os
 
 from migrations.common import migrate_ct_config_values, migrate_indexes_and_constraints
+from migrations.utils.batched import clear_checkpoints, run_in_batches
 from migrations.utils.utils import (
     get_db_driver,
     run_cypher_query,
@@ -27,7 +28,7 @@ def main():
     ### Release-specific migrations
     remove_broken_study_activity_instances(DB_DRIVER, logger)
     migrate_study_activity_instances(DB_DRIVER, logger)
-    update_insertion_visit_to_manually_defined_visit(DB_DRIVER, logger)
+    update_insertion_visit_to_manually_defined_visit(DB_DRIVER, logger, MIGRATION_DESC)
     fix_study_week_property_for_negative_timings_less_than_one_week(
         DB_DRIVER, logger, MIGRATION_DESC
     )
@@ -37,6 +38,9 @@ def main():
     fix_not_migrated_study_soa_groups(DB_DRIVER, logger, MIGRATION_DESC)
     merge_multiple_study_activity_subgroup_and_group_nodes(DB_DRIVER, logger, MIGRATION_DESC)
     migrate_study_selection_metadata_merge(DB_DRIVER, logger, MIGRATION_DESC)
+    create_sponsor_ct_package_members(DB_DRIVER, logger, MIGRATION_DESC)
+
+    clear_checkpoints(DB_DRIVER, MIGRATION_DESC)
 
 
 def remove_broken_study_activity_instances(db_driver, log):
@@ -121,21 +125,30 @@ def migrate_study_activity_instances(db_driver, log):
     return contains_updates
 
 
-def update_insertion_visit_to_manually_defined_visit(db_driver, log):
+def update_insertion_visit_to_manually_defined_visit(db_driver, log, migration_desc):
     log.info(
         "Updating INSERTION_VISIT to MANUALLY_DEFINED_VISIT as visit_class property."
     )
-    _, summary = run_cypher_query(
+    progress = run_in_batches(
         db_driver,
-        """
-            MATCH (study_visit:StudyVisit) 
-            WHERE study_visit.visit_class = "INSERTION_VISIT"
+        log,
+        migration_desc,
+        "update_insertion_visit_to_manually_defined_visit",
+        items_query="""
+            MATCH (study_visit:StudyVisit)
+            WHERE study_visit.visit_class = "INSERTION_VISIT" AND elementId(study_visit) > $cursor
+            RETURN elementId(study_visit) AS key
+            ORDER BY key
+            LIMIT $batch_size
+        """,
+        batch_query="""
+            UNWIND $batch AS key
+            MATCH (study_visit:StudyVisit)
+            WHERE elementId(study_visit) = key
             SET study_visit.visit_class = "MANUALLY_DEFINED_VISIT"
         """,
     )
-    counters = summary.counters
-    print_counters_table(counters)
-    return counters.contains_updates
+    return progress.contains_updates
 
 
 def fix_study_week_property_for_negative_timings_less_than_one_week(
@@ -1154,5 +1167,92 @@ def merge_multiple_study_activity_subgroup_and_group_nodes(db_driver, log, migra
     return contains_updates
 
 
+SPONSOR_CT_PACKAGE_MEMBERS_ITEMS = {
+    "term": """
+        CALL {
+            WITH parent_package, exact_datetime
+            MATCH (parent_package)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_TERM]->(:CTPackageTerm)-
+                [:CONTAINS_ATTRIBUTES]->(:CTTermAttributesValue)<-[attr_v_rel:HAS_VERSION]-(:CTTermAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
+                (:CTTermRoot)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(:CTTermNameValue)
+            WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
+            RETURN DISTINCT false AS is_sponsor_library, attr_v_rel, name_v_rel
+
+            UNION
+            WITH exact_datetime
+            MATCH (:Library {name:"Sponsor"})-->(term_root:CTTermRoot)
+                -[:HAS_ATTRIBUTES_ROOT]->(:CTTermAttributesRoot)-[attr_v_rel:HAS_VERSION]->(:CTTermAttributesValue)
+            MATCH (term_root)-[:HAS_NAME_ROOT]->(:CTTermNameRoot)-[name_v_rel:HAS_VERSION]->(:CTTermNameValue)
+            WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
+                AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime))
+            RETURN DISTINCT true AS is_sponsor_library, attr_v_rel, name_v_rel
+        }
+    """,
+    "codelist": """
+        CALL {
+            WITH parent_package, exact_datetime
+            MATCH (parent_package)-[:CONTAINS_CODELIST]->(:CTPackageCodelist)-[:CONTAINS_ATTRIBUTES]->
+                (:CTCodelistAttributesValue)<-[attr_v_rel:HAS_VERSION]-(:CTCodelistAttributesRoot)<-[:HAS_ATTRIBUTES_ROOT]-
+                (:CTCodelistRoot)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(:CTCodelistNameValue)
+            WHERE name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime)
+            RETURN DISTINCT false AS is_sponsor_library, attr_v_rel, name_v_rel
+
+            UNION
+            WITH exact_datetime
+            MATCH (:Library {name:"Sponsor"})-->(codelist_root:CTCodelistRoot)
+                -[:HAS_ATTRIBUTES_ROOT]->(:CTCodelistAttributesRoot)-[attr_v_rel:HAS_VERSION]->(:CTCodelistAttributesValue)
+            MATCH (codelist_root)-[:HAS_NAME_ROOT]->(:CTCodelistNameRoot)-[name_v_rel:HAS_VERSION]->(:CTCodelistNameValue)
+            WHERE (name_v_rel.start_date<= exact_datetime < name_v_rel.end_date OR (name_v_rel.end_date IS NULL AND name_v_rel.start_date <= exact_datetime))
+                AND (attr_v_rel.start_date<= exact_datetime < attr_v_rel.end_date OR (attr_v_rel.end_date IS NULL AND attr_v_rel.start_date <= exact_datetime))
+            RETURN DISTINCT true AS is_sponsor_library, attr_v_rel, name_v_rel
+        }
+    """,
+}
+
+
+def create_sponsor_ct_package_members(db_driver, log, migration_desc):
+    log.info(
+        "Linking the term and codelist versions making up existing sponsor CT packages to the packages"
+    )
+    contains_updates = []
+    for item_type, relationship, label in [
+        ("term", "CONTAINS_SPONSOR_TERM", "CTPackageSponsorTerm"),
+        ("codelist", "CONTAINS_SPONSOR_CODELIST", "CTPackageSponsorCodelist"),
+    ]:
+        # The versions are resolved as of the end of the effective date of the package,
+        # like the API did on every read before
+        progress = run_in_batches(
+            db_driver,
+            log,
+            migration_desc,
+            f"create_sponsor_ct_package_{item_type}_members",
+            items_query=f"""
+                MATCH (package:CTPackage)-[:EXTENDS_PACKAGE]->(:CTPackage)
+                WHERE NOT (package)-[:{relationship}]->(:{label}) AND elementId(package) > $cursor
+                RETURN elementId(package) AS key
+                ORDER BY key
+                LIMIT $batch_size
+            """,
+            batch_query=f"""
+                UNWIND $batch AS key
+                MATCH (package:CTPackage)-[:EXTENDS_PACKAGE]->(parent_package:CTPackage)
+                WHERE elementId(package) = key
+                WITH package, parent_package, datetime(package.effective_date + "T23:59:59") AS exact_datetime
+                {SPONSOR_CT_PACKAGE_MEMBERS_ITEMS[item_type]}
+                WITH package, attr_v_rel, name_v_rel, collect(is_sponsor_library) AS sources
+                CREATE (package)-[:{relationship}]->(member:{label} {{
+                    in_parent_package: false IN sources,
+                    in_sponsor_library: true IN sources,
+                    attributes_start_date: attr_v_rel.start_date,
+                    name_start_date: name_v_rel.start_date
+                }})
+                WITH member, endNode(attr_v_rel) AS attributes_value, endNode(name_v_rel) AS name_value
+                CREATE (member)-[:CONTAINS_ATTRIBUTES_VERSION]->(attributes_value)
+                CREATE (member)-[:CONTAINS_NAME_VERSION]->(name_value)
+            """,
+        )
+        contains_updates.append(progress.contains_updates)
+    return contains_updates
+
+
 if __name__ == "__main__":
     main()
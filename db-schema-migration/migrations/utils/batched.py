@@ -0,0 +1,216 @@
+"""Runs data-rewrite steps of migrations in bounded batches, with resumable checkpoints stored in the graph.
+
+A batched step is defined by two queries:
+- an items query, returning the keys of the next items to rewrite, in ascending order of key, after `$cursor`
+  and limited to `$batch_size` keys, e.g. the `elementId` of the nodes to update,
+- a batch query, rewriting the items whose keys are given as `$batch`.
+
+Each batch is rewritten in its own transaction, together with the checkpoint of the step,
+so that an interrupted migration resumes after the last committed batch when run again.
+"""
+import time
+from dataclasses import astuple, dataclass, field, fields
+
+from migrations.utils.utils import DATABASE_NAME, load_env, print_counters_table
+
+BATCH_SIZE = int(load_env("MIGRATION_BATCH_SIZE", "1000"))
+
+GET_CHECKPOINT_QUERY = """
+    MATCH (checkpoint:MigrationCheckpoint {migration: $migration, step: $step})
+    RETURN checkpoint.cursor, checkpoint.batches, checkpoint.items, checkpoint.seconds, checkpoint.completed
+"""
+
+SAVE_CHECKPOINT_QUERY = """
+    MERGE (checkpoint:MigrationCheckpoint {migration: $migration, step: $step})
+    SET checkpoint.cursor = $cursor,
+        checkpoint.batches = $batches,
+        checkpoint.items = $items,
+        checkpoint.seconds = $seconds,
+        checkpoint.completed = $completed,
+        checkpoint.updated = datetime()
+"""
+
+CLEAR_CHECKPOINTS_QUERY = """
+    MATCH (checkpoint:MigrationCheckpoint {migration: $migration})
+    DELETE checkpoint
+"""
+
+
+@dataclass
+class BatchCounters:  # pylint: disable=too-many-instance-attributes
+    """Sums the update counters of the batches of a step, and can be printed with `print_counters_table`"""
+
+    nodes_created: int = 0
+    nodes_deleted: int = 0
+    relationships_created: int = 0
+    relationships_deleted: int = 0
+    properties_set: int = 0
+    labels_added: int = 0
+    labels_removed: int = 0
+    indexes_added: int = 0
+    indexes_removed: int = 0
+    constraints_added: int = 0
+    constraints_removed: int = 0
+
+    def add(self, counters):
+        for counter in fields(self):
+            setattr(
+                self,
+                counter.name,
+                getattr(self, counter.name) + getattr(counters, counter.name),
+            )
+
+    @property
+    def contains_updates(self) -> bool:
+        return any(astuple(self))
+
+
+@dataclass
+class BatchProgress:  # pylint: disable=too-many-instance-attributes
+    """The progress of a batched step, stored as a checkpoint, and the update counters of the current run"""
+
+    migration: str
+    step: str
+    cursor: str = ""
+    batches: int = 0
+    items: int = 0
+    seconds: float = 0
+    completed: bool = False
+    counters: BatchCounters = field(default_factory=BatchCounters)
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0
+
+    @property
+    def contains_updates(self) -> bool:
+        return self.counters.contains_updates
+
+
+def get_checkpoint(db_driver, migration: str, step: str) -> BatchProgress:
+    """Returns the progress of a step stored in the graph, or the progress of a step not started yet"""
+    with db_driver.session(database=DATABASE_NAME) as session:
+        record = session.run(
+            GET_CHECKPOINT_QUERY, {"migration": migration, "step": step}
+        ).single()
+    if record is None:
+        return BatchProgress(migration=migration, step=step)
+    cursor, batches, items, seconds, completed = record
+    return BatchProgress(
+        migration=migration,
+        step=step,
+        cursor=cursor,
+        batches=batches,
+        items=items,
+        seconds=seconds,
+        completed=completed,
+    )
+
+
+def clear_checkpoints(db_driver, migration: str):
+    """Removes the checkpoints of all steps of a migration, once the whole migration succeeded"""
+    with db_driver.session(database=DATABASE_NAME) as session:
+        session.run(CLEAR_CHECKPOINTS_QUERY, {"migration": migration}).consume()
+
+
+def _checkpoint_params(progress: BatchProgress) -> dict:
+    return {
+        "migration": progress.migration,
+        "step": progress.step,
+        "cursor": progress.cursor,
+        "batches": progress.batches,
+        "items": progress.items,
+        "seconds": progress.seconds,
+        "completed": progress.completed,
+    }
+
+
+def run_in_batches(  # pylint: disable=too-many-arguments
+    db_driver,
+    log,
+    migration: str,
+    step: str,
+    items_query: str,
+    batch_query: str,
+    params: dict | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> BatchProgress:
+    """Runs a data-rewrite step of a migration in batches, resuming after the last completed batch if any.
+
+    Args:
+        db_driver: The neo4j driver, see `get_db_driver`.
+        log: The logger of the migration.
+        migration (str): The name of the migration, e.g. its description.
+        step (str): The name of the step, unique within the migration.
+        items_query (str): Returns the keys of the next items to rewrite, ordered by key,
+            given the last key of the previous batch as `$cursor` and the maximum number of keys as `$batch_size`.
+        batch_query (str): Rewrites the items whose keys are given as `$batch`.
+        params (dict | None): Further parameters of both queries.
+        batch_size (int): The maximum number of items rewritten in one transaction.
+
+    Returns:
+        BatchProgress: The progress of the step, with the update counters of this run.
+    """
+    params = params or {}
+    progress = get_checkpoint(db_driver, migration, step)
+    if progress.completed:
+        log.info("Step '%s' of '%s' was already completed", step, migration)
+        return progress
+    if progress.batches:
+        log.info(
+            "Resuming step '%s' of '%s' after %i batches, %i items",
+            step,
+            migration,
+            progress.batches,
+            progress.items,
+        )
+
+    with db_driver.session(database=DATABASE_NAME) as session:
+        while True:
+            started = time.perf_counter()
+            keys = [
+                record[0]
+                for record in session.run(
+                    items_query,
+                    {**params, "cursor": progress.cursor, "batch_size": batch_size},
+                )
+            ]
+            if not keys:
+                break
+
+            with session.begin_transaction() as transaction:
+                summary = transaction.run(
+                    batch_query, {**params, "batch": keys}
+                ).consume()
+                transaction.run(
+                    SAVE_CHECKPOINT_QUERY,
+                    _checkpoint_params(progress)
+                    | {
+                        "cursor": keys[-1],
+                        "batches": progress.batches + 1,
+                        "items": progress.items + len(keys),
+                        "seconds": progress.seconds + time.perf_counter() - started,
+                    },
+                ).consume()
+                transaction.commit()
+
+            progress.cursor = keys[-1]
+            progress.batches += 1
+            progress.items += len(keys)
+            progress.seconds += time.perf_counter() - started
+            progress.counters.add(summary.counters)
+            log.info(
+                "Step '%s': batch %i, %i items, %.1f items/s",
+                step,
+                progress.batches,
+                progress.items,
+                progress.items_per_second,
+            )
+
+    if progress.batches:
+        progress.completed = True
+        with db_driver.session(database=DATABASE_NAME) as session:
+            session.run(SAVE_CHECKPOINT_QUERY, _checkpoint_params(progress)).consume()
+
+    print_counters_table(progress.counters, progress)
+    return progress
@@ -297,7 +297,8 @@ def print_aligned(label, col_1, col_2, col_3):
 
 
 # ---------- Console logging of counters ----------
-def print_counters_table(counters):
+def print_counters_table(counters, progress=None):
+    """Prints the update counters of a query, and the progress of a batched step if given, see `run_in_batches`"""
     if counters.contains_updates:
         print_aligned("Summary", "Created", "Deleted", "Set")
         print_aligned("Nodes", counters.nodes_created, counters.nodes_deleted, "")
@@ -312,3 +313,8 @@ def print_counters_table(counters):
         )
     else:
         print("No changes made")
+    if progress is not None and progress.batches:
+        print_aligned("Batches", progress.batches, "", "")
+        print_aligned("Items", progress.items, "", "")
+        print_aligned("Seconds", f"{progress.seconds:.1f}", "", "")
+        print_aligned("Items/s", f"{progress.items_per_second:.1f}", "", "")
@@ -3,6 +3,7 @@ import os
 import pytest
 
 from migrations import migration_006
+from migrations.utils import batched
 from migrations.utils.utils import (
     api_get,
     api_get_paged,
@@ -164,7 +165,7 @@ def test_update_insertion_visit_to_manually_defined(migration):
 @pytest.mark.order(after="test_update_insertion_visit_to_manually_defined")
 def test_repeat_update_insertion_visit_to_manually_defined(migration):
     assert not migration_006.update_insertion_visit_to_manually_defined_visit(
-        DB_DRIVER, logger
+        DB_DRIVER, logger, migration_006.MIGRATION_DESC
     ), "The second run for migration shouldn't return anything"
 
 
@@ -803,3 +804,103 @@ def test_repeat_fix_not_migrated_study_soa_groups(migration):
     assert not migration_006.fix_not_migrated_study_soa_groups(
         DB_DRIVER, logger, migration_006.MIGRATION_DESC
     )
+
+
+def test_create_sponsor_ct_package_members(migration):
+    logger.info("Check for sponsor CT packages without term and codelist members")
+    records, _ = run_cypher_query(
+        DB_DRIVER,
+        """
+        MATCH (package:CTPackage)-[:EXTENDS_PACKAGE]->(parent_package:CTPackage)
+        WHERE ((parent_package)-[:CONTAINS_CODELIST]->() OR (:Library {name:"Sponsor"})-[:CONTAINS_CODELIST]->())
+            AND NOT ((package)-[:CONTAINS_SPONSOR_TERM]->() AND (package)-[:CONTAINS_SPONSOR_CODELIST]->())
+        RETURN package.name
+        """,
+    )
+    assert (
+        len(records) == 0
+    ), f"Found {len(records)} sponsor CT packages without term and codelist members"
+
+    records, _ = run_cypher_query(
+        DB_DRIVER,
+        """
+        MATCH (:CTPackage)-[:CONTAINS_SPONSOR_TERM|CONTAINS_SPONSOR_CODELIST]->(member)
+        WHERE NOT (member)-[:CONTAINS_ATTRIBUTES_VERSION]->() OR NOT (member)-[:CONTAINS_NAME_VERSION]->()
+            OR NOT (member.in_parent_package OR member.in_sponsor_library)
+        RETURN member
+        """,
+    )
+    assert (
+        len(records) == 0
+    ), f"Found {len(records)} sponsor CT package members without versions or source"
+
+
+@pytest.mark.order(after="test_create_sponsor_ct_package_members")
+def test_repeat_create_sponsor_ct_package_members(migration):
+    assert not any(
+        migration_006.create_sponsor_ct_package_members(
+            DB_DRIVER, logger, migration_006.MIGRATION_DESC
+        )
+    ), "The second run for migration shouldn't return anything"
+
+
+def test_run_in_batches_resumes_after_last_completed_batch():
+    run_cypher_query(
+        DB_DRIVER,
+        "UNWIND range(1, 5) AS index CREATE (:BatchedMigrationTest {index: index, done: false})",
+    )
+    items_query = """
+        MATCH (item:BatchedMigrationTest)
+        WHERE NOT item.done AND elementId(item) > $cursor
+        RETURN elementId(item) AS key
+        ORDER BY key
+        LIMIT $batch_size
+    """
+    batch_query = """
+        UNWIND $batch AS key
+        MATCH (item:BatchedMigrationTest)
+        WHERE elementId(item) = key
+        SET item.done = true
+    """
+    try:
+        # Simulate a run interrupted after its first batch of two items was committed
+        keys, _ = run_cypher_query(
+            DB_DRIVER, items_query, {"cursor": "", "batch_size": 2}
+        )
+        keys = [record[0] for record in keys]
+        run_cypher_query(DB_DRIVER, batch_query, {"batch": keys})
+        run_cypher_query(
+            DB_DRIVER,
+            batched.SAVE_CHECKPOINT_QUERY,
+            {
+                "migration": "test",
+                "step": "resume",
+                "cursor": keys[-1],
+                "batches": 1,
+                "items": 2,
+                "seconds": 0.1,
+                "completed": False,
+            },
+        )
+
+        progress = batched.run_in_batches(
+            DB_DRIVER, logger, "test", "resume", items_query, batch_query, batch_size=2
+        )
+        assert progress.completed
+        assert progress.batches == 3
+        assert progress.items == 5
+        assert progress.counters.properties_set == 3
+
+        records, _ = run_cypher_query(
+            DB_DRIVER,
+            "MATCH (item:BatchedMigrationTest) WHERE NOT item.done RETURN item",
+        )
+        assert len(records) == 0
+
+        progress = batched.run_in_batches(
+            DB_DRIVER, logger, "test", "resume", items_query, batch_query, batch_size=2
+        )
+        assert not progress.contains_updates, "A completed step shouldn't run again"
+    finally:
+        run_cypher_query(DB_DRIVER, "MATCH (item:BatchedMigrationTest) DELETE item")
+        batched.clear_checkpoints(DB_DRIVER, "test")
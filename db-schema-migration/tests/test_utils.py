@@ -1,6 +1,9 @@
+from dataclasses import asdict
+from types import SimpleNamespace
+
 import pytest
 
-from migrations.utils import utils
+from migrations.utils import batched, utils
 
 
 @pytest.mark.parametrize(
@@ -22,3 +25,20 @@ from migrations.utils import utils
 )
 def test_snake_case(input_val, output):
     assert output == utils.snake_case(input_val)
+
+
+def test_batch_counters():
+    counters = batched.BatchCounters()
+    assert not counters.contains_updates
+
+    counters.add(batched.BatchCounters())
+    assert not counters.contains_updates
+
+    summary_counters = SimpleNamespace(
+        **asdict(batched.BatchCounters(properties_set=3))
+    )
+    counters.add(summary_counters)
+    counters.add(summary_counters)
+    assert counters.contains_updates
+    assert counters.properties_set == 6
+    assert counters.nodes_created == 0
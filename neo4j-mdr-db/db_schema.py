@@ -28,6 +28,7 @@ INDEXES = [
     ("StudyBranchArm", "uid"),
     ("StudyDiseaseMilestone", "uid"),
     ("StudySoAFootnote", "uid"),
+    ("StudySDTMDataset", "study_uid"),
     ("OrderedStudySelectionDiseaseMilestone", "uid"),
     ("TemplateParameterTermValue", "name"),
     ("CTCodelistAttributesValue", "name"),
@@ -4,6 +4,11 @@ import os
 import logging
 import sys
 import json
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 OUTPUT_DIR = environ.get("OUTPUT_DIR", "./output")
 LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
@@ -11,11 +16,69 @@ LOG_LEVEL = environ.get("LOG_LEVEL", "INFO")
 INCLUDE_STUDY_NUMBERS = environ.get("INCLUDE_STUDY_NUMBERS", "")
 EXCLUDE_STUDY_NUMBERS = environ.get("EXCLUDE_STUDY_NUMBERS", "")
 
+# Number of endpoints fetched at the same time
+EXPORT_WORKERS = int(environ.get("EXPORT_WORKERS", "4"))
+# Skip the studies that are unchanged since the export recorded in the manifest
+INCREMENTAL_EXPORT = environ.get("INCREMENTAL_EXPORT", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+MANIFEST_FILENAME = "export-manifest.json"
+
 DEFAULT_QUERY_PARAMS = {
     "page_size": 0,
     "page_number": 1,
 }
 
+# ---------------------------------------------------------------
+# Throughput statistics
+# ---------------------------------------------------------------
+#
+class ExportStats:
+    """Totals per exported endpoint, updated from all export threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.failures = 0
+
+    def add(self, name, requests, items, size, seconds, success):
+        with self._lock:
+            stats = self.endpoints.setdefault(
+                name,
+                {"exports": 0, "requests": 0, "items": 0, "size": 0, "seconds": 0.0},
+            )
+            stats["exports"] += 1
+            stats["requests"] += requests
+            stats["items"] += items
+            stats["size"] += size
+            stats["seconds"] += seconds
+            if not success:
+                self.failures += 1
+
+    def report(self, log, elapsed):
+        """Logs the throughput of each endpoint, the slowest first"""
+        with self._lock:
+            endpoints = sorted(
+                self.endpoints.items(), key=lambda item: item[1]["seconds"], reverse=True
+            )
+        for name, stats in endpoints:
+            seconds = max(stats["seconds"], 1e-6)
+            log.info(
+                f"{name}: {stats['exports']} exports, {stats['requests']} requests, "
+                f"{stats['items']} items, {stats['size'] / 1024:.1f} kB "
+                f"in {stats['seconds']:.2f} s "
+                f"({stats['items'] / seconds:.0f} items/s, {stats['size'] / 1024 / seconds:.1f} kB/s)"
+            )
+        size = sum(stats["size"] for _, stats in endpoints)
+        log.info(
+            f"Exported {len(endpoints)} endpoints, {size / 1024:.1f} kB "
+            f"in {elapsed:.2f} s with {EXPORT_WORKERS} workers"
+        )
+        return {name: dict(stats) for name, stats in endpoints}
+
+
 # ---------------------------------------------------------------
 # Api bindings
 # ---------------------------------------------------------------
@@ -34,6 +97,18 @@ class StudyExporter:
         api_headers = {"Accept": "application/json"}
         self.api_headers = self._authenticate(api_headers)
         self.verify_connection()
+        self._local = threading.local()
+        self.stats = ExportStats()
+
+    @property
+    def session(self):
+        """A session per thread, so that connections to the api are reused"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.api_headers)
+            self._local.session = session
+        return session
 
     def _read_env(self, varname):
         value = environ.get(varname)
@@ -105,9 +180,7 @@ class StudyExporter:
                 if key not in params:
                     params[key] = value
 
-        response = requests.get(
-            self.api_base_url + path, params=params, headers=self.api_headers
-        )
+        response = self.session.get(self.api_base_url + path, params=params)
         if response.ok:
             self.log.info(f"Successfully fetched data from: {path}")
             data = response.json()
@@ -151,12 +224,114 @@ class StudyExporter:
             return None
         return data[0].get("codelist_uid")
 
+    def iter_pages(self, path, params=None, page_size=100):
+        """Yields the items of a paginated endpoint, one page at a time"""
+        page_params = {
+            "page_number": 1,
+            "page_size": page_size,
+            "total_count": True,
+        }
+        page_params.update(params or {})
+        data = self.get_from_api(path, params=page_params, items_only=False)
+        if data is None:
+            raise RuntimeError(f"Failed to fetch page 1 from: {path}")
+        count = data["total"]
+        yield data["items"]
+
+        page_params["total_count"] = False
+        while page_size * page_params["page_number"] < count:
+            page_params["page_number"] += 1
+            data = self.get_from_api(path, params=page_params, items_only=True)
+            if data is None:
+                raise RuntimeError(
+                    f"Failed to fetch page {page_params['page_number']} from: {path}"
+                )
+            yield data
+
     def save_formatted_json(self, data, dir, filename):
         filename = filename.replace("/", ".")
         path = os.path.join(dir, filename)
         with open(path, "w") as f:
             self.log.info(f"Saving to file: {path}")
-            f.write(json.dumps(data, indent=2, sort_keys=True))
+            text = json.dumps(data, indent=2, sort_keys=True)
+            f.write(text)
+        return len(text)
+
+    def save_formatted_json_pages(self, pages, dir, filename):
+        """
+        Writes the items of each page to the file as soon as the page is fetched,
+        formatted like save_formatted_json formats the whole list.
+        The file is only replaced once all pages are written.
+        Returns the number of items and characters written.
+        """
+        filename = filename.replace("/", ".")
+        path = os.path.join(dir, filename)
+        partial_path = path + ".partial"
+        items = 0
+        size = 0
+        try:
+            with open(partial_path, "w") as f:
+                self.log.info(f"Streaming to file: {path}")
+                for page in pages:
+                    for item in page:
+                        text = (",\n" if items else "[\n") + textwrap.indent(
+                            json.dumps(item, indent=2, sort_keys=True), "  "
+                        )
+                        f.write(text)
+                        items += 1
+                        size += len(text)
+                text = "\n]" if items else "[]"
+                f.write(text)
+                size += len(text)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return items, size
+
+    def export_endpoint(self, path, filename, params=None, page_size=None, name=None):
+        """
+        Exports an endpoint to a file, page by page if a page size is given.
+        Returns True if all data was fetched.
+        """
+        started = time.perf_counter()
+        if page_size is None:
+            data = self.get_from_api(path, params=dict(params or {}))
+            success = data is not None
+            if success:
+                size = self.save_formatted_json(data, OUTPUT_DIR, filename)
+            else:
+                # Keep the file of the previous export rather than replacing it with null
+                self.log.error(f"Export of {path} failed, not saving {filename}")
+                size = 0
+            requests_count = 1
+            items = len(data) if isinstance(data, list) else int(success)
+        else:
+            pages = []
+
+            def counted_pages():
+                for page in self.iter_pages(path, params=params, page_size=page_size):
+                    pages.append(len(page))
+                    yield page
+
+            try:
+                items, size = self.save_formatted_json_pages(
+                    counted_pages(), OUTPUT_DIR, filename
+                )
+                success = True
+            except RuntimeError as e:
+                self.log.error(f"Export of {path} failed: {e}")
+                items, size, success = sum(pages), 0, False
+            requests_count = len(pages) + (0 if success else 1)
+        self.stats.add(
+            name or path.lstrip("/"),
+            requests=requests_count,
+            items=items,
+            size=size,
+            seconds=time.perf_counter() - started,
+            success=success,
+        )
+        return success
 
     def filter_studies(self, studies):
         include_numbers = [
@@ -358,6 +533,9 @@ activity_endpoints = [
     }
 ]
 
+# Dictionaries are large, they are fetched and written page by page
+DICTIONARY_PAGE_SIZE = 1000
+
 dictionaries = [
     "SNOMED",
     "UNII",
@@ -366,12 +544,81 @@ dictionaries = [
 ]
 
 
-def run_export():
+def study_fingerprint(study):
+    """The version metadata of a study, which changes when a locked study is unlocked"""
+    version_metadata = study["current_metadata"].get("version_metadata") or {}
+    return {
+        "study_status": version_metadata.get("study_status"),
+        "version_number": version_metadata.get("version_number"),
+        "version_timestamp": version_metadata.get("version_timestamp"),
+    }
+
+
+def is_study_unchanged(study, manifest):
+    """
+    Locked studies can't be edited, a locked study whose version is the one already exported is unchanged.
+    Draft studies are always exported, as editing their selections doesn't change their version metadata.
+    """
+    exported = manifest.get("studies", {}).get(study["uid"])
+    fingerprint = study_fingerprint(study)
+    return (
+        exported is not None
+        and fingerprint["study_status"] == "LOCKED"
+        and exported["fingerprint"] == fingerprint
+    )
+
+
+def is_exported(api, future):
+    """Whether an endpoint export succeeded, logging the error of an export that raised"""
+    try:
+        return future.result()
+    except Exception as e:
+        api.log.error(f"Export failed with error: {e}")
+        api.stats.failures += 1
+        return False
+
+
+def read_manifest():
+    path = os.path.join(OUTPUT_DIR, MANIFEST_FILENAME)
     try:
-        os.mkdir("output")
-    except FileExistsError:
-        pass
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_manifest(manifest):
+    path = os.path.join(OUTPUT_DIR, MANIFEST_FILENAME)
+    with open(path, "w") as f:
+        f.write(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def export_study(api, executor, uid, fields):
+    """Submits the export of the metadata and all design endpoints of a study, returns their futures"""
+    futures = [
+        executor.submit(
+            api.export_endpoint,
+            f"/studies/{uid}?fields={fields}",
+            f"studies/{uid}.json",
+            name="studies/{study_uid}",
+        )
+    ]
+    for ep in study_design_endpoints:
+        study_ep = ep.format(study_uid=uid)
+        futures.append(
+            executor.submit(
+                api.export_endpoint, f"/{study_ep}", f"{study_ep}.json", name=ep
+            )
+        )
+    return futures
+
+
+def run_export():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     api = StudyExporter()
+    started = time.perf_counter()
+    manifest = read_manifest() if INCREMENTAL_EXPORT else {}
+    exported_studies = manifest.get("studies", {})
 
     # Clinical programmes
     api.log.info("=== Export clinical programmes ===")
@@ -396,109 +643,121 @@ def run_export():
     study_uids = [s["uid"] for s in studies]
     api.log.info(f"Found studies {study_uids}")
 
-    # Study metadata
-    api.log.info("=== Export study metadata ===")
-    # Include all optional fields
-    # , --> %2C
-    # + --> %2B
-    fields = "%2C".join(["%2B" + f for f in study_optional_fields])
-    for uid in study_uids:
-        api.log.info(f"Export metadata for study uid: {uid}")
-        study = api.get_from_api(f"/studies/{uid}?fields={fields}")
-        api.save_formatted_json(study, OUTPUT_DIR, f"studies/{uid}.json")
-
-    # Study design
-    api.log.info("=== Export study design ===")
-    for uid in study_uids:
-        api.log.info(f"Export study design for study uid: {uid}")
-        for ep in study_design_endpoints:
-            study_ep = ep.format(study_uid=uid)
-            data = api.get_from_api(f"/{study_ep}")
-            api.save_formatted_json(data, OUTPUT_DIR, f"{study_ep}.json")
-
-    # Templates
-    api.log.info("=== Export syntax templates ===")
-    for ep in template_endpoints:
-        data = api.get_from_api(f"/{ep}")
-        api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-    # Templates pre-instances
-    api.log.info("=== Export syntax pre-instances ===")
-    for ep in syntax_pre_instance_endpoints:
-        data = api.get_from_api(f"/{ep}")
-        api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-    # Sponsor extensions to CT packages
-    api.log.info("=== Export sponsor extensions ===")
-    for ext in sponsor_ct_extensions:
-        ep = ext["endpoint"]
-        params = ext["parameters"]
-        page_size = ext["page_size"]
-        codelist_name = params["codelist_name"]
-        api.log.info(f"Export sponsor extensions to {codelist_name} codelist")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.{codelist_name}.json")
+    changed_studies = [s for s in studies if not is_study_unchanged(s, manifest)]
+    api.log.info(
+        f"Skipping {len(studies) - len(changed_studies)} studies unchanged since the last export"
+    )
+
+    with ThreadPoolExecutor(
+        max_workers=EXPORT_WORKERS, thread_name_prefix="export"
+    ) as executor:
+        # Study metadata and design
+        api.log.info("=== Export study metadata and design ===")
+        # Include all optional fields
+        # , --> %2C
+        # + --> %2B
+        fields = "%2C".join(["%2B" + f for f in study_optional_fields])
+        study_futures = {
+            study["uid"]: (study, export_study(api, executor, study["uid"], fields))
+            for study in changed_studies
+        }
+        library_futures = []
 
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.{codelist_name}.json")
-
-    # Concepts
-    api.log.info("=== Export concepts ===")
-    for cpt in concept_endpoints:
-        ep = cpt["endpoint"]
-        params = cpt["parameters"]
-        page_size = cpt["page_size"]
-        concept_name = ep.rsplit("/", 1)[1]
-        api.log.info(f"Export concept: {concept_name}")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+        # Templates
+        api.log.info("=== Export syntax templates ===")
+        for ep in template_endpoints:
+            library_futures.append(
+                executor.submit(api.export_endpoint, f"/{ep}", f"{ep}.json")
+            )
 
-        # Large dataset, split request into pages.
-        else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-    # Activity items etc
-    api.log.info("=== Export activity items, classes etc ===")
-    for cpt in activity_endpoints:
-        ep = cpt["endpoint"]
-        params = cpt["parameters"]
-        page_size = cpt["page_size"]
-        api.log.info(f"Export activity data: {ep}")
-
-        # Small dataset, no need to split into pages.
-        if page_size is None:
-            data = api.get_from_api(f"/{ep}", params=params)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
+        # Templates pre-instances
+        api.log.info("=== Export syntax pre-instances ===")
+        for ep in syntax_pre_instance_endpoints:
+            library_futures.append(
+                executor.submit(api.export_endpoint, f"/{ep}", f"{ep}.json")
+            )
+
+        # Sponsor extensions to CT packages
+        api.log.info("=== Export sponsor extensions ===")
+        for ext in sponsor_ct_extensions:
+            ep = ext["endpoint"]
+            params = ext["parameters"]
+            codelist_name = params["codelist_name"]
+            api.log.info(f"Export sponsor extensions to {codelist_name} codelist")
+            library_futures.append(
+                executor.submit(
+                    api.export_endpoint,
+                    f"/{ep}",
+                    f"{ep}.{codelist_name}.json",
+                    params=params,
+                    page_size=ext["page_size"],
+                )
+            )
 
-        # Large dataset, split request into pages.
+        # Concepts
+        api.log.info("=== Export concepts ===")
+        for cpt in concept_endpoints + activity_endpoints:
+            ep = cpt["endpoint"]
+            library_futures.append(
+                executor.submit(
+                    api.export_endpoint,
+                    f"/{ep}",
+                    f"{ep}.json",
+                    params=cpt["parameters"],
+                    page_size=cpt["page_size"],
+                )
+            )
+
+        # Dictionaries
+        api.log.info("=== Export dictionaries ===")
+        for d in dictionaries:
+            api.log.info(f"Export dictionary: {d}")
+            uid = api.get_dictionary_uid(d)
+            if uid is None:
+                api.log.error(f"Could not find dictionary: {d}")
+                continue
+            library_futures.append(
+                executor.submit(
+                    api.export_endpoint,
+                    "/dictionaries/terms",
+                    f"dictionaries.{d}.json",
+                    params={"codelist_uid": uid},
+                    page_size=DICTIONARY_PAGE_SIZE,
+                    name=f"dictionaries/{d}",
+                )
+            )
+
+    # A study is recorded in the manifest once all its endpoints are exported,
+    # a study that failed is exported again by the next run
+    exported_at = datetime.now(timezone.utc).isoformat()
+    for future in library_futures:
+        is_exported(api, future)
+    for uid, (study, futures) in study_futures.items():
+        if all([is_exported(api, future) for future in futures]):
+            exported_studies[uid] = {
+                "fingerprint": study_fingerprint(study),
+                "exported_at": exported_at,
+            }
         else:
-            data = api.get_from_api_paged(f"/{ep}", params=params, page_size=page_size)
-            api.save_formatted_json(data, OUTPUT_DIR, f"{ep}.json")
-
-    # Dictionaries
-    api.log.info("=== Export dictionaries ===")
-    for d in dictionaries:
-        api.log.info(f"Export dictionary: {d}")
-        uid = api.get_dictionary_uid(d)
-        if uid is None:
-            api.log.error(f"Could not find dictionary: {d}")
-            continue
-        params = {"codelist_uid": uid}
-        data = api.get_from_api("/dictionaries/terms", params=params)
-        api.save_formatted_json(data, OUTPUT_DIR, f"dictionaries.{d}.json")
-
-
-    # All done
-    api.log.info(f"=== Export completed successfully ===")
+            exported_studies.pop(uid, None)
+
+    api.log.info("=== Export throughput ===")
+    throughput = api.stats.report(api.log, time.perf_counter() - started)
+    write_manifest(
+        {
+            "studies": {
+                uid: exported for uid, exported in exported_studies.items() if uid in study_uids
+            },
+            "exported_at": exported_at,
+            "throughput": throughput,
+        }
+    )
+
+    if api.stats.failures:
+        api.log.error(f"=== Export completed with {api.stats.failures} failed endpoints ===")
+    else:
+        # All done
+        api.log.info(f"=== Export completed successfully ===")
 
 
 if __name__ == "__main__":
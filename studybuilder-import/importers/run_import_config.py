@@ -30,9 +30,17 @@ class Configuration(BaseImporter):
             )
             self.api.simple_post_to_api(body=data, path=path, simple_path=path)
 
+    def materialize_ct_package_changes(self):
+        # The CT packages are imported by the clinical standards import before this tool,
+        # store the changes between them once instead of computing them on each request
+        path = "/ct/packages/changes/materialize"
+        self.log.info("Materializing the changes between CT packages")
+        self.api.simple_post_to_api(body=None, path=path, simple_path=path)
+
     def run(self):
         self.log.info("Importing general config")
         self.migrate_study_fields(MDR_STUDY_FIELDS_DEFINITIONS)
+        self.materialize_ct_package_changes()
         self.log.info("Done importing general config")
 
 
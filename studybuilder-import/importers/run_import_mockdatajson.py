@@ -1,7 +1,6 @@
 import copy
 import json
 import os
-from functools import lru_cache
 from os import environ
 
 from .functions.utils import load_env
@@ -48,7 +47,7 @@ from .utils.api_bindings import (
     UNIT_SUBSET_DOSE,
     UNIT_SUBSET_STUDY_TIME,
 )
-from .utils.importer import BaseImporter, open_file
+from .utils.importer import NOT_RESOLVED, BaseImporter, open_file, timed_lru_cache
 from .utils.metrics import Metrics
 
 metrics = Metrics()
@@ -199,6 +198,32 @@ TEMPLATE_PARAM_MAP = {
     #        }
 }
 
+# Type of lookup in the lookups endpoint for each concept endpoint
+CONCEPT_LOOKUP_TYPES = {
+    "activities/activities": "activity",
+    "activities/activity-groups": "activity_group",
+    "activities/activity-sub-groups": "activity_subgroup",
+    "activities/activity-instances": "activity_instance",
+    "compounds": "compound",
+    "compound-aliases": "compound_alias",
+    "unit-definitions": "unit_definition",
+}
+
+# Codelists whose terms are looked up while importing compounds, templates and studies,
+# fetched in parallel before the import
+WARMUP_CODELISTS = [
+    CODELIST_COMPOUND_DISPENSED_IN,
+    CODELIST_DELIVERY_DEVICE,
+    CODELIST_DOSAGE_FORM,
+    CODELIST_ENDPOINT_LEVEL,
+    CODELIST_ENDPOINT_SUBLEVEL,
+    CODELIST_OBJECTIVE_LEVEL,
+    CODELIST_ROUTE_OF_ADMINISTRATION,
+    CODELIST_TYPE_OF_TREATMENT,
+    CODELIST_UNIT_DIMENSION,
+]
+
+
 # Print any object nicely, useful while debugging
 def jsonprint(data):
     print(json.dumps(data, indent=2))
@@ -222,10 +247,40 @@ class MockdataJson(BaseImporter):
             value="uid",
         )
 
-    @lru_cache(maxsize=10000)
+    ############ bulk lookups ###########
+
+    def ct_term_lookup(self, codelist_name, name):
+        if codelist_name in CODELIST_NAME_MAP:
+            return {
+                "type": "ct_term",
+                "name": name,
+                "codelist_uid": CODELIST_NAME_MAP[codelist_name],
+            }
+        return {"type": "ct_term", "name": name, "codelist_name": codelist_name}
+
+    def concept_lookup(self, endpoint, name):
+        return {"type": CONCEPT_LOOKUP_TYPES.get(endpoint, endpoint), "name": name}
+
+    def unit_lookups(self, name):
+        # lookup_unit_uid retries with the name in lowercase and uppercase
+        if not name:
+            return []
+        return [
+            self.concept_lookup("unit-definitions", variant)
+            for variant in (name, name.lower(), name.upper())
+        ]
+
+    def dictionary_term_lookup(self, dictionary_uid, name):
+        return {"type": "dictionary_term", "name": name, "codelist_uid": dictionary_uid}
+
+    @timed_lru_cache(maxsize=10000)
     def lookup_ct_term_uid(
         self, codelist_name, value, key="sponsor_preferred_name", uid_key="term_uid"
     ):
+        if key == "sponsor_preferred_name" and uid_key == "term_uid":
+            uid = self.get_resolved_uid(self.ct_term_lookup(codelist_name, value))
+            if uid is not NOT_RESOLVED:
+                return uid
         filt = {key: {"v": [value], "op": "eq"}}
         if codelist_name in CODELIST_NAME_MAP:
             self.log.info(
@@ -260,8 +315,11 @@ class MockdataJson(BaseImporter):
             f"Could not find term with '{key}' == '{value}' in codelist '{codelist_name}'"
         )
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def lookup_concept_uid(self, name, endpoint, subset=None):
+        uid = self.get_resolved_uid(self.concept_lookup(endpoint, name))
+        if uid is not NOT_RESOLVED:
+            return uid
         self.log.info(f"Looking up concept {endpoint} with name '{name}'")
         filt = {"name": {"v": [name], "op": "eq"}}
         path = f"/concepts/{endpoint}"
@@ -315,7 +373,7 @@ class MockdataJson(BaseImporter):
         self.log.info(f"Looked up unit name '{name}', found uid '{uid}'")
         return uid
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def lookup_dictionary_uid(self, name):
         self.log.info(f"Looking up dictionary with name '{name}'")
         items = self.api.get_all_from_api(
@@ -327,8 +385,11 @@ class MockdataJson(BaseImporter):
             return uid
         self.log.warning(f"Could not find dictionary with name '{name}'")
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def lookup_ct_codelist_uid(self, name):
+        uid = self.get_resolved_uid({"type": "ct_codelist", "name": name})
+        if uid is not NOT_RESOLVED:
+            return uid
         self.log.info(f"Looking up ct codelist with name '{name}'")
         filt = {"name": {"v": [name], "op": "eq"}}
         items = self.api.get_all_from_api(
@@ -377,7 +438,7 @@ class MockdataJson(BaseImporter):
         self.log.debug(f"Got {len(items)} study compounds")
         return items
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def fetch_codelist_terms(self, name):
         if name in CODELIST_NAME_MAP:
             self.log.info(
@@ -393,7 +454,7 @@ class MockdataJson(BaseImporter):
         self.log.debug(f"Got {len(items)} terms from codelist with name '{name}'")
         return items
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def fetch_dictionary_terms(self, name):
         uid = self.lookup_dictionary_uid(name)
         self.log.info(f"Fetching terms for dictionary with name '{name}'")
@@ -405,24 +466,30 @@ class MockdataJson(BaseImporter):
         self.log.debug(f"Got {len(items)} terms from dictionary with name '{name}'")
         return items
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def lookup_dictionary_term_uid(self, dictionary_name, term_name):
         self.log.info(
             f"Looking up term with name '{term_name}' from dictionary '{dictionary_name}'"
         )
-        snomed_uid = self.lookup_dictionary_uid(dictionary_name)
-        filt = {"name": {"v": [term_name], "op": "eq"}}
-        items = self.api.get_all_from_api(
-            "/dictionaries/terms",
-            params={"codelist_uid": snomed_uid, "filters": json.dumps(filt)},
+        dictionary_uid = self.lookup_dictionary_uid(dictionary_name)
+        uid = self.get_resolved_uid(
+            self.dictionary_term_lookup(dictionary_uid, term_name)
+        )
+        if uid is not NOT_RESOLVED:
+            return uid
+        # The lookup endpoint resolves names from an in-memory index of the dictionary
+        result = self.api.simple_post_to_api(
+            "/dictionaries/terms/lookup",
+            {"codelist_uid": dictionary_uid, "names": [term_name]},
         )
+        items = result.get(term_name) if result is not None else None
         if items is not None and len(items) > 0:
             uid = items[0].get("term_uid", None)
             self.log.debug(f"Found term with name '{term_name}' and uid '{uid}'")
             return uid
         self.log.warning(f"Could not find term with name '{term_name}'")
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def lookup_codelist_term_uid(self, codelist_name, sponsor_preferred_name):
         self.log.info(
             f"Looking up term with name '{sponsor_preferred_name}' from dictionary '{codelist_name}'"
@@ -440,7 +507,7 @@ class MockdataJson(BaseImporter):
             f"Could not find term with sponsor preferred name '{sponsor_preferred_name}'"
         )
 
-    @lru_cache(maxsize=10000)
+    @timed_lru_cache(maxsize=10000)
     def lookup_codelist_term_name_from_concept_id(self, codelist_name, concept_id):
         self.log.info(
             f"Looking up term with concept id '{concept_id}' from codelist '{codelist_name}'"
@@ -698,12 +765,34 @@ class MockdataJson(BaseImporter):
 
     def print_cache_stats(self):
         print("\nCache summary")
-        print(f"{'function':35s}\thits\tmisses")
+        print(f"{'function':35s}\thits\tmisses\ttime (s)\tsaved (s)")
+        total_misses = 0
+        total_seconds = 0.0
         for key in dir(self):
             item = getattr(self, key)
             if hasattr(item, "cache_info"):
                 info = item.cache_info()
-                print(f"{key:35s}\t{info.hits}\t{info.misses}")
+                seconds = getattr(item, "miss_seconds", 0.0)
+                # each hit saved about the average time of a miss
+                saved = info.hits * seconds / info.misses if info.misses else 0.0
+                total_misses += info.misses
+                total_seconds += seconds
+                print(
+                    f"{key:35s}\t{info.hits}\t{info.misses}\t{seconds:.2f}\t\t{saved:.2f}"
+                )
+        stats = self.lookup_stats
+        # the misses answered from the bulk lookups took no time
+        api_misses = total_misses - stats["hits"]
+        saved = (
+            stats["hits"] * total_seconds / api_misses - stats["seconds"]
+            if api_misses > 0
+            else 0.0
+        )
+        print(
+            f"Bulk lookups: {stats['items']} names resolved in {stats['requests']} requests "
+            f"taking {stats['seconds']:.2f} s, {stats['hits']} lookups answered from them "
+            f"saving about {saved:.2f} s"
+        )
 
     ####################### Helper functions ######################
 
@@ -2539,6 +2628,10 @@ class MockdataJson(BaseImporter):
     def handle_compound_aliases(self, jsonfile):
         self.log.info("======== Compound aliases ========")
         import_data = json.load(jsonfile)
+        self.resolve_uids(
+            self.concept_lookup("compounds", alias["compound"]["name"])
+            for alias in import_data
+        )
         for alias in import_data:
             data = copy.deepcopy(import_templates.compound_alias)
             for key in data.keys():
@@ -2563,6 +2656,24 @@ class MockdataJson(BaseImporter):
     def handle_compounds(self, jsonfile):
         self.log.info("======== Compounds ========")
         import_data = json.load(jsonfile)
+        lookups = []
+        for comp in import_data:
+            for val in (
+                comp["dose_values"]
+                + comp["strength_values"]
+                + comp["lag_times"]
+                + comp["dose_frequencies"]
+                + [comp["half_life"]]
+            ):
+                if val is not None:
+                    lookups.extend(self.unit_lookups(val["unit_label"]))
+            for val in comp["lag_times"]:
+                lookups.append(
+                    self.ct_term_lookup(
+                        CODELIST_SDTM_DOMAIN_ABBREVIATION, val["sdtm_domain_label"]
+                    )
+                )
+        self.resolve_uids(lookups)
         for comp in import_data:
             data = copy.deepcopy(import_templates.compound)
             for key in data.keys():
@@ -2876,6 +2987,19 @@ class MockdataJson(BaseImporter):
     def handle_unit_definitions(self, jsonfile):
         self.log.info("======== Unit definitions ========")
         imported = json.load(jsonfile)
+        ucum_uid = self.lookup_dictionary_uid("UCUM")
+        # the units themselves are not resolved in bulk, they are created below
+        lookups = []
+        for unit in imported:
+            for ct in unit["ct_units"]:
+                lookups.append(self.ct_term_lookup(CODELIST_UNIT, ct["name"]))
+            for ct in unit["unit_subsets"]:
+                lookups.append(self.ct_term_lookup(CODELIST_UNIT_SUBSET, ct["name"]))
+            if unit["ucum"] is not None and ucum_uid is not None:
+                lookups.append(
+                    self.dictionary_term_lookup(ucum_uid, unit["ucum"].get("name"))
+                )
+        self.resolve_uids(lookups)
         for unit in imported:
             name = unit["name"]
             existing = self.lookup_concept_uid(name, "unit-definitions")
@@ -2950,6 +3074,11 @@ class MockdataJson(BaseImporter):
         imported = json.load(jsonfile)
         existing_subgroups = self.fetch_all_activity_subgroups()
         existing_names = list(existing_subgroups.keys())
+        self.resolve_uids(
+            self.concept_lookup("activities/activity-groups", group["name"])
+            for subgroup in imported
+            for group in subgroup.get("activity_groups") or []
+        )
         for subgroup in imported:
             name = subgroup["name"]
             if name in existing_names:
@@ -2989,6 +3118,21 @@ class MockdataJson(BaseImporter):
         imported = json.load(jsonfile)
         existing_activities = self.fetch_all_activities()
         existing_names = list(existing_activities.keys())
+        lookups = []
+        for activity in imported:
+            for grouping in activity.get("activity_groupings") or []:
+                lookups.append(
+                    self.concept_lookup(
+                        "activities/activity-groups", grouping["activity_group_name"]
+                    )
+                )
+                lookups.append(
+                    self.concept_lookup(
+                        "activities/activity-sub-groups",
+                        grouping["activity_subgroup_name"],
+                    )
+                )
+        self.resolve_uids(lookups)
         for activity in imported:
             name = activity["name"]
             if name in existing_names:
@@ -3061,6 +3205,8 @@ class MockdataJson(BaseImporter):
         units_ct_json = os.path.join(self.import_dir, "ct.terms.Unit.json")
         self.handle_ct_extensions(units_ct_json, "Unit")
 
+        self.warmup_cache(self.fetch_codelist_terms, WARMUP_CODELISTS)
+
         # Unit definitions
         if MDR_MIGRATION_EXPORTED_UNITS:
             units_json = os.path.join(self.import_dir, "concepts.unit-definitions.json")
@@ -1,7 +1,9 @@
 import logging
+import threading
 import time
-from collections.abc import Callable
-from functools import wraps
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from typing import Dict
 
 import aiohttp
@@ -23,6 +25,13 @@ API_HEADERS = {"Accept": "application/json", "User-Agent": "test"}
 # ---------------------------------------------------------------
 #
 API_BASE_URL = load_env("API_BASE_URL")
+# Number of requests sent in parallel when warming up the caches
+LOOKUP_WARMUP_WORKERS = int(load_env("LOOKUP_WARMUP_WORKERS", default="4"))
+# Number of names resolved to uids per request to the lookups endpoint
+LOOKUP_BATCH_SIZE = int(load_env("LOOKUP_BATCH_SIZE", default="1000"))
+
+# Returned by get_resolved_uid for names that weren't resolved in bulk
+NOT_RESOLVED = object()
 
 
 class TermCache:
@@ -54,6 +63,28 @@ class TermCache:
         self.added_terms = CaselessDict()
 
 
+# Decorator caching the results of a function like lru_cache,
+# that also sums up the time spent in calls that were not answered from the cache
+def timed_lru_cache(maxsize=128):
+    def timed_decorator(func):
+        lock = threading.Lock()
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with lock:
+                    cached.miss_seconds += time.perf_counter() - start
+
+        cached = lru_cache(maxsize=maxsize)(timed)
+        cached.miss_seconds = 0.0
+        return cached
+
+    return timed_decorator
+
+
 # Decorator to avoid starting every function with the open() context manager
 def open_file():
     def open_decorator(func):
@@ -114,6 +145,9 @@ class BaseImporter:
             self.api = api
 
         self.cache = cache
+        # uids resolved in bulk by resolve_uids, by lookup key
+        self.resolved_uids = {}
+        self.lookup_stats = {"requests": 0, "items": 0, "seconds": 0.0, "hits": 0}
 
         self.visit_type_codelist_name = "VisitType"
         self.element_subtype_codelist_name = "Element Sub Type"
@@ -184,6 +218,72 @@ class BaseImporter:
         self.ensure_cache()
         return self.cache
 
+    def warmup_cache(self, loader: Callable, keys: Iterable):
+        """Calls a cached loader for each key in parallel, so that the following calls are answered from its cache"""
+        keys = list(dict.fromkeys(keys))
+        self.log.info(f"Warming up cache of {loader.__name__} with {len(keys)} keys")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=LOOKUP_WARMUP_WORKERS) as executor:
+            for key, future in [(key, executor.submit(loader, key)) for key in keys]:
+                try:
+                    future.result()
+                except Exception as e:
+                    self.log.warning(
+                        f"Failed to warm up cache of {loader.__name__} for '{key}': {e}"
+                    )
+        self.log.info(
+            f"Warmed up cache of {loader.__name__} in {time.perf_counter() - start:.2f} s"
+        )
+
+    @staticmethod
+    def lookup_key(item: Dict):
+        return (
+            item["type"],
+            item.get("codelist_uid"),
+            item.get("codelist_name"),
+            item["name"],
+        )
+
+    def resolve_uids(self, items: Iterable[Dict]):
+        """
+        Resolves many names to uids with the lookups endpoint, a few requests instead of one per name.
+        Each item is a dict with the type and name to look up, and for terms, the codelist_uid or codelist_name.
+        The uids are then returned by get_resolved_uid.
+        """
+        unresolved = {}
+        for item in items:
+            if not item.get("name"):
+                continue
+            key = self.lookup_key(item)
+            if key not in self.resolved_uids:
+                unresolved[key] = item
+        items = list(unresolved.values())
+        for offset in range(0, len(items), LOOKUP_BATCH_SIZE):
+            batch = items[offset : offset + LOOKUP_BATCH_SIZE]
+            start = time.perf_counter()
+            results = self.api.simple_post_to_api("/lookups", {"items": batch})
+            self.lookup_stats["seconds"] += time.perf_counter() - start
+            self.lookup_stats["requests"] += 1
+            if results is None:
+                self.log.warning(
+                    f"Failed to resolve {len(batch)} names, looking them up one by one"
+                )
+                continue
+            self.lookup_stats["items"] += len(results)
+            for result in results:
+                self.resolved_uids[self.lookup_key(result)] = result.get("uid")
+
+    def get_resolved_uid(self, item: Dict):
+        """
+        Returns the uid resolved in bulk for an item, or NOT_RESOLVED if no uid was found in bulk.
+        Names the bulk lookup didn't find are NOT_RESOLVED too, so that callers fall back to their own lookup.
+        """
+        uid = self.resolved_uids.get(self.lookup_key(item))
+        if uid is None:
+            return NOT_RESOLVED
+        self.lookup_stats["hits"] += 1
+        return uid
+
     ############ helper functions ###########
 
     # Check if a codelist contains a term with sponsor preferred name equal to the given name.